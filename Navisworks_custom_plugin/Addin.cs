@@ -5,6 +5,7 @@ using Autodesk.Navisworks.Api.Plugins;
 using Autodesk.Navisworks.Api.Timeliner;
 using System;
 using System.Collections.Generic;
+using System.Globalization;
 using System.Linq;
 using System.Threading.Tasks;
 using System.Windows.Forms;
@@ -571,6 +572,34 @@ namespace timeliner_Plugin
         }
 
 
+        public List<SyncTaskRecord> ListTimelinerTasks()
+        {
+            var doc = Autodesk.Navisworks.Api.Application.ActiveDocument;
+            DocumentTimeliner timeliner = doc.GetTimeliner();
+            var records = new List<SyncTaskRecord>();
+            foreach (SavedItem savedItem in timeliner.Tasks)
+            {
+                TimelinerTask task = savedItem as TimelinerTask;
+                if (task == null)
+                {
+                    continue;
+                }
+
+                // Timeliner only keeps actual dates, so the status is reported at that resolution
+                string status = task.ActualEndDate.HasValue ? "complete"
+                    : task.ActualStartDate.HasValue ? "in progress"
+                    : "not started";
+                records.Add(new SyncTaskRecord
+                {
+                    Name = task.DisplayName,
+                    Status = status,
+                    Start = task.PlannedStartDate?.ToString("yyyy-MM-dd", CultureInfo.InvariantCulture) ?? "",
+                    End = task.PlannedEndDate?.ToString("yyyy-MM-dd", CultureInfo.InvariantCulture) ?? ""
+                });
+            }
+            return records;
+        }
+
         public void DeleteTimelinerTask(string taskToDelete)
         {
             var doc = Autodesk.Navisworks.Api.Application.ActiveDocument;
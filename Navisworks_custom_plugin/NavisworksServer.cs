@@ -2,6 +2,9 @@
 using System.Net;
 using System.Threading.Tasks;
 using System.Collections.Generic;
+using System.Linq;
+using System.Security.Cryptography;
+using System.Text;
 using Newtonsoft.Json;
 
 namespace timeliner_Plugin
@@ -12,6 +15,10 @@ namespace timeliner_Plugin
         private readonly VIS4D plugin;
         private const string Url = "http://localhost:5000/";
 
+        // Hash tree of the schedule for the sync session in progress; dropped whenever the server changes a task
+        private readonly object syncLock = new object();
+        private SyncSnapshot syncSnapshot;
+
         public NavisworksServer(VIS4D pluginInstance)
         {
             plugin = pluginInstance;
@@ -31,8 +38,15 @@ namespace timeliner_Plugin
 
         private async Task HandleRequestAsync(HttpListenerContext context)
         {
+            // Anything but a sync query may change tasks, so the sync snapshot is dropped before and after it
+            bool changesTasks = context.Request.HttpMethod != "POST"
+                || !context.Request.Url.PathAndQuery.StartsWith("/api/timeliner/sync/");
             try
             {
+                if (changesTasks)
+                {
+                    InvalidateSyncSnapshot();
+                }
                 switch (context.Request.HttpMethod)
                 {
                     case "POST" when context.Request.Url.PathAndQuery == "/api/timeliner/task":
@@ -44,6 +58,15 @@ namespace timeliner_Plugin
                     case "DELETE" when context.Request.Url.PathAndQuery.StartsWith("/api/timeliner/task/delete/"):
                         await HandleDeleteTask(context);
                         break;
+                    case "POST" when context.Request.Url.PathAndQuery == "/api/timeliner/task/batch":
+                        await HandleBatch(context);
+                        break;
+                    case "POST" when context.Request.Url.PathAndQuery == "/api/timeliner/sync/tree":
+                        await HandleSyncTree(context);
+                        break;
+                    case "POST" when context.Request.Url.PathAndQuery == "/api/timeliner/sync/tasks":
+                        await HandleSyncTasks(context);
+                        break;
                     default:
                         SendResponse(context, 404, new { error = "Endpoint not found" });
                         break;
@@ -53,6 +76,13 @@ namespace timeliner_Plugin
             {
                 SendResponse(context, 500, new { error = ex.Message });
             }
+            finally
+            {
+                if (changesTasks)
+                {
+                    InvalidateSyncSnapshot();
+                }
+            }
         }
 
         private async Task HandleCreateTask(HttpListenerContext context)
@@ -110,6 +140,135 @@ namespace timeliner_Plugin
             SendResponse(context, 200, new { success = true });
         }
 
+        private async Task HandleBatch(HttpListenerContext context)
+        {
+            System.IO.StreamReader reader = new System.IO.StreamReader(context.Request.InputStream);
+            string requestBody = await reader.ReadToEndAsync();
+            reader.Dispose();
+            var batch = JsonConvert.DeserializeObject<BatchRequest>(requestBody);
+
+            var results = new List<object>();
+            bool allSucceeded = true;
+            foreach (var op in batch.Operations)
+            {
+                try
+                {
+                    int result;
+                    switch (op.Action)
+                    {
+                        case "create":
+                            result = plugin.CreateTimelinerTask(
+                                op.TaskName,
+                                op.TaskType ?? "Construct",
+                                DateTime.Parse(op.StartDate),
+                                DateTime.Parse(op.EndDate)
+                            );
+                            break;
+                        case "update":
+                            result = plugin.UpdateTimelinerTask(
+                                op.TaskName,
+                                op.NewName,
+                                string.IsNullOrEmpty(op.StartDate) ? (DateTime?)null : DateTime.Parse(op.StartDate),
+                                string.IsNullOrEmpty(op.EndDate) ? (DateTime?)null : DateTime.Parse(op.EndDate),
+                                op.NewStatus
+                            );
+                            break;
+                        case "delete":
+                            plugin.DeleteTimelinerTask(op.TaskName);
+                            result = 0;
+                            break;
+                        default:
+                            allSucceeded = false;
+                            results.Add(new { success = false, error = "Unknown action: " + op.Action });
+                            continue;
+                    }
+                    allSucceeded &= result == 0;
+                    results.Add(new { success = result == 0 });
+                }
+                catch (Exception ex)
+                {
+                    allSucceeded = false;
+                    results.Add(new { success = false, error = ex.Message });
+                }
+            }
+
+            // Per-operation outcomes are reported in the body, so the batch itself always succeeds
+            SendResponse(context, 200, new { success = allSucceeded, results });
+        }
+
+        private async Task<SyncRequest> ReadSyncRequest(HttpListenerContext context)
+        {
+            System.IO.StreamReader reader = new System.IO.StreamReader(context.Request.InputStream);
+            string requestBody = await reader.ReadToEndAsync();
+            reader.Dispose();
+            return JsonConvert.DeserializeObject<SyncRequest>(requestBody);
+        }
+
+        // The schedule is listed and hashed once per sync session, not once per request
+        private SyncSnapshot GetSyncSnapshot(SyncRequest request)
+        {
+            lock (syncLock)
+            {
+                if (syncSnapshot == null || !syncSnapshot.Matches(request))
+                {
+                    syncSnapshot = SyncSnapshot.Build(request.Session, plugin.ListTimelinerTasks(), request.Fanout, request.Depth);
+                }
+                return syncSnapshot;
+            }
+        }
+
+        private void InvalidateSyncSnapshot()
+        {
+            lock (syncLock)
+            {
+                syncSnapshot = null;
+            }
+        }
+
+        private async Task HandleSyncTree(HttpListenerContext context)
+        {
+            var request = await ReadSyncRequest(context);
+            ulong[][] levels = GetSyncSnapshot(request).Levels;
+
+            // Only non-empty nodes are sent; the client treats missing nodes as empty
+            var hashes = new Dictionary<string, string>();
+            if (request.Level == 0)
+            {
+                if (levels[0][0] != 0)
+                {
+                    hashes["0"] = levels[0][0].ToString("x16");
+                }
+            }
+            else
+            {
+                ulong[] row = levels[request.Level];
+                foreach (int parent in request.Parents ?? new List<int>())
+                {
+                    for (int child = parent * request.Fanout; child < (parent + 1) * request.Fanout; child++)
+                    {
+                        if (row[child] != 0)
+                        {
+                            hashes[child.ToString()] = row[child].ToString("x16");
+                        }
+                    }
+                }
+            }
+
+            SendResponse(context, 200, new { success = true, hashes });
+        }
+
+        private async Task HandleSyncTasks(HttpListenerContext context)
+        {
+            var request = await ReadSyncRequest(context);
+            var snapshot = GetSyncSnapshot(request);
+            var tasks = (request.Buckets ?? new List<int>())
+                .Distinct()
+                .SelectMany(bucket => snapshot.TasksIn(bucket))
+                .ToList();
+
+            SendResponse(context, 200, new { success = true, tasks });
+        }
+
         private void SendResponse(HttpListenerContext context, int statusCode, object data)
         {
             string response = JsonConvert.SerializeObject(data);
@@ -129,6 +288,154 @@ namespace timeliner_Plugin
         public UpdateData Updates { get; set; }
     }
 
+    public class BatchRequest
+    {
+        public List<BatchOperation> Operations { get; set; }
+    }
+
+    public class BatchOperation
+    {
+        public string Action { get; set; }
+        public string TaskName { get; set; }
+        public string TaskType { get; set; }
+        public string StartDate { get; set; }
+        public string EndDate { get; set; }
+        public string NewName { get; set; }
+        public string NewStatus { get; set; }
+    }
+
+    public class SyncRequest
+    {
+        public int Level { get; set; }
+        public List<int> Parents { get; set; }
+        public List<int> Buckets { get; set; }
+        public int Fanout { get; set; } = 16;
+        public int Depth { get; set; } = 4;
+        public string Session { get; set; }
+    }
+
+    // One listing of the schedule: its hash tree and its tasks by leaf bucket and by name
+    public class SyncSnapshot
+    {
+        public string Session { get; private set; }
+        public int Fanout { get; private set; }
+        public int Depth { get; private set; }
+        public ulong[][] Levels { get; private set; }
+        public Dictionary<string, SyncTaskRecord> TasksByName { get; } = new Dictionary<string, SyncTaskRecord>();
+        private readonly Dictionary<int, List<SyncTaskRecord>> tasksByBucket = new Dictionary<int, List<SyncTaskRecord>>();
+
+        public static SyncSnapshot Build(string session, List<SyncTaskRecord> tasks, int fanout, int depth)
+        {
+            var snapshot = new SyncSnapshot { Session = session, Fanout = fanout, Depth = depth };
+            snapshot.Levels = SyncTree.Build(tasks, fanout, depth);
+            int leaves = SyncTree.LeafCount(fanout, depth);
+            foreach (var task in tasks)
+            {
+                snapshot.TasksByName[task.Name] = task;
+                int bucket = SyncTree.Bucket(task.Name, leaves);
+                if (!snapshot.tasksByBucket.TryGetValue(bucket, out var bucketTasks))
+                {
+                    bucketTasks = new List<SyncTaskRecord>();
+                    snapshot.tasksByBucket[bucket] = bucketTasks;
+                }
+                bucketTasks.Add(task);
+            }
+            return snapshot;
+        }
+
+        // Requests without a session (older clients) always get a fresh listing
+        public bool Matches(SyncRequest request)
+        {
+            return request.Session != null && request.Session == Session
+                && request.Fanout == Fanout && request.Depth == Depth;
+        }
+
+        public IEnumerable<SyncTaskRecord> TasksIn(int bucket)
+        {
+            return tasksByBucket.TryGetValue(bucket, out var bucketTasks)
+                ? bucketTasks
+                : Enumerable.Empty<SyncTaskRecord>();
+        }
+    }
+
+    public class SyncTaskRecord
+    {
+        [JsonProperty("name")]
+        public string Name { get; set; }
+        [JsonProperty("status")]
+        public string Status { get; set; }
+        [JsonProperty("start")]
+        public string Start { get; set; }
+        [JsonProperty("end")]
+        public string End { get; set; }
+    }
+
+    // Task hash tree for delta sync; must stay in step with schedule_sync.py on the VIS4D side
+    public static class SyncTree
+    {
+        public static ulong Digest(SyncTaskRecord task)
+        {
+            string data = string.Join("\u001f", task.Name, task.Status, task.Start, task.End);
+            return ReadBigEndian(Hash(data), 8);
+        }
+
+        public static int Bucket(string taskName, int leaves)
+        {
+            return (int)(ReadBigEndian(Hash(taskName), 4) % (ulong)leaves);
+        }
+
+        public static int LeafCount(int fanout, int depth)
+        {
+            int leaves = 1;
+            for (int level = 0; level < depth; level++)
+            {
+                leaves *= fanout;
+            }
+            return leaves;
+        }
+
+        // Every node is the XOR of the digests of the tasks below it
+        public static ulong[][] Build(IEnumerable<SyncTaskRecord> tasks, int fanout, int depth)
+        {
+            var levels = new ulong[depth + 1][];
+            for (int level = 0; level <= depth; level++)
+            {
+                levels[level] = new ulong[LeafCount(fanout, level)];
+            }
+
+            int leaves = levels[depth].Length;
+            foreach (var task in tasks)
+            {
+                ulong digest = Digest(task);
+                int node = Bucket(task.Name, leaves);
+                for (int level = depth; level >= 0; level--)
+                {
+                    levels[level][node] ^= digest;
+                    node /= fanout;
+                }
+            }
+            return levels;
+        }
+
+        private static byte[] Hash(string text)
+        {
+            using (var sha1 = SHA1.Create())
+            {
+                return sha1.ComputeHash(Encoding.UTF8.GetBytes(text));
+            }
+        }
+
+        private static ulong ReadBigEndian(byte[] bytes, int count)
+        {
+            ulong value = 0;
+            for (int i = 0; i < count; i++)
+            {
+                value = (value << 8) | bytes[i];
+            }
+            return value;
+        }
+    }
+
     public class UpdateData
     {
         public string NewName { get; set; }
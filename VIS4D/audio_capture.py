@@ -0,0 +1,201 @@
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable
+
+import numpy as np
+
+from constants import RECORDING_SETTINGS
+
+_SAMPLE_TYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+def frame_energy(chunk: bytes, sample_width: int = 2) -> float:
+    """RMS energy of one chunk of little-endian PCM audio"""
+    samples = np.frombuffer(chunk, dtype=_SAMPLE_TYPES[sample_width])
+    if not len(samples):
+        return 0.0
+    samples = samples.astype(np.float32)
+    return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+
+class NoiseFloor:
+    """Rolling background-noise estimate from recent frame energies.
+
+    The floor is a low percentile of the last window of frames, so it follows
+    the room (a generator starting, a crew leaving) while speech, which
+    occupies a minority of frames, barely moves it. Until warmup frames have
+    been seen the initial threshold is used.
+    """
+    def __init__(self, window: int, warmup: int,
+                 percentile: float = RECORDING_SETTINGS['NOISE_PERCENTILE'],
+                 ratio: float = RECORDING_SETTINGS['SPEECH_RATIO'],
+                 minimum: float = RECORDING_SETTINGS['MIN_ENERGY'],
+                 initial: float = RECORDING_SETTINGS['INITIAL_ENERGY'],
+                 refresh: int = RECORDING_SETTINGS['NOISE_REFRESH_FRAMES']):
+        self.percentile = percentile
+        self.ratio = ratio
+        self.minimum = minimum
+        self.warmup = max(1, min(warmup, window))
+        self.refresh = refresh
+        self._energies = np.zeros(window, dtype=np.float32)
+        self._count = 0
+        self.floor: Optional[float] = None
+        self.threshold = initial
+
+    def update(self, energy: float):
+        self._energies[self._count % len(self._energies)] = energy
+        self._count += 1
+        if self._count >= self.warmup and self._count % self.refresh == 0:
+            self.floor = float(np.percentile(self._energies[:min(self._count, len(self._energies))], self.percentile))
+            self.threshold = max(self.minimum, self.floor * self.ratio)
+
+class AudioCapture:
+    """Long-lived microphone stream shared by everything that listens.
+
+    A reader thread keeps the stream open and drained, updating the noise
+    floor from every frame. Listening only subscribes to the frames that
+    follow (plus a short pre-roll of the ones just before), so there is no
+    stream setup or calibration between a button press and capture.
+
+    source is an opened speech_recognition Microphone (or anything exposing
+    stream.read(), CHUNK, SAMPLE_RATE and SAMPLE_WIDTH the same way).
+    """
+    def __init__(self, source):
+        self.source = source
+        self.sample_rate = source.SAMPLE_RATE
+        self.sample_width = source.SAMPLE_WIDTH
+        self.chunk = source.CHUNK
+        self.frame_seconds = self.chunk / self.sample_rate
+        frames_per_second = 1.0 / self.frame_seconds
+        self.noise = NoiseFloor(
+            window=max(1, int(RECORDING_SETTINGS['NOISE_WINDOW_SECONDS'] * frames_per_second)),
+            warmup=max(1, int(RECORDING_SETTINGS['CALIBRATION_DURATION'] * frames_per_second))
+        )
+        self._preroll = deque(maxlen=max(1, math.ceil(RECORDING_SETTINGS['PREROLL_SECONDS'] * frames_per_second)))
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.latencies = deque(maxlen=100)          # button press to first captured frame, seconds
+
+    @property
+    def energy_threshold(self) -> float:
+        return self.noise.threshold
+
+    def start(self):
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def cancel(self):
+        """Make a listen() in progress return None"""
+        self._cancelled.set()
+
+    def subscribe(self) -> queue.Queue:
+        """Queue of (chunk, energy) frames starting with the pre-roll"""
+        frames: queue.Queue = queue.Queue()
+        with self._lock:
+            for frame in self._preroll:
+                frames.put(frame)
+            self._subscribers.append(frames)
+        return frames
+
+    def unsubscribe(self, frames: queue.Queue):
+        with self._lock:
+            if frames in self._subscribers:
+                self._subscribers.remove(frames)
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                chunk = self.source.stream.read(self.chunk)
+            except Exception as e:
+                logging.error(f"Audio capture read error: {str(e)}")
+                time.sleep(self.frame_seconds)
+                continue
+            if not chunk:
+                continue
+            energy = frame_energy(chunk, self.sample_width)
+            self.noise.update(energy)
+            frame = (chunk, energy)
+            with self._lock:
+                self._preroll.append(frame)
+                for frames in self._subscribers:
+                    frames.put(frame)
+
+    def listen(self, timeout: float = RECORDING_SETTINGS['TIMEOUT'],
+               phrase_time_limit: float = RECORDING_SETTINGS['PHRASE_TIME_LIMIT'],
+               requested_at: float = None,
+               on_frame: Callable[[bytes], None] = None) -> Optional[bytes]:
+        """Capture one phrase; returns its raw audio, or None if no speech started before timeout.
+
+        requested_at is the perf_counter() time of the button press, used to
+        record how long it took for capture to begin. on_frame, if given, is
+        called with each chunk of the phrase as it arrives (for streaming
+        recognition).
+        """
+        requested_at = requested_at or time.perf_counter()
+        self._cancelled.clear()
+        frames = self.subscribe()
+        pause_frames = max(1, int(RECORDING_SETTINGS['PAUSE_SECONDS'] / self.frame_seconds))
+        wait_frames = int(timeout / self.frame_seconds) if timeout else None
+        limit_frames = int(phrase_time_limit / self.frame_seconds) if phrase_time_limit else None
+        before = deque(maxlen=self._preroll.maxlen)
+        phrase: List[bytes] = []
+        waited = 0
+        quiet = 0
+        try:
+            while True:
+                try:
+                    chunk, energy = frames.get(timeout=max(1.0, 4 * self.frame_seconds))
+                except queue.Empty:
+                    logging.error("Audio capture stalled; no frames from the microphone")
+                    return None
+                if self._cancelled.is_set():
+                    return None
+                if waited == 0 and not phrase:
+                    self.latencies.append(time.perf_counter() - requested_at)
+                speaking = energy > self.noise.threshold
+                if not phrase:
+                    before.append(chunk)
+                    waited += 1
+                    if speaking:
+                        phrase = list(before)
+                        if on_frame is not None:
+                            for earlier in phrase:
+                                on_frame(earlier)
+                    elif wait_frames is not None and waited >= wait_frames:
+                        return None
+                    continue
+                phrase.append(chunk)
+                if on_frame is not None:
+                    on_frame(chunk)
+                quiet = 0 if speaking else quiet + 1
+                if quiet >= pause_frames or (limit_frames is not None and len(phrase) >= limit_frames):
+                    break
+        finally:
+            self.unsubscribe(frames)
+        # Drop most of the trailing silence, keeping a little as the recognizer expects
+        keep = len(phrase) - max(0, quiet - len(before))
+        return b"".join(phrase[:keep])
+
+    def latency_summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {'presses': 0}
+        return {
+            'presses': len(ordered),
+            'median_ms': ordered[len(ordered) // 2] * 1000,
+            'max_ms': ordered[-1] * 1000
+        }
@@ -0,0 +1,170 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Optional, Callable, Tuple
+
+from constants import AUTH_SETTINGS
+
+class CredentialStore:
+    """Navisworks client credentials in the OS keyring (Windows Credential Manager, macOS Keychain, Secret Service).
+
+    Needs the optional keyring package; without it nothing is remembered
+    and load() returns None. Credentials are never written anywhere else.
+    """
+    def __init__(self, service: str = AUTH_SETTINGS['KEYRING_SERVICE']):
+        self.service = service
+        self._keyring = None
+        self._missing = False
+
+    @property
+    def available(self) -> bool:
+        return self._backend() is not None
+
+    def load(self) -> Optional[Tuple[str, str]]:
+        keyring = self._backend()
+        if keyring is None:
+            return None
+        try:
+            client_id = keyring.get_password(self.service, AUTH_SETTINGS['CLIENT_ID_KEY'])
+            client_secret = keyring.get_password(self.service, client_id) if client_id else None
+        except Exception as e:
+            logging.error(f"Could not read saved credentials: {str(e)}")
+            return None
+        if not client_id or not client_secret:
+            return None
+        return client_id, client_secret
+
+    def save(self, client_id: str, client_secret: str) -> bool:
+        keyring = self._backend()
+        if keyring is None:
+            return False
+        try:
+            keyring.set_password(self.service, AUTH_SETTINGS['CLIENT_ID_KEY'], client_id)
+            keyring.set_password(self.service, client_id, client_secret)
+            return True
+        except Exception as e:
+            logging.error(f"Could not save credentials: {str(e)}")
+            return False
+
+    def clear(self):
+        keyring = self._backend()
+        if keyring is None:
+            return
+        try:
+            client_id = keyring.get_password(self.service, AUTH_SETTINGS['CLIENT_ID_KEY'])
+            if client_id:
+                keyring.delete_password(self.service, client_id)
+            keyring.delete_password(self.service, AUTH_SETTINGS['CLIENT_ID_KEY'])
+        except Exception as e:
+            logging.error(f"Could not remove saved credentials: {str(e)}")
+
+    def _backend(self):
+        if self._keyring is None and not self._missing:
+            try:
+                import keyring
+                self._keyring = keyring
+            except ImportError:
+                self._missing = True
+                logging.info("Install the keyring package to remember Navisworks credentials between sessions")
+        return self._keyring
+
+class AuthAttempt:
+    """One background sign-in; outcome is 'success', 'failed', 'timeout', 'cancelled' or 'error' once finished"""
+    def __init__(self, attempt_id: int, client_id: str, client_secret: str, timeout: float,
+                 on_done: Callable[['AuthAttempt'], None] = None):
+        self.id = attempt_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.timeout = timeout
+        self.started_at = time.perf_counter()
+        self.seconds = 0.0
+        self.outcome: Optional[str] = None
+        self.result = None                  # what authenticate returned, kept only on success
+        self.error: Optional[str] = None
+        self.finished = threading.Event()
+        self.on_done = on_done
+        self.timer: Optional[threading.Timer] = None
+
+    @property
+    def pending(self) -> bool:
+        return self.outcome is None
+
+class Authenticator:
+    """Signs in on a background thread so a slow or unreachable plugin never blocks the window.
+
+    authenticate(client_id, client_secret, timeout) is the blocking call
+    (TaskManager.request_token); a falsy result means the credentials were
+    rejected. It must not sign anything in itself: the attempt ends at
+    whichever comes first of the call returning, the timeout, or cancel(),
+    and a call still running after a timeout or cancel is abandoned with
+    its result dropped. The caller applies attempt.result once it sees the
+    attempt succeed and is still current. Only the latest attempt is live;
+    starting one cancels the previous. on_done is called exactly once per
+    attempt, on the thread that finished it.
+    """
+    def __init__(self, authenticate: Callable[[str, str, float], Any],
+                 timeout: float = AUTH_SETTINGS['TIMEOUT_SECONDS']):
+        self.authenticate = authenticate
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.current: Optional[AuthAttempt] = None
+
+    @property
+    def pending(self) -> bool:
+        attempt = self.current
+        return attempt is not None and attempt.pending
+
+    def start(self, client_id: str, client_secret: str,
+              on_done: Callable[[AuthAttempt], None] = None) -> AuthAttempt:
+        self.cancel()
+        attempt = AuthAttempt(next(self._ids), client_id, client_secret, self.timeout, on_done)
+        attempt.timer = threading.Timer(self.timeout, self._finish, args=(attempt, 'timeout'))
+        attempt.timer.daemon = True
+        self.current = attempt
+        attempt.timer.start()
+        threading.Thread(target=self._run, args=(attempt,), name=f"auth-{attempt.id}", daemon=True).start()
+        return attempt
+
+    def cancel(self) -> bool:
+        attempt = self.current
+        return attempt is not None and self._finish(attempt, 'cancelled')
+
+    def wait(self, timeout: float = None) -> Optional[AuthAttempt]:
+        """Block until the current attempt finishes (for scripts and benchmarks, never the Tk thread)"""
+        attempt = self.current
+        if attempt is not None:
+            attempt.finished.wait(timeout)
+        return attempt
+
+    def _run(self, attempt: AuthAttempt):
+        try:
+            result = self.authenticate(attempt.client_id, attempt.client_secret, attempt.timeout)
+            self._finish(attempt, 'success' if result else 'failed', result=result)
+        except Exception as e:
+            self._finish(attempt, 'error', str(e))
+
+    def _finish(self, attempt: AuthAttempt, outcome: str, error: str = None, result: Any = None) -> bool:
+        with self._lock:
+            if attempt.outcome is not None:
+                if outcome in ('success', 'failed', 'error'):
+                    logging.info(f"Ignoring sign-in result '{outcome}' of abandoned attempt {attempt.id} "
+                                 f"({attempt.outcome} after {attempt.seconds:.1f}s)")
+                return False
+            attempt.outcome = outcome
+            attempt.result = result if outcome == 'success' else None
+            attempt.error = error
+            attempt.seconds = time.perf_counter() - attempt.started_at
+        attempt.timer.cancel()
+        attempt.finished.set()
+        if outcome == 'timeout':
+            logging.error(f"Navisworks sign-in timed out after {attempt.timeout:g}s")
+        if attempt.on_done:
+            try:
+                attempt.on_done(attempt)
+            except Exception as e:
+                logging.error(f"Error handling sign-in result: {str(e)}")
+        # on_done had its chance to store the secret; don't keep it around
+        attempt.client_secret = None
+        return True
@@ -0,0 +1,107 @@
+import os
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable, Union
+
+from speech_backends import SpeechBackend, create_backend, read_audio
+from constants import SPEECH_SETTINGS
+
+BackendFactory = Union[str, Callable[[], SpeechBackend]]
+
+# Set in each worker process by _init_worker; the model loads once per process
+_worker_backend: Optional[SpeechBackend] = None
+
+def _init_worker(backend: BackendFactory):
+    global _worker_backend
+    _worker_backend = create_backend(backend) if isinstance(backend, str) else backend()
+    if _worker_backend is not None and not _worker_backend.load():
+        _worker_backend = None
+
+def _transcribe_file(path: str) -> Dict[str, Any]:
+    result = {'path': path, 'name': os.path.basename(path), 'text': None, 'error': None,
+              'audio_seconds': 0.0, 'seconds': 0.0, 'rtf': 0.0}
+    started = time.perf_counter()
+    try:
+        if _worker_backend is None:
+            result['error'] = "speech backend unavailable"
+            return result
+        transcript = _worker_backend.transcribe(*read_audio(path))
+        if transcript is None:
+            result['error'] = "transcription failed"
+        else:
+            result.update(text=transcript.text, audio_seconds=transcript.audio_seconds, rtf=transcript.rtf)
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['seconds'] = time.perf_counter() - started
+    return result
+
+def find_memos(directory: str) -> List[str]:
+    """Audio files directly inside directory, in name order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(SPEECH_SETTINGS['MEMO_EXTENSIONS'])
+    )
+
+class BatchTranscriber:
+    """Transcribes a directory of recorded voice memos across a pool of processes.
+
+    backend is a backend name or a picklable factory returning a
+    SpeechBackend; each worker process creates and loads it once. progress,
+    if given, is called with (files done, total files).
+    """
+    def __init__(self, backend: BackendFactory = SPEECH_SETTINGS['BATCH_BACKEND'],
+                 workers: int = SPEECH_SETTINGS['BATCH_WORKERS'],
+                 progress: Callable[[int, int], None] = None):
+        self.backend = backend
+        self.workers = workers
+        self.progress = progress
+
+    def run(self, directory: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        paths = find_memos(directory)
+        report: Dict[str, Any] = {'files': len(paths), 'transcribed': 0, 'failed': 0, 'results': []}
+        if paths:
+            workers = min(self.workers or os.cpu_count() or 1, len(paths))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.backend,)) as pool:
+                futures = [pool.submit(_transcribe_file, path) for path in paths]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    report['results'].append(future.result())
+                    if self.progress:
+                        self.progress(done, len(paths))
+            report['workers'] = workers
+
+        results = sorted(report['results'], key=lambda result: result['name'])
+        report['results'] = results
+        report['transcribed'] = sum(1 for result in results if result['error'] is None)
+        report['failed'] = len(results) - report['transcribed']
+        report['audio_seconds'] = sum(result['audio_seconds'] for result in results)
+        report['busy_seconds'] = sum(result['seconds'] for result in results)
+        report['seconds'] = time.perf_counter() - started
+        report['speedup'] = report['busy_seconds'] / report['seconds'] if report['seconds'] else 0.0
+        for result in results:
+            if result['error']:
+                logging.error(f"Could not transcribe {result['path']}: {result['error']}")
+        logging.info(f"Transcribed {report['transcribed']} of {report['files']} memo(s) from {directory} "
+                     f"in {report['seconds']:.1f}s ({report['speedup']:.1f}x parallel)")
+        return report
+
+def timing_summary(report: Dict[str, Any], limit: int = 20) -> List[str]:
+    """One line per file (slowest first) plus totals"""
+    lines = [
+        f"{report['transcribed']} of {report['files']} memo(s), {report['audio_seconds']:.0f}s of audio, "
+        f"transcribed in {report['seconds']:.1f}s on {report.get('workers', 0)} worker(s) "
+        f"({report['speedup']:.1f}x parallel)"
+    ]
+    slowest = sorted(report['results'], key=lambda result: result['seconds'], reverse=True)
+    for result in slowest[:limit]:
+        if result['error']:
+            lines.append(f"• {result['name']}: failed after {result['seconds']:.1f}s ({result['error']})")
+        else:
+            lines.append(f"• {result['name']}: {result['audio_seconds']:.1f}s audio in {result['seconds']:.1f}s "
+                         f"(RTF {result['rtf']:.2f})")
+    if len(slowest) > limit:
+        lines.append(f"…and {len(slowest) - limit} more.")
+    return lines
@@ -0,0 +1,1529 @@
+"""Correctness and latency benchmarks for VISA4D hot paths.
+
+Run from the VIS4D directory, e.g.:
+    python benchmarks.py dates --size 5000
+    python benchmarks.py index --size 50000
+    python benchmarks.py critical_path --size 100000
+    python benchmarks.py conflicts --size 50000
+    python benchmarks.py rollups --size 100000
+    python benchmarks.py import --size 50000
+    python benchmarks.py sync --size 100000
+    python benchmarks.py history --size 500000
+    python benchmarks.py undo --size 100000
+    python benchmarks.py capture --size 20
+    python benchmarks.py speech --size 10
+    python benchmarks.py streaming --size 20
+    python benchmarks.py vad --size 12
+    python benchmarks.py memos --size 16
+    python benchmarks.py chat --size 100000
+    python benchmarks.py ui --size 1000
+    python benchmarks.py commands --size 10
+    python benchmarks.py dashboard --size 50000
+    python benchmarks.py auth --size 20
+    python benchmarks.py vocabulary --size 50000
+"""
+import sys
+import time
+import random
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def _timed(func: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _latency_summary(timings: List[float]) -> Dict[str, float]:
+    """Summarize per-call timings (seconds) in microseconds"""
+    return {
+        'mean_us': sum(timings) / len(timings) * 1e6 if timings else 0.0,
+        'p50_us': _percentile(timings, 50) * 1e6,
+        'p95_us': _percentile(timings, 95) * 1e6,
+        'max_us': max(timings) * 1e6 if timings else 0.0
+    }
+
+# Date grammar
+_BENCH_TASKS = [
+    'door 1000 installation', 'stair 1000', 'slab A', 'window B', 'painting',
+    'grade beams pour #3', 'main floor drywall installation', 'roof door installation'
+]
+
+_START_TEMPLATES = [
+    "Update start date for {task} to {d}",
+    "push {task} to {d}",
+    "{task} starts {d}",
+    "schedule {task} for {d}",
+    "move the start of {task} to {d}"
+]
+
+_FINISH_TEMPLATES = [
+    "Update finish date for {task} to {d}",
+    "{task} must finish by {d}",
+    "set the end date of {task} to {d}",
+    "{task} is due {d}"
+]
+
+_RANGE_TEMPLATES = [
+    "schedule {task} from {d1} to {d2}",
+    "{task} starts {d1} and ends {d2}",
+    "{task} begins {d1} until {d2}"
+]
+
+_WEEKDAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+def _random_date_phrase(rng: random.Random, today: date) -> Tuple[str, datetime]:
+    """Produce one date phrasing together with the date it must resolve to"""
+    base = datetime(today.year, today.month, today.day)
+    form = rng.randrange(11)
+    if form < 2:
+        # Year-less forms resolve into the current year
+        value = datetime(today.year, 1, 1) + timedelta(days=rng.randrange(365))
+        if form == 0:
+            return f"{value:%B} {value.day}", value
+        suffix = 'th' if value.day in (11, 12, 13) else {1: 'st', 2: 'nd', 3: 'rd'}.get(value.day % 10, 'th')
+        return f"{value.day}{suffix} of {value:%B}", value
+    if form < 6:
+        value = base + timedelta(days=rng.randrange(-60, 300))
+        if form == 2:
+            return f"{value:%b} {value.day}, {value.year}", value
+        if form == 3:
+            return f"{value.month}/{value.day}/{value.year}", value
+        if form == 4:
+            return value.strftime("%Y-%m-%d"), value
+        return f"{value:%B} {value.day} {value.year}", value
+    if form == 6:
+        n = rng.randrange(1, 30)
+        return f"in {n} days", base + timedelta(days=n)
+    if form == 7:
+        n = rng.randrange(1, 8)
+        return f"in {n} weeks", base + timedelta(weeks=n)
+    if form == 8:
+        weekday = rng.randrange(7)
+        ahead = (weekday - today.weekday()) % 7 or 7
+        return f"next {_WEEKDAY_NAMES[weekday]}", base + timedelta(days=ahead)
+    if form == 9:
+        n = rng.randrange(1, 15)
+        return f"{n} days from now", base + timedelta(days=n)
+    return rng.choice([("tomorrow", base + timedelta(days=1)),
+                       ("next week", base + timedelta(weeks=1)),
+                       ("day after tomorrow", base + timedelta(days=2))])
+
+def _date_cases(size: int, today: date, seed: int) -> List[Tuple[str, Any, Any]]:
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(size):
+        task = rng.choice(_BENCH_TASKS)
+        kind = rng.randrange(3)
+        if kind == 0:
+            phrase, value = _random_date_phrase(rng, today)
+            cases.append((rng.choice(_START_TEMPLATES).format(task=task, d=phrase), value, None))
+        elif kind == 1:
+            phrase, value = _random_date_phrase(rng, today)
+            cases.append((rng.choice(_FINISH_TEMPLATES).format(task=task, d=phrase), None, value))
+        else:
+            first, start = _random_date_phrase(rng, today)
+            second, end = _random_date_phrase(rng, today)
+            cases.append((rng.choice(_RANGE_TEMPLATES).format(task=task, d1=first, d2=second), start, end))
+    return cases
+
+def _ambiguous_date_cases(today: date) -> List[Tuple[str, Any, Any]]:
+    """Numbers in task names and the modal "may" must not be read as dates"""
+    base = datetime(today.year, today.month, today.day)
+    return [
+        ("update start date of grade beams pour 1-2 to tomorrow", base + timedelta(days=1), None),
+        ("shift pour #3-4 to next week", base + timedelta(weeks=1), None),
+        ("it may 5 rain", None, None),
+        ("mark grade beams pour 3/4 complete", None, None),
+        ("push slab A to may 5", datetime(today.year, 5, 5), None),
+        ("move grade beams pour 2 on 3/10", datetime(today.year, 3, 10), None),
+        ("schedule grade beams pour 7 from 3/10 to 3/14", datetime(today.year, 3, 10), datetime(today.year, 3, 14)),
+        ("grade beams pour 1-2 starts tomorrow", base + timedelta(days=1), None)
+    ]
+
+def bench_dates(size: int = 5000, seed: int = 42) -> Dict[str, Any]:
+    """Check DateGrammar.extract against generated phrasings and time each call"""
+    from date_grammar import DateGrammar
+
+    today = date.today()
+    grammar = DateGrammar()
+    cases = _date_cases(size, today, seed) + _ambiguous_date_cases(today)
+
+    timings, failures = [], []
+    for text, expected_start, expected_end in cases:
+        result, elapsed = _timed(grammar.extract, text, today)
+        timings.append(elapsed)
+        if result['start_date'] != expected_start or result['end_date'] != expected_end:
+            failures.append((text, expected_start, expected_end, result['start_date'], result['end_date']))
+
+    summary = {
+        'phrasings': len(cases),
+        'accuracy': 1 - len(failures) / len(cases),
+        'failures': failures[:10],
+        'relative_memo': grammar.resolver.stats()
+    }
+    summary.update(_latency_summary(timings))
+    summary['ok'] = not failures
+    return summary
+
+# Task index
+_BENCH_FLOORS = ['main', 'second', 'third', 'fourth', 'roof']
+_BENCH_TRADES = ['drywall', 'painting', 'flooring', 'plumbing', 'electrical', 'hvac', 'framing', 'door', 'window']
+_BENCH_STATUSES = ['not started', 'in progress', 'complete', 'on hold', 'suspended']
+
+def _synthetic_schedule(size: int, seed: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=180)
+    statuses, dates = {}, {}
+    for i in range(size):
+        name = f"{rng.choice(_BENCH_FLOORS)} floor {rng.choice(_BENCH_TRADES)} installation {i}"
+        statuses[name] = rng.choice(_BENCH_STATUSES)
+        dates[name] = (start + timedelta(days=rng.randrange(540))).strftime("%B %d, %Y")
+    return statuses, dates
+
+def bench_index(size: int = 50000, seed: int = 7, queries: int = 500, page: int = 50) -> Dict[str, Any]:
+    """Time combined token/status/date queries against TaskIndex and check them against a scan.
+
+    Queries ask for one page of results, the way the chat lists them; full
+    result sets are timed separately since their cost grows with the matches.
+    """
+    from task_index import TaskIndex, tokenize
+
+    statuses, dates = _synthetic_schedule(size, seed)
+    index = TaskIndex()
+    _, build_time = _timed(index.build, statuses, dates)
+
+    rng = random.Random(seed)
+    today = date.today()
+    parsed_dates = {name: datetime.strptime(value, "%B %d, %Y").date() for name, value in dates.items()}
+    timings, full_timings, mismatches = [], [], 0
+    for i in range(queries):
+        tokens = [rng.choice(_BENCH_FLOORS), 'floor'] if i % 2 == 0 else [rng.choice(_BENCH_TRADES)]
+        status = rng.choice(_BENCH_STATUSES) if i % 3 else None
+        start_from = today + timedelta(days=rng.randrange(-30, 60)) if i % 4 else None
+        start_to = start_from + timedelta(days=7) if start_from else None
+        result, elapsed = _timed(index.query, tokens, status, start_from, start_to, page)
+        timings.append(elapsed)
+        full, elapsed = _timed(index.query, tokens, status, start_from, start_to)
+        full_timings.append(elapsed)
+
+        if i % 25 == 0:
+            expected = sorted(
+                (name for name in statuses
+                 if set(tokens) <= set(tokenize(name))
+                 and (status is None or statuses[name] == status)
+                 and (start_from is None or start_from <= parsed_dates[name] <= start_to)),
+                key=lambda name: (parsed_dates[name].toordinal(), name)
+            )
+            mismatches += expected != full or expected[:page] != result
+
+    # Incremental maintenance: one status change plus one date change
+    name = next(iter(statuses))
+    _, update_time = _timed(index.on_change, name, 'status', statuses[name], 'complete')
+    _, date_update_time = _timed(index.on_change, name, 'date', dates[name], today.strftime("%B %d, %Y"))
+    moved = index.query(tokenize(name), 'complete', today, today)
+
+    summary = {
+        'tasks': size,
+        'page': page,
+        'build_ms': build_time * 1e3,
+        'status_update_us': update_time * 1e6,
+        'date_update_us': date_update_time * 1e6,
+        'scan_mismatches': mismatches,
+        'full_result_p50_us': _percentile(full_timings, 50) * 1e6,
+        'full_result_p95_us': _percentile(full_timings, 95) * 1e6
+    }
+    summary.update(_latency_summary(timings))
+    summary['ok'] = mismatches == 0 and name in moved and summary['p95_us'] < 1000
+    return summary
+
+def bench_vocabulary(size: int = 50000, seed: int = 61, queries: int = 500) -> Dict[str, Any]:
+    """Shortlist size, recall and latency of fuzzy task-name candidates (what gets embedded per match)"""
+    from task_vocabulary import TaskVocabulary
+    from constants import CACHE_SETTINGS
+
+    statuses, _ = _synthetic_schedule(size, seed)
+    names = list(statuses)
+    vocabulary, build_time = _timed(TaskVocabulary, names, 1)
+
+    rng = random.Random(seed)
+    timings, sizes, found = [], [], 0
+    for i in range(queries):
+        name = rng.choice(names)
+        words = name.split()
+        if i % 2:
+            # Ambiguous: no task number, so thousands of names share every word
+            phrase = ' '.join(words[:-1])
+        else:
+            # Loose phrasing: drop one word and pluralize the trade
+            del words[rng.choice([1, 3])]
+            phrase = ' '.join(words).replace('installation', 'installations')
+        shortlist, elapsed = _timed(vocabulary.shortlist, phrase)
+        timings.append(elapsed)
+        sizes.append(len(shortlist))
+        found += i % 2 == 0 and name in shortlist
+
+    summary = {
+        'tasks': size,
+        'build_ms': build_time * 1e3,
+        'max_candidates': max(sizes),
+        'recall': found / ((queries + 1) // 2),
+        'encoded_per_match_before': size
+    }
+    summary.update(_latency_summary(timings))
+    summary['ok'] = (max(sizes) <= CACHE_SETTINGS['TASK_SHORTLIST']
+                     and summary['recall'] >= 0.95 and summary['p95_us'] < 5000)
+    return summary
+
+def _synthetic_network(size: int, seed: int) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, List[Dict[str, Any]]]]:
+    """A feasible schedule where each task depends on up to three recent tasks, with a few days of slack"""
+    rng = random.Random(seed)
+    origin = date.today().toordinal()
+    first, last = [], []
+    starts, ends, dependencies = {}, {}, {}
+    for i in range(size):
+        name = f"task {i}"
+        required = origin
+        if i:
+            links = []
+            for j in sorted({rng.randrange(max(0, i - 50), i) for _ in range(rng.randrange(1, 4))}):
+                dep_type, lag = ('FS' if rng.random() < 0.8 else 'SS'), rng.randrange(3)
+                required = max(required, (last[j] if dep_type == 'FS' else first[j]) + lag)
+                links.append({'predecessor': f"task {j}", 'type': dep_type, 'lag': lag})
+            dependencies[name] = links
+        first.append(required + rng.randrange(4))
+        last.append(first[-1] + rng.randrange(1, 15))
+        starts[name] = date.fromordinal(first[-1]).strftime("%B %d, %Y")
+        ends[name] = date.fromordinal(last[-1]).strftime("%B %d, %Y")
+    return starts, ends, dependencies
+
+def bench_critical_path(size: int = 20000, seed: int = 11, updates: int = 200) -> Dict[str, Any]:
+    """Time incremental critical-path updates against a full rebuild and check they agree"""
+    from critical_path import CriticalPathEngine
+
+    starts, ends, dependencies = _synthetic_network(size, seed)
+    engine = CriticalPathEngine()
+    _, build_time = _timed(engine.build, starts, ends, dependencies)
+
+    rng = random.Random(seed)
+    timings, touched = [], []
+    for _ in range(updates):
+        name = f"task {rng.randrange(size)}"
+        moved = datetime.strptime(starts[name], "%B %d, %Y") + timedelta(days=rng.randrange(-5, 6))
+        new_value = moved.strftime("%B %d, %Y")
+        _, elapsed = _timed(engine.on_change, name, 'date', starts[name], new_value)
+        starts[name] = new_value
+        timings.append(elapsed)
+        touched.append(engine.last_touched)
+
+    # An independently rebuilt engine must agree on every early start and float
+    reference = CriticalPathEngine()
+    reference.build(starts, ends, dependencies)
+    mismatches = sum(
+        1 for i in range(size)
+        if engine.early_start(f"task {i}") != reference.early_start(f"task {i}")
+        or engine.total_float(f"task {i}") != reference.total_float(f"task {i}")
+    )
+
+    summary = {
+        'tasks': size,
+        'dependencies': sum(len(links) for links in dependencies.values()),
+        'build_ms': build_time * 1e3,
+        'mean_nodes_touched': sum(touched) / len(touched),
+        'critical_tasks': len(engine.critical_tasks()),
+        'late_tasks': len(engine.late_tasks()),
+        'mismatches': mismatches
+    }
+    summary.update(_latency_summary(timings))
+    summary['speedup_vs_rebuild'] = build_time / (summary['mean_us'] / 1e6) if summary['mean_us'] else 0.0
+    summary['ok'] = mismatches == 0
+    return summary
+
+# Zone conflicts
+def bench_conflicts(size: int = 50000, seed: int = 5, updates: int = 500, zones: int = 40) -> Dict[str, Any]:
+    """Time conflict detection (sweep build, incremental moves) and check it against a direct scan"""
+    from interval_index import ZoneConflictIndex, zone_of
+
+    rng = random.Random(seed)
+    origin = date.today()
+    starts, ends = {}, {}
+    for i in range(size):
+        name = f"zone {i % zones} {rng.choice(_BENCH_TRADES)} {i}"
+        first = origin + timedelta(days=rng.randrange(730))
+        starts[name] = first.strftime("%B %d, %Y")
+        ends[name] = (first + timedelta(days=rng.randrange(1, 10))).strftime("%B %d, %Y")
+
+    index = ZoneConflictIndex()
+    _, build_time = _timed(index.build, starts, ends)
+    initial_pairs = len(index.conflicts())
+
+    names = list(starts)
+    timings = []
+    for _ in range(updates):
+        name = rng.choice(names)
+        moved = (datetime.strptime(starts[name], "%B %d, %Y") + timedelta(days=rng.randrange(-10, 11)))
+        new_value = moved.strftime("%B %d, %Y")
+        _, elapsed = _timed(index.on_change, name, 'date', starts[name], new_value)
+        starts[name] = new_value
+        timings.append(elapsed)
+
+    # Spot-check against a direct scan of the task's zone
+    bounds, task_zones = {}, {}
+    for name in names:
+        first = datetime.strptime(starts[name], "%B %d, %Y").toordinal()
+        bounds[name] = first, max(first, datetime.strptime(ends[name], "%B %d, %Y").toordinal())
+        task_zones[name] = zone_of(name)
+
+    mismatches = 0
+    for name in rng.sample(names, 100):
+        lo, hi = bounds[name]
+        expected = sorted(
+            other for other in names
+            if other != name and task_zones[other] == task_zones[name]
+            and bounds[other][0] <= hi and bounds[other][1] >= lo
+        )
+        mismatches += expected != index.conflicts_for(name)
+
+    summary = {
+        'tasks': size,
+        'zones': zones,
+        'build_ms': build_time * 1e3,
+        'conflicting_pairs': initial_pairs,
+        'mismatches': mismatches
+    }
+    summary.update(_latency_summary(timings))
+    summary['ok'] = mismatches == 0
+    return summary
+
+# Hierarchy roll-ups
+def bench_rollups(size: int = 100000, seed: int = 3, updates: int = 2000) -> Dict[str, Any]:
+    """Time incremental status roll-ups and progress reads, and check them against a full scan"""
+    from task_tree import TaskTree, infer_path
+    from constants import STATUS_PROGRESS
+
+    statuses, _ = _synthetic_schedule(size, seed)
+    tree = TaskTree()
+    _, build_time = _timed(tree.build, statuses)
+
+    rng = random.Random(seed)
+    names = list(statuses)
+    update_timings = []
+    for _ in range(updates):
+        name = rng.choice(names)
+        status = rng.choice(_BENCH_STATUSES)
+        _, elapsed = _timed(tree.on_change, name, 'status', statuses[name], status)
+        statuses[name] = status
+        update_timings.append(elapsed)
+
+    zones: Dict[str, List[str]] = {}
+    for name in names:
+        zones.setdefault(infer_path(name)[0], []).append(name)
+
+    read_timings, mismatches = [], 0
+    for zone, members in zones.items():
+        summary, elapsed = _timed(tree.summary, zone)
+        read_timings.append(elapsed)
+        expected = 100.0 * sum(STATUS_PROGRESS[statuses[name]] for name in members) / len(members)
+        mismatches += len(members) != summary['tasks'] or abs(expected - summary['percent_complete']) > 1e-6
+
+    summary = {
+        'tasks': size,
+        'build_ms': build_time * 1e3,
+        'read_mean_us': sum(read_timings) / len(read_timings) * 1e6,
+        'mismatches': mismatches
+    }
+    summary.update(_latency_summary(update_timings))
+    summary['ok'] = mismatches == 0
+    return summary
+
+# Schedule import
+def _write_schedules(directory: str, size: int, seed: int) -> Dict[str, str]:
+    """Write the same synthetic schedule as MS Project XML, P6 XML and CSV"""
+    import os
+    from xml.sax.saxutils import escape
+
+    rng = random.Random(seed)
+    origin = datetime(date.today().year, 1, 1, 8)
+    rows = []
+    for i in range(size):
+        start = origin + timedelta(days=rng.randrange(540))
+        finish = start + timedelta(days=rng.randrange(1, 20))
+        predecessor = rng.randrange(i) if i and rng.random() < 0.7 else None
+        name = f"{rng.choice(_BENCH_FLOORS)} floor {rng.choice(_BENCH_TRADES)} {i}"
+        rows.append((i + 1, name, start, finish, rng.choice([0, 0, 50, 100]), predecessor))
+
+    paths = {name: os.path.join(directory, f"schedule.{ext}")
+             for name, ext in (('msp', 'xml'), ('csv', 'csv'))}
+    paths['p6'] = os.path.join(directory, "schedule_p6.xml")
+
+    with open(paths['msp'], 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<Project xmlns="http://schemas.microsoft.com/project">'
+                '<Name>Bench</Name><Tasks>\n')
+        f.write('<Task><UID>0</UID><Name>Bench</Name><OutlineLevel>0</OutlineLevel><Summary>1</Summary></Task>\n')
+        f.write('<Task><UID>100000000</UID><Name>Building A</Name><OutlineLevel>1</OutlineLevel><Summary>1</Summary></Task>\n')
+        for uid, name, start, finish, percent, predecessor in rows:
+            link = (f'<PredecessorLink><PredecessorUID>{predecessor + 1}</PredecessorUID><Type>1</Type>'
+                    f'<LinkLag>4800</LinkLag></PredecessorLink>') if predecessor is not None else ''
+            f.write(f'<Task><UID>{uid}</UID><Name>{escape(name)}</Name><OutlineLevel>2</OutlineLevel>'
+                    f'<Summary>0</Summary><Start>{start:%Y-%m-%dT%H:%M:%S}</Start><Finish>{finish:%Y-%m-%dT%H:%M:%S}</Finish>'
+                    f'<PercentComplete>{percent}</PercentComplete>{link}</Task>\n')
+        f.write('</Tasks></Project>\n')
+
+    statuses = {0: 'Not Started', 50: 'In Progress', 100: 'Completed'}
+    with open(paths['p6'], 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<APIBusinessObjects xmlns="http://xmlns.oracle.com/Primavera/P6/V8.3/API/BusinessObjects"><Project>\n')
+        f.write('<WBS><ObjectId>1</ObjectId><Name>Building A</Name></WBS>\n')
+        for uid, name, start, finish, percent, _ in rows:
+            f.write(f'<Activity><ObjectId>{uid}</ObjectId><Name>{escape(name)}</Name><WBSObjectId>1</WBSObjectId>'
+                    f'<PlannedStartDate>{start:%Y-%m-%dT%H:%M:%S}</PlannedStartDate>'
+                    f'<PlannedFinishDate>{finish:%Y-%m-%dT%H:%M:%S}</PlannedFinishDate>'
+                    f'<Status>{statuses[percent]}</Status></Activity>\n')
+        for uid, _, _, _, _, predecessor in rows:
+            if predecessor is not None:
+                f.write(f'<Relationship><PredecessorActivityObjectId>{predecessor + 1}</PredecessorActivityObjectId>'
+                        f'<SuccessorActivityObjectId>{uid}</SuccessorActivityObjectId><Type>Finish to Start</Type>'
+                        f'<Lag>8</Lag></Relationship>\n')
+        f.write('</Project></APIBusinessObjects>\n')
+
+    with open(paths['csv'], 'w', encoding='utf-8', newline='') as f:
+        f.write("ID,Task Name,Start,Finish,% Complete,Predecessors,WBS\n")
+        for uid, name, start, finish, percent, predecessor in rows:
+            link = f"{predecessor + 1}FS+1d" if predecessor is not None else ""
+            f.write(f'{uid},"{name}",{start:%m/%d/%Y},{finish:%m/%d/%Y},{percent}%,{link},Building A\n')
+    return paths
+
+def bench_history(size: int = 500000, seed: int = 17, days: int = 1095, tasks: int = 5000) -> Dict[str, Any]:
+    """Record years of changes into day partitions, then time the aggregations and check them against a replay"""
+    import tempfile
+    from change_history import ChangeHistory
+
+    rng = random.Random(seed)
+    first_day = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+    names = [f"level {i % 40} {_BENCH_TRADES[i % len(_BENCH_TRADES)]} task {i}" for i in range(tasks)]
+    statuses: Dict[str, str] = {}
+    starts: Dict[str, str] = {}
+    per_day = max(1, size // days)
+    samples = set(rng.sample(range(days), 10)) | {days - 1}
+    expected_counts: Dict[int, Dict[str, int]] = {}
+    expected_slip = 0
+
+    summary: Dict[str, Any] = {'changes': per_day * days, 'days': days}
+    with tempfile.TemporaryDirectory() as directory:
+        history = ChangeHistory(directory)
+        started = time.perf_counter()
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            for i in range(per_day):
+                when = day + timedelta(seconds=i * 86400 // per_day)
+                name = rng.choice(names)
+                if name not in starts or rng.random() < 0.3:
+                    old = starts.get(name)
+                    moved = (datetime.strptime(old, "%B %d, %Y") if old else day) + timedelta(days=rng.randrange(-3, 8))
+                    starts[name] = moved.strftime("%B %d, %Y")
+                    if old:
+                        expected_slip += (moved - datetime.strptime(old, "%B %d, %Y")).days
+                    history.record(name, 'date', old, starts[name], 'text', 'planner', when=when)
+                else:
+                    old = statuses.get(name)
+                    statuses[name] = rng.choice(_BENCH_STATUSES)
+                    history.record(name, 'status', old, statuses[name], rng.choice(['voice', 'text']), None, when=when)
+            if offset in samples:
+                counts: Dict[str, int] = {}
+                for status in statuses.values():
+                    counts[status] = counts.get(status, 0) + 1
+                expected_counts[offset] = counts
+        history.flush()
+        summary['record_seconds'] = time.perf_counter() - started
+
+        reloaded = ChangeHistory(directory)
+        (_, summary['first_load_seconds']) = _timed(len, reloaded)
+        ok = len(reloaded) == per_day * days
+
+        curve, summary['status_counts_ms'] = _timed(reloaded.status_counts)
+        summary['status_counts_ms'] *= 1000
+        for offset, counts in expected_counts.items():
+            ok = ok and all(int(curve['counts'][status][offset]) == counts.get(status, 0) for status in _BENCH_STATUSES)
+        s_curve, summary['s_curve_ms'] = _timed(reloaded.s_curve)
+        summary['s_curve_ms'] *= 1000
+        summary['percent_complete_today'] = float(s_curve['percent_complete'][-1])
+
+        slip, summary['slippage_ms'] = _timed(reloaded.slippage)
+        summary['slippage_ms'] *= 1000
+        ok = ok and slip['total_days'] == expected_slip and int(slip['cumulative_days'][-1]) == expected_slip
+
+        week_start = date.today() - timedelta(days=6)
+        week, summary['changes_this_week_ms'] = _timed(reloaded.changes, week_start, None, None, 50)
+        summary['changes_this_week_ms'] *= 1000
+        ok = ok and len(week) == 50 and all(change['time'].date() >= week_start for change in week)
+        ok = ok and week[0]['time'] >= week[-1]['time']
+    summary['ok'] = ok
+    return summary
+
+def bench_undo(size: int = 100000, seed: int = 19, steps: int = 300, changes: int = 5) -> Dict[str, Any]:
+    """Keep hundreds of task-state versions; measure their memory and check undo diffs against full copies"""
+    import tracemalloc
+    from undo_stack import PersistentMap, restore_operations
+
+    rng = random.Random(seed)
+    statuses, dates = _synthetic_schedule(size, seed)
+    current, build_seconds = _timed(PersistentMap.from_items,
+                                    ((name, (statuses[name], dates[name], None)) for name in statuses))
+    plain = {name: (statuses[name], dates[name], None) for name in statuses}
+    names = list(plain)
+
+    tracemalloc.start()
+    versions = [current]
+    for _ in range(steps):
+        for name in rng.sample(names, changes):
+            roll = rng.random()
+            if roll < 0.1:
+                current = current.set(name, None)                      # misheard "delete ..."
+            elif roll < 0.5:
+                current = current.set(name, (rng.choice(_BENCH_STATUSES), dates[name], None))
+            else:
+                moved = (datetime.strptime(dates[name], "%B %d, %Y") + timedelta(days=rng.randrange(1, 9))).strftime("%B %d, %Y")
+                current = current.set(name, (statuses[name], moved, None))
+        versions.append(current)
+    version_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Undo every step: the diff must find exactly the tasks that a full comparison finds
+    ok = len(current) == len({name for name in names if current.get(name) is not None})
+    timings = []
+    operations = 0
+    snapshot = {name: current.get(name) for name in names}
+    for index in range(steps, 0, -1):
+        after, before = versions[index], versions[index - 1]
+        started = time.perf_counter()
+        changed = list(after.diff(before))
+        for name, have, wanted in changed:
+            task_operations, status_operations = restore_operations(name, have, wanted)
+            operations += len(task_operations) + len(status_operations)
+        timings.append(time.perf_counter() - started)
+        previous = {name: before.get(name) for name, _, _ in changed}
+        expected = {name for name in names if snapshot[name] != before.get(name)}
+        ok = ok and {name for name, _, _ in changed} == expected
+        snapshot.update(previous)
+
+    # A shallow dict copy per version (sharing names and records) is the cheapest non-structural alternative
+    copy_bytes = sys.getsizeof(dict(plain))
+    summary: Dict[str, Any] = {
+        'tasks': size,
+        'versions': steps,
+        'build_seconds': build_seconds,
+        'versions_kb': version_bytes / 1024,
+        'kb_per_version': version_bytes / 1024 / steps,
+        'dict_copy_kb_per_version': copy_bytes / 1024,
+        'undo_operations': operations
+    }
+    summary.update({f'diff_{key}': value for key, value in _latency_summary(timings).items()})
+    summary['ok'] = ok
+    return summary
+
+def bench_import(size: int = 50000, seed: int = 9, memory_sample: int = 10000) -> Dict[str, Any]:
+    """Stream each schedule format through the readers and operation mapping; report throughput and peak memory"""
+    import tempfile
+    import tracemalloc
+    from schedule_import import READERS, ImportedTask, task_operation
+
+    summary: Dict[str, Any] = {'tasks': size}
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_schedules(directory, size, seed)
+        for fmt, path in sorted(paths.items()):
+            started = time.perf_counter()
+            tasks = links = with_path = 0
+            with open(path, 'rb') as source:
+                for record in READERS[fmt](source):
+                    if isinstance(record, ImportedTask):
+                        tasks += task_operation(record, existing=False) is not None
+                        with_path += record.path == ['building a']
+                    else:
+                        links += 1
+            elapsed = time.perf_counter() - started
+
+            # Peak reader memory over the first records (tracing slows parsing ~10x); it stays
+            # flat as the file grows because finished elements are dropped
+            tracemalloc.start()
+            with open(path, 'rb') as source:
+                for count, _ in enumerate(READERS[fmt](source)):
+                    if count >= memory_sample:
+                        break
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            summary[f'{fmt}_seconds'] = elapsed
+            summary[f'{fmt}_tasks_per_s'] = tasks / elapsed if elapsed else 0.0
+            summary[f'{fmt}_peak_kb'] = peak / 1024
+            summary[f'{fmt}_links'] = links
+            ok = ok and tasks == size and with_path == size
+    summary['ok'] = ok
+    return summary
+
+def bench_sync(size: int = 100000, seed: int = 13, rounds: Tuple[int, ...] = (10, 100, 1000)) -> Dict[str, Any]:
+    """Plan delta syncs after a few edits on each side; check them against a full three-way scan"""
+    from types import SimpleNamespace
+    from schedule_sync import ScheduleSync, SnapshotRemote, TaskDigests, canonical_record, resolve
+
+    rng = random.Random(seed)
+    statuses, dates = _synthetic_schedule(size, seed)
+    end_dates = {name: (datetime.strptime(value, "%B %d, %Y") + timedelta(days=rng.randrange(1, 30))).strftime("%B %d, %Y")
+                 for name, value in dates.items()}
+    local = TaskDigests()
+    (_, build_seconds) = _timed(local.build, statuses, dates, end_dates)
+    remote = SnapshotRemote(TaskDigests())
+    engine = ScheduleSync(SimpleNamespace(digests=local), policy='merge', state_file='sync_bench_unused.json')
+    for name, record in local.records().items():
+        remote.digests.put(name, record)
+        engine.base.put(name, record)
+
+    summary: Dict[str, Any] = {'tasks': size, 'build_seconds': build_seconds}
+    ok = True
+    names = sorted(local.records())
+    for changes in rounds:
+        # Edits on each side, some on the same task, plus a deletion and an addition per side
+        for name in rng.sample(names, changes):
+            local.on_change(name, 'status', None, rng.choice(_BENCH_STATUSES))
+        for name in rng.sample(names, changes):
+            status, start, end = remote.digests.record(name)
+            moved = (datetime.strptime(start, "%Y-%m-%d") + timedelta(days=rng.randrange(1, 9))).strftime("%Y-%m-%d")
+            remote.digests.put(name, (status, moved, max(moved, end)))
+        removed_local, removed_remote = rng.sample(names, 2)
+        local.on_change(removed_local, 'task', removed_local, None)
+        remote.digests.put(removed_remote, None)
+        local.put(f"local task {changes}", ('not started', '2025-01-06', '2025-01-10'))
+        remote.digests.put(f"remote task {changes}", ('in progress', '2025-02-03', '2025-02-07'))
+
+        remote.requests = 0
+        plan, seconds = _timed(engine.plan, remote)
+
+        # Full scan for comparison
+        started = time.perf_counter()
+        ours, theirs, before = local.records(), remote.digests.records(), engine.base.records()
+        expected = set()
+        for name in set(ours) | set(theirs) | set(before):
+            if resolve(ours.get(name), theirs.get(name), before.get(name), 'merge')[0] != 'none':
+                expected.add(name)
+        scan_seconds = time.perf_counter() - started
+
+        planned = set(plan.push) | set(plan.pull) | set(plan.conflicts)
+        summary[f'changes_{changes}_plan_ms'] = seconds * 1000
+        summary[f'changes_{changes}_full_scan_ms'] = scan_seconds * 1000
+        summary[f'changes_{changes}_tasks_fetched'] = len(plan.remote)
+        summary[f'changes_{changes}_nodes_compared'] = plan.nodes_compared
+        summary[f'changes_{changes}_requests'] = remote.requests
+        ok = ok and planned == expected
+
+        # Apply the plan to the stand-ins and check that all three trees agree afterwards
+        for name, record in plan.pull.items():
+            local.put(name, record)
+            engine.base.put(name, record)
+        for name, record in plan.push.items():
+            remote.digests.put(name, record)
+            engine.base.put(name, record)
+        for name, record in plan.adopt.items():
+            engine.base.put(name, record)
+        ok = ok and local.tree.levels[0][0] == remote.digests.tree.levels[0][0] == engine.base.tree.levels[0][0]
+        names = sorted(local.records())
+
+    ok = ok and canonical_record('on hold', 'March 3, 2025', None) == ('in progress', '2025-03-03', '')
+    summary['ok'] = ok
+    return summary
+
+class _SyntheticMicrophone:
+    """Stands in for an opened sr.Microphone: background noise plus scheduled bursts, paced at speed x real time.
+
+    A burst is a tone (voiced, few zero crossings) or hiss (broadband noise).
+    """
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    def __init__(self, seed: int, noise: float = 60.0, speed: float = 20.0):
+        import numpy as np
+        self.np = np
+        self.rng = np.random.default_rng(seed)
+        self.noise = noise
+        self.speed = speed
+        self.stream = self
+        self._delay = 0
+        self._speech = 0
+        self._hiss = False
+        self._phase = 0
+
+    def say(self, delay: float, duration: float, hiss: bool = False):
+        frame_seconds = self.CHUNK / self.SAMPLE_RATE
+        self._delay = int(delay / frame_seconds)
+        self._speech = int(duration / frame_seconds)
+        self._hiss = hiss
+
+    def wait(self, seconds: float):
+        """Block until seconds more of audio have been read (sleep overshoot makes wall time unreliable)"""
+        target = self._phase + seconds * self.SAMPLE_RATE
+        while self._phase < target:
+            time.sleep(self.CHUNK / self.SAMPLE_RATE / self.speed)
+
+    def read(self, size: int) -> bytes:
+        np = self.np
+        time.sleep(size / self.SAMPLE_RATE / self.speed)
+        samples = self.rng.normal(0.0, self.noise, size)
+        if self._delay:
+            self._delay -= 1
+        elif self._speech:
+            self._speech -= 1
+            if self._hiss:
+                samples += self.rng.normal(0.0, 8 * self.noise, size)
+            else:
+                t = (self._phase + np.arange(size)) / self.SAMPLE_RATE
+                samples += 6000.0 * np.sin(2 * np.pi * 220.0 * t)
+        self._phase += size
+        return np.clip(samples, -32768, 32767).astype('<i2').tobytes()
+
+def bench_capture(size: int = 20, seed: int = 29, speed: float = 20.0) -> Dict[str, Any]:
+    """Press-to-listen latency and phrase capture on a persistent stream whose noise floor adapts as the room changes"""
+    from audio_capture import AudioCapture
+    from constants import RECORDING_SETTINGS
+
+    microphone = _SyntheticMicrophone(seed, speed=speed)
+    capture = AudioCapture(microphone)
+    capture.start()
+    frame_seconds = microphone.CHUNK / microphone.SAMPLE_RATE
+    bytes_per_second = microphone.SAMPLE_RATE * microphone.SAMPLE_WIDTH
+    try:
+        # Let the rolling floor settle once, as happens while the app starts up
+        time.sleep(RECORDING_SETTINGS['CALIBRATION_DURATION'] * 1.5 / speed)
+        quiet_floor = capture.noise.floor
+
+        captured = 0
+        for press in range(size):
+            if press == size // 2:
+                # A generator starts: the floor has to follow without any recalibration step
+                microphone.noise *= 5
+                time.sleep(RECORDING_SETTINGS['NOISE_WINDOW_SECONDS'] / speed)
+            microphone.say(delay=0.3, duration=1.0)
+            audio = capture.listen(timeout=2.0, phrase_time_limit=5.0, requested_at=time.perf_counter())
+            seconds = len(audio or b'') / bytes_per_second
+            # The phrase plus at most the pre-roll before it and the pause after it
+            if 1.0 - frame_seconds <= seconds <= 1.0 + RECORDING_SETTINGS['PREROLL_SECONDS'] + RECORDING_SETTINGS['PAUSE_SECONDS'] + 2 * frame_seconds:
+                captured += 1
+        noisy_floor = capture.noise.floor
+
+        # Noise alone must not open a phrase
+        false_start = capture.listen(timeout=1.0, phrase_time_limit=5.0) is not None
+    finally:
+        capture.stop()
+
+    latency = capture.latency_summary()
+    return {
+        'presses': size,
+        'captured': captured,
+        'press_to_listen_median_ms': latency['median_ms'],
+        'press_to_listen_max_ms': latency['max_ms'],
+        'legacy_calibration_ms': 1000.0,       # adjust_for_ambient_noise(duration=1) on every press
+        'quiet_floor': quiet_floor,
+        'noisy_floor': noisy_floor,
+        'false_start': false_start,
+        'ok': captured == size and not false_start and latency['max_ms'] < 50.0 and noisy_floor > 3 * quiet_floor
+    }
+
+def _write_wav(path: str, samples, sample_rate: int, sample_width: int = 2, channels: int = 1):
+    import wave
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+def bench_vad(size: int = 12, seed: int = 41, speed: float = 20.0, idle_seconds: float = 3.0) -> Dict[str, Any]:
+    """Hands-free segmentation of tone "speech" among hiss bursts, and CPU use while idle"""
+    from audio_capture import AudioCapture
+    from voice_activity import ContinuousListener
+    from constants import RECORDING_SETTINGS, VAD_SETTINGS
+
+    microphone = _SyntheticMicrophone(seed, speed=speed)
+    capture = AudioCapture(microphone)
+    segments: List[float] = []
+    listener = ContinuousListener(capture, lambda frame_data: segments.append(len(frame_data) / (2 * microphone.SAMPLE_RATE)))
+    rng = random.Random(seed)
+    capture.start()
+    try:
+        time.sleep(RECORDING_SETTINGS['CALIBRATION_DURATION'] * 1.5 / speed)
+        listener.start()
+        spoken = []
+        for i in range(size):
+            hiss = i % 3 == 2
+            duration = rng.uniform(0.6, 2.5)
+            microphone.say(delay=0.3, duration=duration, hiss=hiss)
+            if not hiss:
+                spoken.append(duration)
+            microphone.wait(0.3 + duration + VAD_SETTINGS['HANGOVER_SECONDS'] + 0.5)
+        time.sleep(0.2)
+        detection_cpu = listener.cpu_percent()
+
+        # Idle at real-time pace: the whole process, synthetic microphone included
+        microphone.speed = 1.0
+        time.sleep(0.2)
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        time.sleep(idle_seconds)
+        idle_cpu = 100.0 * (time.process_time() - cpu_started) / (time.perf_counter() - wall_started)
+    finally:
+        listener.stop()
+        capture.stop()
+
+    # A segment spans its speech plus at most the pre-roll and the hangover
+    slack = RECORDING_SETTINGS['PREROLL_SECONDS'] + VAD_SETTINGS['HANGOVER_SECONDS'] + 0.2
+    matched = sum(1 for expected, found in zip(spoken, segments) if expected - 0.1 <= found <= expected + slack)
+    return {
+        'speech_bursts': len(spoken),
+        'hiss_bursts': size - len(spoken),
+        'segments': len(segments),
+        'matched': matched,
+        'detection_cpu_percent': detection_cpu,
+        'idle_process_cpu_percent': idle_cpu,
+        'ok': len(segments) == len(spoken) and matched == len(spoken) and idle_cpu < 5.0
+    }
+
+_MEMO_COMMANDS = ['mark slab a complete', 'push painting to march 9', 'window b on hold', 'stair 1000 in progress']
+
+class _ToneBackend:
+    """CPU-bound stand-in for an offline recognizer: decodes a memo's tone back to its command
+    after burning rtf x audio length of CPU time"""
+    name = 'tone'
+
+    def __init__(self, rtf: float = 0.1):
+        self.rtf = rtf
+
+    def load(self) -> bool:
+        return True
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int):
+        import numpy as np
+        from speech_backends import Transcript
+        started = time.perf_counter()
+        audio_seconds = len(frame_data) / (sample_rate * sample_width)
+        busy_until = time.process_time() + self.rtf * audio_seconds
+        while time.process_time() < busy_until:
+            pass
+        samples = np.frombuffer(frame_data, dtype='<i2').astype(np.float32)
+        peak = int(np.argmax(np.abs(np.fft.rfft(samples[:sample_rate]))))
+        text = _MEMO_COMMANDS[min(len(_MEMO_COMMANDS) - 1, max(0, round((peak - 200) / 100)))]
+        return Transcript(text, self.name, audio_seconds, time.perf_counter() - started)
+
+def bench_memos(size: int = 16, seed: int = 43, rtf: float = 0.1) -> Dict[str, Any]:
+    """Batch transcription of a folder of memos: serial versus a process pool, per-file timing summary"""
+    import os
+    import tempfile
+    import functools
+    import numpy as np
+    from batch_transcribe import BatchTranscriber, timing_summary
+
+    rng = random.Random(seed)
+    sample_rate = 16000
+    expected = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(size):
+            command = rng.randrange(len(_MEMO_COMMANDS))
+            seconds = rng.uniform(2.0, 6.0)
+            t = np.arange(int(seconds * sample_rate)) / sample_rate
+            samples = (8000 * np.sin(2 * np.pi * (200 + 100 * command) * t)).astype('<i2')
+            name = f'memo_{i:03d}.wav'
+            _write_wav(os.path.join(directory, name), samples, sample_rate)
+            expected[name] = _MEMO_COMMANDS[command]
+
+        factory = functools.partial(_ToneBackend, rtf)
+        serial = BatchTranscriber(factory, workers=1).run(directory)
+        pooled = BatchTranscriber(factory).run(directory)
+
+    correct = sum(1 for result in pooled['results'] if result['text'] == expected[result['name']])
+    cores = os.cpu_count() or 1
+    return {
+        'memos': size,
+        'audio_seconds': pooled['audio_seconds'],
+        'workers': pooled['workers'],
+        'serial_seconds': serial['seconds'],
+        'pool_seconds': pooled['seconds'],
+        'speedup': serial['seconds'] / pooled['seconds'] if pooled['seconds'] else 0.0,
+        'correct': correct,
+        'summary': timing_summary(pooled, limit=3)[0],
+        'ok': correct == size and (cores == 1 or serial['seconds'] / pooled['seconds'] > min(cores, 4) * 0.5)
+    }
+
+def bench_chat(size: int = 100000, seed: int = 47, in_memory: int = 1000, lookups: int = 500) -> Dict[str, Any]:
+    """Append, random scroll-back reads and search over a long chat session held in a bounded log"""
+    import tempfile
+    import tracemalloc
+    from chat_log import ChatLog
+
+    rng = random.Random(seed)
+    words = ['pour', 'slab', 'door', 'stair', 'window', 'painting', 'delay', 'complete', 'drywall', 'roof']
+    texts = [f"{i}: " + ' '.join(rng.choice(words) for _ in range(12)) for i in range(size)]
+    texts[size // 3] += " needle"
+    texts[-5] += " needle"
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = ChatLog(directory, max_in_memory=in_memory)
+        tracemalloc.start()
+        started = time.perf_counter()
+        for i, text in enumerate(texts):
+            log.append(text, is_user=i % 2 == 0, timestamp=float(i))
+        append_seconds = time.perf_counter() - started
+        _, log_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # What the old widget-per-message transcript kept: every message, forever
+        tracemalloc.start()
+        reference = [(float(i), i % 2 == 0, text) for i, text in enumerate(texts)]
+        _, list_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = []
+        correct = 0
+        for _ in range(lookups):
+            index = rng.randrange(size)
+            message, seconds = _timed(log.get, index)
+            timings.append(seconds)
+            correct += message == reference[index]
+        window, window_seconds = _timed(log.messages, size // 2, size // 2 + 12)
+        hits, search_seconds = _timed(log.search, 'NEEDLE')
+        log.close()
+
+    latency = _latency_summary(timings)
+    return {
+        'messages': size,
+        'spilled': log.spilled,
+        'appends_per_s': size / append_seconds if append_seconds else 0.0,
+        'get_p50_us': latency['p50_us'],
+        'get_p95_us': latency['p95_us'],
+        'window_ms': window_seconds * 1000,
+        'search_ms': search_seconds * 1000,
+        'log_peak_kb': log_peak / 1024,
+        'list_peak_kb': list_peak / 1024,
+        'ok': (correct == lookups and window == reference[size // 2:size // 2 + 12]
+               and hits == [size - 5, size // 3] and log_peak < list_peak / 5)
+    }
+
+class _EventLoop:
+    """Stand-in for the Tk main loop: after() callbacks run on the calling thread in due order"""
+    def __init__(self):
+        import heapq
+        import threading
+        self._heapq = heapq
+        self._lock = threading.Lock()
+        self._jobs: List[Tuple[float, int, Callable, tuple]] = []
+        self._cancelled = set()
+        self._ids = 0
+
+    def after(self, ms: int, func: Callable, *args) -> int:
+        with self._lock:
+            self._ids += 1
+            self._heapq.heappush(self._jobs, (time.perf_counter() + ms / 1000, self._ids, func, args))
+            return self._ids
+
+    def after_cancel(self, job: int):
+        self._cancelled.add(job)
+
+    def run(self, until: Callable[[], bool], timeout: float = 30.0):
+        deadline = time.perf_counter() + timeout
+        while not until() and time.perf_counter() < deadline:
+            with self._lock:
+                job = self._jobs[0] if self._jobs and self._jobs[0][0] <= time.perf_counter() else None
+                if job:
+                    self._heapq.heappop(self._jobs)
+            if job is None:
+                time.sleep(0.0005)
+            elif job[1] not in self._cancelled:
+                job[2](*job[3])
+
+class _ChatSink:
+    """Chat view and status bar with a fixed cost per redraw"""
+    def __init__(self, render_ms: float, status_ms: float):
+        self.render_seconds = render_ms / 1000
+        self.status_seconds = status_ms / 1000
+        self.messages: List[Tuple[str, bool]] = []
+        self.status = None
+        self.renders = 0
+
+    @staticmethod
+    def _busy(seconds: float):
+        until = time.perf_counter() + seconds
+        while time.perf_counter() < until:
+            pass
+
+    def extend(self, messages: List[Tuple[str, bool]]):
+        self.messages.extend(messages)
+        self.renders += 1
+        self._busy(self.render_seconds)
+
+    def set_status(self, text: str):
+        self.status = text
+        self._busy(self.status_seconds)
+
+def bench_ui(size: int = 1000, seed: int = 53, producers: int = 4, render_ms: float = 1.0,
+             status_ms: float = 0.1) -> Dict[str, Any]:
+    """Input latency while worker threads post a burst of results: one Tk callback per update vs the frame queue"""
+    import threading
+    from ui_queue import UIUpdateQueue
+
+    per_producer = size // producers
+    expected = producers * per_producer
+
+    def run(queued: bool) -> Dict[str, Any]:
+        loop = _EventLoop()
+        sink = _ChatSink(render_ms, status_ms)
+        ui = UIUpdateQueue(loop, sink.set_status, sink.extend)
+        if queued:
+            ui.start()
+            post_message, post_status = ui.message, ui.status
+        else:
+            post_message = lambda text, is_user: loop.after(0, sink.extend, [(text, is_user)])
+            post_status = lambda text: loop.after(0, sink.set_status, text)
+
+        def produce(worker: int):
+            rng = random.Random(seed + worker)
+            for i in range(per_producer):
+                post_message(f"{worker}:{i}", False)
+                post_status(f"Working... {worker}:{i}")
+                if rng.random() < 0.05:
+                    time.sleep(0.001)
+
+        # Keystrokes arrive every 5 ms; their delay is what the user feels
+        latencies: List[float] = []
+        done = threading.Event()
+
+        def keystrokes():
+            while not done.is_set():
+                loop.after(0, lambda sent=time.perf_counter(): latencies.append(time.perf_counter() - sent))
+                time.sleep(0.005)
+
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(producers)]
+        typist = threading.Thread(target=keystrokes)
+        started = time.perf_counter()
+        typist.start()
+        for thread in threads:
+            thread.start()
+        loop.run(lambda: len(sink.messages) >= expected and not any(thread.is_alive() for thread in threads))
+        seconds = time.perf_counter() - started
+        done.set()
+        typist.join()
+        ui.stop()
+
+        in_order = all(
+            [text for text, _ in sink.messages if text.startswith(f"{worker}:")] ==
+            [f"{worker}:{i}" for i in range(per_producer)]
+            for worker in range(producers)
+        )
+        return {
+            'seconds': seconds,
+            'renders': sink.renders,
+            'input_p95_ms': _percentile(latencies, 95) * 1000,
+            'input_max_ms': max(latencies) * 1000 if latencies else 0.0,
+            'in_order': in_order and len(sink.messages) == expected,
+            'final_status': sink.status,
+            'statuses_dropped': ui.statuses_dropped
+        }
+
+    legacy = run(queued=False)
+    queued = run(queued=True)
+    summary: Dict[str, Any] = {'updates': 2 * expected}
+    for name, result in (('legacy', legacy), ('queued', queued)):
+        for key, value in result.items():
+            if key not in ('in_order', 'final_status') and not (name == 'legacy' and key == 'statuses_dropped'):
+                summary[f'{name}_{key}'] = value
+    summary['ok'] = (legacy['in_order'] and queued['in_order']
+                     and queued['final_status'] is not None and queued['final_status'].startswith("Working...")
+                     and queued['renders'] < legacy['renders'] / 10
+                     and queued['input_max_ms'] < legacy['input_max_ms'])
+    return summary
+
+def bench_commands(size: int = 10, parse_ms: float = 50.0, request_ms: float = 150.0) -> Dict[str, Any]:
+    """Keystroke latency while commands parse and call Navisworks, on the Tk thread vs the command worker; then cancellation"""
+    import threading
+    from command_executor import CommandExecutor, checkpoint
+    from ui_queue import UIUpdateQueue
+
+    applied: List[str] = []
+
+    def process(text: str):
+        checkpoint("Understanding your command")
+        _ChatSink._busy(parse_ms / 1000)           # spaCy and classification
+        checkpoint("Updating Navisworks")
+        time.sleep(request_ms / 1000)               # blocking plugin request
+        applied.append(text)
+
+    def keystroke_latency(submit: Callable[[str], None], finished: Callable[[], bool], loop: '_EventLoop') -> List[float]:
+        latencies: List[float] = []
+        sent: List[int] = [0]
+        done = threading.Event()
+
+        def keystrokes():
+            while not done.is_set():
+                loop.after(0, lambda pressed=time.perf_counter(): latencies.append(time.perf_counter() - pressed))
+                sent[0] += 1
+                time.sleep(0.005)
+
+        typist = threading.Thread(target=keystrokes)
+        typist.start()
+        for i in range(size):
+            loop.after(0, submit, f"mark task {i} complete")
+        loop.run(finished)
+        done.set()
+        typist.join()
+        # Keystrokes still waiting behind a blocked loop count too
+        loop.run(lambda: len(latencies) >= sent[0])
+        return latencies
+
+    # Legacy: on_enter runs the whole command on the Tk thread
+    loop = _EventLoop()
+    legacy = keystroke_latency(process, lambda: len(applied) >= size, loop)
+
+    # Worker: on_enter only submits; status updates come back through the UI queue
+    applied.clear()
+    loop = _EventLoop()
+    sink = _ChatSink(render_ms=0.0, status_ms=0.0)
+    ui = UIUpdateQueue(loop, sink.set_status, sink.extend)
+    ui.start()
+    executor = CommandExecutor()
+    statuses: List[str] = []
+    on_progress = lambda job: (statuses.append(job.stage), ui.status(f"{job.stage}: {job.text}"))
+    submit = lambda text: executor.submit(text, lambda job: process(job.text), on_progress=on_progress)
+    worker = keystroke_latency(submit, lambda: len(applied) >= size and not executor.active(), loop)
+    ui.stop()
+
+    # Cancel while the first of three commands is still being understood: nothing is applied
+    applied.clear()
+    jobs = [executor.submit(f"delete task {i}", lambda job: process(job.text)) for i in range(3)]
+    while jobs[0].stage != "Understanding your command":
+        time.sleep(0.001)
+    cancelled = executor.cancel_all()
+    for job in jobs:
+        try:
+            job.future.result(timeout=5)
+        except Exception:
+            pass
+    cancel_states = [job.state for job in jobs]
+    executor.shutdown(wait=True)
+
+    return {
+        'commands': size,
+        'legacy_input_p95_ms': _percentile(legacy, 95) * 1000,
+        'legacy_input_max_ms': max(legacy) * 1000,
+        'worker_input_p95_ms': _percentile(worker, 95) * 1000,
+        'worker_input_max_ms': max(worker) * 1000,
+        'progress_updates': len(statuses),
+        'cancelled': cancelled,
+        'applied_after_cancel': len(applied),
+        'ok': (max(worker) < 0.05 and max(legacy) > parse_ms / 1000
+               and cancel_states == ['cancelled'] * 3 and not applied
+               and statuses.count("Updating Navisworks") == size)
+    }
+
+def bench_dashboard(size: int = 50000, seed: int = 59, updates: int = 2000, scrolls: int = 2000,
+                    window: int = 40) -> Dict[str, Any]:
+    """Dashboard table over a large schedule: sort/filter switches, scroll windows and per-change upkeep vs a re-sort"""
+    from task_dashboard import TaskTable, SORT_COLUMNS
+    from task_index import tokenize
+
+    rng = random.Random(seed)
+    origin = date.today()
+    statuses, starts, ends = {}, {}, {}
+    for i in range(size):
+        name = f"{rng.choice(['first', 'second', 'third', 'main'])} floor {rng.choice(_BENCH_TRADES)} {i}"
+        first = origin + timedelta(days=rng.randrange(730))
+        statuses[name] = rng.choice(['complete', 'in progress', 'on hold'])
+        if rng.random() < 0.95:
+            starts[name] = first.strftime("%B %d, %Y")
+            ends[name] = (first + timedelta(days=rng.randrange(1, 30))).strftime("%B %d, %Y")
+
+    table = TaskTable()
+    _, build_seconds = _timed(table.build, statuses, starts, ends)
+    view_timings = {}
+    for column in SORT_COLUMNS:
+        _, view_timings[column] = _timed(table.set_view, sort_column=column)
+    _, status_filter_seconds = _timed(table.set_view, sort_column='start', status='on hold')
+    _, text_filter_seconds = _timed(table.set_view, text='sec flo plumb')
+
+    # Live upkeep under an active filter: each change moves one entry
+    names = list(statuses)
+    change_timings = []
+    for _ in range(updates):
+        name = rng.choice(names)
+        if rng.random() < 0.5:
+            new = rng.choice(['complete', 'in progress', 'on hold'])
+            _, seconds = _timed(table.on_change, name, 'status', statuses[name], new)
+            statuses[name] = new
+        else:
+            new = (origin + timedelta(days=rng.randrange(730))).strftime("%B %d, %Y")
+            _, seconds = _timed(table.on_change, name, 'date', starts.get(name), new)
+            starts[name] = new
+        change_timings.append(seconds)
+    changed = len(table.take_changed())
+
+    # What rebuilding the filtered, sorted view on every change would cost
+    def full_resort():
+        matching = [name for name in statuses if statuses[name] == 'on hold'
+                    and all(any(word.startswith(token) for word in tokenize(name)) for token in tokenize('sec flo plumb'))]
+        return sorted(matching, key=lambda name: (datetime.strptime(starts[name], "%B %d, %Y").toordinal()
+                                                  if name in starts else 10 ** 7, name.lower()))
+    expected, resort_seconds = _timed(full_resort)
+    filtered_ok = [row[0] for row in table.rows(0, len(table))] == expected
+
+    table.set_view(status=None, text='', descending=True)
+    scroll_timings = []
+    for _ in range(scrolls):
+        _, seconds = _timed(table.rows, rng.randrange(len(table)), window)
+        scroll_timings.append(seconds)
+    ordered = sorted(names, key=lambda name: (datetime.strptime(starts[name], "%B %d, %Y").toordinal()
+                                              if name in starts else 10 ** 7, name.lower()), reverse=True)
+    probe = rng.randrange(size - window)
+    window_ok = [row[0] for row in table.rows(probe, window)] == ordered[probe:probe + window]
+    position_ok = all(table.position(ordered[i]) == i for i in rng.sample(range(size), 100))
+
+    scroll = _latency_summary(scroll_timings)
+    change = _latency_summary(change_timings)
+    return {
+        'tasks': size,
+        'build_ms': build_seconds * 1000,
+        **{f'sort_{column}_ms': seconds * 1000 for column, seconds in view_timings.items()},
+        'status_filter_ms': status_filter_seconds * 1000,
+        'text_filter_ms': text_filter_seconds * 1000,
+        'filtered_rows': len(expected),
+        'scroll_window_p50_us': scroll['p50_us'],
+        'scroll_window_max_us': scroll['max_us'],
+        'change_p50_us': change['p50_us'],
+        'change_max_us': change['max_us'],
+        'resort_per_change_ms': resort_seconds * 1000,
+        'rows_changed': changed,
+        'ok': filtered_ok and window_ok and position_ok and scroll['max_us'] < 5000
+    }
+
+def bench_auth(size: int = 20, timeout_ms: float = 200.0, slow_ms: float = 50.0) -> Dict[str, Any]:
+    """Sign-in start latency and outcomes against an instant, a slow and a hung plugin; then cancel and supersede"""
+    from auth_session import Authenticator
+
+    timeout = timeout_ms / 1000
+    hang_seconds = timeout * 2
+    delays = {'instant': 0.0, 'slow': slow_ms / 1000, 'hung': hang_seconds}
+
+    def plugin(delay: float):
+        def request_token(client_id: str, client_secret: str, request_timeout: float) -> Optional[Dict[str, Any]]:
+            time.sleep(delay)                   # blocking HTTP request, cannot be interrupted
+            return {'token': f"token-{client_secret}"} if client_secret == 'secret' else None
+        return request_token
+
+    def run(case: str, cancel_after: float = None) -> Tuple[List[float], List[float], List[str], int]:
+        authenticator = Authenticator(plugin(delays[case]), timeout=timeout)
+        starts: List[float] = []
+        finishes: List[float] = []
+        outcomes: List[str] = []
+        calls = [0]
+        for _ in range(size):
+            def on_done(attempt):
+                calls[0] += 1
+            attempt, seconds = _timed(authenticator.start, 'client', 'secret', on_done)
+            starts.append(seconds)
+            if cancel_after is not None:
+                time.sleep(cancel_after)
+                authenticator.cancel()
+            attempt.finished.wait(5)
+            finishes.append(attempt.seconds)
+            outcomes.append(attempt.outcome)
+        # Let abandoned requests return: their late results must change nothing
+        time.sleep(hang_seconds)
+        return starts, finishes, outcomes, calls[0]
+
+    results: Dict[str, Any] = {}
+    start_latencies: List[float] = []
+    ok = True
+    expected = {'instant': 'success', 'slow': 'success', 'hung': 'timeout'}
+    for case, outcome in expected.items():
+        starts, finishes, outcomes, calls = run(case)
+        start_latencies.extend(starts)
+        results[f'{case}_finish_p50_ms'] = _percentile(finishes, 50) * 1000
+        ok &= outcomes == [outcome] * size and calls == size
+    ok &= abs(results['hung_finish_p50_ms'] - timeout_ms) < timeout_ms * 0.5
+
+    starts, finishes, outcomes, calls = run('hung', cancel_after=0.01)
+    start_latencies.extend(starts)
+    results['cancel_finish_p50_ms'] = _percentile(finishes, 50) * 1000
+    ok &= outcomes == ['cancelled'] * size and calls == size
+
+    # A new sign-in supersedes a hung one; the hung request's late token is never handed out
+    authenticator = Authenticator(plugin(hang_seconds), timeout=timeout)
+    first = authenticator.start('client', 'secret')
+    authenticator.authenticate = plugin(0.0)
+    second = authenticator.start('client', 'wrong')
+    authenticator.wait(5)
+    time.sleep(hang_seconds)
+    ok &= (first.outcome == 'cancelled' and first.result is None and first.client_secret is None
+           and second.outcome == 'failed' and authenticator.current is second)
+
+    start_stats = _latency_summary(start_latencies)
+    return {
+        'attempts': size * 4,
+        'start_p95_us': start_stats['p95_us'],
+        'start_max_us': start_stats['max_us'],
+        'legacy_hung_block_ms': hang_seconds * 1000,
+        **results,
+        'ok': ok and start_stats['p95_us'] < 2000
+    }
+
+def bench_speech(size: int = 10, seed: int = 31, model_path: str = None) -> Dict[str, Any]:
+    """Offline transcription of WAV utterances: model load count and per-utterance real-time factor"""
+    import tempfile
+    import os
+    import numpy as np
+    from speech_backends import SpeechEngine, VoskBackend, read_wav, to_int16
+
+    rng = np.random.default_rng(seed)
+    sample_rate = 16000
+    summary: Dict[str, Any] = {'utterances': size}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(size):
+            seconds = 1.0 + 3.0 * rng.random()
+            t = np.arange(int(seconds * sample_rate)) / sample_rate
+            voice = 4000 * np.sin(2 * np.pi * (140 + 60 * np.sin(3 * t)) * t) * (np.sin(2 * np.pi * 4 * t) > 0)
+            samples = np.clip(voice + rng.normal(0, 200, len(t)), -32768, 32767).astype('<i2')
+            path = os.path.join(directory, f'utterance_{i}.wav')
+            _write_wav(path, samples, sample_rate)
+            paths.append((path, samples))
+
+        # WAV decoding and sample-width conversion round trip exactly
+        stereo = os.path.join(directory, 'stereo.wav')
+        _write_wav(stereo, np.repeat(paths[0][1], 2), sample_rate, channels=2)
+        frame_data, rate, width = read_wav(stereo)
+        wide = (paths[0][1].astype('<i4') << 16).tobytes()
+        ok = (frame_data == paths[0][1].tobytes() and rate == sample_rate and width == 2
+              and to_int16(wide, 4) == paths[0][1].tobytes())
+
+        backend = VoskBackend(model_path) if model_path else VoskBackend()
+        loaded, load_seconds = _timed(backend.load)
+        if not loaded:
+            summary['skipped'] = "vosk or its model is not installed; decoding checks only"
+            summary['ok'] = ok
+            return summary
+
+        engine = SpeechEngine([backend, VoskBackend(backend.model_path)])
+        transcripts = [engine.transcribe_wav(path) for path, _ in paths]
+        rtfs = engine.rtf_summary().get('vosk', {})
+        summary.update({
+            'model_load_seconds': load_seconds,
+            'models_loaded': len(VoskBackend._models),
+            'audio_seconds': sum(transcript.audio_seconds for transcript in transcripts),
+            'median_rtf': rtfs.get('median_rtf', 0.0),
+            'max_rtf': rtfs.get('max_rtf', 0.0),
+        })
+        ok = ok and all(transcript is not None for transcript in transcripts) and len(VoskBackend._models) == 1
+    summary['ok'] = ok
+    return summary
+
+def bench_streaming(size: int = 20, seed: int = 37, parse_ms: float = 40.0, word_ms: float = 100.0,
+                    revised: float = 0.2) -> Dict[str, Any]:
+    """End-of-speech to parsed-command latency, serial versus speculative parsing of partial hypotheses.
+
+    The parser is a fixed-cost stand-in for the spaCy pipeline behind the real
+    ParseCache; the speaker reveals one word per word_ms, and a revised
+    fraction of utterances change their last word in the final transcript.
+    """
+    from parse_cache import ParseCache
+    from speculation import SpeculativeParser
+
+    rng = random.Random(seed)
+    cache = ParseCache()
+
+    def parse(text: str):
+        result = cache.get(text, 0, 0)
+        if result is None:
+            time.sleep(parse_ms / 1000)
+            result = {'text': text}
+            cache.put(text, result, 0)
+        return result
+
+    statuses = ['complete', 'in progress', 'on hold']
+    serial, speculative = [], []
+    reused = 0
+    for i in range(size):
+        task = f"{rng.choice(_BENCH_TASKS)} {i}"
+        words = f"mark {task} {rng.choice(statuses)}".split()
+        final = ' '.join(words)
+        if rng.random() < revised:
+            words[-1] = 'hold' if words[-1] != 'hold' else 'complete'
+
+        # Serial: nothing happens until the final transcript is in
+        started = time.perf_counter()
+        parse(final + ' serial')
+        serial.append(time.perf_counter() - started)
+
+        # Speculative: partials are parsed while the words arrive
+        speculator = SpeculativeParser(parse)
+        for count in range(1, len(words) + 1):
+            speculator.submit(' '.join(words[:count]))
+            time.sleep(word_ms / 1000)
+        started = time.perf_counter()
+        reused += speculator.finish(final)
+        parse(final)
+        speculative.append(time.perf_counter() - started)
+
+    serial_ms = _latency_summary(serial)['p50_us'] / 1000
+    speculative_ms = _latency_summary(speculative)['p50_us'] / 1000
+    return {
+        'utterances': size,
+        'final_reused': reused,
+        'serial_p50_ms': serial_ms,
+        'speculative_p50_ms': speculative_ms,
+        'speculative_p95_ms': _latency_summary(speculative)['p95_us'] / 1000,
+        'cache_hit_rate': cache.stats()['hit_rate'],
+        'ok': reused >= size * (1 - revised) * 0.7 and speculative_ms < serial_ms / 4
+    }
+
+BENCHMARKS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'auth': bench_auth,
+    'capture': bench_capture,
+    'chat': bench_chat,
+    'commands': bench_commands,
+    'conflicts': bench_conflicts,
+    'critical_path': bench_critical_path,
+    'dashboard': bench_dashboard,
+    'dates': bench_dates,
+    'history': bench_history,
+    'import': bench_import,
+    'index': bench_index,
+    'memos': bench_memos,
+    'rollups': bench_rollups,
+    'speech': bench_speech,
+    'streaming': bench_streaming,
+    'sync': bench_sync,
+    'ui': bench_ui,
+    'undo': bench_undo,
+    'vad': bench_vad,
+    'vocabulary': bench_vocabulary
+}
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="VISA4D benchmarks")
+    arg_parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    arg_parser.add_argument('--size', type=int, default=None, help="Problem size (phrasings, tasks, ...)")
+    args = arg_parser.parse_args(argv)
+
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    ok = True
+    for name in names:
+        kwargs = {'size': args.size} if args.size else {}
+        result = BENCHMARKS[name](**kwargs)
+        ok = ok and result.get('ok', True)
+        print(f"== {name}")
+        for key, value in result.items():
+            if isinstance(value, float):
+                value = f"{value:.3f}"
+            print(f"  {key}: {value}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
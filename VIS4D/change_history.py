@@ -0,0 +1,346 @@
+import json
+import logging
+import threading
+import numpy as np
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime, date
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from constants import HISTORY_SETTINGS, STATUS_PROGRESS
+
+FIELDS = ['status', 'date', 'end_date', 'task']
+_FIELD_CODES = {field: code for code, field in enumerate(FIELDS)}
+_COLUMNS = [('ts', np.int64), ('day', np.int32), ('task', np.int32), ('field', np.int8),
+            ('old', np.int32), ('new', np.int32), ('source', np.int16), ('user', np.int32)]
+_MISSING = -1
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(value: str) -> int:
+    try:
+        return datetime.strptime(value, "%B %d, %Y").toordinal()
+    except ValueError:
+        return _MISSING
+
+class ChangeHistory:
+    """Append-only, columnar log of every task status and date change.
+
+    Each change is one row: timestamp, day, task, field, old and new value,
+    source ("voice", "text", "import", ...) and user. Strings are stored as
+    ids into an append-only vocabulary and dates as ordinals, so every
+    column is an integer array. The current day is appended to a row log;
+    when the day rolls over it is sealed into a compressed .npz partition.
+    Aggregations run over the concatenated columns with numpy.
+    """
+    def __init__(self, directory: str = HISTORY_SETTINGS['DIRECTORY']):
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+        self._context = threading.local()
+        self._vocab: Dict[str, List[str]] = {'task': [], 'status': [], 'source': [], 'user': []}
+        self._ids: Dict[str, Dict[str, int]] = {kind: {} for kind in self._vocab}
+        self._open_day: Optional[int] = None
+        self._open_rows: Dict[str, list] = {name: [] for name, _ in _COLUMNS}
+        self._pending: List[str] = []
+        self._pending_vocab: List[str] = []
+        self._sealed: Optional[Dict[str, np.ndarray]] = None
+        self._load()
+
+    # Recording
+    @contextmanager
+    def attribution(self, source: str, user: str = None):
+        """Attribute changes made on this thread inside the block to source and user"""
+        previous = getattr(self._context, 'value', None)
+        self._context.value = (source, user)
+        try:
+            yield
+        finally:
+            self._context.value = previous
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: append one change"""
+        if field not in _FIELD_CODES:
+            return
+        source, user = getattr(self._context, 'value', None) or (HISTORY_SETTINGS['DEFAULT_SOURCE'], None)
+        self.record(task_name, field, old, new, source, user)
+
+    def record(self, task_name: str, field: str, old: Optional[str], new: Optional[str],
+               source: str = HISTORY_SETTINGS['DEFAULT_SOURCE'], user: str = None, when: datetime = None):
+        when = when or datetime.now()
+        with self._lock:
+            day = when.toordinal()
+            if self._open_day is not None and day != self._open_day:
+                self._seal()
+            self._open_day = day
+            row = (
+                int(when.timestamp() * 1000), day, self._id('task', task_name), _FIELD_CODES[field],
+                self._encode(field, old), self._encode(field, new), self._id('source', source),
+                self._id('user', user) if user else _MISSING
+            )
+            for (name, _), value in zip(_COLUMNS, row):
+                self._open_rows[name].append(value)
+            self._pending.append(','.join(map(str, row)))
+
+    def seed(self, statuses: Dict[str, str], start_dates: Dict[str, str], end_dates: Dict[str, str]):
+        """Record the current state as a baseline when the history is still empty"""
+        with self._lock:
+            if self._open_rows['ts'] or self._partitions():
+                return
+            for field, values in (('status', statuses), ('date', start_dates), ('end_date', end_dates)):
+                for task_name, value in values.items():
+                    self.record(task_name, field, None, value, source='baseline')
+            self.flush()
+
+    def flush(self):
+        """Append buffered rows and vocabulary to disk (called whenever task state is saved)"""
+        with self._lock:
+            if not self._pending and not self._pending_vocab:
+                return
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                # Vocabulary first, so every id in a row can always be resolved
+                if self._pending_vocab:
+                    with open(self.directory / 'vocab.jsonl', 'a') as f:
+                        f.write('\n'.join(self._pending_vocab) + '\n')
+                    self._pending_vocab = []
+                if self._pending:
+                    with open(self._log_path(self._open_day), 'a') as f:
+                        f.write('\n'.join(self._pending) + '\n')
+                    self._pending = []
+            except Exception as e:
+                logging.error(f"Error writing change history: {e}")
+
+    # Queries
+    def status_counts(self, since: date = None, until: date = None) -> Dict[str, Any]:
+        """Number of tasks in each status at the end of every day from since to until"""
+        columns = self._columns(until=until)
+        mask = columns['field'] == _FIELD_CODES['status']
+        days, old, new = columns['day'][mask], columns['old'][mask], columns['new'][mask]
+        first, last = self._range(days, since, until)
+        span = last - first + 1
+        statuses = self._vocab['status']
+        if span <= 0 or not statuses:
+            return {'dates': [], 'counts': {}}
+
+        # Changes before since fold into the first day, so the running totals start from the true state
+        index = np.clip(days - first, 0, None).astype(np.int64)
+        width = len(statuses)
+        delta = np.zeros(span * width, dtype=np.int64)
+        entered, left = new != _MISSING, old != _MISSING
+        delta += np.bincount(index[entered] * width + new[entered], minlength=span * width)
+        delta -= np.bincount(index[left] * width + old[left], minlength=span * width)
+        counts = np.cumsum(delta.reshape(span, width), axis=0)
+        return {
+            'dates': [date.fromordinal(day) for day in range(first, last + 1)],
+            'counts': {status: counts[:, code] for code, status in enumerate(statuses)}
+        }
+
+    def s_curve(self, since: date = None, until: date = None) -> Dict[str, Any]:
+        """Percent complete per day, weighting statuses as the progress roll-ups do"""
+        history = self.status_counts(since, until)
+        if not history['dates']:
+            return {'dates': [], 'percent_complete': np.zeros(0)}
+        total = sum(history['counts'].values())
+        done = sum(counts * STATUS_PROGRESS.get(status, 0.0) for status, counts in history['counts'].items())
+        percent = np.divide(100.0 * done, total, out=np.zeros(len(history['dates'])), where=total > 0)
+        return {'dates': history['dates'], 'percent_complete': percent}
+
+    def slippage(self, since: date = None, until: date = None, field: str = 'date') -> Dict[str, Any]:
+        """Cumulative days that start (or finish, field='end_date') dates moved, per day"""
+        columns = self._columns(until=until)
+        mask = ((columns['field'] == _FIELD_CODES[field])
+                & (columns['old'] != _MISSING) & (columns['new'] != _MISSING))
+        days = columns['day'][mask]
+        moved = (columns['new'][mask] - columns['old'][mask]).astype(np.int64)
+        first, last = self._range(days, since, until)
+        span = last - first + 1
+        if span <= 0:
+            return {'dates': [], 'cumulative_days': np.zeros(0), 'changes': 0, 'total_days': 0, 'tasks': 0}
+        index = np.clip(days - first, 0, None).astype(np.int64)
+        daily = np.bincount(index, weights=moved, minlength=span).astype(np.int64)
+        in_range = days >= first
+        return {
+            'dates': [date.fromordinal(day) for day in range(first, last + 1)],
+            'cumulative_days': np.cumsum(daily),
+            'changes': int(np.count_nonzero(in_range)),
+            'total_days': int(moved[in_range].sum()),
+            'tasks': int(np.unique(columns['task'][mask][in_range]).size)
+        }
+
+    def changes(self, since: date = None, until: date = None, task_name: str = None,
+                limit: int = None, skip_sources: Tuple[str, ...] = ('baseline',)) -> List[Dict[str, Any]]:
+        """Individual changes between since and until (inclusive), newest first"""
+        columns = self._columns(since=since, until=until)
+        mask = np.ones(len(columns['ts']), dtype=bool)
+        for source in skip_sources:
+            if source in self._ids['source']:
+                mask &= columns['source'] != self._ids['source'][source]
+        if task_name is not None:
+            task_id = self._ids['task'].get(task_name)
+            if task_id is None:
+                return []
+            mask &= columns['task'] == task_id
+        rows = np.flatnonzero(mask)[::-1]
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._decode_row(columns, row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sealed_columns()['ts']) + len(self._open_rows['ts'])
+
+    # Encoding
+    def _id(self, kind: str, value: str) -> int:
+        ids = self._ids[kind]
+        if value not in ids:
+            ids[value] = len(self._vocab[kind])
+            self._vocab[kind].append(value)
+            self._pending_vocab.append(json.dumps([kind, value]))
+        return ids[value]
+
+    def _encode(self, field: str, value: Optional[str]) -> int:
+        if value is None:
+            return _MISSING
+        if field == 'status':
+            return self._id('status', value)
+        if field == 'task':
+            return 1
+        return _date_ordinal(value)
+
+    def _decode(self, field: str, value: int) -> Optional[str]:
+        if value == _MISSING:
+            return None
+        if field == 'status':
+            return self._vocab['status'][value]
+        if field == 'task':
+            return 'present'
+        return date.fromordinal(value).strftime("%B %d, %Y")
+
+    def _decode_row(self, columns: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+        field = FIELDS[columns['field'][row]]
+        user = int(columns['user'][row])
+        return {
+            'time': datetime.fromtimestamp(columns['ts'][row] / 1000),
+            'task': self._vocab['task'][columns['task'][row]],
+            'field': field,
+            'old': self._decode(field, int(columns['old'][row])),
+            'new': self._decode(field, int(columns['new'][row])),
+            'source': self._vocab['source'][columns['source'][row]],
+            'user': self._vocab['user'][user] if user != _MISSING else None
+        }
+
+    # Storage
+    def _log_path(self, day: int) -> Path:
+        return self.directory / f"{date.fromordinal(day).isoformat()}.log"
+
+    def _partitions(self) -> List[Path]:
+        """Month (YYYY-MM) and day (YYYY-MM-DD) partitions in day order"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob('*.npz'), key=lambda path: (path.stem[:7], len(path.stem), path.stem))
+
+    def _load(self):
+        """Read the vocabulary, seal logs from earlier days and reopen today's log"""
+        try:
+            if not self.directory.exists():
+                return
+            vocab_path = self.directory / 'vocab.jsonl'
+            if vocab_path.exists():
+                with open(vocab_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            kind, value = json.loads(line)
+                            self._ids[kind][value] = len(self._vocab[kind])
+                            self._vocab[kind].append(value)
+            today = date.today().toordinal()
+            for log_path in sorted(self.directory.glob('*.log')):
+                self._open_day = date.fromisoformat(log_path.stem).toordinal()
+                with open(log_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            for (name, _), value in zip(_COLUMNS, line.split(',')):
+                                self._open_rows[name].append(int(value))
+                if self._open_day != today:
+                    self._seal()
+        except Exception as e:
+            logging.error(f"Error loading change history: {e}")
+
+    def _seal(self):
+        """Turn the open day's rows into a columnar partition and drop its row log"""
+        if self._open_day is None or not self._open_rows['ts']:
+            self._open_day = None
+            return
+        self.flush()
+        try:
+            rows = {name: np.asarray(self._open_rows[name], dtype=dtype) for name, dtype in _COLUMNS}
+            partition = self.directory / f"{date.fromordinal(self._open_day).isoformat()}.npz"
+            self._write_partition(partition, rows)
+            self._log_path(self._open_day).unlink(missing_ok=True)
+            self._roll_up_months(date.fromordinal(self._open_day).isoformat()[:7])
+        except Exception as e:
+            logging.error(f"Error sealing change history partition: {e}")
+            return
+
+        # Extend the cached columns instead of reloading every partition
+        if self._sealed is not None:
+            if len(self._sealed['day']) and self._sealed['day'][-1] > self._open_day:
+                self._sealed = None
+            else:
+                self._sealed = {name: np.concatenate([self._sealed[name], rows[name]]) for name, _ in _COLUMNS}
+        self._open_rows = {name: [] for name, _ in _COLUMNS}
+        self._open_day = None
+
+    @staticmethod
+    def _write_partition(partition: Path, rows: Dict[str, np.ndarray]):
+        if partition.exists():
+            with np.load(partition) as existing:
+                rows = {name: np.concatenate([existing[name], rows[name]]) for name, _ in _COLUMNS}
+            order = np.argsort(rows['day'], kind='stable')
+            rows = {name: values[order] for name, values in rows.items()}
+        np.savez_compressed(partition, **rows)
+
+    def _roll_up_months(self, current_month: str):
+        """Merge the day partitions of months before current_month into one file per month"""
+        months: Dict[str, List[Path]] = {}
+        for partition in self._partitions():
+            if len(partition.stem) == 10 and partition.stem[:7] < current_month:
+                months.setdefault(partition.stem[:7], []).append(partition)
+        for month, days in months.items():
+            parts = []
+            for partition in days:
+                with np.load(partition) as data:
+                    parts.append({name: data[name] for name, _ in _COLUMNS})
+            self._write_partition(self.directory / f"{month}.npz",
+                                  {name: np.concatenate([part[name] for part in parts]) for name, _ in _COLUMNS})
+            for partition in days:
+                partition.unlink()
+
+    def _sealed_columns(self) -> Dict[str, np.ndarray]:
+        if self._sealed is None:
+            parts = []
+            for partition in self._partitions():
+                with np.load(partition) as data:
+                    parts.append({name: data[name] for name, _ in _COLUMNS})
+            self._sealed = {
+                name: np.concatenate([part[name] for part in parts]) if parts else np.zeros(0, dtype=dtype)
+                for name, dtype in _COLUMNS
+            }
+        return self._sealed
+
+    def _columns(self, since: date = None, until: date = None) -> Dict[str, np.ndarray]:
+        """Sealed and open rows, restricted to a day range (rows are in day order)"""
+        with self._lock:
+            sealed = self._sealed_columns()
+            columns = {
+                name: np.concatenate([sealed[name], np.asarray(self._open_rows[name], dtype=dtype)])
+                for name, dtype in _COLUMNS
+            }
+        lo = np.searchsorted(columns['day'], since.toordinal(), 'left') if since else 0
+        hi = np.searchsorted(columns['day'], until.toordinal(), 'right') if until else len(columns['day'])
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    @staticmethod
+    def _range(days: np.ndarray, since: Optional[date], until: Optional[date]) -> Tuple[int, int]:
+        first = since.toordinal() if since else (int(days.min()) if days.size else date.today().toordinal())
+        last = until.toordinal() if until else date.today().toordinal()
+        return first, last
@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Optional, List, Tuple
+
+from constants import CHAT_SETTINGS
+
+# (timestamp, is_user, text)
+ChatMessage = Tuple[float, bool, str]
+
+class ChatLog:
+    """Full chat transcript with a bounded in-memory tail.
+
+    Messages are addressed by index in arrival order. Only the newest
+    max_in_memory stay in memory; older ones are spilled to a per-session
+    JSON-lines file in batches, with their byte offsets kept so any message
+    can still be read back with one seek. search() covers both.
+    """
+    def __init__(self, directory: str = CHAT_SETTINGS['DIRECTORY'],
+                 max_in_memory: int = CHAT_SETTINGS['MAX_IN_MEMORY']):
+        self.directory = directory
+        self.max_in_memory = max_in_memory
+        self.spill_batch = max(1, min(CHAT_SETTINGS['SPILL_BATCH'], max_in_memory))
+        self._lock = threading.RLock()
+        self._memory: deque = deque()
+        self._offsets = array('q')          # spill-file offset of every spilled message
+        self._spill_path = os.path.join(directory, time.strftime("chat_%Y%m%d_%H%M%S.jsonl"))
+        self._reader = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._memory)
+
+    @property
+    def spilled(self) -> int:
+        return len(self._offsets)
+
+    def append(self, text: str, is_user: bool = False, timestamp: float = None) -> int:
+        with self._lock:
+            self._memory.append((timestamp or time.time(), is_user, text))
+            if len(self._memory) > self.max_in_memory:
+                self._spill()
+            return len(self) - 1
+
+    def get(self, index: int) -> Optional[ChatMessage]:
+        with self._lock:
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                return None
+            if index >= len(self._offsets):
+                return self._memory[index - len(self._offsets)]
+            return self._read_spilled(index)
+
+    def messages(self, start: int, end: int) -> List[ChatMessage]:
+        """Messages [start, end) in order"""
+        with self._lock:
+            return [self.get(index) for index in range(max(0, start), min(end, len(self)))]
+
+    def search(self, query: str, limit: int = 50) -> List[int]:
+        """Indices of messages containing query (case-insensitive), newest first"""
+        needle = query.lower().strip()
+        if not needle:
+            return []
+        hits: List[int] = []
+        with self._lock:
+            base = len(self._offsets)
+            for position in range(len(self._memory) - 1, -1, -1):
+                if needle in self._memory[position][2].lower():
+                    hits.append(base + position)
+                    if len(hits) >= limit:
+                        return hits
+            if not base:
+                return hits
+            spilled_hits = []
+            with open(self._spill_path, 'rb') as spill:
+                for index, line in enumerate(spill):
+                    line = line.decode('utf-8')
+                    # Cheap pre-check on the raw line before decoding the JSON
+                    if needle in line.lower() and needle in json.loads(line)[2].lower():
+                        spilled_hits.append(index)
+            hits.extend(reversed(spilled_hits[-(limit - len(hits)):]))
+        return hits
+
+    def close(self):
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _spill(self):
+        batch = [self._memory.popleft() for _ in range(min(self.spill_batch, len(self._memory)))]
+        lines = [(json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8') for message in batch]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._spill_path, 'ab') as spill:
+                spill.seek(0, os.SEEK_END)
+                offset = spill.tell()
+                spill.write(b"".join(lines))
+            for line in lines:
+                self._offsets.append(offset)
+                offset += len(line)
+        except Exception as e:
+            logging.error(f"Error spilling chat history to {self._spill_path}: {str(e)}")
+            # Keep the messages in memory rather than lose them
+            self._memory.extendleft(reversed(batch))
+
+    def _read_spilled(self, index: int) -> Optional[ChatMessage]:
+        try:
+            if self._reader is None:
+                self._reader = open(self._spill_path, 'rb')
+            self._reader.seek(self._offsets[index])
+            timestamp, is_user, text = json.loads(self._reader.readline().decode('utf-8'))
+            return timestamp, is_user, text
+        except Exception as e:
+            logging.error(f"Error reading chat history from {self._spill_path}: {str(e)}")
+            return None
+
+def prune_history(directory: str = CHAT_SETTINGS['DIRECTORY'], keep: int = CHAT_SETTINGS['KEEP_FILES']):
+    """Delete all but the newest keep session files"""
+    try:
+        files = sorted(name for name in os.listdir(directory) if name.startswith('chat_') and name.endswith('.jsonl'))
+    except FileNotFoundError:
+        return
+    for name in files[:-keep] if keep else files:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError as e:
+            logging.error(f"Could not remove old chat history {name}: {str(e)}")
@@ -0,0 +1,148 @@
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Optional, List, Callable
+
+from constants import COMMAND_SETTINGS
+
+class CommandCancelled(Exception):
+    """Raised inside a running command at its next checkpoint after cancel()"""
+
+_local = threading.local()
+
+def checkpoint(stage: str = None):
+    """Report progress from the command running on this thread and stop it if it was cancelled.
+
+    A no-op outside CommandExecutor workers, so the NLP code calls it
+    unconditionally.
+    """
+    job: Optional['CommandJob'] = getattr(_local, 'job', None)
+    if job is None:
+        return
+    if job.cancelled.is_set():
+        raise CommandCancelled(job.text)
+    if stage and stage != job.stage:
+        job.stage = stage
+        if job.on_progress:
+            job.on_progress(job)
+
+class CommandJob:
+    """One submitted command: its future, progress stage and cancel flag"""
+    def __init__(self, job_id: int, text: str, source: str, on_progress: Callable[['CommandJob'], None] = None):
+        self.id = job_id
+        self.text = text
+        self.source = source
+        self.on_progress = on_progress
+        self.future: Optional[Future] = None
+        self.cancelled = threading.Event()
+        self.stage = 'Queued'
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.outcome: Optional[str] = None      # 'done', 'cancelled' or 'failed' once finished
+
+    @property
+    def state(self) -> str:
+        if self.outcome is not None:
+            return self.outcome
+        return 'running' if self.started_at is not None else 'queued'
+
+    @property
+    def seconds(self) -> float:
+        """Time from submission to completion (or until now)"""
+        return (self.finished_at or time.perf_counter()) - self.submitted_at
+
+    def cancel(self) -> bool:
+        """Cancel a queued command outright, or a running one at its next checkpoint.
+
+        Returns False once the command has finished. A command already
+        sending its changes to Navisworks runs to completion.
+        """
+        if self.finished_at is not None:
+            return False
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+        return True
+
+class CommandExecutor:
+    """Runs user commands off the Tk thread.
+
+    Commands execute one at a time in submission order, since each one can
+    depend on the context, confirmations and task state left by the one
+    before. on_done is called on the worker thread with the finished job;
+    callers marshal anything that touches widgets back to the UI thread.
+    """
+    def __init__(self, workers: int = COMMAND_SETTINGS['WORKERS']):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="command")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: List[CommandJob] = []
+        self.completed = 0
+        self.cancelled = 0
+
+    def submit(self, text: str, run: Callable[[CommandJob], Any], source: str = 'text',
+               on_done: Callable[[CommandJob], None] = None,
+               on_progress: Callable[[CommandJob], None] = None) -> CommandJob:
+        job = CommandJob(next(self._ids), text, source, on_progress)
+        with self._lock:
+            self._jobs.append(job)
+        job.future = self._executor.submit(self._run, job, run)
+        # Also fires for a job cancelled before it started
+        job.future.add_done_callback(lambda future: self._finish(job, on_done))
+        return job
+
+    def active(self) -> List[CommandJob]:
+        """Queued and running commands, oldest first"""
+        with self._lock:
+            return [job for job in self._jobs if job.finished_at is None]
+
+    def cancel_all(self) -> int:
+        """Cancel every queued and running command; returns how many were cancelled"""
+        return sum(job.cancel() for job in self.active())
+
+    def shutdown(self, wait: bool = False):
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'completed': self.completed, 'cancelled': self.cancelled, 'active': len(self.active())}
+
+    def _run(self, job: CommandJob, run: Callable[[CommandJob], Any]):
+        job.started_at = time.perf_counter()
+        _local.job = job
+        try:
+            checkpoint('Starting')
+            result = run(job)
+            job.outcome = 'done'
+            return result
+        except CommandCancelled:
+            job.outcome = 'cancelled'
+            logging.info(f"Cancelled command '{job.text}' at stage '{job.stage}'")
+        except Exception as e:
+            job.outcome = 'failed'
+            logging.error(f"Error running command '{job.text}': {str(e)}")
+            raise
+        finally:
+            _local.job = None
+
+    def _finish(self, job: CommandJob, on_done: Callable[[CommandJob], None]):
+        job.finished_at = time.perf_counter()
+        if job.outcome is None:
+            job.outcome = 'cancelled'       # cancelled before it started
+        with self._lock:
+            self._jobs.remove(job)
+            if job.outcome == 'cancelled':
+                self.cancelled += 1
+            else:
+                self.completed += 1
+        if job.started_at is not None and job.seconds > COMMAND_SETTINGS['SLOW_SECONDS']:
+            logging.info(f"Command '{job.text}' took {job.seconds:.1f}s "
+                         f"({job.started_at - job.submitted_at:.1f}s queued)")
+        if on_done:
+            try:
+                on_done(job)
+            except Exception as e:
+                logging.error(f"Error finishing command '{job.text}': {str(e)}")
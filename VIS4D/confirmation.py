@@ -0,0 +1,104 @@
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Callable
+
+from constants import CONFIRMATION_SETTINGS
+
+_ALL = r"(?:\s+(?:to\s+)?(?:all|everything|all of them|them all))"
+_YES = r"(?:yes|yeah|yep|yup|sure|ok(?:ay)?|correct|right|confirm(?:ed)?|do it|go ahead|apply(?: it)?)"
+_NO = r"(?:no|nope|nah|cancel|stop|skip|don'?t|never ?mind)"
+
+_END = r"(?:\s+(?:please|thanks|thank you))?\s*$"
+
+# Whole-reply patterns: anything longer ("ok mark painting complete") is a new command
+_REPLIES = [
+    ('yes_all', re.compile(rf"^(?:{_YES}\s+)?(?:{_YES}{_ALL}|(?:apply|do|confirm)\s+(?:them\s+)?all){_END}")),
+    ('no_all', re.compile(rf"^(?:{_NO}\s+)?(?:{_NO}{_ALL}|cancel\s+(?:them\s+)?all){_END}")),
+    ('yes', re.compile(rf"^{_YES}(?:\s+{_YES})*{_END}")),
+    ('no', re.compile(rf"^{_NO}(?:\s+{_NO})*{_END}")),
+]
+
+def classify_reply(text: str) -> Optional[str]:
+    """Map a reply to 'yes', 'no', 'yes_all', 'no_all', or None when it is not an answer"""
+    text_clean = re.sub(r"[.!,]+", " ", text.lower()).strip()
+    for reply, pattern in _REPLIES:
+        if pattern.match(text_clean):
+            return reply
+    return None
+
+@dataclass
+class PendingCommand:
+    """A parsed command held until the user confirms it"""
+    prompt: str
+    command: Any = None                   # CommandResult, kept so "yes" runs it without re-parsing
+    operations: List[Dict[str, Any]] = field(default_factory=list)
+    expires_at: float = 0.0
+
+class ConfirmationQueue:
+    """State machine for commands awaiting a yes/no.
+
+    The queue is idle when empty and awaiting while it holds commands; only
+    the head is presented to the user. Each head gets TIMEOUT_SECONDS from the
+    moment it is presented, and an expired head drops the rest of its queue
+    with it, since those confirmations were asked for together.
+    """
+    def __init__(self, timeout: float = CONFIRMATION_SETTINGS['TIMEOUT_SECONDS'],
+                 clock: Callable[[], float] = time.monotonic):
+        self.timeout = timeout
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._queue: List[PendingCommand] = []
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def state(self) -> str:
+        return 'awaiting' if self._queue else 'idle'
+
+    def push(self, prompt: str, command: Any = None,
+             operations: List[Dict[str, Any]] = None) -> PendingCommand:
+        """Queue a command for confirmation; the clock starts once it reaches the head"""
+        with self._lock:
+            pending = PendingCommand(prompt, command, list(operations or []))
+            self._queue.append(pending)
+            if len(self._queue) == 1:
+                self._present()
+            return pending
+
+    def current(self) -> Optional[PendingCommand]:
+        with self._lock:
+            return self._queue[0] if self._queue else None
+
+    def expire(self) -> int:
+        """Drop everything if the head has timed out; returns the number of commands dropped"""
+        with self._lock:
+            if self._queue and self.clock() >= self._queue[0].expires_at:
+                return self.clear()
+            return 0
+
+    def take(self) -> Optional[PendingCommand]:
+        """Remove the head and present the next command"""
+        with self._lock:
+            if not self._queue:
+                return None
+            pending = self._queue.pop(0)
+            if self._queue:
+                self._present()
+            return pending
+
+    def take_all(self) -> List[PendingCommand]:
+        with self._lock:
+            pending, self._queue = self._queue, []
+            return pending
+
+    def clear(self) -> int:
+        with self._lock:
+            dropped = len(self._queue)
+            self._queue = []
+            return dropped
+
+    def _present(self):
+        self._queue[0].expires_at = self.clock() + self.timeout
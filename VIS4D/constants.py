@@ -46,7 +46,20 @@ FILE_PATHS = {
     'TASK_MAPPING': 'task_mapping.json',
     'TASK_STATE': 'task_state.json',
     'TASK_OUTPUT': 'task_output.json',
-    'LOG_FILE': 'visa4d.log'
+    'LOG_FILE': 'visa4d.log',
+    'FEEDBACK_STORE': 'intent_feedback.jsonl',
+    'MODEL_SNAPSHOTS': 'model_snapshots',
+    'EMBEDDING_CACHE': 'cache/embeddings',
+    'VOSK_MODEL': 'models/vosk-model-small-en-us-0.15'
+}
+
+# Speech-to-text engines, tried in order until one can run
+SPEECH_SETTINGS = {
+    'BACKENDS': ('vosk', 'google'),   # Local engine first; Google when no offline model is installed
+    'HISTORY': 100,             # Recent utterances kept for real-time factor reporting
+    'BATCH_BACKEND': 'vosk',    # Engine used for recorded voice memos
+    'BATCH_WORKERS': None,      # Transcription processes (None: one per core)
+    'MEMO_EXTENSIONS': ('.wav', '.flac')
 }
 
 # GUI Settings
@@ -57,14 +70,40 @@ GUI_SETTINGS = {
     'FONT_FAMILY': "Segoe UI",
     'DEFAULT_FONT_SIZE': 12,
     'SMALL_FONT_SIZE': 10,
-    'LARGE_FONT_SIZE': 14
+    'LARGE_FONT_SIZE': 14,
+    'FRAME_MS': 33,                 # UI update queue drain interval (~30 fps)
+    'MAX_UPDATES_PER_FRAME': 500    # Anything beyond waits for the next frame
 }
 
 # Recording Settings
 RECORDING_SETTINGS = {
     'TIMEOUT': 8,
     'PHRASE_TIME_LIMIT': 15,
-    'CALIBRATION_DURATION': 2
+    'CALIBRATION_DURATION': 2,      # Seconds of audio before the rolling noise floor is trusted
+    'NOISE_WINDOW_SECONDS': 10,     # Frames the noise floor is estimated from
+    'NOISE_PERCENTILE': 20,
+    'NOISE_REFRESH_FRAMES': 8,      # Re-estimate the floor every this many frames
+    'SPEECH_RATIO': 3.0,            # Speech threshold as a multiple of the noise floor
+    'MIN_ENERGY': 100,
+    'INITIAL_ENERGY': 300,          # speech_recognition's default threshold, used until calibrated
+    'PREROLL_SECONDS': 0.5,         # Audio kept from just before speech starts
+    'PAUSE_SECONDS': 0.8            # Silence that ends a phrase
+}
+
+# Hands-free listening: voice activity detection and wake phrase
+VAD_SETTINGS = {
+    'ZCR_MAX': 0.3,                 # Frames crossing zero more often than this look like noise, not voice
+    'LOUD_RATIO': 3.0,              # ...unless they are this many times over the speech threshold
+    'ONSET_FRAMES': 2,              # Consecutive speech frames that open a segment
+    'HANGOVER_SECONDS': 0.6,        # Non-speech that closes a segment
+    'MIN_SEGMENT_SECONDS': 0.3,
+    'MAX_SEGMENT_SECONDS': 15,
+    'BUFFER_SECONDS': 30,           # Audio held in the ring buffer
+    'WAKE_PHRASES': ('hey visa', 'ok visa', 'okay visa'),
+    'REQUIRE_WAKE_PHRASE': True,
+    'WAKE_WINDOW_SECONDS': 6,       # After a bare wake phrase, the next utterance counts as a command
+    'WAKE_CHECK_SECONDS': 2.0,      # Start of a segment transcribed locally to look for the wake phrase
+    'CLOUD_BACKENDS': False         # Opt in to sending hands-free audio to online engines (Google)
 }
 
 # Message Settings
@@ -74,6 +113,44 @@ MESSAGE_SETTINGS = {
     'PADDING_Y': 5
 }
 
+# Chat transcript: bubbles on screen at once, and how much history stays in memory
+CHAT_SETTINGS = {
+    'VISIBLE_MESSAGES': 12,         # Bubble widgets in the recycled pool
+    'SCROLL_STEP': 1,               # Messages moved per mouse-wheel notch
+    'MAX_IN_MEMORY': 1000,          # Older messages spill to disk
+    'SPILL_BATCH': 250,
+    'DIRECTORY': 'chat_history',
+    'KEEP_FILES': 30                # Past sessions' transcripts kept on disk
+}
+
+# Task dashboard panel: only the rows in view are drawn
+DASHBOARD_SETTINGS = {
+    'ROW_HEIGHT': 24,
+    'COLUMN_WIDTHS': {'name': 240, 'status': 90, 'start': 120, 'finish': 120},
+    'GANTT_MIN_WIDTH': 160,
+    'SCROLL_ROWS': 3,               # Rows moved per mouse-wheel notch
+    'FILTER_DELAY_MS': 150,         # Wait for a pause in typing before filtering
+    'STATUS_COLORS': {
+        'complete': "#10B981",      # Green
+        'in progress': "#3B82F6",   # Blue
+        'on hold': "#F59E0B"        # Yellow
+    }
+}
+
+# Navisworks sign-in runs in the background; remembered credentials live in the OS keyring
+AUTH_SETTINGS = {
+    'TIMEOUT_SECONDS': 15,
+    'KEYRING_SERVICE': 'VISA4D Navisworks',
+    'CLIENT_ID_KEY': 'client_id',   # keyring entry holding the last client ID
+    'SPINNER_MS': 100
+}
+
+# Typed and spoken commands run on a worker thread, one at a time in order
+COMMAND_SETTINGS = {
+    'WORKERS': 1,
+    'SLOW_SECONDS': 2.0             # Log commands slower than this
+}
+
 # Default Task Categories
 DEFAULT_TASK_MAPPING = {
     "flooring": "Flooring Installation",
@@ -86,6 +163,58 @@ DEFAULT_TASK_MAPPING = {
     "drywall": "Drywall Installation"
 }
 
+# Task hierarchy (project -> floor/zone -> trade -> task)
+TASK_HIERARCHY = {
+    'ROOT': 'project',
+    'UNZONED': 'site',
+    'GENERAL_TRADE': 'general',
+    'TRADES': [
+        'flooring', 'roofing', 'concrete', 'painting', 'plumbing', 'electrical', 'hvac', 'drywall',
+        'framing', 'insulation', 'door', 'window', 'slab', 'stair', 'beam', 'foundation', 'masonry',
+        'steel', 'tile', 'ceiling', 'glazing', 'excavation', 'landscaping', 'elevator', 'fire'
+    ]
+}
+
+# Schedule import (P6 / MS Project XML, CSV)
+IMPORT_SETTINGS = {
+    'BATCH_SIZE': 500
+}
+
+# Delta sync with Timeliner (per-task hashes summarized in a FANOUT-ary tree of DEPTH levels)
+SYNC_SETTINGS = {
+    'FANOUT': 16,
+    'DEPTH': 4,
+    'CONFLICT_POLICY': 'merge',          # merge | local | remote | manual
+    'STATE_FILE': 'sync_state.json'
+}
+
+# Append-only change history (one partition per day)
+HISTORY_SETTINGS = {
+    'DIRECTORY': 'history',
+    'DEFAULT_SOURCE': 'system'
+}
+
+# Undo/redo of task changes (one step per command)
+UNDO_SETTINGS = {
+    'MAX_STEPS': 200
+}
+
+# Commands held for a yes/no before they are applied
+CONFIRMATION_SETTINGS = {
+    'TIMEOUT_SECONDS': 120,
+    'CONFIRM_INTENTS': ('delete_task',),
+    'PREVIEW_LIMIT': 10
+}
+
+# Fraction of a task counted as done in percent-complete roll-ups
+STATUS_PROGRESS = {
+    'complete': 1.0,
+    'in progress': 0.5,
+    'on hold': 0.5,
+    'suspended': 0.5,
+    'not started': 0.0
+}
+
 # Error Messages
 ERROR_MESSAGES = {
     'INVALID_COMMAND': "I couldn't understand your command. Please try again.",
@@ -116,6 +245,25 @@ NLP_SETTINGS = {
     'TRANSFORMER_MODEL': 'all-MiniLM-L6-v2'
 }
 
+# Online Learning Settings
+LEARNING_SETTINGS = {
+    'HASH_FEATURES': 2 ** 18,
+    'MIN_FEEDBACK': 5,          # Confirmed commands before the online model is trusted
+    'BATCH_SIZE': 16,           # Max feedback samples folded into one partial_fit
+    'MAX_SNAPSHOTS': 20         # Older model versions are pruned beyond this
+}
+
+# Cache Settings
+CACHE_SETTINGS = {
+    'EMBEDDING_MAX_ENTRIES': 20000,
+    'EMBEDDING_MAX_BYTES': 64 * 1024 * 1024,
+    'EMBEDDING_FLUSH_EVERY': 50,    # Persist the index after this many new entries
+    'PERSIST_EMBEDDINGS': True,
+    'PARSE_MAX_ENTRIES': 2000,
+    'TASK_SHORTLIST': 50,           # Known task names compared by embedding per fuzzy match
+    'TASK_SHORTLIST_SCAN': 1000     # Max names looked at to build that shortlist
+}
+
 # Logging Settings
 LOGGING_CONFIG = {
     'VERSION': 1,
@@ -191,6 +339,7 @@ class StatusEmojis:
     RECORDING = "⏺️"
     SEND = "➤"
     MIC = "🎤"
+    LISTENING = "👂"
     SUCCESS = "✅"
     ERROR = "❌"
     WARNING = "⚠️"
@@ -0,0 +1,362 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List, Set, Tuple
+
+DEPENDENCY_TYPES = ('FS', 'SS')
+
+def _date_ordinal(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%B %d, %Y").toordinal()
+    except ValueError:
+        return None
+
+class CriticalPathEngine:
+    """Incremental critical-path method over task dependencies.
+
+    Each task has a planned start (its Timeliner start date) and a duration
+    (finish minus start, in days). Dependencies are finish-to-start or
+    start-to-start with a lag in days. The engine keeps for every task:
+
+    * the early start: the planned start, pushed later if a predecessor
+      requires it (a task whose predecessors push it is reported as late);
+    * the tail: the longest time from the task's start to the end of the
+      network, which gives late start = project finish - tail without a
+      separate backward pass over the whole graph.
+
+    A change only re-evaluates the affected subgraph: early starts propagate
+    to successors and tails to predecessors, each in level order, and
+    propagation stops wherever a value comes out unchanged. Levels satisfy
+    level(successor) > level(predecessor) and are raised incrementally when
+    an edge is added.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._planned: Dict[str, Optional[int]] = {}
+        self._finish: Dict[str, Optional[int]] = {}
+        self._preds: Dict[str, Dict[str, Tuple[str, int]]] = {}    # successor -> {predecessor: (type, lag)}
+        self._succs: Dict[str, Set[str]] = {}
+        self._level: Dict[str, int] = {}
+        self._early: Dict[str, Optional[int]] = {}
+        self._early_finish: Dict[str, Optional[int]] = {}
+        self._tail: Dict[str, int] = {}
+        self._late: Dict[str, int] = {}                              # task -> days its planned start is too early
+        self._finish_heap: List[Tuple[int, str]] = []                # lazy max-heap of (-early finish, task)
+        self.last_touched = 0
+
+    def __len__(self) -> int:
+        return len(self._planned)
+
+    # Building and change notifications
+    def build(self, start_dates: Dict[str, str], end_dates: Dict[str, str],
+              dependencies: Dict[str, List[Dict[str, Any]]] = None):
+        """Rebuild the whole network from TaskManager state"""
+        with self._lock:
+            self._reset()
+            for task_name in set(start_dates) | set(end_dates) | set(dependencies or {}):
+                self._add_node(task_name)
+                self._planned[task_name] = _date_ordinal(start_dates.get(task_name))
+                self._finish[task_name] = _date_ordinal(end_dates.get(task_name))
+            for successor, links in (dependencies or {}).items():
+                for link in links:
+                    self._add_node(link['predecessor'])
+                    self._add_edge(successor, link['predecessor'], link.get('type', 'FS'), int(link.get('lag', 0)))
+            self._assign_levels()
+            self._propagate_forward(self._planned)
+            self._propagate_backward(self._planned)
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: re-evaluate the subgraph affected by one change"""
+        with self._lock:
+            if field == 'task':
+                if new is None:
+                    self._remove_node(task_name)
+                else:
+                    self._add_node(task_name)
+                return
+            if field not in ('date', 'end_date'):
+                return
+            self._add_node(task_name)
+            if field == 'date':
+                self._planned[task_name] = _date_ordinal(new)
+            else:
+                self._finish[task_name] = _date_ordinal(new)
+            self._propagate_forward([task_name])
+            self._propagate_backward([task_name])
+
+    def add_dependency(self, successor: str, predecessor: str, dep_type: str = 'FS', lag: int = 0):
+        """Add (or replace) a dependency; raises ValueError on unknown types or cycles"""
+        dep_type = dep_type.upper()
+        if dep_type not in DEPENDENCY_TYPES:
+            raise ValueError(f"Unsupported dependency type: {dep_type}")
+        if successor == predecessor:
+            raise ValueError("A task cannot depend on itself")
+        with self._lock:
+            self._add_node(successor)
+            self._add_node(predecessor)
+            if self._reaches(successor, predecessor):
+                raise ValueError(f"'{successor}' already precedes '{predecessor}'")
+            self._add_edge(successor, predecessor, dep_type, lag)
+            self._raise_levels(predecessor, successor)
+            self._propagate_forward([successor])
+            self._propagate_backward([predecessor])
+
+    def remove_dependency(self, successor: str, predecessor: str) -> bool:
+        with self._lock:
+            if predecessor not in self._preds.get(successor, {}):
+                return False
+            del self._preds[successor][predecessor]
+            self._succs[predecessor].discard(successor)
+            self._propagate_forward([successor])
+            self._propagate_backward([predecessor])
+            return True
+
+    # Read access
+    def dependencies(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Dependencies in the shape stored in task_state.json"""
+        with self._lock:
+            return {
+                successor: [{'predecessor': pred, 'type': dep_type, 'lag': lag}
+                            for pred, (dep_type, lag) in sorted(links.items())]
+                for successor, links in self._preds.items() if links
+            }
+
+    def predecessors(self, task_name: str) -> List[str]:
+        with self._lock:
+            return sorted(self._preds.get(task_name, {}))
+
+    def project_finish(self) -> Optional[int]:
+        with self._lock:
+            while self._finish_heap:
+                neg_finish, task_name = self._finish_heap[0]
+                if self._early_finish.get(task_name) == -neg_finish:
+                    return -neg_finish
+                heapq.heappop(self._finish_heap)
+            return None
+
+    def early_start(self, task_name: str) -> Optional[date]:
+        with self._lock:
+            ordinal = self._early.get(task_name)
+            return date.fromordinal(ordinal) if ordinal is not None else None
+
+    def total_float(self, task_name: str) -> Optional[int]:
+        """Days task_name can slip without moving the project finish"""
+        with self._lock:
+            early = self._early.get(task_name)
+            finish = self.project_finish()
+            if early is None or finish is None:
+                return None
+            return finish - self._tail[task_name] - early
+
+    def is_critical(self, task_name: str) -> bool:
+        total_float = self.total_float(task_name)
+        return total_float is not None and total_float <= 0
+
+    def critical_tasks(self) -> List[str]:
+        """Critical tasks ordered by early start"""
+        with self._lock:
+            finish = self.project_finish()
+            if finish is None:
+                return []
+            names = [name for name, early in self._early.items()
+                     if early is not None and finish - self._tail[name] - early <= 0]
+            return sorted(names, key=lambda name: (self._early[name], name))
+
+    def late_tasks(self) -> Dict[str, int]:
+        """Tasks planned to start before their predecessors allow, with the slip in days"""
+        with self._lock:
+            return dict(self._late)
+
+    def schedule_flags(self, task_name: str) -> Dict[str, Any]:
+        """Float and critical/late flags for one task, for display"""
+        with self._lock:
+            return {
+                'early_start': self.early_start(task_name),
+                'total_float': self.total_float(task_name),
+                'critical': self.is_critical(task_name),
+                'late_by': self._late.get(task_name, 0)
+            }
+
+    # Graph maintenance (callers hold the lock)
+    def _duration(self, task_name: str) -> int:
+        start, finish = self._planned[task_name], self._finish[task_name]
+        if start is None or finish is None:
+            return 0
+        return max(0, finish - start)
+
+    def _add_node(self, task_name: str):
+        if task_name in self._planned:
+            return
+        self._planned[task_name] = None
+        self._finish[task_name] = None
+        self._preds[task_name] = {}
+        self._succs[task_name] = set()
+        self._level[task_name] = 0
+        self._early[task_name] = None
+        self._early_finish[task_name] = None
+        self._tail[task_name] = 0
+
+    def _remove_node(self, task_name: str):
+        if task_name not in self._planned:
+            return
+        successors = list(self._succs.pop(task_name, ()))
+        predecessors = list(self._preds.pop(task_name, {}))
+        for successor in successors:
+            self._preds[successor].pop(task_name, None)
+        for predecessor in predecessors:
+            self._succs[predecessor].discard(task_name)
+        for table in (self._planned, self._finish, self._level, self._early, self._early_finish,
+                      self._tail, self._late):
+            table.pop(task_name, None)
+        self._propagate_forward(successors)
+        self._propagate_backward(predecessors)
+
+    def _add_edge(self, successor: str, predecessor: str, dep_type: str, lag: int):
+        self._preds[successor][predecessor] = (dep_type.upper(), lag)
+        self._succs[predecessor].add(successor)
+
+    def _reaches(self, source: str, target: str) -> bool:
+        """Whether target is downstream of source; levels prune the search"""
+        limit = self._level[target]
+        stack, seen = [source], {source}
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            for successor in self._succs[node]:
+                if successor not in seen and self._level[successor] <= limit:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+
+    def _raise_levels(self, predecessor: str, successor: str):
+        stack = [(predecessor, successor)]
+        while stack:
+            pred, node = stack.pop()
+            if self._level[node] > self._level[pred]:
+                continue
+            self._level[node] = self._level[pred] + 1
+            stack.extend((node, nxt) for nxt in self._succs[node])
+
+    def _assign_levels(self):
+        """Longest-path levels for a full build (Kahn's algorithm).
+
+        Saved state can hold a cycle (e.g. edited by hand); one link of each
+        cycle is logged and dropped so the rest of the network still builds.
+        """
+        indegree = {name: len(preds) for name, preds in self._preds.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        done: Set[str] = set()
+        while True:
+            while ready:
+                node = ready.pop()
+                done.add(node)
+                for successor in self._succs[node]:
+                    self._level[successor] = max(self._level[successor], self._level[node] + 1)
+                    indegree[successor] -= 1
+                    if indegree[successor] == 0:
+                        ready.append(successor)
+            if len(done) == len(indegree):
+                return
+            successor, predecessor = self._cycle_link(next(name for name in indegree if name not in done), done)
+            logging.error(f"Task dependencies contain a cycle; dropping '{predecessor}' -> '{successor}'")
+            del self._preds[successor][predecessor]
+            self._succs[predecessor].discard(successor)
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                ready.append(successor)
+
+    def _cycle_link(self, start: str, done: Set[str]) -> Tuple[str, str]:
+        """A (successor, predecessor) link on a cycle upstream of start.
+
+        Every node Kahn's algorithm could not reach still has an unreached
+        predecessor, so walking those backwards must come round to a node
+        already on the walk.
+        """
+        seen = set()
+        node = start
+        while True:
+            seen.add(node)
+            pred = next(name for name in self._preds[node] if name not in done)
+            if pred in seen:
+                return node, pred
+            node = pred
+
+    # Propagation
+    def _required_start(self, task_name: str) -> Optional[int]:
+        required = None
+        for pred, (dep_type, lag) in self._preds[task_name].items():
+            anchor = self._early_finish[pred] if dep_type == 'FS' else self._early.get(pred)
+            if anchor is not None and (required is None or anchor + lag > required):
+                required = anchor + lag
+        return required
+
+    def _propagate_forward(self, seeds):
+        heap = [(self._level[name], name) for name in seeds if name in self._level]
+        heapq.heapify(heap)
+        queued = {name for _, name in heap}
+        touched = 0
+        while heap:
+            _, node = heapq.heappop(heap)
+            queued.discard(node)
+            touched += 1
+
+            planned = self._planned[node]
+            required = self._required_start(node)
+            if planned is not None and required is not None and required > planned:
+                self._late[node] = required - planned
+            else:
+                self._late.pop(node, None)
+            candidates = [value for value in (planned, required) if value is not None]
+            early = max(candidates) if candidates else None
+            finish = early + self._duration(node) if early is not None else None
+
+            changed = early != self._early[node] or finish != self._early_finish[node]
+            if finish is not None and finish != self._early_finish[node]:
+                self._push_finish(node, finish)
+            self._early[node] = early
+            self._early_finish[node] = finish
+            if changed:
+                for successor in self._succs[node]:
+                    if successor not in queued:
+                        queued.add(successor)
+                        heapq.heappush(heap, (self._level[successor], successor))
+        self.last_touched = touched
+
+    def _push_finish(self, task_name: str, finish: int):
+        """Record a new early finish; the heap is rebuilt once stale entries outnumber live ones about 2:1"""
+        heapq.heappush(self._finish_heap, (-finish, task_name))
+        if len(self._finish_heap) > 3 * max(len(self._planned), 16):
+            self._finish_heap = [(-value, name) for name, value in self._early_finish.items() if value is not None]
+            # The entry being pushed may not be stored in _early_finish yet
+            self._finish_heap.append((-finish, task_name))
+            heapq.heapify(self._finish_heap)
+
+    def _propagate_backward(self, seeds):
+        heap = [(-self._level[name], name) for name in seeds if name in self._level]
+        heapq.heapify(heap)
+        queued = {name for _, name in heap}
+        while heap:
+            _, node = heapq.heappop(heap)
+            queued.discard(node)
+
+            duration = self._duration(node)
+            tail = duration
+            for successor in self._succs[node]:
+                dep_type, lag = self._preds[successor][node]
+                offset = duration + lag if dep_type == 'FS' else lag
+                tail = max(tail, offset + self._tail[successor])
+
+            if tail != self._tail[node]:
+                self._tail[node] = tail
+                for pred in self._preds[node]:
+                    if pred not in queued:
+                        queued.add(pred)
+                        heapq.heappush(heap, (-self._level[pred], pred))
+            self.last_touched += 1
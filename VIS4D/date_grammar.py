@@ -0,0 +1,268 @@
+import re
+import threading
+from calendar import monthrange
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
+    'friday': 4, 'saturday': 5, 'sunday': 6
+}
+
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12
+}
+
+_MONTH = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|'
+          r'aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+_ORD = r'(?:st|nd|rd|th)?'
+_COUNT = r'\d+|' + '|'.join(NUMBER_WORDS)
+_UNIT = r'days?|weeks?|months?'
+
+# Every supported form as one alternation, so a single finditer pass finds them all
+DATE_GRAMMAR = re.compile(
+    r'\b(?:'
+    rf'(?P<iso_y>\d{{4}})-(?P<iso_m>\d{{1,2}})-(?P<iso_d>\d{{1,2}})'
+    rf'|(?P<num_m>\d{{1,2}})[/-](?P<num_d>\d{{1,2}})(?:[/-](?P<num_y>\d{{4}}|\d{{2}}))?(?![\d/-])'
+    rf'|(?P<md_mon>{_MONTH})\.?\s+(?P<md_day>\d{{1,2}}){_ORD}\b(?:,?\s*(?P<md_year>\d{{4}}))?'
+    rf'|(?P<dm_day>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<dm_mon>{_MONTH})\b\.?(?:,?\s*(?P<dm_year>\d{{4}}))?'
+    rf'|in\s+(?P<in_n>{_COUNT})\s+(?P<in_unit>{_UNIT})'
+    rf'|(?P<ago_n>{_COUNT})\s+(?P<ago_unit>{_UNIT})\s+(?:from\s+(?:now|today)|later)'
+    r'|(?:(?P<wd_mod>next|this|coming|on)\s+)?(?P<weekday>monday|tuesday|wednesday|thursday|friday|saturday|sunday)'
+    r'|(?P<word>day\s+after\s+tomorrow|today|tonight|tomorrow|yesterday'
+    r'|next\s+week|next\s+month|end\s+of\s+(?:the\s+)?(?:week|month))'
+    r')\b',
+    re.IGNORECASE
+)
+
+# Cues in the text between the previous date (or sentence start) and a match
+_ROLE_CUE = re.compile(
+    r'\b(?:(?P<start>start|starts|starting|begin|begins|beginning|commence|commencing|from)'
+    r'|(?P<finish>finish|finishes|finishing|end|ends|ending|until|till|through|due|deadline|by))\b'
+)
+_RANGE_JOIN = re.compile(r'^\s*(to|until|till|through|thru|and|-)\s*$')
+# Words that may directly precede a year-less numeric date ("on 3/4") or "may 5";
+# anywhere else "pour 1-2", "#3-4" or "it may 5 rain" are not dates
+_DATE_CUE_WORDS = {
+    'on', 'by', 'for', 'from', 'to', 'until', 'till', 'through', 'thru', 'and', '-', 'before', 'after',
+    'start', 'starts', 'starting', 'begin', 'begins', 'beginning', 'finish', 'finishes', 'end', 'ends',
+    'due', 'date', 'deadline'
+}
+_FINISH_DATE = re.compile(r'\b(finish|end)\s+date\b')
+
+class DateMatch:
+    """A date found in text along with its inferred start/finish role"""
+    __slots__ = ('value', 'role', 'kind', 'span', 'text')
+
+    def __init__(self, value: datetime, role: str, kind: str, span: Tuple[int, int], text: str):
+        self.value = value
+        self.role = role
+        self.kind = kind
+        self.span = span
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"DateMatch({self.text!r}, {self.value:%Y-%m-%d}, {self.role})"
+
+class RelativeDateResolver:
+    """Resolves relative expressions through a memo table that resets each day"""
+    def __init__(self):
+        self._day: Optional[date] = None
+        self._memo: Dict[Tuple, datetime] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, key: Tuple, today: date) -> datetime:
+        with self._lock:
+            if today != self._day:
+                self._day = today
+                self._memo.clear()
+            value = self._memo.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = self._compute(key, today)
+            self._memo[key] = value
+            return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._memo)
+        }
+
+    @staticmethod
+    def _compute(key: Tuple, today: date) -> datetime:
+        kind = key[0]
+        base = datetime(today.year, today.month, today.day)
+        if kind == 'offset':
+            _, n, unit = key
+            if unit == 'day':
+                return base + timedelta(days=n)
+            if unit == 'week':
+                return base + timedelta(weeks=n)
+            return _add_months(base, n)
+        if kind == 'weekday':
+            _, weekday, modifier = key
+            ahead = (weekday - today.weekday()) % 7
+            if modifier == 'next' and ahead == 0:
+                ahead = 7
+            return base + timedelta(days=ahead)
+        if kind == 'end_of':
+            if key[1] == 'week':
+                return base + timedelta(days=(4 - today.weekday()) % 7)  # Friday
+            return base.replace(day=monthrange(today.year, today.month)[1])
+        raise ValueError(f"Unknown relative date key: {key}")
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+def _count(token: str) -> int:
+    token = token.lower()
+    return NUMBER_WORDS[token] if token in NUMBER_WORDS else int(token)
+
+def _unit(token: str) -> str:
+    return token.lower().rstrip('s')
+
+class DateGrammar:
+    """Single-pass extraction of absolute, numeric, weekday and relative dates"""
+    def __init__(self, resolver: RelativeDateResolver = None):
+        self.resolver = resolver or RelativeDateResolver()
+
+    def find_all(self, text: str, today: date = None) -> List[DateMatch]:
+        """Return every date in text, in order, with start/finish roles assigned"""
+        today = today or date.today()
+        text_lower = text.lower()
+        finish_phrase = bool(_FINISH_DATE.search(text_lower))
+
+        matches: List[DateMatch] = []
+        previous_end = 0
+        for m in DATE_GRAMMAR.finditer(text_lower):
+            if not self._cued(m, text_lower):
+                continue
+            value, kind = self._evaluate(m, today)
+            if value is None:
+                continue
+
+            # The cue nearest to the date wins; "from X to Y" makes Y the finish
+            gap = text_lower[previous_end:m.start()]
+            cues = list(_ROLE_CUE.finditer(gap))
+            cue = cues[-1] if cues else None
+            # A year-less numeric date only opens a range closed by another one
+            if (matches and matches[-1].role == 'start' and _RANGE_JOIN.match(gap)
+                    and (matches[-1].kind != 'numeric' or kind == 'numeric')):
+                role = 'finish'
+            elif cue is not None:
+                role = 'start' if cue.group('start') else 'finish'
+            else:
+                role = 'finish' if finish_phrase else 'start'
+
+            matches.append(DateMatch(value, role, kind, m.span(), m.group(0)))
+            previous_end = m.end()
+        return matches
+
+    def extract(self, text: str, today: date = None) -> Dict[str, Any]:
+        """Extract start/finish dates in the shape used by NLPProcessor entities"""
+        date_info = {
+            'start_date': None,
+            'end_date': None,
+            'duration': None,
+            'date_type': 'start'
+        }
+        for match in self.find_all(text, today):
+            if match.role == 'finish' and date_info['end_date'] is None:
+                date_info['end_date'] = match.value
+            elif match.role == 'start' and date_info['start_date'] is None:
+                date_info['start_date'] = match.value
+
+        if date_info['end_date'] and not date_info['start_date']:
+            date_info['date_type'] = 'finish'
+        if date_info['start_date'] and date_info['end_date']:
+            date_info['duration'] = (date_info['end_date'] - date_info['start_date']).days
+        return date_info
+
+    def parse(self, text: str, today: date = None) -> Optional[datetime]:
+        """Return the first date found in text, or None"""
+        matches = self.find_all(text, today)
+        return matches[0].value if matches else None
+
+    @staticmethod
+    def _cued(m: re.Match, text_lower: str) -> bool:
+        """Whether an ambiguous match (year-less M/D or "may N") is placed like a date"""
+        g = m.groupdict()
+        ambiguous = (g['num_m'] and not g['num_y']) or (g['md_mon'] == 'may' and not g['md_year'])
+        if not ambiguous:
+            return True
+        before = text_lower[:m.start()].rstrip(' ,')
+        if not before:
+            return True
+        return before.rsplit(None, 1)[-1] in _DATE_CUE_WORDS
+
+    def _evaluate(self, m: re.Match, today: date) -> Tuple[Optional[datetime], str]:
+        g = m.groupdict()
+        try:
+            if g['iso_y']:
+                return datetime(int(g['iso_y']), int(g['iso_m']), int(g['iso_d'])), 'absolute'
+            if g['num_m']:
+                year = g['num_y']
+                if not year:
+                    return datetime(today.year, int(g['num_m']), int(g['num_d'])), 'numeric'
+                year = int(year) + (2000 if len(year) == 2 else 0)
+                return datetime(year, int(g['num_m']), int(g['num_d'])), 'absolute'
+            if g['md_mon']:
+                year = int(g['md_year']) if g['md_year'] else today.year
+                return datetime(year, MONTHS[g['md_mon'][:3]], int(g['md_day'])), 'absolute'
+            if g['dm_mon']:
+                year = int(g['dm_year']) if g['dm_year'] else today.year
+                return datetime(year, MONTHS[g['dm_mon'][:3]], int(g['dm_day'])), 'absolute'
+            if g['in_n']:
+                key = ('offset', _count(g['in_n']), _unit(g['in_unit']))
+                return self.resolver.resolve(key, today), 'relative'
+            if g['ago_n']:
+                key = ('offset', _count(g['ago_n']), _unit(g['ago_unit']))
+                return self.resolver.resolve(key, today), 'relative'
+            if g['weekday']:
+                modifier = 'next' if (g['wd_mod'] or '').lower() == 'next' else 'upcoming'
+                key = ('weekday', WEEKDAYS[g['weekday']], modifier)
+                return self.resolver.resolve(key, today), 'weekday'
+            if g['word']:
+                return self.resolver.resolve(self._word_key(g['word']), today), 'relative'
+        except (ValueError, KeyError):
+            # Out-of-range day or month, e.g. "february 30"
+            pass
+        return None, ''
+
+    @staticmethod
+    def _word_key(word: str) -> Tuple:
+        word = ' '.join(word.split())
+        if word in ('today', 'tonight'):
+            return ('offset', 0, 'day')
+        if word == 'tomorrow':
+            return ('offset', 1, 'day')
+        if word == 'day after tomorrow':
+            return ('offset', 2, 'day')
+        if word == 'yesterday':
+            return ('offset', -1, 'day')
+        if word == 'next week':
+            return ('offset', 1, 'week')
+        if word == 'next month':
+            return ('offset', 1, 'month')
+        return ('end_of', word.rsplit(' ', 1)[-1])
+
+# Shared instance so the relative-date memo is reused across callers
+default_grammar = DateGrammar()
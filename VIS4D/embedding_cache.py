@@ -0,0 +1,183 @@
+import json
+import atexit
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Union
+import numpy as np
+from constants import CACHE_SETTINGS
+
+def normalize_text(text: str) -> str:
+    """Normalize text into a cache key (case and whitespace insensitive)"""
+    return ' '.join(text.lower().split())
+
+class EmbeddingCache:
+    """Bounded LRU cache in front of SentenceTransformer.encode.
+
+    Vectors live in a fixed-size float32 slot array whose capacity is the
+    smaller of the entry limit and the byte budget. When a persist path is
+    given the slot array is a numpy memmap and the key -> slot index is
+    saved alongside it, so the cache survives restarts. The saved index
+    records the model name and vector size; a cache written by another
+    model is discarded on load.
+    """
+    def __init__(self, model, max_entries: int = CACHE_SETTINGS['EMBEDDING_MAX_ENTRIES'],
+                 max_bytes: int = CACHE_SETTINGS['EMBEDDING_MAX_BYTES'],
+                 persist_path: Optional[str] = None, model_name: Optional[str] = None):
+        self.model = model
+        self.model_name = model_name
+        dimension = getattr(model, 'get_sentence_embedding_dimension', None)
+        self.dim: Optional[int] = dimension() if callable(dimension) else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        self._slots: Optional[np.ndarray] = None
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = []
+        self._lock = threading.RLock()
+        self._dirty = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.persist_path:
+            self._load()
+            atexit.register(self.flush)
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._slots is None else self._slots.shape[0]
+
+    def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Encode one text or a list of texts, only running the model on misses"""
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        if not items:
+            dim = 0 if self._slots is None else self._slots.shape[1]
+            return np.zeros((0, dim), dtype=np.float32)
+        keys = [normalize_text(t) for t in items]
+
+        with self._lock:
+            vectors: Dict[str, np.ndarray] = {}
+            missing = []
+            for key in keys:
+                if key in vectors:
+                    continue
+                slot = self._index.get(key)
+                if slot is not None:
+                    self._index.move_to_end(key)
+                    vectors[key] = self._slots[slot].copy()
+                    self.hits += 1
+                elif key not in missing:
+                    missing.append(key)
+                    self.misses += 1
+
+        if missing:
+            # Batch every miss into a single forward pass, outside the lock
+            encoded = np.asarray(self.model.encode(missing), dtype=np.float32)
+            with self._lock:
+                for key, vector in zip(missing, encoded):
+                    vectors[key] = vector
+                    self._store(key, vector)
+
+        result = np.stack([vectors[key] for key in keys])
+        return result[0] if single else result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._index),
+                'capacity': self.capacity,
+                'bytes': 0 if self._slots is None else int(self._slots.nbytes)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._index.clear()
+            self._free = list(range(self.capacity))
+            self._dirty += 1
+
+    def flush(self):
+        """Write the memmap and its key index to disk"""
+        if not self.persist_path or self._slots is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._slots.flush()
+                index = {
+                    'model': self.model_name,
+                    'dim': int(self._slots.shape[1]),
+                    'capacity': self.capacity,
+                    'keys': list(self._index.items())
+                }
+                with open(self._index_path(), 'w') as f:
+                    json.dump(index, f)
+                self._dirty = 0
+            except Exception as e:
+                logging.error(f"Error flushing embedding cache: {e}")
+
+    def _store(self, key: str, vector: np.ndarray):
+        if self._slots is None:
+            self._allocate(vector.shape[0])
+        # Another thread may have stored the same miss while this one was encoding
+        slot = self._index.get(key)
+        if slot is not None:
+            self._index.move_to_end(key)
+        elif not self._free:
+            _, slot = self._index.popitem(last=False)
+            self.evictions += 1
+        else:
+            slot = self._free.pop()
+        self._slots[slot] = vector
+        self._index[key] = slot
+
+        self._dirty += 1
+        if self.persist_path and self._dirty >= CACHE_SETTINGS['EMBEDDING_FLUSH_EVERY']:
+            self.flush()
+
+    def _allocate(self, dim: int):
+        capacity = max(1, min(self.max_entries, self.max_bytes // (dim * 4)))
+        if self.persist_path:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            self._slots = np.memmap(self._data_path(), dtype=np.float32, mode='w+', shape=(capacity, dim))
+        else:
+            self._slots = np.zeros((capacity, dim), dtype=np.float32)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def _data_path(self) -> Path:
+        return self.persist_path.with_suffix('.dat')
+
+    def _index_path(self) -> Path:
+        return self.persist_path.with_suffix('.json')
+
+    def _load(self):
+        try:
+            if not (self._index_path().exists() and self._data_path().exists()):
+                return
+            with open(self._index_path(), 'r') as f:
+                index = json.load(f)
+            dim, capacity = index['dim'], index['capacity']
+            if index.get('model') != self.model_name or (self.dim is not None and dim != self.dim):
+                logging.info(f"Discarding embedding cache written by model {index.get('model')} ({dim} dims)")
+                return
+            self._slots = np.memmap(self._data_path(), dtype=np.float32, mode='r+', shape=(capacity, dim))
+            self._index = OrderedDict((key, int(slot)) for key, slot in index['keys'])
+            used = set(self._index.values())
+            self._free = [slot for slot in range(capacity - 1, -1, -1) if slot not in used]
+            logging.info(f"Loaded {len(self._index)} cached embeddings")
+        except Exception as e:
+            logging.error(f"Error loading embedding cache, starting empty: {e}")
+            self._slots = None
+            self._index = OrderedDict()
+            self._free = []
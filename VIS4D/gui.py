@@ -3,11 +3,27 @@ import speech_recognition as sr
 import logging
 import traceback
 import threading
+import time
+import os
 from datetime import datetime
-from typing import Optional, Dict, Any
+import tkinter as tk
+from tkinter import filedialog
+from typing import Optional, Dict, Any, List, Tuple
 from nlp_processor import NLPProcessor
 from task_manager import TaskManager
-from constants import ThemeColors, UIConfig, StatusEmojis, THEME_PRESETS
+from schedule_import import ScheduleImporter
+from audio_capture import AudioCapture
+from speech_backends import SpeechEngine
+from speculation import SpeculativeParser
+from voice_activity import ContinuousListener, WakePhraseGate
+from batch_transcribe import BatchTranscriber, timing_summary
+from chat_log import ChatLog, prune_history
+from ui_queue import UIUpdateQueue
+from command_executor import CommandExecutor, CommandJob, CommandCancelled
+from task_dashboard import TaskTable, TaskRow
+from auth_session import Authenticator, AuthAttempt, CredentialStore
+from constants import (ThemeColors, UIConfig, StatusEmojis, THEME_PRESETS, RECORDING_SETTINGS, VAD_SETTINGS, CHAT_SETTINGS,
+                       DASHBOARD_SETTINGS, AUTH_SETTINGS)
 
 class AnimatedButton(ctk.CTkButton):
     """Custom animated button with hover effects"""
@@ -81,7 +97,347 @@ class MessageBubble(ctk.CTkFrame):
         self.timestamp.pack(padx=UIConfig.PADDING["small"], 
                           pady=(0, UIConfig.PADDING["small"]), 
                           anchor="e")
-                          
+
+    def show(self, message: str, is_user: bool, timestamp: float):
+        """Reuse this bubble for another message"""
+        text_color = ThemeColors.USER_MSG_TEXT if is_user else ThemeColors.BOT_MSG_TEXT
+        self.configure(fg_color=ThemeColors.USER_MSG_BG if is_user else ThemeColors.BOT_MSG_BG)
+        self.message.configure(text=message, text_color=text_color)
+        self.timestamp.configure(text=datetime.fromtimestamp(timestamp).strftime("%H:%M"), text_color=text_color)
+
+class ChatView(ctk.CTkFrame):
+    """Virtualized chat transcript.
+
+    A fixed pool of MessageBubble widgets shows a window of consecutive
+    messages from a ChatLog; scrolling moves the window and re-fills the same
+    bubbles, so the widget count stays constant however long the session
+    runs. The window follows the newest message unless scrolled back.
+    """
+    def __init__(self, master: Any, log: ChatLog, pool_size: int = CHAT_SETTINGS['VISIBLE_MESSAGES'], **kwargs):
+        super().__init__(master, **kwargs)
+        self.log = log
+        self.pool_size = pool_size
+        self.bottom: Optional[int] = None       # last message shown; None follows the newest
+        self.bubbles: List[MessageBubble] = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        for widget in (self, self.body):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda event: self.scroll(-CHAT_SETTINGS['SCROLL_STEP']))
+            widget.bind("<Button-5>", lambda event: self.scroll(CHAT_SETTINGS['SCROLL_STEP']))
+
+    def append(self, message: str, is_user: bool = False) -> int:
+        self.extend([(message, is_user)])
+        return len(self.log) - 1
+
+    def extend(self, messages: List[Tuple[str, bool]]):
+        """Add several messages with a single redraw"""
+        for message, is_user in messages:
+            self.log.append(message, is_user)
+        if self.bottom is None:
+            self.render()
+        else:
+            self._update_scrollbar(*self._window())
+
+    def scroll(self, messages: int):
+        total = len(self.log)
+        if not total:
+            return
+        last = (total - 1 if self.bottom is None else self.bottom) + messages
+        last = max(min(self.pool_size, total) - 1, last)
+        self.bottom = None if last >= total - 1 else last
+        self.render()
+
+    def show_message(self, index: int):
+        """Scroll so that message index is in view"""
+        total = len(self.log)
+        last = min(total - 1, index + self.pool_size // 2)
+        self.bottom = None if last >= total - 1 else last
+        self.render()
+
+    def render(self):
+        first, last = self._window()
+        messages = self.log.messages(first, last + 1)
+        while len(self.bubbles) < len(messages):
+            bubble = MessageBubble(self.body, "", is_user=False)
+            for widget in (bubble, bubble.message_container, bubble.message, bubble.timestamp):
+                widget.bind("<MouseWheel>", self._on_mousewheel)
+                widget.bind("<Button-4>", lambda event: self.scroll(-CHAT_SETTINGS['SCROLL_STEP']))
+                widget.bind("<Button-5>", lambda event: self.scroll(CHAT_SETTINGS['SCROLL_STEP']))
+            self.bubbles.append(bubble)
+
+        for bubble in self.bubbles:
+            bubble.pack_forget()
+        # Pack newest first from the bottom, so overflow cuts off the oldest bubbles
+        for bubble, message in reversed(list(zip(self.bubbles, messages))):
+            if message is None:
+                continue
+            timestamp, is_user, text = message
+            bubble.show(text, is_user, timestamp)
+            bubble.pack(
+                side="bottom",
+                fill="x",
+                padx=UIConfig.PADDING["medium"],
+                pady=UIConfig.PADDING["small"],
+                anchor="e" if is_user else "w"
+            )
+        self._update_scrollbar(first, last)
+
+    def _window(self):
+        total = len(self.log)
+        last = total - 1 if self.bottom is None else min(self.bottom, total - 1)
+        return max(0, last - self.pool_size + 1), last
+
+    def _update_scrollbar(self, first: int, last: int):
+        total = len(self.log)
+        if total:
+            self.scrollbar.set(first / total, (last + 1) / total)
+
+    def _on_scrollbar(self, action: str, amount, unit: str = None):
+        if action == 'moveto':
+            first = int(float(amount) * len(self.log))
+            self.show_message(first + self.pool_size // 2)
+        else:
+            step = int(amount) * (self.pool_size if unit == 'pages' else CHAT_SETTINGS['SCROLL_STEP'])
+            self.scroll(step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-CHAT_SETTINGS['SCROLL_STEP'] if event.delta > 0 else CHAT_SETTINGS['SCROLL_STEP'])
+
+class TaskDashboard(ctk.CTkFrame):
+    """Task table with a Gantt column, drawn on one canvas from a TaskTable.
+
+    Only the rows in view exist as canvas items, in a fixed pool of slots
+    that is re-filled as the view scrolls. refresh() re-reads the visible
+    window and reconfigures just the slots whose row changed, so a command
+    that touches one task redraws one row.
+    """
+    COLUMNS = (('name', "Task"), ('status', "Status"), ('start', "Start"), ('finish', "Finish"))
+    STATUSES = ("All statuses", "complete", "in progress", "on hold")
+
+    def __init__(self, master: Any, table: TaskTable, theme: Dict[str, str], **kwargs):
+        super().__init__(master, **kwargs)
+        self.table = table
+        self.theme = theme
+        self.row_height = DASHBOARD_SETTINGS['ROW_HEIGHT']
+        self.widths = DASHBOARD_SETTINGS['COLUMN_WIDTHS']
+        self.top = 0                            # view index of the first visible row
+        self.slots: List[Dict[str, int]] = []
+        self._drawn: List[Any] = []             # what each slot currently shows
+        self._recent: set = set()               # tasks changed by the latest update, highlighted
+        self._gantt_width = DASHBOARD_SETTINGS['GANTT_MIN_WIDTH']
+        self._filter_job = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", padx=UIConfig.PADDING["small"],
+                     pady=UIConfig.PADDING["small"])
+        self.filter_text = tk.StringVar()
+        self.filter_text.trace_add("write", lambda *args: self._schedule_filter())
+        ctk.CTkEntry(toolbar, textvariable=self.filter_text, placeholder_text="Filter tasks...",
+                     font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["small"])).pack(
+            side="left", fill="x", expand=True, padx=(0, UIConfig.PADDING["small"]))
+        self.status_menu = ctk.CTkOptionMenu(toolbar, values=list(self.STATUSES), command=self._on_status, width=130)
+        self.status_menu.pack(side="left", padx=UIConfig.PADDING["small"])
+        self.count_label = ctk.CTkLabel(toolbar, text="", font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["small"]))
+        self.count_label.pack(side="left", padx=UIConfig.PADDING["small"])
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.sort_buttons: Dict[str, ctk.CTkButton] = {}
+        for column, title in self.COLUMNS:
+            button = ctk.CTkButton(header, text=title, width=self.widths[column], height=26, anchor="w",
+                                   fg_color="transparent", text_color=theme["fg_color"],
+                                   hover_color=ThemeColors.PRIMARY_HOVER,
+                                   command=lambda column=column: self.sort(column))
+            button.pack(side="left")
+            self.sort_buttons[column] = button
+        ctk.CTkLabel(header, text="Timeline", anchor="w").pack(side="left", fill="x", expand=True)
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=theme["bg_color"])
+        self.canvas.grid(row=2, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=2, column=1, sticky="ns")
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll(-DASHBOARD_SETTINGS['SCROLL_ROWS']))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll(DASHBOARD_SETTINGS['SCROLL_ROWS']))
+        self._update_headers()
+
+    @property
+    def visible_rows(self) -> int:
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def refresh(self):
+        """Redraw rows that changed since the last refresh (Tk thread)"""
+        self._recent = self.table.take_changed()
+        self.render()
+
+    def render(self):
+        size = len(self.table)
+        self.top = max(0, min(self.top, size - self.visible_rows))
+        rows = self.table.rows(self.top, len(self.slots))
+        timeline = self.table.timeline()
+        for index, slot in enumerate(self.slots):
+            row = rows[index] if index < len(rows) else None
+            drawn = (row, timeline, self._gantt_width, row is not None and row[0] in self._recent)
+            if self._drawn[index] != drawn:
+                self._draw_row(slot, row, timeline, drawn[3])
+                self._drawn[index] = drawn
+
+        self.count_label.configure(text=f"{size:,} of {self.table.total:,} tasks")
+        if size:
+            self.scrollbar.set(self.top / size, min(1.0, (self.top + self.visible_rows) / size))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int):
+        self.top += rows
+        self.render()
+
+    def show_task(self, task_name: str) -> bool:
+        """Scroll task_name into the middle of the view"""
+        position = self.table.position(task_name)
+        if position is None:
+            return False
+        self.top = max(0, position - self.visible_rows // 2)
+        self.render()
+        return True
+
+    def sort(self, column: str):
+        descending = not self.table.descending if column == self.table.sort_column else False
+        self.table.set_view(sort_column=column, descending=descending)
+        self.top = 0
+        self._update_headers()
+        self.render()
+
+    def set_theme(self, theme: Dict[str, str]):
+        self.theme = theme
+        self.canvas.configure(bg=theme["bg_color"])
+        for button in self.sort_buttons.values():
+            button.configure(text_color=theme["fg_color"])
+        self._drawn = [None] * len(self.slots)
+        self.render()
+
+    def _draw_row(self, slot: Dict[str, int], row: Optional[TaskRow], timeline, highlighted: bool):
+        canvas = self.canvas
+        if row is None:
+            for item in slot.values():
+                canvas.itemconfigure(item, state="hidden")
+            return
+        name, status, start, finish = row
+        for item in slot.values():
+            canvas.itemconfigure(item, state="normal")
+        canvas.itemconfigure(slot['background'], fill=self.theme["secondary_bg"] if highlighted else self.theme["bg_color"])
+        canvas.itemconfigure(slot['name'], text=name, fill=self.theme["fg_color"])
+        canvas.itemconfigure(slot['status'], text=status or "", fill=self.theme["fg_color"])
+        canvas.itemconfigure(slot['start'], text=self._short_date(start), fill=self.theme["fg_color"])
+        canvas.itemconfigure(slot['finish'], text=self._short_date(finish), fill=self.theme["fg_color"])
+
+        first_day = self._ordinal(start)
+        if timeline is None or first_day is None:
+            canvas.itemconfigure(slot['bar'], state="hidden")
+            return
+        last_day = max(first_day, self._ordinal(finish) or first_day) + 1
+        origin, end = timeline
+        scale = self._gantt_width / max(1, end + 1 - origin)
+        left = self._gantt_left + (first_day - origin) * scale
+        y = canvas.coords(slot['background'])[1]
+        canvas.coords(slot['bar'], left, y + 6, max(left + 2, self._gantt_left + (last_day - origin) * scale),
+                      y + self.row_height - 6)
+        color = DASHBOARD_SETTINGS['STATUS_COLORS'].get((status or "").lower(), ThemeColors.ACCENT)
+        canvas.itemconfigure(slot['bar'], fill=color, outline=color)
+
+    @property
+    def _gantt_left(self) -> int:
+        return sum(self.widths.values())
+
+    @staticmethod
+    def _ordinal(value: Optional[str]) -> Optional[int]:
+        try:
+            return datetime.strptime(value, "%B %d, %Y").toordinal() if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _short_date(value: Optional[str]) -> str:
+        try:
+            return datetime.strptime(value, "%B %d, %Y").strftime("%b %d, %Y") if value else ""
+        except ValueError:
+            return value
+
+    def _add_slot(self):
+        canvas = self.canvas
+        y = len(self.slots) * self.row_height
+        font = (UIConfig.FONTS["main"], UIConfig.FONT_SIZES["tiny"])
+        slot = {'background': canvas.create_rectangle(0, y, 10000, y + self.row_height, width=0)}
+        x = UIConfig.PADDING["small"]
+        for column, _ in self.COLUMNS:
+            slot[column] = canvas.create_text(x, y + self.row_height / 2, anchor="w", font=font)
+            x += self.widths[column]
+        slot['bar'] = canvas.create_rectangle(0, 0, 0, 0)
+        for item in slot.values():
+            canvas.tag_bind(item, "<Double-Button-1>", lambda event, index=len(self.slots): self._on_double_click(index))
+        self.slots.append(slot)
+        self._drawn.append(None)
+
+    def _on_resize(self, event):
+        while len(self.slots) < self.visible_rows + 1:
+            self._add_slot()
+        self._gantt_width = max(DASHBOARD_SETTINGS['GANTT_MIN_WIDTH'],
+                                event.width - self._gantt_left - UIConfig.PADDING["small"])
+        self.render()
+
+    def _on_double_click(self, index: int):
+        drawn = self._drawn[index]
+        if drawn and drawn[0]:
+            # Put the task name in the command box, ready for a command about it
+            entry = self.master.input_entry
+            entry.delete(0, 'end')
+            entry.insert(0, drawn[0][0] + " ")
+            entry.focus_set()
+
+    def _on_scrollbar(self, action: str, amount, unit: str = None):
+        if action == 'moveto':
+            self.top = int(float(amount) * len(self.table))
+            self.render()
+        else:
+            self.scroll(int(amount) * (self.visible_rows if unit == 'pages' else 1))
+
+    def _on_mousewheel(self, event):
+        self.scroll(-DASHBOARD_SETTINGS['SCROLL_ROWS'] if event.delta > 0 else DASHBOARD_SETTINGS['SCROLL_ROWS'])
+
+    def _on_status(self, choice: str):
+        self.table.set_view(status=None if choice == self.STATUSES[0] else choice)
+        self.top = 0
+        self.render()
+
+    def _schedule_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(DASHBOARD_SETTINGS['FILTER_DELAY_MS'], self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        self.table.set_view(text=self.filter_text.get())
+        self.top = 0
+        self.render()
+
+    def _update_headers(self):
+        for column, title in self.COLUMNS:
+            arrow = ""
+            if column == self.table.sort_column:
+                arrow = " ▼" if self.table.descending else " ▲"
+            self.sort_buttons[column].configure(text=title + arrow)
+
 class VISA4DGui(ctk.CTkFrame):
     def __init__(self, master: ctk.CTk):
         super().__init__(master)
@@ -89,12 +445,18 @@ class VISA4DGui(ctk.CTkFrame):
         self.master.title("VISA4D: Voice-Integrated Scheduling Assistant")
         self.master.geometry("1000x700")
         
-        # Initialize speech recognition
+        # Initialize speech recognition on one long-lived, self-calibrating microphone stream
         try:
             self.recognizer = sr.Recognizer()
-            # Test microphone availability
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            self.microphone = sr.Microphone()
+            self.capture = AudioCapture(self.microphone.__enter__())
+            self.capture.start()
+            self.speech = SpeechEngine.from_settings(self.recognizer)
+            # Load offline models once, in the background, before the first utterance needs them
+            threading.Thread(target=self.speech.load, daemon=True).start()
+            # Hands-free mode: only detected speech segments reach the recognizer
+            self.hands_free = ContinuousListener(self.capture, self._on_speech_segment)
+            self.wake_gate = WakePhraseGate()
             self.speech_recognition_available = True
         except Exception as e:
             logging.error(f"Speech recognition initialization error: {str(e)}")
@@ -107,6 +469,20 @@ class VISA4DGui(ctk.CTkFrame):
         # Initialize components
         self.nlp_processor = NLPProcessor()
         self.task_manager = TaskManager()  # Initialize without credentials initially
+        # Commands are parsed and applied off the Tk thread so the window never freezes
+        self.commands = CommandExecutor()
+        # Dashboard rows follow task changes as they happen; the panel itself is built on first open
+        self.task_table = TaskTable()
+        self.task_table.build(self.task_manager.task_statuses, self.task_manager.task_dates,
+                              self.task_manager.task_end_dates)
+        self.task_manager.add_listener(self.task_table.on_change)
+        self.task_manager.add_listener(self._on_task_change)
+        self.dashboard: Optional[TaskDashboard] = None
+        self._dashboard_refresh_pending = False
+        # Sign-in runs in the background with a timeout; commands issued meanwhile wait for it
+        self.credentials = CredentialStore()
+        self.authenticator = Authenticator(self.task_manager.request_token)
+        self._after_auth: List = []
         
         # GUI state
         self.state: Dict[str, Any] = {
@@ -115,16 +491,28 @@ class VISA4DGui(ctk.CTkFrame):
             'confirmation_date': None,
             'command_type': None,
             'recording': False,
+            'hands_free': False,
             'theme': 'light',
             'authenticated': False
         }
 
+        # Worker threads update the window only through this queue, drained once per frame
+        self.ui = UIUpdateQueue(
+            self,
+            set_status=lambda text: self.status_bar.configure(text=text),
+            insert_messages=lambda messages: self.chat_frame.extend(messages)
+        )
+
         self._init_gui_components()
+        self.ui.start()
+        self.master.bind("<Control-f>", self.prompt_search)
+        self.master.bind("<F3>", self.next_search_hit)
+        self.master.bind("<Escape>", self.cancel_commands)
         self._apply_theme(self.state['theme'])
         self.pack(fill="both", expand=True)
         
-        # Show authentication prompt after initializing GUI
-        self.after(500, self.prompt_authentication)
+        # Sign in with credentials remembered in the OS keyring, or ask for them
+        threading.Thread(target=self._sign_in_saved, daemon=True).start()
 
     def _init_gui_components(self):
         # Configure grid layout
@@ -185,6 +573,36 @@ class VISA4DGui(ctk.CTkFrame):
         )
         self.auth_button.pack(side="right", padx=UIConfig.PADDING["small"])
         
+        # Schedule import button
+        import_button = AnimatedButton(
+            header,
+            text="Import",
+            width=80,
+            command=self.prompt_import,
+            font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["small"])
+        )
+        import_button.pack(side="right", padx=UIConfig.PADDING["small"])
+        
+        # Recorded voice memo batch button
+        memos_button = AnimatedButton(
+            header,
+            text="Memos",
+            width=80,
+            command=self.prompt_memos,
+            font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["small"])
+        )
+        memos_button.pack(side="right", padx=UIConfig.PADDING["small"])
+        
+        # Task dashboard toggle
+        tasks_button = AnimatedButton(
+            header,
+            text="Tasks",
+            width=80,
+            command=self.toggle_dashboard,
+            font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["small"])
+        )
+        tasks_button.pack(side="right", padx=UIConfig.PADDING["small"])
+        
         # Theme switcher
         theme_button = AnimatedButton(
             header,
@@ -197,9 +615,12 @@ class VISA4DGui(ctk.CTkFrame):
         
         return header
 
-    def _setup_chat_frame(self) -> ctk.CTkScrollableFrame:
-        return ctk.CTkScrollableFrame(
+    def _setup_chat_frame(self) -> ChatView:
+        prune_history()
+        self.chat_log = ChatLog()
+        return ChatView(
             self,
+            self.chat_log,
             corner_radius=UIConfig.CORNERS["large"],
             fg_color=THEME_PRESETS[self.state['theme']]['secondary_bg']
         )
@@ -231,6 +652,18 @@ class VISA4DGui(ctk.CTkFrame):
         )
         self.speak_button.pack(side="left", padx=UIConfig.PADDING["small"])
 
+        # Hands-free (continuous listening) toggle
+        self.hands_free_button = AnimatedButton(
+            input_frame,
+            text=StatusEmojis.LISTENING,
+            width=45,
+            height=45,
+            corner_radius=UIConfig.CORNERS["medium"],
+            command=self.toggle_hands_free,
+            font=(UIConfig.FONTS["main"], UIConfig.FONT_SIZES["large"])
+        )
+        self.hands_free_button.pack(side="left", padx=UIConfig.PADDING["small"])
+
         # Send button with animation
         self.send_button = AnimatedButton(
             input_frame,
@@ -262,7 +695,7 @@ class VISA4DGui(ctk.CTkFrame):
         # Create a standard Tkinter dialog instead
         auth_dialog = tk.Toplevel(self)
         auth_dialog.title("Connect to Navisworks")
-        auth_dialog.geometry("400x200")
+        auth_dialog.geometry("400x240")
         auth_dialog.resizable(False, False)
         
         # Make dialog modal using standard Tkinter
@@ -333,7 +766,39 @@ class VISA4DGui(ctk.CTkFrame):
         
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=4, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=10)
+        
+        # Remember credentials in the OS keyring for background sign-in at the next launch
+        remember_var = tk.BooleanVar(value=self.credentials.available)
+        remember_check = ttk.Checkbutton(main_frame, text="Remember on this computer", variable=remember_var)
+        remember_check.grid(row=4, column=0, columnspan=2, padx=10, sticky="w")
+        if not self.credentials.available:
+            remember_check.state(['disabled'])
+        
+        spinner_frames = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+        
+        def spin(attempt: AuthAttempt, frame: int = 0):
+            if attempt.pending and auth_dialog.winfo_exists():
+                status_var.set(f"{spinner_frames[frame % len(spinner_frames)]} Connecting...")
+                auth_dialog.after(AUTH_SETTINGS['SPINNER_MS'], spin, attempt, frame + 1)
+        
+        def on_result(attempt: AuthAttempt):
+            if not auth_dialog.winfo_exists():
+                return
+            connect_button.state(['!disabled'])
+            if attempt.outcome == 'success':
+                status_var.set("Connected successfully!")
+                # Change status label color to green
+                status_label.configure(foreground="#27AE60")
+                auth_dialog.after(1000, auth_dialog.destroy)
+            elif attempt.outcome == 'timeout':
+                status_var.set(f"No answer after {attempt.timeout:.0f}s. Is the Navisworks plugin running?")
+            elif attempt.outcome == 'cancelled':
+                status_var.set("Connection cancelled.")
+            elif attempt.outcome == 'error':
+                status_var.set(f"Could not connect: {attempt.error}")
+            else:
+                status_var.set("Authentication failed. Please check your credentials.")
         
         # Connect button
         def on_connect():
@@ -344,19 +809,19 @@ class VISA4DGui(ctk.CTkFrame):
                 status_var.set("Please enter both Client ID and Client Secret")
                 return
             
-            status_var.set("Connecting...")
-            auth_dialog.update()
-            
-            # Authenticate with Navisworks API
-            success = self.authenticate(client_id, client_secret)
-            
-            if success:
-                status_var.set("Connected successfully!")
-                # Change status label color to green
-                status_label.configure(foreground="#27AE60")
-                auth_dialog.after(1000, auth_dialog.destroy)
-            else:
-                status_var.set("Authentication failed. Please check your credentials.")
+            # Authenticate in the background; the dialog stays responsive and can cancel
+            connect_button.state(['disabled'])
+            attempt = self.authenticate(client_id, client_secret, remember=remember_var.get(), on_done=on_result)
+            spin(attempt)
+        
+        def on_cancel():
+            # The first press stops a sign-in in progress, the next closes the dialog
+            if not self.authenticator.cancel():
+                auth_dialog.destroy()
+        
+        def on_close():
+            self.authenticator.cancel()
+            auth_dialog.destroy()
         
         connect_button = ttk.Button(
             button_frame,
@@ -369,9 +834,12 @@ class VISA4DGui(ctk.CTkFrame):
         cancel_button = ttk.Button(
             button_frame,
             text="Cancel",
-            command=auth_dialog.destroy
+            command=on_cancel
         )
         cancel_button.pack(side="left", padx=5)
+        auth_dialog.protocol("WM_DELETE_WINDOW", on_close)
+        client_id_entry.bind("<Return>", lambda event: client_secret_entry.focus_set())
+        client_secret_entry.bind("<Return>", lambda event: on_connect())
         
         # Set focus to the client ID entry
         client_id_entry.focus_set()
@@ -379,46 +847,98 @@ class VISA4DGui(ctk.CTkFrame):
         # Set focus to first entry
         client_id_entry.focus_set()
 
-    def authenticate(self, client_id: str, client_secret: str) -> bool:
-        """Authenticate with the Navisworks API"""
-        try:
-            # Initialize a new TaskManager with credentials if not already created
-            if not hasattr(self, 'task_manager') or self.task_manager is None:
-                self.task_manager = TaskManager(client_id, client_secret)
-            
-            # Authenticate with the API
-            success = self.task_manager.authenticate(client_id, client_secret)
-            
-            # Update UI based on authentication result
-            if success:
-                self.state['authenticated'] = True
-                self.auth_status.configure(
-                    text="🔓 Connected",
-                    text_color="#27AE60"  # Green color for success
-                )
-                self.auth_button.configure(text="Reconnect")
-                self.display_message("✅ Connected to Navisworks successfully!", is_user=False)
-            else:
-                self.state['authenticated'] = False
-                self.auth_status.configure(
-                    text="🔒 Not Connected",
-                    text_color="#F39C12"  # Yellow/orange for warning
-                )
-                self.display_message("❌ Failed to connect to Navisworks API. Please check your credentials and try again.", is_user=False)
+    def authenticate(self, client_id: str, client_secret: str, remember: bool = True,
+                     on_done=None) -> AuthAttempt:
+        """Sign in to the Navisworks API in the background (any thread).
+
+        The sign-in thread only checks the credentials; they and the token are
+        applied on the Tk thread if the attempt is still the current one, then
+        on_done(attempt) is called there. On success the credentials are
+        saved to the OS keyring when remember is set.
+        """
+        def finished(attempt: AuthAttempt):
+            # Keyring access can block, so it stays on the sign-in thread
+            if attempt.outcome == 'success' and remember and attempt is self.authenticator.current:
+                self.credentials.save(attempt.client_id, attempt.client_secret)
+            # The attempt drops its secret once this returns
+            self.ui.call(self._on_authenticated, attempt, attempt.client_secret, on_done)
+        
+        self.ui.call(self.auth_status.configure, text="⏳ Connecting...", text_color="#F39C12")
+        return self.authenticator.start(client_id, client_secret, on_done=finished)
+    
+    def _sign_in_saved(self):
+        """Startup: sign in with remembered credentials before the first command, or ask for credentials"""
+        saved = self.credentials.load()
+        if saved is None:
+            self.ui.call(self.prompt_authentication)
+            return
+        self.set_status("Connecting to Navisworks...")
+        
+        def on_done(attempt: AuthAttempt):
+            if attempt.outcome != 'success':
+                self.prompt_authentication()
+        
+        self.authenticate(*saved, remember=False, on_done=on_done)
+    
+    def _on_authenticated(self, attempt: AuthAttempt, client_secret: str, on_done=None):
+        """Apply a finished sign-in to the task manager and the window (Tk thread)"""
+        if attempt is not self.authenticator.current:
+            return  # superseded by a newer attempt, whose credentials must win
+        
+        waiting, self._after_auth = self._after_auth, []
+        if attempt.outcome == 'success':
+            self.task_manager.apply_credentials(attempt.client_id, client_secret, attempt.result)
+            self.state['authenticated'] = True
+            self.auth_status.configure(
+                text="🔓 Connected",
+                text_color="#27AE60"  # Green color for success
+            )
+            self.auth_button.configure(text="Reconnect")
+            self.display_message("✅ Connected to Navisworks successfully!", is_user=False)
+            logging.info(f"Connected to Navisworks in {attempt.seconds:.1f}s")
             
-            return success
-        except Exception as e:
-            logging.error(f"Authentication error: {e}")
+            # Reconcile local task state with Timeliner on the command worker, between commands
+            self._submit_command("Sync with Timeliner", lambda job: self._run_sync(), source='sync')
+            # Run the commands that arrived while connecting
+            for callback in waiting:
+                callback()
+        else:
             self.state['authenticated'] = False
             self.auth_status.configure(
-                text="🔒 Error Connecting",
-                text_color="#E74C3C"  # Red color for error
+                text="🔒 Error Connecting" if attempt.outcome == 'error' else "🔒 Not Connected",
+                text_color="#E74C3C" if attempt.outcome == 'error' else "#F39C12"
             )
-            self.display_message(f"❌ Error connecting to Navisworks API: {str(e)}", is_user=False)
-            return False
+            if attempt.outcome == 'timeout':
+                self.display_message(
+                    f"❌ Navisworks did not answer within {attempt.timeout:.0f} seconds. "
+                    "Check that the Navisworks plugin is running and try again.",
+                    is_user=False
+                )
+            elif attempt.outcome == 'error':
+                self.display_message(f"❌ Error connecting to Navisworks API: {attempt.error}", is_user=False)
+            elif attempt.outcome == 'failed':
+                self.display_message("❌ Failed to connect to Navisworks API. Please check your credentials and try again.", is_user=False)
+            if waiting:
+                self.display_message(f"{StatusEmojis.WARNING} Skipped {len(waiting)} command(s) that were waiting for the connection.",
+                                     is_user=False)
+        self._show_command_status()
+        if on_done:
+            on_done(attempt)
 
-    def check_authenticated(self) -> bool:
-        """Check if authenticated and prompt if not"""
+    def check_authenticated(self, then=None) -> bool:
+        """Check if authenticated and prompt if not.
+        
+        While a sign-in is still in progress, then (if given) is queued to
+        run as soon as it succeeds instead.
+        """
+        if not self.state.get('authenticated', False) and self.authenticator.pending:
+            if then is not None:
+                self._after_auth.append(then)
+                self.display_message("⏳ Still connecting to Navisworks. I'll run that as soon as the connection is up.",
+                                     is_user=False)
+            else:
+                self.display_message("⏳ Still connecting to Navisworks. Please try again in a moment.", is_user=False)
+            return False
         if not self.state.get('authenticated', False):
             self.display_message(
                 "⚠️ You need to connect to Navisworks first before performing this action.",
@@ -428,6 +948,95 @@ class VISA4DGui(ctk.CTkFrame):
             return False
         return True
 
+    def prompt_import(self):
+        """Pick a P6 / MS Project XML or CSV schedule and import it in the background"""
+        if not self.check_authenticated():
+            return
+        path = filedialog.askopenfilename(
+            title="Import schedule",
+            filetypes=[("Schedules", "*.xml *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.display_message(f"📥 Importing {os.path.basename(path)}...", is_user=False)
+        # Imports change tasks, so they queue with commands instead of racing them
+        self._submit_command(f"Import {os.path.basename(path)}", lambda job: self._run_import(path), source='import')
+
+    def _run_import(self, path: str):
+        def on_progress(read: int, fraction: float):
+            self.set_status(f"Importing schedule... {read} tasks read ({fraction:.0%})")
+
+        try:
+            report = ScheduleImporter(self.task_manager, progress=on_progress).run(path)
+            message = (
+                f"{StatusEmojis.SUCCESS} Imported {report['read']} task(s) in {report['seconds']:.1f}s: "
+                f"{report['created']} created, {report['updated']} updated, {report['failed']} failed"
+            )
+            if report['skipped']:
+                message += f", {report['skipped']} skipped without dates"
+            message += f". Linked {report['links']} dependencies."
+            self.display_message(message, is_user=False)
+        except CommandCancelled:
+            raise
+        except Exception as e:
+            logging.error(f"Schedule import error: {str(e)}")
+            error = f"{StatusEmojis.ERROR} Could not import {os.path.basename(path)}: {str(e)}"
+            self.display_message(error, is_user=False)
+
+    def prompt_memos(self):
+        """Pick a folder of recorded voice memos and transcribe them in the background"""
+        if not self.check_authenticated():
+            return
+        directory = filedialog.askdirectory(title="Voice memo folder")
+        if not directory:
+            return
+        self.display_message(f"🎙️ Transcribing voice memos in {os.path.basename(directory)}...", is_user=False)
+        threading.Thread(target=self._run_memos, args=(directory,), daemon=True).start()
+
+    def _run_memos(self, directory: str):
+        def on_progress(done: int, total: int):
+            self.set_status(f"Transcribing memos... {done} of {total}")
+
+        try:
+            report = BatchTranscriber(progress=on_progress).run(directory)
+            if not report['files']:
+                self.display_message(
+                    f"{StatusEmojis.WARNING} No WAV or FLAC files found in {os.path.basename(directory)}.",
+                    is_user=False
+                )
+                return
+            summary = f"{StatusEmojis.INFO} " + "\n".join(timing_summary(report))
+            memos = [(result['name'], result['text']) for result in report['results'] if result['text']]
+            self.display_message(summary, is_user=False)
+            if memos:
+                self._submit_command(
+                    f"{len(memos)} voice memo(s)",
+                    lambda job: self.nlp_processor.process_memos(memos, self),
+                    source='voice'
+                )
+        except Exception as e:
+            logging.error(f"Voice memo batch error: {str(e)}")
+            error = f"{StatusEmojis.ERROR} Could not transcribe memos in {os.path.basename(directory)}: {str(e)}"
+            self.display_message(error, is_user=False)
+        finally:
+            self._show_command_status()
+
+    def _run_sync(self):
+        report = self.task_manager.sync()
+        if not report['success']:
+            error = f"{StatusEmojis.WARNING} Could not sync with Timeliner: {report.get('error')}"
+            self.display_message(error, is_user=False)
+        elif report['pushed'] or report['pulled'] or report['conflicts'] or report['failed']:
+            message = (
+                f"{StatusEmojis.INFO} Synced with Timeliner: {report['pulled']} task(s) updated from Timeliner, "
+                f"{report['pushed']} sent"
+            )
+            if report['failed']:
+                message += f", {report['failed']} failed"
+            if report['conflicts']:
+                message += f". Changed on both sides, left as is: {', '.join(report['conflicts'][:10])}"
+            self.display_message(message + ".", is_user=False)
+
     def _toggle_theme(self):
         self.state['theme'] = 'dark' if self.state['theme'] == 'light' else 'light'
         self._apply_theme(self.state['theme'])
@@ -436,23 +1045,70 @@ class VISA4DGui(ctk.CTkFrame):
         theme = THEME_PRESETS[theme_name]
         self.configure(fg_color=theme["bg_color"])
         self.chat_frame.configure(fg_color=theme["secondary_bg"])
+        if self.dashboard is not None:
+            self.dashboard.set_theme(theme)
         ctk.set_appearance_mode(theme_name)
 
+    def toggle_dashboard(self):
+        """Show or hide the task dashboard beside the chat"""
+        if self.dashboard is None:
+            self.dashboard = TaskDashboard(
+                self,
+                self.task_table,
+                THEME_PRESETS[self.state['theme']],
+                corner_radius=UIConfig.CORNERS["large"],
+                fg_color=THEME_PRESETS[self.state['theme']]['secondary_bg']
+            )
+        if self.dashboard.winfo_ismapped():
+            self.dashboard.grid_remove()
+            self.grid_columnconfigure(1, weight=0)
+        else:
+            self.grid_columnconfigure(1, weight=1)
+            self.dashboard.grid(row=1, column=1, rowspan=2, padx=(0, UIConfig.PADDING["medium"]),
+                                pady=(0, UIConfig.PADDING["medium"]), sticky="nsew")
+            # Changes made while hidden are not worth highlighting
+            self.task_table.take_changed()
+            self.dashboard.render()
+
+    def _on_task_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        # TaskManager listener, on whichever thread made the change: one dashboard refresh per frame at most
+        if self.dashboard is not None and not self._dashboard_refresh_pending:
+            self._dashboard_refresh_pending = True
+            self.ui.call(self._refresh_dashboard)
+
+    def _refresh_dashboard(self):
+        self._dashboard_refresh_pending = False
+        if self.dashboard.winfo_ismapped():
+            self.dashboard.refresh()
+
     def display_message(self, message: str, is_user: bool = False):
-        message_bubble = MessageBubble(
-            self.chat_frame,
-            message,
-            is_user=is_user
-        )
-        message_bubble.pack(
-            fill="x",
-            padx=UIConfig.PADDING["medium"],
-            pady=UIConfig.PADDING["small"],
-            anchor="e" if is_user else "w"
-        )
-        
-        # Auto scroll to bottom
-        self.after(100, self.chat_frame._parent_canvas.yview_moveto, 1.0)
+        """Queue a chat message; safe to call from any thread"""
+        self.ui.message(message, is_user)
+
+    def set_status(self, text: str):
+        """Queue a status bar update; safe to call from any thread"""
+        self.ui.status(text)
+
+    def prompt_search(self, event=None):
+        """Search the whole chat transcript and scroll to the newest match (F3 for the next one)"""
+        dialog = ctk.CTkInputDialog(text="Search messages:", title="Search")
+        query = dialog.get_input()
+        if not query:
+            return
+        self._search_hits = self.chat_log.search(query)
+        self._search_position = -1
+        if not self._search_hits:
+            self.status_bar.configure(text=f"No messages contain \"{query}\"")
+            return
+        self.next_search_hit()
+
+    def next_search_hit(self, event=None):
+        hits = getattr(self, '_search_hits', None)
+        if not hits:
+            return
+        self._search_position = (self._search_position + 1) % len(hits)
+        self.chat_frame.show_message(hits[self._search_position])
+        self.status_bar.configure(text=f"Match {self._search_position + 1} of {len(hits)}")
 
     # Modified to check authentication before processing commands
     def on_enter(self, event=None):
@@ -465,12 +1121,10 @@ class VISA4DGui(ctk.CTkFrame):
                 if "connect" in command.lower() or "login" in command.lower() or "authenticate" in command.lower():
                     self.prompt_authentication()
                 else:
-                    # For other commands, check authentication status
-                    if not self.check_authenticated() and "help" not in command.lower():
-                        # Skip NLP processing if not authenticated
-                        pass
-                    else:
-                        self.nlp_processor.process_command(command, self)
+                    # For other commands, check authentication status (help always works)
+                    if "help" in command.lower() or self.check_authenticated(
+                            then=lambda: self.run_command(command, source='text')):
+                        self.run_command(command, source='text')
                 
                 self.input_entry.delete(0, 'end')
         except Exception as e:
@@ -497,13 +1151,14 @@ class VISA4DGui(ctk.CTkFrame):
                 # Start recording
                 self.state['recording'] = True
                 self.speak_button.configure(text=StatusEmojis.RECORDING)
-                self.status_bar.configure(text="Recording started...")
+                self.status_bar.configure(text="Listening for your command...")
                 
                 # Start recording in a separate thread
-                threading.Thread(target=self.start_recording, daemon=True).start()
+                threading.Thread(target=self.start_recording, args=(time.perf_counter(),), daemon=True).start()
             else:
                 # Stop recording
                 self.state['recording'] = False
+                self.capture.cancel()
                 self.speak_button.configure(text=StatusEmojis.MIC)
                 self.status_bar.configure(text="Recording stopped")
         except Exception as e:
@@ -514,69 +1169,202 @@ class VISA4DGui(ctk.CTkFrame):
             )
             self._reset_recording_state()
 
-    def start_recording(self):
+    def start_recording(self, pressed_at: float = None):
         """Handle the actual recording process"""
+        speculator = None
         try:
-            with sr.Microphone() as source:
-                # Update GUI from main thread
-                self.after(0, lambda: self.status_bar.configure(text="Calibrating microphone..."))
-                
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                
-                # Update status
-                self.after(0, lambda: self.status_bar.configure(text="Listening for your command..."))
-                
-                # Listen for audio
-                audio = self.recognizer.listen(source, timeout=8, phrase_time_limit=15)
-                
-                # Process audio
-                self.after(0, lambda: self.status_bar.configure(text="Processing your command..."))
-                
-                # Convert speech to text
-                text = self.recognizer.recognize_google(audio)
-                
-                # Update GUI with results
-                self.after(0, lambda: self.display_message(text, is_user=True))
-                
-                # Check authentication before processing voice commands
-                def process_voice_command():
-                    if "connect" in text.lower() or "login" in text.lower() or "authenticate" in text.lower():
-                        self.prompt_authentication()
-                    elif not self.check_authenticated() and "help" not in text.lower():
-                        # Skip NLP processing if not authenticated
-                        pass
-                    else:
-                        self.nlp_processor.process_command(text, self)
-                
-                self.after(0, process_voice_command)
+            # With a streaming backend the phrase is recognized while it is captured and
+            # partial hypotheses are parsed ahead, so the final command is a parse cache hit
+            session = self.speech.stream(self.capture.sample_rate, self.capture.sample_width)
+            on_frame = None
+            if session is not None:
+                vocabulary_version = self.task_manager.vocabulary_version
+                speculator = SpeculativeParser(
+                    lambda partial: self.nlp_processor.speculate(partial, self.task_manager.known_tasks,
+                                                                 vocabulary_version)
+                )
                 
+                def on_frame(chunk: bytes):
+                    partial = session.feed(chunk)
+                    if partial:
+                        speculator.submit(partial)
+                        self.set_status(f"Hearing: {partial}")
+            
+            # The shared stream is already open and calibrated, so capture starts immediately
+            frame_data = self.capture.listen(
+                timeout=RECORDING_SETTINGS['TIMEOUT'],
+                phrase_time_limit=RECORDING_SETTINGS['PHRASE_TIME_LIMIT'],
+                requested_at=pressed_at,
+                on_frame=on_frame
+            )
+            speech_ended = time.perf_counter()
+            if self.capture.latencies:
+                logging.info(f"Listening started {self.capture.latencies[-1] * 1000:.1f} ms after the button press")
+            if frame_data is None:
+                if self.state['recording']:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                return
+            
+            # Process audio
+            self.set_status("Processing your command...")
+            
+            # Convert speech to text with the first backend that can run
+            if session is not None:
+                transcript = self.speech.finish(session)
+                speculated = speculator.finish(transcript.text)
+            else:
+                transcript = self.speech.transcribe(frame_data, self.capture.sample_rate, self.capture.sample_width)
+                speculated = False
+            if transcript is None:
+                raise sr.RequestError("no speech backend could transcribe the audio")
+            if not transcript.text:
+                raise sr.UnknownValueError()
+            text = transcript.text
+            
+            # Update GUI with results and run the command from the main thread
+            self.ui.call(self._process_voice_command, text, speech_ended, speculated)
+            
         except sr.WaitTimeoutError:
-            self.after(0, lambda: self.display_message(
+            self.display_message(
                 "No speech detected. Please try again.",
                 is_user=False
-            ))
+            )
         except sr.RequestError:
-            self.after(0, lambda: self.display_message(
-                "Could not connect to the speech recognition service. Please check your internet connection.",
+            self.display_message(
+                "Could not reach a speech recognition service. Check your internet connection or install an offline speech model.",
                 is_user=False
-            ))
+            )
         except sr.UnknownValueError:
-            self.after(0, lambda: self.display_message(
+            self.display_message(
                 "Sorry, I couldn't understand what you said. Please try again.",
                 is_user=False
-            ))
+            )
         except Exception as e:
             logging.error(f"Error in start_recording: {str(e)}\n{traceback.format_exc()}")
-            self.after(0, lambda: self.display_message(
+            self.display_message(
                 "An error occurred during recording. Please try again.",
                 is_user=False
-            ))
+            )
         finally:
+            if speculator is not None:
+                speculator.finish('')
             self._reset_recording_state()
 
+    def _process_voice_command(self, text: str, speech_ended: float, speculated: bool = False):
+        """Show a transcribed command and process it (main thread)"""
+        self.display_message(text, is_user=True)
+        
+        # Check authentication before processing voice commands
+        if "connect" in text.lower() or "login" in text.lower() or "authenticate" in text.lower():
+            self.prompt_authentication()
+        else:
+            def on_done(job: CommandJob):
+                logging.info(f"Responded {(time.perf_counter() - speech_ended) * 1000:.0f} ms after speech ended "
+                             f"(speculative parse {'reused' if speculated else 'not reused'})")
+            
+            # Check authentication before processing voice commands (help always works)
+            if "help" in text.lower() or self.check_authenticated(
+                    then=lambda: self.run_command(text, source='voice', on_done=on_done)):
+                self.run_command(text, source='voice', on_done=on_done)
+    
+    def run_command(self, text: str, source: str = 'text', on_done=None) -> CommandJob:
+        """Process a command on the command worker; progress and results reach the window through the UI queue"""
+        def run(job: CommandJob):
+            with self.task_manager.history.attribution(source, self.task_manager.client_id), \
+                    self.task_manager.versions.step(text):
+                self.nlp_processor.process_command(text, self)
+        
+        return self._submit_command(text, run, source, on_done)
+    
+    def _submit_command(self, text: str, run, source: str, on_done=None) -> CommandJob:
+        def finished(job: CommandJob):
+            if job.state == 'cancelled':
+                self.display_message(f"{StatusEmojis.WARNING} Cancelled \"{job.text}\".", is_user=False)
+            elif job.state == 'failed':
+                self.display_message(
+                    f"{StatusEmojis.ERROR} An error occurred while processing your command. Please try again.",
+                    is_user=False
+                )
+            if on_done:
+                on_done(job)
+            self._show_command_status()
+        
+        job = self.commands.submit(text, run, source=source, on_done=finished,
+                                   on_progress=lambda job: self._show_command_status())
+        self._show_command_status()
+        return job
+    
+    def _show_command_status(self):
+        active = self.commands.active()
+        if not active:
+            self.set_status("Ready")
+            return
+        current = active[0]
+        queued = f" (+{len(active) - 1} queued)" if len(active) > 1 else ""
+        self.set_status(f"{current.stage}: \"{current.text}\"{queued}... Esc to cancel")
+    
+    def cancel_commands(self, event=None):
+        """Cancel queued commands and stop the running one before it changes anything"""
+        cancelled = self.commands.cancel_all()
+        if cancelled:
+            self.set_status(f"Cancelling {cancelled} command(s)...")
+    
+    def toggle_hands_free(self):
+        """Start or stop continuous listening"""
+        if not self.speech_recognition_available:
+            self.display_message(
+                f"{StatusEmojis.ERROR} Speech recognition is not available. Please check your microphone.",
+                is_user=False
+            )
+            return
+        
+        if self.hands_free.listening:
+            self.hands_free.stop()
+            self.state['hands_free'] = False
+            self.hands_free_button.configure(fg_color=ThemeColors.PRIMARY)
+            self.status_bar.configure(text="Hands-free listening off")
+            logging.info(f"Hands-free detection used {self.hands_free.cpu_percent():.2f}% CPU "
+                         f"over {self.hands_free.audio_seconds:.0f} s of audio")
+        else:
+            self.hands_free.start()
+            self.state['hands_free'] = True
+            self.hands_free_button.configure(fg_color=ThemeColors.SUCCESS)
+            wake = f" Say \"{VAD_SETTINGS['WAKE_PHRASES'][0]}\" before a command." \
+                if self.wake_gate.required else ""
+            self.display_message(f"{StatusEmojis.LISTENING} Hands-free listening on.{wake}", is_user=False)
+    
+    def _on_speech_segment(self, frame_data: bytes):
+        """Transcribe a speech segment found by hands-free listening (worker thread)"""
+        if self.state['recording']:
+            return  # push-to-talk has the microphone
+        speech_ended = time.perf_counter()
+        sample_rate, sample_width = self.capture.sample_rate, self.capture.sample_width
+        local_only = not VAD_SETTINGS['CLOUD_BACKENDS']
+        if self.wake_gate.required and not self.wake_gate.armed:
+            # Only speech that opens with the wake phrase is worth a full transcription
+            head = self.speech.transcribe_head(frame_data, sample_rate, sample_width,
+                                               VAD_SETTINGS['WAKE_CHECK_SECONDS'])
+            if head is None and local_only:
+                self.set_status("Hands-free listening needs the offline speech model")
+                return
+            if head is not None and not self.wake_gate.heard(head.text):
+                return
+        transcript = self.speech.transcribe(frame_data, sample_rate, sample_width, local_only=local_only)
+        if transcript is None and local_only:
+            self.set_status("Hands-free listening needs the offline speech model")
+            return
+        if transcript is None or not transcript.text:
+            return
+        command = self.wake_gate.accept(transcript.text)
+        if command is None:
+            return
+        if not command:
+            self.set_status("Listening for your command...")
+            return
+        self.ui.call(self._process_voice_command, command, speech_ended)
+    
     def _reset_recording_state(self):
         """Reset the recording state and update UI"""
         self.state['recording'] = False
-        self.after(0, lambda: self.speak_button.configure(text=StatusEmojis.MIC))
-        self.after(0, lambda: self.status_bar.configure(text="Ready"))
\ No newline at end of file
+        self.ui.call(self.speak_button.configure, text=StatusEmojis.MIC)
+        self._show_command_status()
\ No newline at end of file
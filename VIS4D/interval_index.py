@@ -0,0 +1,236 @@
+import re
+import heapq
+import random
+import threading
+from datetime import datetime
+from typing import Dict, Optional, List, Set, Tuple, Iterator
+
+from task_index import stem_token
+
+_ZONE_PATTERN = re.compile(
+    r'\b(?:(?P<floor>main|ground|first|second|third|fourth|fifth|1st|2nd|3rd|\d+th)\s+floor'
+    r'|(?P<kind>level|zone|area|sector)\s+(?P<label>[a-z0-9]+)'
+    r'|(?P<roof>roof))\b'
+)
+
+def zone_of(task_name: str) -> Optional[str]:
+    """Infer the floor/zone a task works in from its name, e.g. "Main Floor Drywall" -> "main floor" """
+    match = _ZONE_PATTERN.search(task_name.lower())
+    if not match:
+        return None
+    if match.group('floor'):
+        return f"{stem_token(match.group('floor'))} floor"
+    if match.group('kind'):
+        return f"{match.group('kind')} {match.group('label')}"
+    return 'roof'
+
+def _date_ordinal(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%B %d, %Y").toordinal()
+    except ValueError:
+        return None
+
+class _Node:
+    __slots__ = ('start', 'end', 'name', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, start: int, end: int, name: str):
+        self.start = start
+        self.end = end
+        self.name = name
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        return self.start, self.name
+
+def _update(node: _Node) -> _Node:
+    node.max_end = node.end
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+    return node
+
+def _split(node: Optional[_Node], key: Tuple[int, str]) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into nodes with keys < key and keys >= key"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key)
+    node.left = right
+    return left, _update(node)
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+class IntervalTree:
+    """Treap of closed day intervals keyed by (start, name), augmented with the max end per subtree"""
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, start: int, end: int, name: str):
+        node = _Node(start, end, name)
+        left, right = _split(self._root, node.key)
+        self._root = _merge(_merge(left, node), right)
+        self._size += 1
+
+    def remove(self, start: int, name: str) -> bool:
+        key = (start, name)
+        left, rest = _split(self._root, key)
+        middle, right = _split(rest, (start, name + '\0'))
+        self._root = _merge(left, right)
+        if middle is not None:
+            self._size -= 1
+            return True
+        return False
+
+    def overlapping(self, lo: int, hi: int) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, name) for every interval intersecting [lo, hi]"""
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.max_end < lo:
+                continue
+            if node.left is not None:
+                stack.append(node.left)
+            if node.start <= hi:
+                if node.end >= lo:
+                    yield node.start, node.end, node.name
+                if node.right is not None:
+                    stack.append(node.right)
+
+class ZoneConflictIndex:
+    """Per-zone interval trees plus the live set of overlapping task pairs.
+
+    Tasks are grouped by the zone inferred from their name; a task without
+    a finish date occupies its start day. build() finds every overlap with
+    one sweep per zone (O(n log n + conflicts)); TaskManager change
+    notifications then update a single task's interval and conflict pairs
+    with one tree query.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._trees: Dict[str, IntervalTree] = {}
+        self._starts: Dict[str, Optional[str]] = {}
+        self._ends: Dict[str, Optional[str]] = {}
+        self._intervals: Dict[str, Tuple[str, int, int]] = {}     # task -> (zone, start, end)
+        self._conflicts: Dict[str, Set[str]] = {}
+
+    def build(self, start_dates: Dict[str, str], end_dates: Dict[str, str]):
+        """Rebuild every zone from TaskManager state"""
+        with self._lock:
+            self._reset()
+            self._starts = dict(start_dates)
+            self._ends = dict(end_dates)
+            by_zone: Dict[str, List[Tuple[int, int, str]]] = {}
+            for task_name in set(start_dates) | set(end_dates):
+                interval = self._interval(task_name)
+                if interval is not None:
+                    zone, start, end = interval
+                    self._intervals[task_name] = interval
+                    by_zone.setdefault(zone, []).append((start, end, task_name))
+
+            for zone, intervals in by_zone.items():
+                intervals.sort()
+                tree = self._trees[zone] = IntervalTree()
+                active: List[Tuple[int, str]] = []              # min-heap of (end, task)
+                for start, end, task_name in intervals:
+                    tree.insert(start, end, task_name)
+                    while active and active[0][0] < start:
+                        heapq.heappop(active)
+                    for _, other in active:
+                        self._link(task_name, other)
+                    heapq.heappush(active, (end, task_name))
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: move one task's interval and refresh its conflicts"""
+        with self._lock:
+            if field == 'date':
+                self._starts[task_name] = new
+            elif field == 'end_date':
+                self._ends[task_name] = new
+            elif field == 'task' and new is None:
+                self._starts.pop(task_name, None)
+                self._ends.pop(task_name, None)
+            else:
+                return
+            self._reindex(task_name)
+
+    def conflicts_for(self, task_name: str) -> List[str]:
+        """Tasks in the same zone whose dates overlap task_name"""
+        with self._lock:
+            return sorted(self._conflicts.get(task_name, ()))
+
+    def conflicts(self, zone: str = None) -> List[Tuple[str, str, str]]:
+        """All overlapping pairs as (zone, task, other task), optionally for one zone"""
+        with self._lock:
+            pairs = []
+            for task_name, others in self._conflicts.items():
+                task_zone = self._intervals[task_name][0]
+                if zone is not None and task_zone != zone:
+                    continue
+                pairs.extend((task_zone, task_name, other) for other in others if task_name < other)
+            return sorted(pairs)
+
+    def zone(self, task_name: str) -> Optional[str]:
+        with self._lock:
+            interval = self._intervals.get(task_name)
+            return interval[0] if interval else None
+
+    # Internal helpers (callers hold the lock)
+    def _interval(self, task_name: str) -> Optional[Tuple[str, int, int]]:
+        zone = zone_of(task_name)
+        start = _date_ordinal(self._starts.get(task_name))
+        if zone is None or start is None:
+            return None
+        end = _date_ordinal(self._ends.get(task_name))
+        return zone, start, max(start, end) if end is not None else start
+
+    def _link(self, task_name: str, other: str):
+        self._conflicts.setdefault(task_name, set()).add(other)
+        self._conflicts.setdefault(other, set()).add(task_name)
+
+    def _reindex(self, task_name: str):
+        previous = self._intervals.pop(task_name, None)
+        if previous is not None:
+            zone, start, _ = previous
+            self._trees[zone].remove(start, task_name)
+        for other in self._conflicts.pop(task_name, ()):
+            others = self._conflicts.get(other)
+            if others is not None:
+                others.discard(task_name)
+                if not others:
+                    del self._conflicts[other]
+
+        interval = self._interval(task_name)
+        if interval is None:
+            return
+        zone, start, end = interval
+        tree = self._trees.setdefault(zone, IntervalTree())
+        for _, _, other in tree.overlapping(start, end):
+            self._link(task_name, other)
+        tree.insert(start, end, task_name)
+        self._intervals[task_name] = interval
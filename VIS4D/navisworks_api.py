@@ -1,6 +1,6 @@
 import requests
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone, timedelta
 from urllib.parse import quote
 
@@ -11,6 +11,9 @@ class NavisworksAPI:
             'create_task': '/api/timeliner/task',
             'update_task': '/api/timeliner/task/update',
             'delete_task': '/api/timeliner/task/delete',
+            'batch_tasks': '/api/timeliner/task/batch',
+            'sync_tree': '/api/timeliner/sync/tree',
+            'sync_tasks': '/api/timeliner/sync/tasks',
             'auth_token': '/api/auth/token',
             'auth_status': '/api/auth/status'
         }
@@ -18,8 +21,21 @@ class NavisworksAPI:
         self.access_token = None
         self.token_expiry = None
 
-    def authenticate(self, client_id: str, client_secret: str) -> bool:
-        """Authenticate with the Navisworks API using APS credentials"""
+    def authenticate(self, client_id: str, client_secret: str, timeout: float = None) -> bool:
+        """Authenticate with the Navisworks API using APS credentials (timeout in seconds, None waits indefinitely)"""
+        token = self.request_token(client_id, client_secret, timeout=timeout)
+        if token is None:
+            return False
+        self.apply_token(token)
+        return True
+
+    def request_token(self, client_id: str, client_secret: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Ask the plugin for an access token without using it yet.
+
+        Returns {'token', 'expires_at'} or None when the credentials are
+        rejected or the plugin cannot be reached. Nothing on this client
+        changes, so a request abandoned by a newer sign-in is harmless.
+        """
         try:
             payload = {
                 'clientId': client_id,
@@ -28,56 +44,60 @@ class NavisworksAPI:
             response = requests.post(
                 f"{self.base_url}{self.endpoints['auth_token']}",
                 json=payload,
-                headers=self.headers
+                headers={'Content-Type': 'application/json'},
+                timeout=timeout
             )
             response.raise_for_status()
             auth_data = response.json()
             
             if auth_data.get('success'):
-                self.access_token = auth_data.get('token')
-                # Handle the ISO format date string more robustly
-                expiry_str = auth_data.get('expiresAt')
-                try:
-                    # Try to parse using fromisoformat with potential adjustment
-                    if 'Z' in expiry_str:
-                        expiry_str = expiry_str.replace('Z', '+00:00')
-                    
-                    # Handle microsecond precision if needed
-                    if '.' in expiry_str:
-                        parts = expiry_str.split('.')
-                        microseconds = parts[1].split('+')[0]
-                        if len(microseconds) > 6:
-                            # Truncate to 6 digits for microseconds
-                            microseconds = microseconds[:6]
-                            expiry_str = parts[0] + '.' + microseconds + '+00:00'
-                    
-                    self.token_expiry = datetime.fromisoformat(expiry_str)
-                except ValueError:
-                    # Fallback: use a more flexible approach with strptime
-                    import re
-                    import pytz
-                    
-                    # Extract date and time part
-                    match = re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?([+-]\d{2}:\d{2}|Z)?', expiry_str)
-                    if match:
-                        date_part = match.group(1)
-                        self.token_expiry = datetime.strptime(date_part, "%Y-%m-%dT%H:%M:%S")
-                        self.token_expiry = self.token_expiry.replace(tzinfo=pytz.UTC)
-                    else:
-                        # Last resort: set expiry to 1 hour from now
-                        self.token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
-                        logging.warning(f"Could not parse token expiry date: {expiry_str}. Using default 1 hour expiry.")
-                
-                # Add token to headers for future requests
-                self.headers['Authorization'] = f"Bearer {self.access_token}"
-                logging.info(f"Authentication successful. Token expires at {self.token_expiry}")
-                return True
+                return {'token': auth_data.get('token'), 'expires_at': self._parse_expiry(auth_data.get('expiresAt'))}
             else:
                 logging.error("Authentication failed: No success indicator in response")
-                return False
+                return None
         except Exception as e:
             logging.error(f"Authentication error: {str(e)}")
-            return False
+            return None
+
+    def apply_token(self, token: Dict[str, Any]):
+        """Use a token from request_token for every following request"""
+        self.access_token = token['token']
+        self.token_expiry = token['expires_at']
+        # Add token to headers for future requests
+        self.headers['Authorization'] = f"Bearer {self.access_token}"
+        logging.info(f"Authentication successful. Token expires at {self.token_expiry}")
+
+    @staticmethod
+    def _parse_expiry(expiry_str: str) -> datetime:
+        """Token expiry from the ISO date string the plugin sends, handled robustly"""
+        try:
+            # Try to parse using fromisoformat with potential adjustment
+            if 'Z' in expiry_str:
+                expiry_str = expiry_str.replace('Z', '+00:00')
+            
+            # Handle microsecond precision if needed
+            if '.' in expiry_str:
+                parts = expiry_str.split('.')
+                microseconds = parts[1].split('+')[0]
+                if len(microseconds) > 6:
+                    # Truncate to 6 digits for microseconds
+                    microseconds = microseconds[:6]
+                    expiry_str = parts[0] + '.' + microseconds + '+00:00'
+            
+            return datetime.fromisoformat(expiry_str)
+        except ValueError:
+            # Fallback: use a more flexible approach with strptime
+            import re
+            import pytz
+            
+            # Extract date and time part
+            match = re.match(r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?([+-]\d{2}:\d{2}|Z)?', expiry_str)
+            if match:
+                date_part = match.group(1)
+                return datetime.strptime(date_part, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=pytz.UTC)
+            # Last resort: set expiry to 1 hour from now
+            logging.warning(f"Could not parse token expiry date: {expiry_str}. Using default 1 hour expiry.")
+            return datetime.now(timezone.utc) + timedelta(hours=1)
 
     def check_auth_status(self) -> Dict[str, Any]:
         """Check the current authentication status"""
@@ -192,6 +212,99 @@ class NavisworksAPI:
             logging.error(f"Error deleting Navisworks task: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    def batch_tasks(self, operations: List[Dict[str, Any]],
+                    client_id: str = None, client_secret: str = None) -> List[Dict[str, Any]]:
+        """Send create/update/delete operations to Timeliner in one request.
+        
+        Each operation is {'action': 'create'|'update'|'delete', 'task_name': ...} plus
+        'task_type'/'start_date'/'end_date' for creates and 'updates' for updates.
+        Falls back to one request per operation if the plugin has no batch endpoint.
+        """
+        if not operations:
+            return []
+        if not self.ensure_authenticated(client_id, client_secret):
+            return [{"success": False, "error": "Not authenticated"}] * len(operations)
+            
+        try:
+            payload = {'Operations': [self._batch_payload(op) for op in operations]}
+            response = requests.post(
+                f"{self.base_url}{self.endpoints['batch_tasks']}",
+                json=payload,
+                headers=self.headers
+            )
+            if response.status_code == 404:
+                logging.warning("Batch endpoint not available, sending operations individually")
+                return [self._send_single(op, client_id, client_secret) for op in operations]
+            response.raise_for_status()
+            results = response.json().get('results', [])
+            if len(results) != len(operations):
+                raise ValueError(f"Expected {len(operations)} batch results, got {len(results)}")
+            return results
+        except Exception as e:
+            logging.error(f"Error sending Navisworks task batch: {str(e)}")
+            return [{"success": False, "error": str(e)}] * len(operations)
+
+    def sync_tree(self, level: int, parents: List[int], fanout: int, depth: int,
+                  client_id: str = None, client_secret: str = None, session: str = None) -> Dict[str, Any]:
+        """Fetch Timeliner's task hash tree nodes at level under the given parent nodes.
+        
+        Requests sharing a session are answered from one listing of the schedule.
+        """
+        return self._post_sync('sync_tree', {'Level': level, 'Parents': parents, 'Fanout': fanout, 'Depth': depth,
+                                             'Session': session},
+                               client_id, client_secret)
+
+    def sync_tasks(self, buckets: List[int], fanout: int, depth: int,
+                   client_id: str = None, client_secret: str = None, session: str = None) -> Dict[str, Any]:
+        """Fetch the Timeliner tasks that hash into the given leaf buckets"""
+        return self._post_sync('sync_tasks', {'Buckets': buckets, 'Fanout': fanout, 'Depth': depth,
+                                              'Session': session},
+                               client_id, client_secret)
+
+    def _post_sync(self, endpoint: str, payload: Dict[str, Any], client_id: str = None,
+                   client_secret: str = None) -> Dict[str, Any]:
+        if not self.ensure_authenticated(client_id, client_secret):
+            return {"success": False, "error": "Not authenticated"}
+            
+        try:
+            response = requests.post(
+                f"{self.base_url}{self.endpoints[endpoint]}",
+                json=payload,
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logging.error(f"Error fetching Timeliner sync data: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    def _batch_payload(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        def fmt(value):
+            return value.strftime("%Y-%m-%d") if isinstance(value, datetime) else value
+        
+        updates = operation.get('updates', {})
+        return {
+            'Action': operation['action'],
+            'TaskName': operation['task_name'],
+            'TaskType': operation.get('task_type'),
+            'StartDate': fmt(operation.get('start_date') or updates.get('start_date')),
+            'EndDate': fmt(operation.get('end_date') or updates.get('end_date')),
+            'NewName': updates.get('name'),
+            'NewStatus': updates.get('status')
+        }
+
+    def _send_single(self, operation: Dict[str, Any], client_id: str = None,
+                     client_secret: str = None) -> Dict[str, Any]:
+        action = operation['action']
+        if action == 'create':
+            return self.create_task(operation['task_name'], operation.get('task_type', "Construct"),
+                                    operation['start_date'], operation['end_date'], client_id, client_secret)
+        if action == 'update':
+            return self.update_task(operation['task_name'], operation.get('updates', {}), client_id, client_secret)
+        if action == 'delete':
+            return self.delete_task(operation['task_name'], client_id, client_secret)
+        return {"success": False, "error": f"Unknown action: {action}"}
+
     def map_vis4d_status_to_navisworks(self, vis4d_status: str) -> str:
         """Map VIS4D status to Navisworks status"""
         status_mapping = {
@@ -7,24 +7,71 @@ from sklearn.metrics import classification_report
 from sentence_transformers import SentenceTransformer, util
 import nltk
 from nltk.corpus import stopwords
-from dateutil import parser
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
+from calendar import monthrange
 import numpy as np
 import re
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable
+from dataclasses import dataclass, field
 from spacy.tokens import Doc
+from online_learning import OnlineIntentModel
+from embedding_cache import EmbeddingCache
+from parse_cache import ParseCache
+from date_grammar import default_grammar, NUMBER_WORDS
+from interval_index import zone_of
+from task_index import tokenize
+from task_vocabulary import TaskVocabulary
+from task_tree import infer_path
+from confirmation import ConfirmationQueue, PendingCommand, classify_reply
+from command_executor import CommandCancelled, checkpoint
+from constants import FILE_PATHS, CACHE_SETTINGS, TASK_HIERARCHY, CONFIRMATION_SETTINGS, DEFAULT_TASK_MAPPING
+
+# Known task names, or a function returning them so they are loaded only when needed
+KnownTasks = Union[List[str], Callable[[], List[str]]]
+
+@dataclass
+class CommandResult:
+    """A fully parsed command: intent plus extracted entities"""
+    text: str
+    intent: str
+    entities: Dict[str, Any] = field(default_factory=dict)
+    processed_text: str = ''
 
 class NLPProcessor:
     def __init__(self):
         # Initialize components
         self.nlp = spacy.load("en_core_web_lg")
-        self.sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
+        embedding_model = 'all-MiniLM-L6-v2'
+        self.sentence_transformer = SentenceTransformer(embedding_model)
+        # Shared by status matching and task-name similarity
+        self.embedding_cache = EmbeddingCache(
+            self.sentence_transformer,
+            persist_path=FILE_PATHS['EMBEDDING_CACHE'] if CACHE_SETTINGS['PERSIST_EMBEDDINGS'] else None,
+            model_name=embedding_model
+        )
         nltk.download('stopwords')
         
+        # Compiled date grammar with a per-day relative-date memo
+        self.date_grammar = default_grammar
+        
+        # Parsed commands keyed by normalized text and calendar day
+        self.parse_cache = ParseCache()
+        
+        # Known task names prepared for matching, rebuilt when the vocabulary version changes
+        self._vocabulary = TaskVocabulary([], version=-1)
+        
         # Initialize intent classifier
         self.intent_classifier = self._train_enhanced_model()
         
+        # Incremental model refined from confirmed commands in the background. It is seeded
+        # from the forest's training split and only served while it matches the forest's
+        # accuracy on the held-out split
+        X_train, X_test, y_train, y_test = self.intent_split
+        self.online_model = OnlineIntentModel(classes=list(self.intent_classifier.classes_))
+        self.online_model.bootstrap(X_train, y_train, holdout=(X_test, y_test),
+                                    baseline=self.intent_classifier.score(X_test, y_test))
+        
         # Task name similarity threshold
         self.similarity_threshold = 0.85
         
@@ -58,12 +105,109 @@ class NLPProcessor:
             'not started': ['not start', 'not started', 'not begun', 'unstarted', 'not commenced']
         }
         
+        # Clause segmentation for multi-command utterances
+        verbs = r'mark|update|set|change|push|move|shift|add|create|delete|remove|schedule'
+        self.clause_separator = re.compile(r'(\s*(?:[;,]|\band\s+then\b|\bthen\b|\band\b|\balso\b)\s*)', re.IGNORECASE)
+        self.command_verb = re.compile(rf'^(?:please\s+)?({verbs})\b', re.IGNORECASE)
+        self.clause_cue = re.compile(
+            rf'\b(?:{verbs}|complete|completed|finished|done|in progress|on hold|hold|'
+            r'suspended|not started|ongoing)\b',
+            re.IGNORECASE
+        )
+        self.clause_outcome = re.compile(
+            r'\b(?:complete|completed|finished|done|in progress|on hold|hold|suspended|not started|ongoing)\b',
+            re.IGNORECASE
+        )
+        # Task names recognized at the start of a verb-less clause even when not tracked yet
+        self.clause_task_start = re.compile(
+            r'^(?:the\s+)?(?:door\s+\d+|stair\s+\d+|slab\s+[a-z]\b|window\s+[a-z]\b|painting\b|railing\b)',
+            re.IGNORECASE
+        )
+        self.default_task_names = TaskVocabulary(DEFAULT_TASK_MAPPING.values())
+        self._protected_names: Tuple[Optional[TaskVocabulary], Optional[re.Pattern]] = (None, None)
+        
+        # Bulk schedule shifts ("push all grade beam pours back 3 days")
+        shift_verbs = r'push|shift|move|delay|slide|pull|bring'
+        self.bulk_shift_pattern = re.compile(
+            rf'\b(?:{shift_verbs})\b.*\b(?:all|every|everything)\b|\b(?:all|every|everything)\b.*\b(?:{shift_verbs})\b'
+        )
+        self.shift_offset_pattern = re.compile(
+            r'\b(?:by\s+)?(\d+|' + '|'.join(NUMBER_WORDS) + r')\s+(day|week)s?\b'
+        )
+        self.shift_backward_pattern = re.compile(r'\b(forward|earlier|ahead|up|sooner)\b')
+        self.shift_filler_words = {
+            'push', 'shift', 'move', 'delay', 'slide', 'pull', 'bring', 'all', 'every', 'everything',
+            'task', 'tasks', 'the', 'on', 'in', 'of', 'for', 'by', 'back', 'forward', 'out', 'later',
+            'earlier', 'ahead', 'up', 'sooner', 'please', 'that', 'are', 'is', 'status', 'with'
+        }
+        
+        # Schedule queries ("what's in progress on the main floor?")
+        self.query_pattern = re.compile(
+            r"^\s*(?:what|what's|whats|which|list|show|how many|any|are there|is there|when)\b|\?\s*$"
+        )
+        self.query_status_phrases = {
+            'complete': ['complete', 'completed', 'finished', 'done'],
+            'in progress': ['in progress', 'ongoing', 'underway'],
+            'on hold': ['on hold', 'hold', 'paused'],
+            'suspended': ['suspended'],
+            'not started': ['not started', 'not begun', 'unstarted']
+        }
+        self.query_filler_words = {
+            'what', 'whats', 's', 'which', 'list', 'show', 'me', 'how', 'many', 'any', 'are', 'is', 'there',
+            'the', 'a', 'on', 'in', 'of', 'for', 'task', 'tasks', 'scheduled', 'schedule', 'start', 'starts',
+            'starting', 'due', 'everything', 'anything', 'all', 'that', 'do', 'does', 'we', 'have', 'work',
+            'item', 'items', 'next', 'this', 'week', 'month', 'between', 'and', 'to', 'from', 'before',
+            'after', 'until', 'by', 'when', 'at', 'will', 'should', 'currently', 'right', 'now', 'still',
+            'critical', 'path', 'late', 'behind', 'running', 'slipping', 'overlap', 'overlaps',
+            'overlapping', 'clash', 'clashes', 'clashing', 'conflict', 'conflicts', 'conflicting', 'with'
+        }
+        
+        # Progress questions ("how far along is the second floor?")
+        self.progress_pattern = re.compile(
+            r"\bhow far along\b|\bhow much of\b|\bprogress (?:on|of|for)\b|\bpercent(?:age)?\b"
+            r"|\bhow (?:is|are)\b.*\b(?:going|coming along)\b"
+        )
+        
+        # Change history questions ("what changed this week?", "how much have we slipped this month?")
+        self.history_pattern = re.compile(
+            r"\bwhat(?:'s| has| have)?\s+changed\b|\b(?:recent|latest)\s+changes\b"
+            r"|\bchanges?\s+(?:made\s+)?(?:today|yesterday|this\s+week|last\s+week|this\s+month|last\s+month)\b"
+            r"|\bslipp(?:age|ed)\b"
+        )
+        self.history_periods = ['today', 'yesterday', 'this week', 'last week', 'this month', 'last month']
+        
+        # Undo/redo of the last command ("undo", "take that back", "redo")
+        self.undo_pattern = re.compile(
+            r"^\s*(?:(?P<redo>redo)|undo|take (?:that|it) back|revert (?:that|the last (?:change|command)))\b"
+        )
+        # Corrections of the previous command ("no, I meant mark it on hold")
+        self.correction_pattern = re.compile(
+            r"^\s*(?:no|nope|sorry|oops)\b[\s,.!]*(?:i\s+meant|i\s+mean|it\s+should\s+be|make\s+that)\s+(?P<command>.+)$",
+            re.IGNORECASE
+        )
+        
+        # Task dependencies ("painting starts 2 days after drywall finishes", "roofing depends on framing")
+        count_words = r'\d+|' + '|'.join(NUMBER_WORDS)
+        self.dependency_patterns = [
+            re.compile(r'^(?:make\s+)?(?P<successor>.+?)\s+depends?\s+on\s+(?P<predecessor>.+?)$'),
+            re.compile(
+                r'^(?P<successor>.+?)\s+(?:(?:starts?|begins?|can\s+start|should\s+start)\s+'
+                rf'(?:(?P<lag>{count_words})\s+days?\s+)?after|follows?)\s+(?P<predecessor>.+?)'
+                r'(?:\s+(?P<anchor>finishes|is\s+(?:done|finished|complete)|completes|ends|starts|begins))?$'
+            )
+        ]
+        
         # Context management
         self.context = {
             'last_task': None,
             'last_intent': None,
+            'last_command': None,
+            'correcting': None,         # Command a "no, I meant ..." is replacing, until the replacement runs
             'recent_tasks': []
         }
+        
+        # Parsed commands waiting for a yes/no
+        self.confirmations = ConfirmationQueue()
 
     def _generate_training_data(self) -> Tuple[List[str], List[str]]:
         """Generate more comprehensive training data with variations"""
@@ -176,6 +320,7 @@ class NLPProcessor:
         X_train, X_test, y_train, y_test = train_test_split(
             commands, labels, test_size=0.2, random_state=42
         )
+        self.intent_split = (X_train, X_test, y_train, y_test)
         
         # Create pipeline with enhanced features
         pipeline = Pipeline([
@@ -201,8 +346,42 @@ class NLPProcessor:
         return pipeline
     
     
-    def _preprocess_text(self, text: str) -> str:
-        doc = self.nlp(text.lower())
+    def _classify_intent(self, processed_text: str) -> Tuple[str, float]:
+        """Classify intent, preferring the online model once it has learned from feedback
+        and is at least as accurate as the forest on held-out commands"""
+        if self.online_model.is_ready():
+            intent, confidence = self.online_model.predict(processed_text)
+            if intent:
+                return intent, confidence
+        
+        intent_proba = self.intent_classifier.predict_proba([processed_text])[0]
+        intent_idx = intent_proba.argmax()
+        return self.intent_classifier.classes_[intent_idx], intent_proba[intent_idx]
+    
+    def _serving_model_version(self) -> int:
+        """Version of the model _classify_intent currently answers from (0 for the random forest)"""
+        return self.online_model.version if self.online_model.is_ready() else 0
+    
+    def record_feedback(self, text: str, intent: str, processed_text: str = None, source: str = 'text'):
+        """Queue a confirmed or corrected utterance -> intent pair for incremental learning.
+        
+        Only call this with an intent the user vouched for; learning from the
+        model's own unconfirmed predictions would just reinforce its mistakes.
+        """
+        try:
+            if processed_text is None:
+                processed_text = self._preprocess_text(text)
+            self.online_model.submit(text, intent, features=processed_text, source=source)
+        except Exception as e:
+            logging.error(f"Error recording intent feedback: {e}")
+    
+    def rollback_intent_model(self, version: int = None) -> bool:
+        """Roll the online intent model back to an earlier snapshot"""
+        return self.online_model.rollback(version)
+    
+    def _preprocess_text(self, text: str, doc: Doc = None) -> str:
+        if doc is None:
+            doc = self.nlp(text.lower())
         return " ".join([
             token.lemma_.lower().strip()
             for token in doc
@@ -317,89 +496,9 @@ class NLPProcessor:
         
         return None
 
-    def _extract_date_enhanced(self, text: str, doc: spacy.tokens.Doc) -> Dict[str, Any]:
-        """Enhanced date extraction with start/finish date distinction"""
-        date_info = {
-            'start_date': None,
-            'end_date': None,
-            'duration': None,
-            'date_type': 'start'  # Default to start date
-        }
-        
-        text_lower = text.lower()
-        
-        # Determine if this is a start or finish date
-        if re.search(r'(finish|end)\s+date', text_lower):
-            date_info['date_type'] = 'finish'
-        
-        # Extract the date (March 9 format)
-        month_day_pattern = r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})(?:st|nd|rd|th)?'
-        month_day_match = re.search(month_day_pattern, text_lower)
-        
-        if month_day_match:
-            month, day = month_day_match.groups()
-            year = datetime.now().year
-            month_num = {'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6, 
-                        'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12}[month.lower()]
-            
-            try:
-                extracted_date = datetime(year, month_num, int(day))
-                
-                # Assign date based on date_type
-                if date_info['date_type'] == 'finish':
-                    date_info['end_date'] = extracted_date
-                else:
-                    date_info['start_date'] = extracted_date
-                    
-            except ValueError:
-                # Handle invalid dates by falling back to existing methods
-                pass
-        
-        # If no specific date format found, continue with existing extraction methods
-        if not date_info['start_date'] and not date_info['end_date']:
-            # Call existing _extract_single_date method
-            date = self._extract_single_date(text, doc)
-            if date:
-                if date_info['date_type'] == 'finish':
-                    date_info['end_date'] = date
-                else:
-                    date_info['start_date'] = date
-        
-        return date_info
-    def _extract_single_date(self, text: str, doc: spacy.tokens.Doc) -> Optional[datetime]:
-        """Extract a single date from text, used as a helper for _extract_date_enhanced"""
-        date_patterns = [
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{4}',
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2}(?:st|nd|rd|th)?,?\s*\d{4}',
-            r'\d{1,2}[-/]\d{1,2}[-/]\d{4}',
-            r'next (monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-            r'(tomorrow|next week|next month)',
-            r'in \d+ (days?|weeks?|months?)'
-        ]
-
-        text_lower = text.lower()
-        
-        # Try pattern matching first
-        for pattern in date_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                try:
-                    date_str = match.group(0)
-                    if 'next' in date_str or 'tomorrow' in date_str:
-                        return self._parse_relative_date(date_str)
-                    return parser.parse(date_str, fuzzy=True)
-                except Exception:
-                    continue
-
-        # Try spaCy's date entities as backup
-        for ent in doc.ents:
-            if ent.label_ == "DATE":
-                try:
-                    return parser.parse(ent.text, fuzzy=True)
-                except Exception:
-                    continue
-                    
-        return None
+    def _extract_date_enhanced(self, text: str) -> Dict[str, Any]:
+        """Extract start/finish dates in a single pass over the compiled date grammar"""
+        return self.date_grammar.extract(text)
 
     def _extract_status_enhanced(self, text: str) -> Tuple[Optional[str], float]:
         """Enhanced status extraction with confidence scoring and expanded status types"""
@@ -420,14 +519,14 @@ class NLPProcessor:
                 return status, 1.0  # High confidence for direct matches
         
         # Fall back to embedding similarity for less exact matches
-        text_embedding = self.sentence_transformer.encode(text_lower)
+        text_embedding = self.embedding_cache.encode(text_lower)
         
         best_status = None
         best_confidence = 0.0
         
         for status, keywords in self.status_mapping.items():
-            # Create embeddings for each keyword phrase
-            keyword_embeddings = self.sentence_transformer.encode(keywords)
+            # Keyword embeddings are computed once and then served from the cache
+            keyword_embeddings = self.embedding_cache.encode(keywords)
             
             # Calculate similarities
             similarities = util.cos_sim(text_embedding, keyword_embeddings)
@@ -439,6 +538,54 @@ class NLPProcessor:
         
         return best_status, best_confidence
 
+    def _task_vocabulary(self, known_tasks: KnownTasks = None, vocabulary_version: int = 0) -> TaskVocabulary:
+        """Known task names prepared for matching, built once per vocabulary version.
+        
+        known_tasks may be a function returning the names (TaskManager.known_tasks),
+        so they are only loaded when the version has changed.
+        """
+        if known_tasks is None:
+            return TaskVocabulary([])
+        vocabulary = self._vocabulary
+        if vocabulary.version != vocabulary_version:
+            names = known_tasks() if callable(known_tasks) else known_tasks
+            vocabulary = TaskVocabulary(names, vocabulary_version)
+            self._vocabulary = vocabulary
+        return vocabulary
+    
+    def _match_known_task(self, task_name: Optional[str], vocabulary: TaskVocabulary) -> Optional[str]:
+        """Snap an extracted task name onto the closest existing task above the similarity threshold.
+        
+        Only a shortlist of names sharing words with task_name is embedded,
+        however many tasks the project has.
+        """
+        if not task_name or not len(vocabulary):
+            return task_name
+        
+        exact = vocabulary.exact(task_name)
+        if exact is not None:
+            return exact
+        
+        candidates = vocabulary.shortlist(task_name)
+        if not candidates:
+            return task_name
+        similarities = util.cos_sim(
+            self.embedding_cache.encode(task_name),
+            self.embedding_cache.encode(candidates)
+        )[0]
+        best_idx = int(similarities.argmax())
+        if float(similarities[best_idx]) >= self.similarity_threshold:
+            return candidates[best_idx]
+        return task_name
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the NLP caches"""
+        return {
+            'embeddings': self.embedding_cache.stats(),
+            'parses': self.parse_cache.stats(),
+            'relative_dates': self.date_grammar.resolver.stats()
+        }
+
     def _validate_command(self, intent: str, entities: Dict[str, Any]) -> bool:
         """Enhanced command validation with confidence thresholds"""
         # Always accept certain patterns regardless of confidence
@@ -511,10 +658,10 @@ class NLPProcessor:
             date_type = dates.get('date_type', 'start')
             date_str = None
             
-            if dates.get('start_date'):
-                date_str = dates['start_date'].strftime("%B %d, %Y")
-            elif dates.get('end_date'):
-                date_str = dates['end_date'].strftime("%B %d, %Y")
+            target_date = dates.get('end_date') if date_type == 'finish' else None
+            target_date = target_date or dates.get('start_date') or dates.get('end_date')
+            if target_date:
+                date_str = target_date.strftime("%B %d, %Y")
             
             if date_str:
                 date_type_text = "start date" if date_type == "start" else "finish date"
@@ -546,211 +693,1024 @@ class NLPProcessor:
         else:
             return f"Command processed for task '{task}'."
 
+    def _segment_clauses(self, text: str, vocabulary: TaskVocabulary = None) -> List[str]:
+        """Split an utterance like "mark slab A complete, window B on hold and push stair 1000 to March 9"
+        into one clause per command.
+        
+        Separators inside a known task name ("Painting and Decorating") never
+        split. Otherwise a fragment only becomes its own clause when it starts
+        its own command: it begins with a command verb, or it begins with a
+        task name and both it and the clause before carry their own status or
+        date. So "mark slab A and slab B complete" and "March 9, 2025" stay
+        intact. Clauses without a leading verb borrow the previous clause's verb.
+        """
+        vocabulary = vocabulary if vocabulary is not None else TaskVocabulary([])
+        text = text.strip()
+        protected = self._protected_pattern(vocabulary)
+        spans = [match.span() for match in protected.finditer(text)] if protected else []
+        
+        pieces = []
+        position = 0
+        for separator in self.clause_separator.finditer(text):
+            if any(start < separator.end() and separator.start() < end for start, end in spans):
+                continue
+            pieces += [text[position:separator.start()], separator.group(0)]
+            position = separator.end()
+        pieces.append(text[position:])
+        
+        clauses = [pieces[0]]
+        for separator, fragment in zip(pieces[1::2], pieces[2::2]):
+            if fragment.strip() and self._starts_command(fragment.strip(), clauses[-1], vocabulary):
+                clauses.append(fragment)
+            else:
+                clauses[-1] += separator + fragment
+        
+        clauses = [clause.strip() for clause in clauses if clause.strip()]
+        verb = None
+        for i, clause in enumerate(clauses):
+            match = self.command_verb.match(clause)
+            if match:
+                verb = match.group(1)
+            elif verb:
+                clauses[i] = f"{verb} {clause}"
+        return clauses
+    
+    def _starts_command(self, fragment: str, previous: str, vocabulary: TaskVocabulary) -> bool:
+        """Whether the fragment after a separator is a command of its own"""
+        if not self.clause_cue.search(previous):
+            return False
+        if self.command_verb.match(fragment):
+            return True
+        names_task = (vocabulary.starts_with_name(fragment) or self.default_task_names.starts_with_name(fragment)
+                      or self.clause_task_start.match(fragment))
+        return bool(names_task) and self._has_outcome(fragment) and self._has_outcome(previous)
+    
+    def _has_outcome(self, clause: str) -> bool:
+        """A status or a date: what a clause changes"""
+        return bool(self.clause_outcome.search(clause)) or self.date_grammar.parse(clause) is not None
+    
+    def _protected_pattern(self, vocabulary: TaskVocabulary) -> Optional[re.Pattern]:
+        """Known task names that contain a clause separator, built once per vocabulary"""
+        cached_vocabulary, pattern = self._protected_names
+        if cached_vocabulary is vocabulary:
+            return pattern
+        names = {name for name in list(vocabulary.by_lower) + list(self.default_task_names.by_lower)
+                 if self.clause_separator.search(name)}
+        pattern = None
+        if names:
+            alternatives = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+            pattern = re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE)
+        self._protected_names = (vocabulary, pattern)
+        return pattern
+    
+    def parse_commands(self, texts: List[str], known_tasks: KnownTasks = None,
+                       vocabulary_version: int = 0) -> List[CommandResult]:
+        """Parse several commands, running spaCy once over all cache misses"""
+        model_version = self._serving_model_version()
+        results: List[Optional[CommandResult]] = [
+            self.parse_cache.get(text, vocabulary_version, model_version) for text in texts
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            docs = list(self.nlp.pipe([texts[i] for i in missing]))
+            lower_docs = list(self.nlp.pipe([texts[i].lower() for i in missing]))
+            for i, doc, lower_doc in zip(missing, docs, lower_docs):
+                checkpoint()
+                results[i] = self.parse_command(
+                    texts[i], known_tasks, vocabulary_version,
+                    doc=doc, processed_text=self._preprocess_text(texts[i], lower_doc)
+                )
+        return results
+    
+    def parse_command(self, text: str, known_tasks: KnownTasks = None, vocabulary_version: int = 0,
+                      doc: Doc = None, processed_text: str = None) -> CommandResult:
+        """Parse a command into intent and entities, serving repeats from the parse cache"""
+        cached = self.parse_cache.get(text, vocabulary_version, self._serving_model_version())
+        if cached is not None:
+            return cached
+        
+        if self.bulk_shift_pattern.search(text.lower()):
+            result = self._parse_bulk_shift(text)
+            if result is not None:
+                self.parse_cache.put(text, result, vocabulary_version)
+                return result
+        
+        if self.history_pattern.search(text.lower()):
+            result = self._parse_history(text)
+            self.parse_cache.put(text, result, vocabulary_version)
+            return result
+        
+        if self.progress_pattern.search(text.lower()):
+            result = self._parse_progress(text)
+            self.parse_cache.put(text, result, vocabulary_version)
+            return result
+        
+        if self.query_pattern.search(text.lower()):
+            result = self._parse_query(text)
+            self.parse_cache.put(text, result, vocabulary_version)
+            return result
+        
+        vocabulary = self._task_vocabulary(known_tasks, vocabulary_version)
+        result = self._parse_dependency(text, vocabulary)
+        if result is not None:
+            self.parse_cache.put(text, result, vocabulary_version)
+            return result
+        
+        # Preprocess text
+        if processed_text is None:
+            processed_text = self._preprocess_text(text)
+        if doc is None:
+            doc = self.nlp(text)
+        text_lower = text.lower()
+        
+        # First, identify specific commands from the text patterns
+        # This is high-priority matching that overrides ML classification
+        intent = None
+        
+        # Identify command type by explicit patterns
+        if "update" in text_lower and "status" in text_lower:
+            intent = "update_status"
+        elif "update" in text_lower and ("start date" in text_lower or "finish date" in text_lower):
+            intent = "update_date"
+        elif "add" in text_lower:
+            intent = "create_task"
+        elif "delete" in text_lower or "remove" in text_lower:
+            intent = "delete_task"
+        
+        # If no explicit pattern found, use ML classification
+        model_version = None
+        if not intent:
+            model_version = self._serving_model_version()
+            intent, confidence = self._classify_intent(processed_text)
+        else:
+            confidence = 1.0  # High confidence for explicit pattern matches
+        
+        # Extract task name using specific pattern matching first
+        task_name = None
+        
+        # Handle door, stair, slab, window tasks with exact pattern matching
+        task_patterns = [
+            (r'door\s+(\d+)\s+installation', 'Door {0} Installation'),
+            (r'stair\s+(\d+)', 'Stair {0}'),
+            (r'slab\s+([a-zA-Z])', 'Slab {0}'),
+            (r'window\s+([a-zA-Z])', 'Window {0}'),
+            (r'\bpainting\b', 'Painting'),
+            (r'\brailing\b', 'Railing')
+        ]
+        
+        for pattern, template in task_patterns:
+            match = re.search(pattern, text_lower)
+            if match:
+                if len(match.groups()) > 0:
+                    task_name = template.format(match.group(1).upper())
+                else:
+                    task_name = template
+                break
+        
+        # If no specific pattern match, use general extraction
+        if not task_name:
+            task_name = self._extract_task_name_enhanced(text, doc)
+        
+        # Resolve loosely phrased names onto tasks that already exist
+        if intent != 'create_task':
+            task_name = self._match_known_task(task_name, vocabulary)
+        
+        # Extract status with special handling for specific patterns
+        status = None
+        
+        # Check for explicit status keywords first
+        status_keywords = {
+            "complete": ["complete", "completed", "finish", "finished"],
+            "in progress": ["in progress", "ongoing", "start"],
+            "on hold": ["on hold", "hold"],
+            "suspended": ["suspended", "suspend"],
+            "not started": ["not started", "not start"]
+        }
+        
+        # Direct status keyword matching
+        for status_value, keywords in status_keywords.items():
+            if any(keyword in text_lower for keyword in keywords):
+                status = status_value
+                break
+        
+        # Additional patterns for specific phrasings
+        status_patterns = [
+            (r'to\s+suspended', 'suspended'),
+            (r'to\s+not\s+start(ed)?', 'not started'),
+            (r'as\s+suspended', 'suspended'),
+            (r'as\s+not\s+start(ed)?', 'not started')
+        ]
+        
+        for pattern, status_value in status_patterns:
+            if re.search(pattern, text_lower):
+                status = status_value
+                break
+        
+        # If no direct match, use semantic similarity
+        if not status and intent == 'update_status':
+            status, _ = self._extract_status_enhanced(text)
+        
+        # Extract dates
+        dates = self._extract_date_enhanced(text)
+        
+        # Prepare entities
+        entities = {
+            'task_name': task_name,
+            'dates': dates,
+            'status': status,
+            'confidence': confidence
+        }
+        
+        result = CommandResult(
+            text=text,
+            intent=intent,
+            entities=entities,
+            processed_text=processed_text
+        )
+        self.parse_cache.put(text, result, vocabulary_version, model_version)
+        return result
+
+    def _parse_bulk_shift(self, text: str) -> Optional[CommandResult]:
+        """Parse a bulk shift into a task selector and a signed day offset"""
+        text_lower = text.lower()
+        offset = self.shift_offset_pattern.search(text_lower)
+        if not offset:
+            return None
+        
+        count, unit = offset.groups()
+        days = NUMBER_WORDS.get(count) or int(count)
+        if unit == 'week':
+            days *= 7
+        if self.shift_backward_pattern.search(text_lower):
+            days = -days
+        
+        remainder = text_lower[:offset.start()] + ' ' + text_lower[offset.end():]
+        
+        floor = None
+        floor_match = re.search(self.construction_patterns['floor_pattern'], remainder)
+        if floor_match:
+            floor = floor_match.group(1).replace('ground', 'main')
+            remainder = remainder.replace(floor_match.group(0), ' ')
+        
+        status, remainder = self._extract_status_phrase(remainder, self.status_mapping)
+        
+        # Whatever is left names the tasks, tokenized exactly as the task index tokenizes names
+        words = [word for word in re.findall(r"[a-z0-9#]+", remainder)
+                 if word not in self.shift_filler_words and word not in NUMBER_WORDS]
+        name_tokens = tokenize(' '.join(words))
+        
+        return CommandResult(
+            text=text,
+            intent='bulk_shift',
+            entities={
+                'task_name': None,
+                'selector': {'name_tokens': name_tokens, 'floor': floor, 'status': status},
+                'shift_days': days,
+                'dates': {},
+                'status': None,
+                'confidence': 1.0
+            }
+        )
+    
+    def _extract_status_phrase(self, text_lower: str, mapping: Dict[str, List[str]]) -> Tuple[Optional[str], str]:
+        """Find a status keyword and return it with the text that remains once it is removed.
+        
+        Longest keywords are tried first so "not started" wins over "started".
+        """
+        status_keywords = sorted(
+            ((keyword, status_value) for status_value, keywords in mapping.items() for keyword in keywords),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        for keyword, status_value in status_keywords:
+            pattern = rf'\b{keyword}\b'
+            if re.search(pattern, text_lower):
+                return status_value, re.sub(pattern, ' ', text_lower)
+        return None, text_lower
+    
+    def _parse_query(self, text: str) -> CommandResult:
+        """Parse a schedule question into index filters"""
+        text_lower = text.lower().replace("'", " ")
+        today = date.today()
+        start_from = start_to = None
+        
+        # Calendar windows first, then explicit dates from the grammar
+        if re.search(r'\bthis week\b', text_lower):
+            start_from, start_to = today, today + timedelta(days=6 - today.weekday())
+        elif re.search(r'\bnext week\b', text_lower):
+            start_from = today + timedelta(days=7 - today.weekday())
+            start_to = start_from + timedelta(days=6)
+        elif re.search(r'\bthis month\b', text_lower):
+            start_from, start_to = today, today.replace(day=monthrange(today.year, today.month)[1])
+        elif re.search(r'\bnext month\b', text_lower):
+            first = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+            start_from, start_to = first, first.replace(day=monthrange(first.year, first.month)[1])
+        else:
+            matches = self.date_grammar.find_all(text_lower)
+            if len(matches) >= 2:
+                start_from, start_to = matches[0].value.date(), matches[1].value.date()
+            elif matches:
+                value = matches[0].value.date()
+                before = text_lower[:matches[0].span[0]]
+                if re.search(r'\b(before|by|until)\s*$', before):
+                    start_to = value
+                elif re.search(r'\b(after|from|since)\s*$', before):
+                    start_from = value
+                else:
+                    start_from = start_to = value
+            for match in reversed(matches):
+                text_lower = text_lower[:match.span[0]] + ' ' + text_lower[match.span[1]:]
+        
+        status, remainder = self._extract_status_phrase(text_lower, self.query_status_phrases)
+        
+        tokens = []
+        floor_match = re.search(self.construction_patterns['floor_pattern'], remainder)
+        if floor_match:
+            tokens += [floor_match.group(1), 'floor']
+            remainder = remainder.replace(floor_match.group(0), ' ')
+        tokens += [word for word in re.findall(r'[a-z0-9]+', remainder) if word not in self.query_filler_words]
+        
+        return CommandResult(
+            text=text,
+            intent='query_tasks',
+            entities={
+                'task_name': None,
+                'query': {
+                    'tokens': tokens,
+                    'status': status,
+                    'start_from': start_from,
+                    'start_to': start_to,
+                    'critical': bool(re.search(r'\bcritical\b', text_lower)),
+                    'late': bool(re.search(r'\b(late|behind|slipping)\b', text_lower)),
+                    'conflicting': bool(re.search(r'\b(overlap\w*|clash\w*|conflict\w*)\b', text_lower)),
+                    'count_only': bool(re.search(r'\bhow many\b', text_lower))
+                },
+                'dates': {},
+                'status': status,
+                'confidence': 1.0
+            }
+        )
+    
+    def _answer_query(self, command: CommandResult, gui) -> None:
+        """Answer a schedule question from the TaskManager index"""
+        query = command.entities['query']
+        task_manager = gui.task_manager
+        names = task_manager.query_tasks(
+            tokens=query['tokens'],
+            status=query['status'],
+            start_from=query['start_from'],
+            start_to=query['start_to'],
+            critical=query.get('critical', False),
+            late=query.get('late', False),
+            conflicting=query.get('conflicting', False)
+        )
+        
+        if not names:
+            gui.display_message("VISA4D: No tasks match that.", is_user=False)
+            return
+        if query['count_only']:
+            gui.display_message(f"VISA4D: {len(names)} task(s) match.", is_user=False)
+            return
+        
+        listing_limit = 15
+        lines = [f"{len(names)} task(s) found:"]
+        for name in names[:listing_limit]:
+            details = [task_manager.task_statuses.get(name, 'no status')]
+            if task_manager.task_dates.get(name):
+                details.append(f"starts {task_manager.task_dates[name]}")
+            flags = task_manager.schedule_flags(name)
+            if flags['late_by']:
+                details.append(f"{flags['late_by']} day(s) late")
+            if flags['critical']:
+                details.append("critical")
+            elif flags['total_float'] is not None and task_manager.schedule.predecessors(name):
+                details.append(f"{flags['total_float']} day(s) float")
+            overlaps = task_manager.zone_conflicts(name)
+            if overlaps:
+                details.append(f"overlaps {len(overlaps)} task(s) in {task_manager.zones.zone(name)}")
+            lines.append(f"• {name} ({', '.join(details)})")
+        if len(names) > listing_limit:
+            lines.append(f"…and {len(names) - listing_limit} more.")
+        gui.display_message("VISA4D: " + "\n".join(lines), is_user=False)
+    
+    def _parse_progress(self, text: str) -> CommandResult:
+        """Parse a progress question into the floor/zone and trade it asks about"""
+        _, trade = infer_path(text)
+        return CommandResult(
+            text=text,
+            intent='progress_query',
+            entities={
+                'task_name': None,
+                'scope': {
+                    'zone': zone_of(text),
+                    'trade': None if trade == TASK_HIERARCHY['GENERAL_TRADE'] else trade
+                },
+                'dates': {},
+                'status': None,
+                'confidence': 1.0
+            }
+        )
+    
+    def _answer_progress(self, command: CommandResult, gui) -> None:
+        """Answer a progress question from the TaskManager roll-ups"""
+        task_manager = gui.task_manager
+        scope = command.entities['scope']
+        if scope['zone'] and scope['trade']:
+            summary = task_manager.progress(scope['trade'], within=scope['zone'])
+            label = f"{scope['trade']} on the {scope['zone']}"
+        elif scope['zone'] or scope['trade']:
+            summary = task_manager.progress(scope['zone'] or scope['trade'])
+            label = f"the {scope['zone']}" if scope['zone'] else scope['trade']
+        else:
+            # Explicitly defined groups (e.g. "building a") are matched by name
+            text_lower = command.text.lower()
+            group = next((name for name in task_manager.tree.groups() if re.search(rf'\b{re.escape(name)}\b', text_lower)), None)
+            summary = task_manager.progress(group)
+            label = group or "the project"
+        
+        if not summary or not summary['tasks']:
+            gui.display_message(f"VISA4D: I don't have any tasks with a status for {label}.", is_user=False)
+            return
+        
+        breakdown = ", ".join(f"{count} {status}" for status, count in sorted(summary['status_counts'].items()))
+        gui.display_message(
+            f"VISA4D: {label[0].upper() + label[1:]} is {summary['percent_complete']:.0f}% complete "
+            f"({summary['tasks']} task(s): {breakdown}). Overall status: {summary['status']}.",
+            is_user=False
+        )
+    
+    def _parse_history(self, text: str) -> CommandResult:
+        """Parse a change history question into what it asks for and over which period"""
+        text_lower = re.sub(r'\s+', ' ', text.lower())
+        # The period is kept as words and resolved when answering, so cached parses never go stale
+        period = next((period for period in self.history_periods if period in text_lower), 'this week')
+        return CommandResult(
+            text=text,
+            intent='history_query',
+            entities={
+                'task_name': None,
+                'history': {
+                    'kind': 'slippage' if re.search(r'\bslipp(?:age|ed)\b', text_lower) else 'changes',
+                    'period': period
+                },
+                'dates': {},
+                'status': None,
+                'confidence': 1.0
+            }
+        )
+    
+    @staticmethod
+    def _period_range(period: str, today: date) -> Tuple[date, date]:
+        if period == 'today':
+            return today, today
+        if period == 'yesterday':
+            return today - timedelta(days=1), today - timedelta(days=1)
+        if period == 'last week':
+            monday = today - timedelta(days=today.weekday() + 7)
+            return monday, monday + timedelta(days=6)
+        if period == 'this month':
+            return today.replace(day=1), today
+        if period == 'last month':
+            last_day = today.replace(day=1) - timedelta(days=1)
+            return last_day.replace(day=1), last_day
+        return today - timedelta(days=today.weekday()), today
+    
+    def _answer_history(self, command: CommandResult, gui) -> None:
+        """Answer "what changed" and slippage questions from the change history"""
+        task_manager = gui.task_manager
+        history = command.entities['history']
+        since, until = self._period_range(history['period'], date.today())
+        
+        if history['kind'] == 'slippage':
+            parts = []
+            for field, label in (('date', 'Start'), ('end_date', 'Finish')):
+                slip = task_manager.slippage(since, until, field)
+                if slip['changes']:
+                    parts.append(f"{label} dates moved a net {slip['total_days']:+d} day(s) across "
+                                 f"{slip['changes']} change(s) to {slip['tasks']} task(s)")
+            if not parts:
+                gui.display_message(f"VISA4D: No dates were moved {history['period']}.", is_user=False)
+                return
+            gui.display_message(f"VISA4D: {'. '.join(parts)} {history['period']}.", is_user=False)
+            return
+        
+        limit = 15
+        changes = task_manager.recent_changes(since, until, limit=limit + 1)
+        if not changes:
+            gui.display_message(f"VISA4D: Nothing changed {history['period']}.", is_user=False)
+            return
+        lines = []
+        for change in changes[:limit]:
+            if change['field'] == 'task':
+                what = 'added' if change['new'] else 'removed'
+            else:
+                label = {'status': 'status', 'date': 'start', 'end_date': 'finish'}[change['field']]
+                what = f"{label} {change['old'] or 'unset'} → {change['new'] or 'unset'}"
+            by = f" ({change['source']}{', ' + change['user'] if change['user'] else ''})"
+            lines.append(f"• {change['time'].strftime('%b %d %H:%M')} {change['task']}: {what}{by}")
+        more = " (most recent first; more not shown)" if len(changes) > limit else ""
+        gui.display_message(f"VISA4D: Changes {history['period']}{more}:\n" + "\n".join(lines), is_user=False)
+    
+    def _process_undo(self, redo: bool, gui) -> None:
+        """Undo or redo the last command's task changes, locally and in Timeliner"""
+        report = gui.task_manager.redo() if redo else gui.task_manager.undo()
+        action = "redo" if redo else "undo"
+        if report is None:
+            gui.display_message(f"VISA4D: There is nothing to {action}.", is_user=False)
+            return
+        done = "Redid" if redo else "Undid"
+        message = f"VISA4D: {done} \"{report['label']}\" ({report['tasks']} task(s))."
+        if report['failed']:
+            message += f" {report['failed']} change(s) could not be sent to Timeliner."
+        gui.display_message(message, is_user=False)
+    
+    def _parse_dependency(self, text: str, vocabulary: TaskVocabulary = None) -> Optional[CommandResult]:
+        """Parse "X starts N days after Y finishes" / "X depends on Y" into a dependency command"""
+        text_clean = re.sub(r'[.!]+$', '', text.strip().lower())
+        for pattern in self.dependency_patterns:
+            match = pattern.match(text_clean)
+            if not match:
+                continue
+            groups = match.groupdict()
+            anchor = groups.get('anchor') or ''
+            lag = groups.get('lag')
+            successor = re.sub(r'^(?:the|task)\s+', '', match.group('successor')).strip()
+            predecessor = re.sub(r'^(?:the|task)\s+', '', match.group('predecessor')).strip()
+            if vocabulary is not None:
+                successor = self._match_known_task(successor, vocabulary) or successor
+                predecessor = self._match_known_task(predecessor, vocabulary) or predecessor
+            return CommandResult(
+                text=text,
+                intent='add_dependency',
+                entities={
+                    'task_name': successor,
+                    'dependency': {
+                        'predecessor': predecessor,
+                        'type': 'SS' if anchor in ('starts', 'begins') else 'FS',
+                        'lag': (NUMBER_WORDS.get(lag) or int(lag)) if lag else 0
+                    },
+                    'dates': {},
+                    'status': None,
+                    'confidence': 1.0
+                }
+            )
+        return None
+    
+    def _process_dependency(self, command: CommandResult, gui) -> None:
+        """Record a dependency and report what it does to the schedule"""
+        task_manager = gui.task_manager
+        successor = command.entities['task_name']
+        dependency = command.entities['dependency']
+        before = self._schedule_snapshot(task_manager, [successor])
+        if not task_manager.add_dependency(successor, dependency['predecessor'], dependency['type'], dependency['lag']):
+            gui.display_message(
+                f"VISA4D: I couldn't link '{successor}' to '{dependency['predecessor']}'. "
+                "Check that both tasks exist and that this doesn't create a loop.",
+                is_user=False
+            )
+            return
+        
+        anchor = "finishes" if dependency['type'] == 'FS' else "starts"
+        lag_text = f"{dependency['lag']} day(s) after" if dependency['lag'] else "after"
+        response = f"'{successor}' now starts {lag_text} '{dependency['predecessor']}' {anchor}."
+        warning = self._schedule_warning(task_manager, before)
+        gui.display_message(f"VISA4D: {response}{warning}", is_user=False)
+    
+    def _schedule_snapshot(self, task_manager, task_names: List[str]) -> Dict[str, Any]:
+        """Late tasks and the zone conflicts of task_names, taken before a change"""
+        return {
+            'late': task_manager.late_tasks(),
+            'conflicts': {name: set(task_manager.zone_conflicts(name)) for name in task_names if name}
+        }
+    
+    def _schedule_warning(self, task_manager, before: Dict[str, Any]) -> str:
+        """Describe tasks that became (more) late and zone overlaps created since the snapshot"""
+        warnings = []
+        
+        newly_late = {name: days for name, days in task_manager.late_tasks().items()
+                      if days > before['late'].get(name, 0)}
+        if newly_late:
+            listed = sorted(newly_late.items(), key=lambda item: -item[1])[:5]
+            details = ", ".join(f"'{name}' by {days} day(s)" for name, days in listed)
+            more = f" and {len(newly_late) - len(listed)} more" if len(newly_late) > len(listed) else ""
+            warnings.append(f"Heads up: downstream work now starts too early: {details}{more}.")
+        
+        new_pairs = set()
+        for name, previous in before['conflicts'].items():
+            for other in task_manager.zone_conflicts(name):
+                if other not in previous:
+                    new_pairs.add(tuple(sorted((name, other))))
+        if new_pairs:
+            listed = sorted(new_pairs)[:5]
+            details = ", ".join(f"'{a}' and '{b}' ({task_manager.zones.zone(a)})" for a, b in listed)
+            more = f" and {len(new_pairs) - len(listed)} more" if len(new_pairs) > len(listed) else ""
+            warnings.append(f"Conflict: these now overlap in the same area: {details}{more}.")
+        
+        return "".join(f" {warning}" for warning in warnings)
+    
+    def _process_bulk_shift(self, command: CommandResult, gui) -> None:
+        """Preview a bulk shift and hold it for confirmation"""
+        selector = command.entities['selector']
+        days = command.entities['shift_days']
+        task_names = gui.task_manager.select_tasks(**selector)
+        operations = gui.task_manager.plan_shift(task_names, days)
+        
+        if not operations:
+            gui.display_message("VISA4D: I couldn't find any scheduled tasks matching that selection.", is_user=False)
+            return
+        
+        direction = "later" if days > 0 else "earlier"
+        lines = [f"This will move {len(operations)} task(s) {abs(days)} day(s) {direction}:"]
+        preview_limit = CONFIRMATION_SETTINGS['PREVIEW_LIMIT']
+        for operation in operations[:preview_limit]:
+            lines.append(f"• {operation['task_name']}: {operation['previous_date']} → {operation['date']}")
+        if len(operations) > preview_limit:
+            lines.append(f"…and {len(operations) - preview_limit} more.")
+        lines.append("Shall I apply these changes?")
+        
+        self.confirmations.push("\n".join(lines), command, operations)
+        self._prompt_confirmation(gui)
+    
+    def _confirmation_prompt(self, command: CommandResult) -> str:
+        if command.intent == 'delete_task':
+            return f"Delete task '{command.entities['task_name']}'?"
+        return f"Apply \"{command.text}\"?"
+    
+    def _prompt_confirmation(self, gui) -> None:
+        """Show the command at the head of the confirmation queue"""
+        pending = self.confirmations.current()
+        gui.state['awaiting_confirmation'] = pending is not None
+        if pending is None:
+            return
+        message = f"VISA4D: {pending.prompt} (yes/no)"
+        waiting = len(self.confirmations) - 1
+        if waiting:
+            message += f"\n{waiting} more change(s) are waiting; say \"yes to all\" or \"no to all\" to answer them together."
+        gui.display_message(message, is_user=False)
+    
+    def _build_operation(self, command: CommandResult) -> Optional[Dict[str, Any]]:
+        """Translate a parsed command into a TaskManager operation"""
+        intent = command.intent
+        entities = command.entities
+        text_lower = command.text.lower()
+        
+        if intent == 'create_task':
+            # FIXED: Handle None values properly for start_date and end_date
+            dates = entities['dates']
+            
+            # Always use a valid start_date
+            start_date = dates.get('start_date')
+            if start_date is None:
+                start_date = datetime.now()
+            
+            # Set a valid end_date
+            end_date = dates.get('end_date')
+            if end_date is None:
+                # Now start_date is guaranteed to be non-None
+                end_date = start_date + timedelta(days=30)
+            
+            return {
+                'action': 'create_task',
+                'task_name': entities['task_name'],
+                'start_date': start_date,
+                'end_date': end_date
+            }
+            
+        elif intent == 'update_status':
+            return {
+                'action': 'update_status',
+                'task_name': entities['task_name'],
+                'status': entities['status']
+            }
+            
+        elif intent == 'update_date':
+            dates = entities['dates']
+            
+            # Determine which date to use
+            if "finish date" in text_lower:
+                # Store internally that this was meant to be a finish date
+                entities['dates']['date_type'] = 'finish'
+                target_date = dates.get('end_date') or dates.get('start_date')
+            else:
+                entities['dates']['date_type'] = 'start'
+                target_date = dates.get('start_date') or dates.get('end_date')
+            
+            if target_date:
+                return {
+                    'action': 'update_date',
+                    'task_name': entities['task_name'],
+                    'date': target_date.strftime("%B %d, %Y"),
+                    'date_type': entities['dates']['date_type']
+                }
+            
+        elif intent == 'delete_task':
+            return {
+                'action': 'delete_task',
+                'task_name': entities['task_name']
+            }
+        
+        return None
+    
+    def _execute_command(self, command: CommandResult, task_manager) -> bool:
+        """Apply a parsed command through the task manager"""
+        operation = self._build_operation(command)
+        if operation is None:
+            return False
+        return task_manager.apply_operation(operation)
+    
+    def _process_batch(self, clauses: List[str], gui) -> None:
+        """Parse every clause in one pass and apply them as a single grouped TaskManager operation"""
+        commands = self.parse_commands(
+            clauses,
+            known_tasks=gui.task_manager.known_tasks,
+            vocabulary_version=gui.task_manager.vocabulary_version
+        )
+        
+        lines = []
+        operations = []
+        planned = []
+        held = []
+        for command in commands:
+            self._update_context(command.intent, command.entities)
+            operation = None
+            if self._validate_command(command.intent, command.entities) or command.entities['task_name']:
+                operation = self._build_operation(command)
+            if operation is None:
+                planned.append((command, None))
+            elif command.intent in CONFIRMATION_SETTINGS['CONFIRM_INTENTS']:
+                planned.append((command, None))
+                held.append((command, operation))
+            else:
+                planned.append((command, len(operations)))
+                operations.append(operation)
+        
+        # Last chance to cancel: once the batch is sent to Navisworks it runs to completion
+        checkpoint("Updating Navisworks" if operations else None)
+        before = self._schedule_snapshot(gui.task_manager, [operation['task_name'] for operation in operations])
+        results = gui.task_manager.apply_batch(operations) if operations else []
+        
+        held_commands = {id(command) for command, _ in held}
+        for i, (command, op_index) in enumerate(planned, start=1):
+            if id(command) in held_commands:
+                message = f"Waiting for confirmation: {self._confirmation_prompt(command)}"
+            elif op_index is None:
+                message = self._generate_clarification_request(command.intent, command.entities)
+            elif results[op_index]:
+                message = self._generate_response(command.intent, command.entities)
+                self.context['last_command'] = command
+            else:
+                message = f"There was an error processing '{command.text}'."
+            lines.append(f"{i}. {message}")
+        
+        warning = self._schedule_warning(gui.task_manager, before)
+        if warning:
+            lines.append(warning.strip())
+        gui.display_message("VISA4D: " + "\n".join(lines), is_user=False)
+        
+        for command, operation in held:
+            self.confirmations.push(self._confirmation_prompt(command), command, [operation])
+        if held:
+            self._prompt_confirmation(gui)
+    
+    @staticmethod
+    def _describe_operation(operation: Dict[str, Any]) -> str:
+        task = operation['task_name']
+        action = operation['action']
+        if action == 'update_status':
+            return f"{task}: mark {operation['status']}"
+        if action == 'update_date':
+            return f"{task}: {operation['date_type']} date → {operation['date']}"
+        if action == 'create_task':
+            return f"create {task} ({operation['start_date']:%B %d, %Y} → {operation['end_date']:%B %d, %Y})"
+        if action == 'delete_task':
+            return f"delete {task}"
+        return f"{task}: {action}"
+    
+    def process_memos(self, memos: List[Tuple[str, str]], gui) -> None:
+        """Parse transcribed voice memos (name, transcript) in one batch and queue each memo's changes for approval"""
+        vocabulary = self._task_vocabulary(gui.task_manager.known_tasks, gui.task_manager.vocabulary_version)
+        clauses = [(name, clause) for name, text in memos if text
+                   for clause in self._segment_clauses(text, vocabulary)]
+        commands = self.parse_commands(
+            [clause for _, clause in clauses],
+            known_tasks=gui.task_manager.known_tasks,
+            vocabulary_version=gui.task_manager.vocabulary_version
+        )
+        checkpoint()
+        
+        changes: Dict[str, List[Dict[str, Any]]] = {}
+        unclear = []
+        for (name, clause), command in zip(clauses, commands):
+            operation = self._build_operation(command) if command.entities.get('task_name') else None
+            if operation is None:
+                unclear.append(f"• {name}: \"{clause}\"")
+            else:
+                changes.setdefault(name, []).append(operation)
+        
+        preview_limit = CONFIRMATION_SETTINGS['PREVIEW_LIMIT']
+        total = sum(len(operations) for operations in changes.values())
+        lines = [f"Found {total} change(s) in {len(changes)} of {len(memos)} memo(s)."]
+        if unclear:
+            lines.append("I couldn't turn these into changes:")
+            lines.extend(unclear[:preview_limit])
+            if len(unclear) > preview_limit:
+                lines.append(f"…and {len(unclear) - preview_limit} more.")
+        gui.display_message("VISA4D: " + "\n".join(lines), is_user=False)
+        
+        for name, operations in changes.items():
+            prompt = [f"From {name}:"] + [f"• {self._describe_operation(operation)}" for operation in operations[:preview_limit]]
+            if len(operations) > preview_limit:
+                prompt.append(f"…and {len(operations) - preview_limit} more.")
+            prompt.append("Apply these changes?")
+            self.confirmations.push("\n".join(prompt), None, operations)
+        self._prompt_confirmation(gui)
+    
+    def _is_structured_command(self, text_lower: str) -> bool:
+        """Commands parsed whole by their own patterns rather than split into clauses"""
+        return bool(self.bulk_shift_pattern.search(text_lower) or self.query_pattern.search(text_lower)
+                    or self.progress_pattern.search(text_lower) or self.history_pattern.search(text_lower)
+                    or any(pattern.match(text_lower.strip()) for pattern in self.dependency_patterns))
+    
+    def speculate(self, text: str, known_tasks: KnownTasks = None, vocabulary_version: int = 0) -> None:
+        """Parse a partial transcript the way process_command would, so a matching
+        final transcript is served from the parse cache"""
+        if self._is_structured_command(text.lower()):
+            clauses = [text]
+        else:
+            clauses = self._segment_clauses(text, self._task_vocabulary(known_tasks, vocabulary_version))
+        if len(clauses) > 1:
+            self.parse_commands(clauses, known_tasks, vocabulary_version)
+        else:
+            self.parse_command(text, known_tasks, vocabulary_version)
+    
     def process_command(self, text: str, gui) -> None:
         """Process command and interact with GUI while maintaining existing interface"""
         try:
-            if gui.state['awaiting_confirmation']:
+            checkpoint("Understanding your command")
+            if self.confirmations.state == 'awaiting':
                 self._handle_confirmation(text, gui)
                 return
-    
-            # Preprocess text
-            processed_text = self._preprocess_text(text)
-            doc = self.nlp(text)
+            
             text_lower = text.lower()
+            undo_match = self.undo_pattern.match(text_lower)
+            if undo_match:
+                self._process_undo(bool(undo_match.group('redo')), gui)
+                return
             
-            # First, identify specific commands from the text patterns
-            # This is high-priority matching that overrides ML classification
-            intent = None
-            
-            # Identify command type by explicit patterns
-            if "update" in text_lower and "status" in text_lower:
-                intent = "update_status"
-            elif "update" in text_lower and ("start date" in text_lower or "finish date" in text_lower):
-                intent = "update_date"
-            elif "add" in text_lower:
-                intent = "create_task"
-            elif "delete" in text_lower or "remove" in text_lower:
-                intent = "delete_task"
-            
-            # If no explicit pattern found, use ML classification
-            if not intent:
-                # Get intent with confidence
-                intent_proba = self.intent_classifier.predict_proba([processed_text])[0]
-                intent_idx = intent_proba.argmax()
-                intent = self.intent_classifier.classes_[intent_idx]
-                confidence = intent_proba[intent_idx]
-            else:
-                confidence = 1.0  # High confidence for explicit pattern matches
-            
-            # Extract task name using specific pattern matching first
-            task_name = None
-            
-            # Handle door, stair, slab, window tasks with exact pattern matching
-            task_patterns = [
-                (r'door\s+(\d+)\s+installation', 'Door {0} Installation'),
-                (r'stair\s+(\d+)', 'Stair {0}'),
-                (r'slab\s+([a-zA-Z])', 'Slab {0}'),
-                (r'window\s+([a-zA-Z])', 'Window {0}'),
-                (r'\bpainting\b', 'Painting'),
-                (r'\brailing\b', 'Railing')
-            ]
-            
-            for pattern, template in task_patterns:
-                match = re.search(pattern, text_lower)
-                if match:
-                    if len(match.groups()) > 0:
-                        task_name = template.format(match.group(1).upper())
-                    else:
-                        task_name = template
-                    break
-            
-            # If no specific pattern match, use general extraction
-            if not task_name:
-                task_name = self._extract_task_name_enhanced(text, doc)
-            
-            # Extract status with special handling for specific patterns
-            status = None
-            
-            # Check for explicit status keywords first
-            status_keywords = {
-                "complete": ["complete", "completed", "finish", "finished"],
-                "in progress": ["in progress", "ongoing", "start"],
-                "on hold": ["on hold", "hold"],
-                "suspended": ["suspended", "suspend"],
-                "not started": ["not started", "not start"]
-            }
+            correction = self.correction_pattern.match(text)
+            if correction and self.context['last_command'] is not None:
+                self._process_correction(correction.group('command'), gui)
+                return
             
-            # Direct status keyword matching
-            for status_value, keywords in status_keywords.items():
-                if any(keyword in text_lower for keyword in keywords):
-                    status = status_value
-                    break
-            
-            # Additional patterns for specific phrasings
-            status_patterns = [
-                (r'to\s+suspended', 'suspended'),
-                (r'to\s+not\s+start(ed)?', 'not started'),
-                (r'as\s+suspended', 'suspended'),
-                (r'as\s+not\s+start(ed)?', 'not started')
-            ]
-            
-            for pattern, status_value in status_patterns:
-                if re.search(pattern, text_lower):
-                    status = status_value
-                    break
-            
-            # If no direct match, use semantic similarity
-            if not status and intent == 'update_status':
-                status, _ = self._extract_status_enhanced(text)
-            
-            # Extract dates
-            dates = self._extract_date_enhanced(text, doc)
-            
-            # Special handling for finish dates
-            if "finish date" in text_lower and dates.get('start_date'):
-                dates['end_date'] = dates['start_date']
-                dates['start_date'] = None
-                dates['date_type'] = 'finish'
-            
-            # Prepare entities
-            entities = {
-                'task_name': task_name,
-                'dates': dates,
-                'status': status,
-                'confidence': confidence
-            }
+            if self._is_structured_command(text_lower):
+                command = self.parse_command(
+                    text,
+                    known_tasks=gui.task_manager.known_tasks,
+                    vocabulary_version=gui.task_manager.vocabulary_version
+                )
+                if command.intent == 'bulk_shift':
+                    self._process_bulk_shift(command, gui)
+                    return
+                if command.intent == 'query_tasks':
+                    self._answer_query(command, gui)
+                    return
+                if command.intent == 'progress_query':
+                    self._answer_progress(command, gui)
+                    return
+                if command.intent == 'history_query':
+                    self._answer_history(command, gui)
+                    return
+                if command.intent == 'add_dependency':
+                    self._process_dependency(command, gui)
+                    return
+            
+            vocabulary = self._task_vocabulary(gui.task_manager.known_tasks, gui.task_manager.vocabulary_version)
+            clauses = self._segment_clauses(text, vocabulary)
+            if len(clauses) > 1:
+                self._process_batch(clauses, gui)
+                return
+            
+            command = self.parse_command(
+                text,
+                known_tasks=gui.task_manager.known_tasks,
+                vocabulary_version=gui.task_manager.vocabulary_version
+            )
+            intent, entities = command.intent, command.entities
             
             # Update context
             self._update_context(intent, entities)
             
             # Process the command
+            if intent in CONFIRMATION_SETTINGS['CONFIRM_INTENTS'] and entities['task_name']:
+                operation = self._build_operation(command)
+                if operation is not None:
+                    self.confirmations.push(self._confirmation_prompt(command), command, [operation])
+                    self._prompt_confirmation(gui)
+                    return
+            
             if self._validate_command(intent, entities) or entities['task_name']:
-                success = False
-                
-                # Apply the command based on intent
-                if intent == 'create_task':
-                    # FIXED: Handle None values properly for start_date and end_date
-                    dates = entities['dates']
-                    
-                    # Always use a valid start_date
-                    start_date = dates.get('start_date')
-                    if start_date is None:
-                        start_date = datetime.now()
-                    
-                    # Set a valid end_date
-                    end_date = dates.get('end_date')
-                    if end_date is None:
-                        # Now start_date is guaranteed to be non-None
-                        end_date = start_date + timedelta(days=30)
-                    
-                    success = gui.task_manager.create_task(
-                        task_name=entities['task_name'],
-                        start_date=start_date,
-                        end_date=end_date
-                    )
-                    
-                elif intent == 'update_status':
-                    success = gui.task_manager.update_task_status(
-                        task_name=entities['task_name'],
-                        status=entities['status']
-                    )
-                    
-                elif intent == 'update_date':
-                    # FIXED: Handle the method without date_type parameter
-                    dates = entities['dates']
-                    target_date = None
-                    
-                    # Determine which date to use
-                    if "finish date" in text_lower:
-                        # Store internally that this was meant to be a finish date
-                        entities['dates']['date_type'] = 'finish'
-                        target_date = dates.get('end_date', dates.get('start_date'))
-                    else:
-                        entities['dates']['date_type'] = 'start'
-                        target_date = dates.get('start_date', dates.get('end_date'))
-                    
-                    if target_date:
-                        date_str = target_date.strftime("%B %d, %Y")
-                        # Call without date_type parameter
-                        success = gui.task_manager.update_task_date(
-                            task_name=entities['task_name'],
-                            date=date_str
-                        )
-                    
-                elif intent == 'delete_task':
-                    success = gui.task_manager.delete_task(
-                        task_name=entities['task_name']
-                    )
+                checkpoint("Updating Navisworks")
+                before = self._schedule_snapshot(gui.task_manager, [entities['task_name']])
+                success = self._execute_command(command, gui.task_manager)
                 
                 # Generate response
                 response = self._generate_response(intent, entities)
-                if not success:
+                if success:
+                    self._learn_correction(command)
+                    self.context['last_command'] = command
+                    response += self._schedule_warning(gui.task_manager, before)
+                else:
                     response = f"There was an error processing your request. Please try again."
                 gui.display_message(f"VISA4D: {response}", is_user=False)
             else:
                 clarification_msg = self._generate_clarification_request(intent, entities)
                 gui.display_message(f"VISA4D: {clarification_msg}", is_user=False)
                 
+        except CommandCancelled:
+            raise
         except Exception as e:
             logging.error(f"Command processing error: {str(e)}")
             gui.display_message(" Sorry, I encountered an error. Please try again.", is_user=False)
     def _handle_confirmation(self, text: str, gui) -> None:
-        """Handle user confirmation of pending commands"""
-        text_lower = text.lower()
-        if any(word in text_lower for word in ['yes', 'yeah', 'correct', 'right', 'sure', 'ok']):
-            # Process the pending command
-            pending = gui.state.get('pending_command', {})
-            if pending:
-                intent = pending.get('intent')
-                entities = pending.get('entities')
-                if intent and entities:
-                    # Reset confirmation state
-                    gui.state['awaiting_confirmation'] = False
-                    gui.state['pending_command'] = None
-                    # Process the command
-                    self.process_command(text, gui)
-        else:
-            # Reset confirmation state
+        """Answer the pending confirmation; a yes runs the stored command without re-parsing"""
+        reply = classify_reply(text)
+        if reply is None or reply.startswith('no'):
+            # The correction being confirmed, if any, will not run
+            self.context['correcting'] = None
+        if self.confirmations.expire():
+            self.context['correcting'] = None
             gui.state['awaiting_confirmation'] = False
-            gui.state['pending_command'] = None
-            gui.display_message("Command cancelled. How else can I help?", is_user=False)
\ No newline at end of file
+            gui.display_message("VISA4D: That confirmation timed out, so nothing was changed.", is_user=False)
+            if reply is None:
+                self.process_command(text, gui)
+            return
+        
+        if reply is None:
+            # Anything other than an answer cancels what is pending and is treated as a new command
+            pending = self.confirmations.current()
+            if pending is not None and pending.command is not None and self.correction_pattern.match(text):
+                self.context['last_command'] = pending.command
+            dropped = self.confirmations.clear()
+            gui.state['awaiting_confirmation'] = False
+            gui.display_message(f"VISA4D: Cancelled {dropped} pending change(s).", is_user=False)
+            self.process_command(text, gui)
+            return
+        
+        if reply == 'yes':
+            self._run_confirmed([self.confirmations.take()], gui)
+        elif reply == 'yes_all':
+            self._run_confirmed(self.confirmations.take_all(), gui)
+        elif reply == 'no':
+            self.confirmations.take()
+            if not len(self.confirmations):
+                gui.display_message("Command cancelled. How else can I help?", is_user=False)
+        else:
+            self.confirmations.clear()
+            gui.display_message("Command cancelled. How else can I help?", is_user=False)
+        if self.confirmations.state != 'awaiting':
+            self.context['correcting'] = None
+        self._prompt_confirmation(gui)
+    
+    def _process_correction(self, text: str, gui) -> None:
+        """Run the corrected command; once it succeeds, learn that the previous utterance meant its intent"""
+        self.context['correcting'] = self.context['last_command']
+        self.context['last_command'] = None
+        try:
+            self.process_command(text, gui)
+        finally:
+            # A correction waiting for confirmation is settled by the reply instead
+            if self.confirmations.state != 'awaiting':
+                self.context['correcting'] = None
+    
+    def _learn_correction(self, command: CommandResult) -> None:
+        """Relabel the corrected utterance with the intent of the command that replaced it"""
+        mistaken = self.context['correcting']
+        self.context['correcting'] = None
+        if mistaken is not None and command.intent != mistaken.intent:
+            self.record_feedback(mistaken.text, command.intent, mistaken.processed_text, source='correction')
+    
+    def _run_confirmed(self, confirmed: List[PendingCommand], gui) -> None:
+        """Apply confirmed commands' stored operations as one batch"""
+        operations = [operation for pending in confirmed for operation in pending.operations]
+        before = self._schedule_snapshot(gui.task_manager, [operation['task_name'] for operation in operations])
+        results = gui.task_manager.apply_batch(operations) if operations else []
+        
+        lines = []
+        offset = 0
+        for pending in confirmed:
+            outcome = results[offset:offset + len(pending.operations)]
+            offset += len(pending.operations)
+            command = pending.command
+            if command is None or command.intent == 'bulk_shift':
+                lines.append(f"Updated {sum(outcome)} of {len(outcome)} task(s).")
+            elif all(outcome):
+                lines.append(self._generate_response(command.intent, command.entities))
+                # The user said yes to this reading, so it is a confirmed training example
+                self.record_feedback(command.text, command.intent, command.processed_text, source='confirmation')
+                self._learn_correction(command)
+                self.context['last_command'] = command
+            else:
+                lines.append(f"There was an error processing '{command.text}'.")
+        
+        warning = self._schedule_warning(gui.task_manager, before)
+        gui.display_message("VISA4D: " + "\n".join(lines) + warning, is_user=False)
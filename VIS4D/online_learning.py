@@ -0,0 +1,297 @@
+import json
+import copy
+import pickle
+import queue
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from constants import FILE_PATHS, LEARNING_SETTINGS, NLP_SETTINGS
+
+class FeedbackStore:
+    """Append-only log of confirmed utterance -> intent pairs"""
+    def __init__(self, filepath: str = FILE_PATHS['FEEDBACK_STORE']):
+        self.filepath = Path(filepath)
+        self._lock = threading.Lock()
+
+    def record(self, utterance: str, intent: str, features: str = None, source: str = 'text') -> Dict[str, Any]:
+        """Append a confirmed command to the store"""
+        entry = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'utterance': utterance,
+            'features': features if features is not None else utterance,
+            'intent': intent,
+            'source': source
+        }
+        try:
+            with self._lock, open(self.filepath, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            logging.error(f"Error recording feedback: {e}")
+        return entry
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load every recorded feedback entry"""
+        entries = []
+        if not self.filepath.exists():
+            return entries
+        try:
+            with self._lock, open(self.filepath, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entries.append(json.loads(line))
+        except Exception as e:
+            logging.error(f"Error loading feedback store: {e}")
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+class OnlineIntentModel:
+    """Incrementally trained intent classifier with versioned snapshots.
+
+    Predictions always read the currently published model; updates are
+    trained on a private copy in a background thread and swapped in once
+    finished, so learning never blocks command handling.
+    """
+    def __init__(self, classes: List[str], feedback_store: FeedbackStore = None,
+                 snapshot_dir: str = FILE_PATHS['MODEL_SNAPSHOTS']):
+        self.classes = sorted(set(classes))
+        self.feedback_store = feedback_store or FeedbackStore()
+        self.snapshot_dir = Path(snapshot_dir)
+        self.vectorizer = HashingVectorizer(
+            ngram_range=(1, 3),
+            n_features=LEARNING_SETTINGS['HASH_FEATURES'],
+            alternate_sign=False,
+            stop_words='english'
+        )
+
+        # Published state, replaced atomically by the worker
+        self.classifier: Optional[SGDClassifier] = None
+        self.version = 0
+        self.feedback_count = 0
+        self.accuracy: Optional[float] = None
+        self._seed: Tuple[List[str], List[str]] = ([], [])
+
+        # Held-out commands and the accuracy the model must match on them before it is served
+        self.holdout: Tuple[List[str], List[str]] = ([], [])
+        self.baseline_accuracy: Optional[float] = None
+
+        # Repeating an already learned example adds nothing, so skip it
+        self._learned = {(e['features'], e['intent']) for e in self.feedback_store.load()}
+
+        self._queue: queue.Queue = queue.Queue()
+        self._snapshot_lock = threading.Lock()
+        # Held from copying the published model to publishing its successor, and by rollback
+        self._publish_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def bootstrap(self, commands: List[str], labels: List[str],
+                  holdout: Tuple[List[str], List[str]] = None, baseline: float = None):
+        """Load the latest snapshot, or seed a first version from template data.
+
+        With a holdout set, the model is only trusted while its accuracy on
+        it is at least baseline (the primary classifier's). Seeding runs on
+        the worker thread so startup is not delayed.
+        """
+        self._seed = (list(commands), list(labels))
+        if holdout is not None:
+            self.holdout = (list(holdout[0]), list(holdout[1]))
+            self.baseline_accuracy = baseline
+        if self._load_snapshot(self.latest_version()):
+            logging.info(f"Loaded intent model snapshot v{self.version}")
+            return
+        self._queue.put(('__bootstrap__', (commands, labels)))
+
+    def is_ready(self) -> bool:
+        """Whether the online model has seen enough feedback and holds up on held-out commands"""
+        if self.classifier is None or self.feedback_count < LEARNING_SETTINGS['MIN_FEEDBACK']:
+            return False
+        return (self.baseline_accuracy is None or
+                (self.accuracy is not None and self.accuracy >= self.baseline_accuracy))
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """Predict an intent with its probability using the published model"""
+        classifier = self.classifier
+        if classifier is None:
+            return None, 0.0
+        proba = classifier.predict_proba(self.vectorizer.transform([text]))[0]
+        idx = int(proba.argmax())
+        return classifier.classes_[idx], float(proba[idx])
+
+    def submit(self, utterance: str, intent: str, features: str = None, source: str = 'text'):
+        """Record a confirmed command and queue it for incremental training"""
+        if intent not in self.classes:
+            logging.warning(f"Ignoring feedback for unknown intent '{intent}'")
+            return
+        key = (features if features is not None else utterance, intent)
+        if key in self._learned:
+            return
+        self._learned.add(key)
+        entry = self.feedback_store.record(utterance, intent, features, source)
+        self._queue.put((entry['features'], intent))
+
+    def wait_until_idle(self):
+        """Block until all queued feedback has been learned (used by tools and benchmarks)"""
+        self._queue.join()
+
+    def stop(self):
+        self._queue.put(None)
+
+    # Snapshot management
+    def list_versions(self) -> List[int]:
+        if not self.snapshot_dir.exists():
+            return []
+        versions = []
+        for path in self.snapshot_dir.glob("intent_model_v*.pkl"):
+            try:
+                versions.append(int(path.stem.rsplit('v', 1)[1]))
+            except ValueError:
+                continue
+        return sorted(versions)
+
+    def latest_version(self) -> Optional[int]:
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def rollback(self, version: int = None) -> bool:
+        """Publish an earlier snapshot; defaults to the one before the current version"""
+        versions = [v for v in self.list_versions() if v < self.version]
+        if version is None:
+            if not versions:
+                logging.warning("No earlier intent model snapshot to roll back to")
+                return False
+            version = versions[-1]
+        with self._publish_lock:
+            loaded = self._load_snapshot(version)
+        if loaded:
+            logging.info(f"Rolled intent model back to v{version}")
+            return True
+        return False
+
+    def _snapshot_path(self, version: int) -> Path:
+        return self.snapshot_dir / f"intent_model_v{version:04d}.pkl"
+
+    def _load_snapshot(self, version: Optional[int]) -> bool:
+        if version is None:
+            return False
+        try:
+            with self._snapshot_lock, open(self._snapshot_path(version), 'rb') as f:
+                snapshot = pickle.load(f)
+            if list(snapshot['classifier'].classes_) != self.classes:
+                # partial_fit would reject every later update, silently freezing learning
+                logging.warning(f"Intent model snapshot v{version} was trained on different intents; ignoring it")
+                return False
+            self.accuracy = self._score(snapshot['classifier'])
+            self.classifier = snapshot['classifier']
+            self.feedback_count = snapshot.get('feedback_count', 0)
+            self.version = version
+            return True
+        except Exception as e:
+            logging.error(f"Error loading intent model snapshot v{version}: {e}")
+            return False
+
+    def _save_snapshot(self, classifier: SGDClassifier, feedback_count: int) -> int:
+        with self._snapshot_lock:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            version = max([self.version] + self.list_versions()) + 1
+            with open(self._snapshot_path(version), 'wb') as f:
+                pickle.dump({
+                    'classifier': classifier,
+                    'feedback_count': feedback_count,
+                    'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }, f)
+
+            # Prune old versions
+            versions = self.list_versions()
+            for old in versions[:-LEARNING_SETTINGS['MAX_SNAPSHOTS']]:
+                self._snapshot_path(old).unlink(missing_ok=True)
+        return version
+
+    # Background training
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            # Fold whatever else is already queued into the same update
+            batch = [item]
+            stopping = False
+            while len(batch) < LEARNING_SETTINGS['BATCH_SIZE']:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(nxt)
+
+            try:
+                self._train(batch)
+            except Exception as e:
+                logging.error(f"Online intent training error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def _train(self, batch: List[Tuple[Any, Any]]):
+        texts, labels = [], []
+        feedback = 0
+        for features, label in batch:
+            if features == '__bootstrap__':
+                texts.extend(label[0])
+                labels.extend(label[1])
+            else:
+                texts.append(features)
+                labels.append(label)
+                feedback += 1
+        if not texts:
+            return
+
+        # A rollback waits for this update; its snapshot is then published on top of it
+        with self._publish_lock:
+            self._fit_and_publish(texts, labels, feedback)
+
+    def _fit_and_publish(self, texts: List[str], labels: List[str], feedback: int):
+        feedback_count = self.feedback_count + feedback
+        if self.classifier is not None and list(self.classifier.classes_) != self.classes:
+            logging.warning("Intent model classes changed; re-initializing it from seed data and this batch")
+            self.classifier = None
+            feedback_count = feedback
+            texts = self._seed[0] + texts
+            labels = self._seed[1] + labels
+        if self.classifier is None:
+            classifier = SGDClassifier(loss='log_loss', random_state=NLP_SETTINGS['RANDOM_STATE'])
+        else:
+            classifier = copy.deepcopy(self.classifier)
+        classifier.partial_fit(self.vectorizer.transform(texts), labels, classes=self.classes)
+
+        version = self._save_snapshot(classifier, feedback_count)
+        accuracy = self._score(classifier)
+
+        # Publish
+        self.accuracy = accuracy
+        self.classifier = classifier
+        self.feedback_count = feedback_count
+        self.version = version
+        logging.info(f"Intent model updated to v{version} ({feedback} new samples, "
+                     f"held-out accuracy {accuracy if accuracy is not None else 'n/a'})")
+
+    def _score(self, classifier: SGDClassifier) -> Optional[float]:
+        """Accuracy on the held-out commands, None without a holdout set"""
+        texts, labels = self.holdout
+        if not texts:
+            return None
+        predicted = classifier.predict(self.vectorizer.transform(texts))
+        return sum(p == label for p, label in zip(predicted, labels)) / len(labels)
@@ -0,0 +1,78 @@
+import copy
+import threading
+from datetime import date
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from embedding_cache import normalize_text
+from constants import CACHE_SETTINGS
+
+class ParseCache:
+    """Bounded LRU of parsed commands keyed by normalized text and calendar day.
+
+    The day is part of the key because relative dates ("tomorrow") resolve
+    against today. Each entry remembers the task vocabulary version it was
+    parsed against and, when the intent came from the classifier, the model
+    version; entries whose versions no longer match are dropped on lookup.
+    """
+    def __init__(self, max_entries: int = CACHE_SETTINGS['PARSE_MAX_ENTRIES']):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(text: str) -> Tuple[str, str]:
+        return normalize_text(text), date.today().isoformat()
+
+    def get(self, text: str, vocabulary_version: int, model_version: int) -> Optional[Any]:
+        """Return a private copy of the cached parse, or None on a miss"""
+        key = self._key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stale = (entry['vocabulary_version'] != vocabulary_version or
+                         (entry['model_version'] is not None and entry['model_version'] != model_version))
+                if stale:
+                    del self._entries[key]
+                    self.invalidations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry['result'])
+
+    def put(self, text: str, result: Any, vocabulary_version: int, model_version: Optional[int] = None):
+        """Cache a parse; pass model_version only if the result depends on the classifier"""
+        key = self._key(text)
+        with self._lock:
+            self._entries[key] = {
+                'result': copy.deepcopy(result),
+                'vocabulary_version': vocabulary_version,
+                'model_version': model_version
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every cached parse"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'capacity': self.max_entries
+            }
@@ -0,0 +1,417 @@
+import csv
+import io
+import os
+import json
+import re
+import time
+import logging
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator, Callable, Union, Tuple, BinaryIO
+
+from constants import IMPORT_SETTINGS
+from command_executor import CommandCancelled, checkpoint
+from date_grammar import default_grammar
+
+@dataclass
+class ImportedTask:
+    name: str
+    start: Optional[datetime] = None
+    finish: Optional[datetime] = None
+    status: Optional[str] = None
+    uid: Optional[str] = None
+    path: List[str] = field(default_factory=list)
+
+@dataclass
+class ImportedLink:
+    successor_uid: str
+    predecessor_uid: str
+    dep_type: str = 'FS'
+    lag_days: int = 0
+
+ScheduleRecord = Union[ImportedTask, ImportedLink]
+
+_STATUS_ALIASES = {
+    'completed': 'complete', 'complete': 'complete', 'finished': 'complete', 'done': 'complete',
+    'in progress': 'in progress', 'active': 'in progress', 'started': 'in progress',
+    'not started': 'not started', 'planned': 'not started',
+    'on hold': 'on hold', 'suspended': 'suspended'
+}
+
+# MS Project PredecessorLink/Type and P6 Relationship/Type -> VISA4D dependency types
+_MSP_LINK_TYPES = {'1': 'FS', '3': 'SS'}
+_P6_LINK_TYPES = {'finish to start': 'FS', 'start to start': 'SS'}
+
+_CSV_COLUMNS = {
+    'name': ['name', 'task', 'task name', 'activity name', 'activity'],
+    'uid': ['uid', 'id', 'task id', 'activity id', 'unique id'],
+    'start': ['start', 'start date', 'planned start', 'planned start date'],
+    'finish': ['finish', 'end', 'finish date', 'end date', 'planned finish', 'planned finish date'],
+    'status': ['status', 'activity status'],
+    'percent': ['% complete', 'percent complete', 'percent'],
+    'predecessors': ['predecessors', 'predecessor'],
+    'wbs': ['wbs', 'wbs path', 'outline']
+}
+
+_CSV_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y", "%m/%d/%y",
+                     "%d-%b-%y", "%d-%b-%Y", "%B %d, %Y")
+
+# MS Project-style predecessor references, e.g. "12FS+2d" or "7SS"
+_PREDECESSOR_REF = re.compile(r'^\s*(?P<uid>[\w.-]+?)(?P<type>FS|SS|FF|SF)?(?:\s*(?P<lag>[+-]\s*\d+)\s*d(?:ays?)?)?\s*$',
+                              re.IGNORECASE)
+
+_NUMERIC_DATE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})$')
+
+_local_names: Dict[str, str] = {}
+
+def _local(tag: str) -> str:
+    """Tag without its XML namespace (memoized: exports repeat a handful of tags)"""
+    name = _local_names.get(tag)
+    if name is None:
+        name = _local_names[tag] = tag.rsplit('}', 1)[-1]
+    return name
+
+def _fields(elem: ET.Element) -> Dict[str, Optional[str]]:
+    """Child element texts by local tag name, in one pass"""
+    fields = {}
+    for child in elem:
+        text = child.text
+        fields.setdefault(_local(child.tag), text.strip() or None if text else None)
+    return fields
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    # Fast paths for the ISO and m/d/y forms that exports almost always use
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    match = _NUMERIC_DATE.match(value)
+    if match:
+        month, day, year = (int(part) for part in match.groups())
+        try:
+            return datetime(year + 2000 if year < 100 else year, month, day)
+        except ValueError:
+            return None
+    for fmt in _CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return default_grammar.parse(value)
+
+def _status_from_percent(percent: Optional[str]) -> Optional[str]:
+    if percent is None:
+        return None
+    try:
+        value = float(percent.rstrip('%'))
+    except ValueError:
+        return None
+    return 'complete' if value >= 100 else 'in progress' if value > 0 else 'not started'
+
+def _normalize_status(status: Optional[str]) -> Optional[str]:
+    return _STATUS_ALIASES.get(status.strip().lower()) if status else None
+
+def detect_format(path: str) -> str:
+    """Return 'csv', 'msp' (MS Project XML) or 'p6' (Primavera P6 XML) for a schedule file"""
+    if path.lower().endswith('.csv'):
+        return 'csv'
+    with open(path, 'rb') as f:
+        head = f.read(4096).decode('utf-8', errors='ignore')
+    if 'schemas.microsoft.com/project' in head:
+        return 'msp'
+    if 'APIBusinessObjects' in head or 'primavera' in head.lower():
+        return 'p6'
+    raise ValueError(f"Unrecognized schedule format: {path}")
+
+def _iter_elements(source: BinaryIO, wanted: Tuple[str, ...]) -> Iterator[Tuple[ET.Element, ET.Element]]:
+    """Yield (element, parent) for each completed element named in wanted.
+
+    Wanted elements, and every record-level element (two levels below the
+    root, e.g. Project/Tasks/Task or APIBusinessObjects/Project/Activity),
+    are dropped once finished so memory does not grow with the file.
+    """
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        is_wanted = _local(elem.tag) in wanted
+        if is_wanted:
+            yield elem, parent
+        if parent is not None and (is_wanted or len(stack) == 2):
+            elem.clear()
+            parent.remove(elem)
+
+def iter_msp_xml(source: BinaryIO) -> Iterator[ScheduleRecord]:
+    """Stream tasks and links out of an MS Project XML file; summary tasks become the hierarchy path"""
+    outline: List[str] = []
+    for elem, parent in _iter_elements(source, ('Task',)):
+        if parent is None or _local(parent.tag) != 'Tasks':
+            continue
+        fields = _fields(elem)
+        name = fields.get('Name')
+        uid = fields.get('UID')
+        level = int(fields.get('OutlineLevel') or 1)
+        if fields.get('Summary') == '1':
+            if level > 0 and name:
+                del outline[level - 1:]
+                outline.append(name.lower())
+            continue
+        if not name:
+            continue
+
+        yield ImportedTask(
+            name=name,
+            start=_parse_date(fields.get('Start')),
+            finish=_parse_date(fields.get('Finish')),
+            status=_status_from_percent(fields.get('PercentComplete')),
+            uid=uid,
+            path=outline[:max(0, level - 1)]
+        )
+        for link in elem:
+            if _local(link.tag) != 'PredecessorLink':
+                continue
+            link_fields = _fields(link)
+            dep_type = _MSP_LINK_TYPES.get(link_fields.get('Type') or '1')
+            predecessor = link_fields.get('PredecessorUID')
+            if dep_type and predecessor and uid:
+                # LinkLag is in tenths of a minute; one working day is 8 hours
+                lag = round(int(link_fields.get('LinkLag') or 0) / 4800)
+                yield ImportedLink(uid, predecessor, dep_type, lag)
+
+def iter_p6_xml(source: BinaryIO) -> Iterator[ScheduleRecord]:
+    """Stream activities and relationships out of a Primavera P6 XML export"""
+    wbs: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def wbs_path(object_id: Optional[str]) -> List[str]:
+        path = []
+        while object_id in wbs and len(path) < 32:
+            name, object_id = wbs[object_id]
+            path.append(name.lower())
+        return path[::-1]
+
+    for elem, _ in _iter_elements(source, ('WBS', 'Activity', 'Relationship')):
+        kind = _local(elem.tag)
+        fields = _fields(elem)
+        if kind == 'WBS':
+            object_id = fields.get('ObjectId')
+            if object_id:
+                wbs[object_id] = (fields.get('Name') or object_id, fields.get('ParentObjectId'))
+        elif kind == 'Activity':
+            name = fields.get('Name')
+            if not name:
+                continue
+            yield ImportedTask(
+                name=name,
+                start=_parse_date(fields.get('PlannedStartDate') or fields.get('StartDate')),
+                finish=_parse_date(fields.get('PlannedFinishDate') or fields.get('FinishDate')),
+                status=_normalize_status(fields.get('Status')),
+                uid=fields.get('ObjectId'),
+                path=wbs_path(fields.get('WBSObjectId'))
+            )
+        else:
+            dep_type = _P6_LINK_TYPES.get((fields.get('Type') or 'Finish to Start').lower())
+            successor = fields.get('SuccessorActivityObjectId')
+            predecessor = fields.get('PredecessorActivityObjectId')
+            if dep_type and successor and predecessor:
+                # P6 lags are in hours
+                lag = round(float(fields.get('Lag') or 0) / 8)
+                yield ImportedLink(successor, predecessor, dep_type, lag)
+
+def iter_csv(source: BinaryIO) -> Iterator[ScheduleRecord]:
+    """Stream tasks (and predecessor references such as "12FS+2d; 7") out of a CSV export"""
+    reader = csv.reader(io.TextIOWrapper(source, encoding='utf-8-sig', newline=''))
+    header = [column.strip().lower() for column in next(reader, [])]
+    columns = {}
+    for key, aliases in _CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in header:
+                columns[key] = header.index(alias)
+                break
+    if 'name' not in columns:
+        raise ValueError("CSV schedule needs a task name column")
+
+    def cell(row: List[str], key: str) -> Optional[str]:
+        index = columns.get(key)
+        if index is None or index >= len(row):
+            return None
+        return row[index].strip() or None
+
+    for row_number, row in enumerate(reader, start=1):
+        name = cell(row, 'name')
+        if not name:
+            continue
+        uid = cell(row, 'uid') or str(row_number)
+        wbs = cell(row, 'wbs')
+        yield ImportedTask(
+            name=name,
+            start=_parse_date(cell(row, 'start')),
+            finish=_parse_date(cell(row, 'finish')),
+            status=_normalize_status(cell(row, 'status')) or _status_from_percent(cell(row, 'percent')),
+            uid=uid,
+            path=[part.strip().lower() for part in re.split(r'[/>]', wbs) if part.strip()] if wbs else []
+        )
+        for reference in re.split(r'[;,]', cell(row, 'predecessors') or ''):
+            match = _PREDECESSOR_REF.match(reference)
+            if not reference.strip() or not match:
+                continue
+            dep_type = (match.group('type') or 'FS').upper()
+            if dep_type in ('FS', 'SS'):
+                lag = int(match.group('lag').replace(' ', '')) if match.group('lag') else 0
+                yield ImportedLink(uid, match.group('uid'), dep_type, lag)
+
+READERS: Dict[str, Callable[[BinaryIO], Iterator[ScheduleRecord]]] = {
+    'csv': iter_csv,
+    'msp': iter_msp_xml,
+    'p6': iter_p6_xml
+}
+
+def task_operation(record: ImportedTask, existing: bool) -> Optional[Dict[str, Any]]:
+    """Map an imported task onto a TaskManager operation (create, or re-date a known task)"""
+    if record.start is None:
+        return None
+    finish = record.finish if record.finish and record.finish >= record.start else record.start
+    if existing:
+        return {
+            'action': 'update_date',
+            'task_name': record.name,
+            'date': record.start.strftime("%B %d, %Y"),
+            'end_date': finish.strftime("%B %d, %Y")
+        }
+    return {
+        'action': 'create_task',
+        'task_name': record.name,
+        'start_date': record.start,
+        'end_date': finish
+    }
+
+class ScheduleImporter:
+    """Streams a P6 / MS Project / CSV schedule into TaskManager in fixed-size batches.
+
+    Records are read one at a time, so memory stays bounded by the batch
+    size plus a UID -> name map used to resolve dependencies. Links between
+    tasks already read are added in batches as the file streams by; links
+    to tasks further down the file are spilled to a temporary file and
+    added in batches at the end. Task state is saved once at the end.
+    """
+    def __init__(self, task_manager, batch_size: int = IMPORT_SETTINGS['BATCH_SIZE'],
+                 progress: Callable[[int, float], None] = None):
+        self.task_manager = task_manager
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def run(self, path: str, fmt: str = None) -> Dict[str, Any]:
+        """Import a schedule file and return counts and timing"""
+        fmt = fmt or detect_format(path)
+        started = time.perf_counter()
+        report = {'format': fmt, 'read': 0, 'created': 0, 'updated': 0, 'failed': 0, 'skipped': 0,
+                  'links': 0, 'failed_links': 0}
+        known = set(self.task_manager.known_tasks())
+        names: Dict[str, str] = {}
+        links: List[ImportedLink] = []
+        batch: List[Tuple[ImportedTask, Dict[str, Any]]] = []
+        total_bytes = max(1, os.path.getsize(path))
+
+        try:
+            with open(path, 'rb') as source, tempfile.TemporaryFile('w+', encoding='utf-8') as deferred, \
+                    self.task_manager.history.attribution('import', self.task_manager.client_id):
+                for record in READERS[fmt](source):
+                    if isinstance(record, ImportedLink):
+                        if record.successor_uid in names and record.predecessor_uid in names:
+                            links.append(record)
+                        else:
+                            deferred.write(json.dumps(asdict(record)) + "\n")
+                        if len(links) >= self.batch_size:
+                            # Both ends must exist before their link is added
+                            checkpoint("Importing schedule")
+                            self._flush(batch, report)
+                            batch = []
+                            self._flush_links(links, names, report)
+                            links = []
+                        continue
+                    report['read'] += 1
+                    if record.uid:
+                        names[record.uid] = record.name
+                    operation = task_operation(record, record.name in known)
+                    if operation is None:
+                        report['skipped'] += 1
+                        continue
+                    known.add(record.name)
+                    batch.append((record, operation))
+                    if len(batch) >= self.batch_size:
+                        checkpoint("Importing schedule")
+                        self._flush(batch, report)
+                        batch = []
+                        self._report_progress(report, source.tell() / total_bytes)
+                self._flush(batch, report)
+                self._flush_links(links, names, report)
+                links = []
+
+                deferred.seek(0)
+                for line in deferred:
+                    links.append(ImportedLink(**json.loads(line)))
+                    if len(links) >= self.batch_size:
+                        checkpoint("Importing schedule")
+                        self._flush_links(links, names, report)
+                        links = []
+                self._flush_links(links, names, report)
+                self._report_progress(report, 1.0)
+        except CommandCancelled:
+            # Batches already applied stay imported
+            self.task_manager.save_state()
+            logging.info(f"Schedule import cancelled after {report['read']} task(s)")
+            raise
+
+        self.task_manager.save_state()
+        report['seconds'] = time.perf_counter() - started
+        logging.info(f"Imported schedule {path}: {report}")
+        return report
+
+    def _flush(self, batch: List[Tuple[ImportedTask, Dict[str, Any]]], report: Dict[str, Any]):
+        if not batch:
+            return
+        results = self.task_manager.apply_batch([operation for _, operation in batch], save=False)
+
+        # Statuses go in a second grouped call once the tasks exist; hierarchy paths are local only
+        status_operations = []
+        for (record, operation), success in zip(batch, results):
+            if not success:
+                report['failed'] += 1
+                continue
+            report['created' if operation['action'] == 'create_task' else 'updated'] += 1
+            if record.path:
+                self.task_manager.tree.set_path(record.name, record.path)
+            if record.status and record.status != self.task_manager.task_statuses.get(record.name):
+                status_operations.append({'action': 'update_status', 'task_name': record.name,
+                                          'status': record.status})
+        if status_operations:
+            self.task_manager.apply_batch(status_operations, save=False)
+
+    def _flush_links(self, links: List[ImportedLink], names: Dict[str, str], report: Dict[str, Any]):
+        resolved = []
+        for link in links:
+            successor, predecessor = names.get(link.successor_uid), names.get(link.predecessor_uid)
+            if successor is None or predecessor is None:
+                logging.error(f"Skipping imported dependency {link.predecessor_uid} -> {link.successor_uid}: "
+                              f"unknown task")
+                report['failed_links'] += 1
+                continue
+            resolved.append((successor, predecessor, link.dep_type, link.lag_days))
+        if not resolved:
+            return
+        for added in self.task_manager.add_dependencies(resolved, save=False):
+            report['links' if added else 'failed_links'] += 1
+
+    def _report_progress(self, report: Dict[str, Any], fraction: float):
+        if self.progress is not None:
+            try:
+                self.progress(report['read'], min(1.0, fraction))
+            except Exception as e:
+                logging.error(f"Import progress callback error: {e}")
@@ -0,0 +1,469 @@
+import json
+import time
+import hashlib
+import logging
+import uuid
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Set, Tuple, Iterable
+
+from constants import SYNC_SETTINGS
+
+# Timeliner only records actual start/finish dates, so statuses are compared at that resolution
+SYNC_STATUS = {
+    'not started': 'not started',
+    'suspended': 'not started',
+    'in progress': 'in progress',
+    'on hold': 'in progress',
+    'complete': 'complete'
+}
+
+# (status, start, finish) with ISO dates; '' where a value is missing
+Record = Tuple[str, str, str]
+EMPTY_RECORD: Record = ('', '', '')
+
+_FIELDS = {'status': 0, 'date': 1, 'end_date': 2}
+
+@lru_cache(maxsize=4096)
+def _iso_date(value: Optional[str]) -> str:
+    if not value:
+        return ''
+    try:
+        return datetime.strptime(value, "%B %d, %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return value
+
+def local_date(value: str) -> Optional[str]:
+    """ISO date from Timeliner -> the "%B %d, %Y" form kept in task_state.json"""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").strftime("%B %d, %Y")
+
+def canonical_record(status: Optional[str], start: Optional[str], end: Optional[str]) -> Record:
+    """Local task values in the form both sides hash"""
+    return SYNC_STATUS.get(status, status) if status else '', _iso_date(start), _iso_date(end)
+
+def remote_record(fields: Dict[str, Any]) -> Record:
+    """A task as returned by the plugin's sync endpoints"""
+    status = (fields.get('status') or '').lower()
+    return SYNC_STATUS.get(status, status), fields.get('start') or '', fields.get('end') or ''
+
+def task_digest(task_name: str, record: Record) -> int:
+    """64-bit content hash; the plugin computes the same value for Timeliner tasks"""
+    data = '\x1f'.join((task_name,) + tuple(record)).encode('utf-8')
+    return int.from_bytes(hashlib.sha1(data).digest()[:8], 'big')
+
+def task_bucket(task_name: str, leaves: int) -> int:
+    return int.from_bytes(hashlib.sha1(task_name.encode('utf-8')).digest()[:4], 'big') % leaves
+
+class DigestTree:
+    """Fixed-shape hash tree over task buckets.
+
+    Every node is the XOR of the digests of the tasks below it, so the
+    value does not depend on insertion order and adding, removing or
+    changing a task touches exactly one node per level.
+    """
+    def __init__(self, fanout: int = SYNC_SETTINGS['FANOUT'], depth: int = SYNC_SETTINGS['DEPTH']):
+        self.fanout = fanout
+        self.depth = depth
+        self.levels = [[0] * (fanout ** level) for level in range(depth + 1)]
+
+    @property
+    def leaves(self) -> int:
+        return self.fanout ** self.depth
+
+    def toggle(self, bucket: int, digest: int):
+        for level in range(self.depth, -1, -1):
+            self.levels[level][bucket] ^= digest
+            bucket //= self.fanout
+
+    def children(self, level: int, parents: Iterable[int]) -> Dict[int, int]:
+        """Non-empty nodes at level under the given parent nodes (level 0: the root)"""
+        if level == 0:
+            return {0: self.levels[0][0]} if self.levels[0][0] else {}
+        row = self.levels[level]
+        return {child: row[child] for parent in parents
+                for child in range(parent * self.fanout, (parent + 1) * self.fanout) if row[child]}
+
+class TaskDigests:
+    """Per-task sync records and their DigestTree, kept current by TaskManager change notifications"""
+    def __init__(self, fanout: int = SYNC_SETTINGS['FANOUT'], depth: int = SYNC_SETTINGS['DEPTH']):
+        self.fanout = fanout
+        self.depth = depth
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.tree = DigestTree(self.fanout, self.depth)
+        self._records: Dict[str, Record] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def build(self, statuses: Dict[str, str], start_dates: Dict[str, str], end_dates: Dict[str, str]):
+        """Rebuild from TaskManager state"""
+        with self._lock:
+            self._reset()
+            for task_name in set(statuses) | set(start_dates) | set(end_dates):
+                self._put(task_name, canonical_record(statuses.get(task_name), start_dates.get(task_name),
+                                                      end_dates.get(task_name)))
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: rehash one task"""
+        with self._lock:
+            if field == 'task':
+                if new is None:
+                    self._put(task_name, None)
+                elif task_name not in self._records:
+                    self._put(task_name, EMPTY_RECORD)
+                return
+            index = _FIELDS.get(field)
+            if index is None:
+                return
+            record = list(self._records.get(task_name, EMPTY_RECORD))
+            if field == 'status':
+                record[index] = SYNC_STATUS.get(new, new) if new else ''
+            else:
+                record[index] = _iso_date(new)
+            self._put(task_name, tuple(record))
+
+    def put(self, task_name: str, record: Optional[Record]):
+        """Set (or with None, drop) one task's record"""
+        with self._lock:
+            self._put(task_name, tuple(record) if record is not None else None)
+
+    def record(self, task_name: str) -> Optional[Record]:
+        with self._lock:
+            return self._records.get(task_name)
+
+    def records(self) -> Dict[str, Record]:
+        with self._lock:
+            return dict(self._records)
+
+    def names_in(self, buckets: Iterable[int]) -> Set[str]:
+        with self._lock:
+            names = set()
+            for bucket in buckets:
+                names.update(self._buckets.get(bucket, ()))
+            return names
+
+    def children(self, level: int, parents: Iterable[int]) -> Dict[int, int]:
+        with self._lock:
+            return self.tree.children(level, parents)
+
+    def _put(self, task_name: str, record: Optional[Record]):
+        old = self._records.get(task_name)
+        if old == record:
+            return
+        bucket = task_bucket(task_name, self.tree.leaves)
+        if old is not None:
+            self.tree.toggle(bucket, task_digest(task_name, old))
+        if record is None:
+            del self._records[task_name]
+            names = self._buckets[bucket]
+            names.discard(task_name)
+            if not names:
+                del self._buckets[bucket]
+        else:
+            self._records[task_name] = record
+            self.tree.toggle(bucket, task_digest(task_name, record))
+            self._buckets.setdefault(bucket, set()).add(task_name)
+
+class SnapshotRemote:
+    """A remote task set that was received whole (e.g. an export) rather than queried"""
+    def __init__(self, digests: TaskDigests):
+        self.digests = digests
+        self.requests = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: Dict[str, Dict[str, Any]], fanout: int = SYNC_SETTINGS['FANOUT'],
+                   depth: int = SYNC_SETTINGS['DEPTH']) -> 'SnapshotRemote':
+        """tasks maps names to {'status', 'start', 'end'} with ISO dates"""
+        digests = TaskDigests(fanout, depth)
+        for task_name, fields in tasks.items():
+            digests.put(task_name, remote_record(fields))
+        return cls(digests)
+
+    def children(self, level: int, parents: List[int]) -> Dict[int, int]:
+        self.requests += 1
+        return self.digests.children(level, parents)
+
+    def tasks(self, buckets: List[int]) -> Dict[str, Record]:
+        self.requests += 1
+        return {name: self.digests.record(name) for name in self.digests.names_in(buckets)}
+
+class TimelinerRemote:
+    """Timeliner as seen through the plugin's sync endpoints.
+
+    One instance is one sync session: its requests share a session id, so
+    the plugin lists and hashes the schedule once for all of them.
+    """
+    def __init__(self, task_manager, fanout: int = SYNC_SETTINGS['FANOUT'], depth: int = SYNC_SETTINGS['DEPTH']):
+        self.task_manager = task_manager
+        self.fanout = fanout
+        self.depth = depth
+        self.session = uuid.uuid4().hex
+        self.requests = 0
+
+    def children(self, level: int, parents: List[int]) -> Dict[int, int]:
+        self.requests += 1
+        result = self.task_manager.api.sync_tree(level, parents, self.fanout, self.depth,
+                                                 self.task_manager.client_id, self.task_manager.client_secret,
+                                                 session=self.session)
+        if not result.get('success', False):
+            raise ConnectionError(result.get('error', "Timeliner sync tree unavailable"))
+        return {int(node): int(value, 16) for node, value in result.get('hashes', {}).items()}
+
+    def tasks(self, buckets: List[int]) -> Dict[str, Record]:
+        self.requests += 1
+        result = self.task_manager.api.sync_tasks(buckets, self.fanout, self.depth,
+                                                  self.task_manager.client_id, self.task_manager.client_secret,
+                                                  session=self.session)
+        if not result.get('success', False):
+            raise ConnectionError(result.get('error', "Timeliner sync tasks unavailable"))
+        return {task['name']: remote_record(task) for task in result.get('tasks', [])}
+
+def changed_buckets(local: TaskDigests, base: TaskDigests, remote) -> Tuple[List[int], int]:
+    """Walk the local, last-synced and remote trees from the root, descending only where they disagree.
+
+    Returns the differing leaf buckets and the number of nodes compared.
+    """
+    parents: List[int] = []
+    compared = 0
+    for level in range(local.depth + 1):
+        theirs = remote.children(level, parents)
+        ours = local.children(level, parents)
+        before = base.children(level, parents)
+        nodes = set(theirs) | set(ours) | set(before)
+        compared += len(nodes)
+        parents = sorted(node for node in nodes
+                         if not theirs.get(node, 0) == ours.get(node, 0) == before.get(node, 0))
+        if not parents:
+            break
+    return parents, compared
+
+def resolve(local: Optional[Record], remote: Optional[Record], base: Optional[Record],
+            policy: str) -> Tuple[str, Optional[Record]]:
+    """Decide one task from its local, remote and last-synced records.
+
+    Returns (action, record) where action is 'none', 'push', 'pull', 'both'
+    (a merged record goes both ways) or 'conflict' (left for the user).
+    """
+    if local == remote:
+        return 'none', local
+    if remote == base:
+        return 'push', local
+    if local == base:
+        return 'pull', remote
+
+    # Both sides changed since the last sync
+    if policy == 'local':
+        return 'push', local
+    if policy == 'remote':
+        return 'pull', remote
+    if policy == 'merge':
+        # An edit wins over a deletion; otherwise keep each side's own field changes, Timeliner first
+        if local is None or remote is None:
+            return ('pull', remote) if local is None else ('push', local)
+        before = base or EMPTY_RECORD
+        merged = tuple(ours if ours != old and theirs == old else theirs
+                       for ours, theirs, old in zip(local, remote, before))
+        if merged == remote:
+            return 'pull', merged
+        if merged == local:
+            return 'push', merged
+        return 'both', merged
+    return 'conflict', None
+
+@dataclass
+class SyncPlan:
+    push: Dict[str, Optional[Record]] = field(default_factory=dict)
+    pull: Dict[str, Optional[Record]] = field(default_factory=dict)
+    adopt: Dict[str, Optional[Record]] = field(default_factory=dict)      # already equal; only the base moves
+    remote: Dict[str, Record] = field(default_factory=dict)
+    conflicts: List[str] = field(default_factory=list)
+    buckets: int = 0
+    nodes_compared: int = 0
+
+class ScheduleSync:
+    """Two-way delta sync between TaskManager state and Timeliner.
+
+    TaskManager.digests keeps a hash tree of the local tasks up to date as
+    they change and the plugin computes the same tree for Timeliner. A sync
+    walks the local, remote and last-synced trees from the root, descends
+    only where they disagree and fetches just the tasks in differing
+    buckets. Each difference is then a local change (pushed), a remote
+    change (pulled) or a conflict settled by the policy, so the cost grows
+    with the number of changed tasks rather than the schedule size.
+    """
+    def __init__(self, task_manager, policy: str = None, state_file: str = None):
+        self.task_manager = task_manager
+        self.policy = policy or SYNC_SETTINGS['CONFLICT_POLICY']
+        self.state_file = state_file or SYNC_SETTINGS['STATE_FILE']
+        self.base = TaskDigests(task_manager.digests.fanout, task_manager.digests.depth)
+        self._load_base()
+
+    def plan(self, remote) -> SyncPlan:
+        """Compare against remote and decide every differing task without applying anything"""
+        local = self.task_manager.digests
+        buckets, compared = changed_buckets(local, self.base, remote)
+        plan = SyncPlan(buckets=len(buckets), nodes_compared=compared)
+        if not buckets:
+            return plan
+        plan.remote = remote.tasks(buckets)
+        for task_name in local.names_in(buckets) | self.base.names_in(buckets) | set(plan.remote):
+            before = self.base.record(task_name)
+            action, record = resolve(local.record(task_name), plan.remote.get(task_name), before, self.policy)
+            if action == 'none':
+                if record != before:
+                    plan.adopt[task_name] = record
+            elif action == 'conflict':
+                plan.conflicts.append(task_name)
+            else:
+                if action in ('pull', 'both'):
+                    plan.pull[task_name] = record
+                if action in ('push', 'both'):
+                    plan.push[task_name] = record
+        return plan
+
+    def sync(self, remote=None) -> Dict[str, Any]:
+        """Reconcile with Timeliner (or a received snapshot) and return counts and timing"""
+        started = time.perf_counter()
+        remote = remote or TimelinerRemote(self.task_manager, self.base.fanout, self.base.depth)
+        report = {'success': False, 'pushed': 0, 'pulled': 0, 'failed': 0, 'conflicts': [],
+                  'buckets': 0, 'nodes_compared': 0}
+        try:
+            plan = self.plan(remote)
+            report['buckets'] = plan.buckets
+            report['nodes_compared'] = plan.nodes_compared
+            report['conflicts'] = sorted(plan.conflicts)
+            with self.task_manager.history.attribution('sync', self.task_manager.client_id):
+                if plan.pull:
+                    self._pull(plan)
+                    report['pulled'] = len(plan.pull)
+                if plan.push:
+                    report['pushed'], report['failed'] = self._push(plan)
+            for task_name, record in plan.adopt.items():
+                self.base.put(task_name, record)
+            if plan.pull or plan.push:
+                self.task_manager.save_state()
+            if plan.pull or plan.push or plan.adopt:
+                self._save_base()
+            report['success'] = True
+        except Exception as e:
+            logging.error(f"Schedule sync error: {e}")
+            report['error'] = str(e)
+        report['requests'] = getattr(remote, 'requests', 0)
+        report['seconds'] = time.perf_counter() - started
+        logging.info(f"Schedule sync: {report}")
+        return report
+
+    # Applying a plan
+    def _pull(self, plan: SyncPlan):
+        tasks: Dict[str, Optional[Dict[str, Optional[str]]]] = {}
+        for task_name, record in plan.pull.items():
+            if record is None:
+                tasks[task_name] = None
+                continue
+            # Keep the finer local status (e.g. "on hold") when Timeliner agrees at its resolution
+            current = self.task_manager.task_statuses.get(task_name)
+            tasks[task_name] = {
+                'status': current if current and SYNC_STATUS.get(current) == record[0] else record[0] or None,
+                'date': local_date(record[1]),
+                'end_date': local_date(record[2])
+            }
+        self.task_manager.apply_remote_state(tasks, save=False)
+        for task_name, record in plan.pull.items():
+            self.base.put(task_name, record)
+
+    def _push(self, plan: SyncPlan) -> Tuple[int, int]:
+        operations: List[Dict[str, Any]] = []
+        owners: List[str] = []
+        status_operations: Dict[str, Dict[str, Any]] = {}
+        failed: Set[str] = set()
+        for task_name, record in plan.push.items():
+            task_operations = self._operations(task_name, record, plan.remote.get(task_name))
+            if task_operations is None:
+                failed.add(task_name)
+                continue
+            for operation in task_operations:
+                if operation['action'] == 'update_status':
+                    status_operations[task_name] = operation
+                else:
+                    operations.append(operation)
+                    owners.append(task_name)
+
+        # Statuses go in a second grouped call so newly created tasks exist first
+        for task_name, success in zip(owners, self.task_manager.apply_batch(operations, save=False)):
+            if not success:
+                failed.add(task_name)
+                status_operations.pop(task_name, None)
+        status_owners = list(status_operations)
+        results = self.task_manager.apply_batch([status_operations[name] for name in status_owners], save=False)
+        for task_name, success in zip(status_owners, results):
+            if not success:
+                failed.add(task_name)
+
+        for task_name, record in plan.push.items():
+            if task_name not in failed:
+                self.base.put(task_name, record)
+        return len(plan.push) - len(failed), len(failed)
+
+    def _operations(self, task_name: str, record: Optional[Record],
+                    remote: Optional[Record]) -> Optional[List[Dict[str, Any]]]:
+        """TaskManager operations that bring Timeliner to record; None if it cannot be expressed"""
+        if record is None:
+            return [{'action': 'delete_task', 'task_name': task_name}]
+        status, start, end = record
+        operations = []
+        if remote is None:
+            if not start or not end:
+                logging.error(f"Cannot create '{task_name}' in Timeliner without start and finish dates")
+                return None
+            operations.append({
+                'action': 'create_task',
+                'task_name': task_name,
+                'start_date': datetime.strptime(start, "%Y-%m-%d"),
+                'end_date': datetime.strptime(end, "%Y-%m-%d")
+            })
+            remote = ('not started', start, end)
+        elif (start or end) and (start, end) != remote[1:]:
+            if start:
+                operation = {'action': 'update_date', 'task_name': task_name, 'date': local_date(start),
+                             'date_type': 'start'}
+                if end:
+                    operation['end_date'] = local_date(end)
+            else:
+                operation = {'action': 'update_date', 'task_name': task_name, 'date': local_date(end),
+                             'date_type': 'finish'}
+            operations.append(operation)
+        if status and status != remote[0]:
+            current = self.task_manager.task_statuses.get(task_name)
+            operations.append({
+                'action': 'update_status',
+                'task_name': task_name,
+                'status': current if current and SYNC_STATUS.get(current) == status else status
+            })
+        return operations
+
+    # Last-synced state
+    def _load_base(self):
+        try:
+            if Path(self.state_file).exists():
+                with open(self.state_file, 'r') as f:
+                    state = json.load(f)
+                for task_name, record in state.get('base', {}).items():
+                    self.base.put(task_name, tuple(record))
+        except Exception as e:
+            logging.error(f"Error loading sync state: {e}")
+
+    def _save_base(self):
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({'base': self.base.records()}, f)
+        except Exception as e:
+            logging.error(f"Error saving sync state: {e}")
@@ -0,0 +1,77 @@
+import logging
+import threading
+from typing import Dict, Any, Optional, Callable
+
+from embedding_cache import normalize_text
+
+class SpeculativeParser:
+    """Parses partial transcripts on a worker thread while the user is still speaking.
+
+    parse is expected to cache its results (NLPProcessor.speculate fills the
+    parse cache), so when the final transcript matches the last hypothesis
+    the command that follows is served from the cache. Only the newest
+    partial is kept: a hypothesis superseded before the worker reaches it is
+    never parsed.
+    """
+    def __init__(self, parse: Callable[[str], Any]):
+        self.parse = parse
+        self._condition = threading.Condition()
+        self._pending: Optional[str] = None
+        self._running: Optional[str] = None
+        self._parsed: Optional[str] = None
+        self._closed = False
+        self.parses = 0
+        self.skipped = 0
+        self._thread = threading.Thread(target=self._run, name="speculative-parse", daemon=True)
+        self._thread.start()
+
+    def submit(self, partial: str):
+        """Offer a new hypothesis; replaces any that has not started parsing"""
+        key = normalize_text(partial)
+        if not key:
+            return
+        with self._condition:
+            if self._closed or key in (self._running, self._parsed):
+                return
+            if self._pending is not None:
+                self.skipped += 1
+            self._pending = key
+            self._condition.notify()
+
+    def finish(self, final: str) -> bool:
+        """Stop speculating; True if the final transcript was already parsed.
+
+        A parse still in flight is waited for so the caller never runs the
+        parser concurrently with the worker.
+        """
+        key = normalize_text(final)
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            self._condition.notify()
+            while self._running is not None:
+                self._condition.wait()
+            return key == self._parsed
+
+    def stats(self) -> Dict[str, Any]:
+        return {'parses': self.parses, 'skipped': self.skipped, 'last_parsed': self._parsed}
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                self._running, self._pending = self._pending, None
+            try:
+                self.parse(self._running)
+                parsed = self._running
+            except Exception as e:
+                logging.error(f"Speculative parse error: {str(e)}")
+                parsed = None
+            with self._condition:
+                self.parses += 1
+                self._parsed = parsed
+                self._running = None
+                self._condition.notify_all()
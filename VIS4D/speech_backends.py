@@ -0,0 +1,303 @@
+import json
+import logging
+import threading
+import time
+import wave
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from constants import FILE_PATHS, SPEECH_SETTINGS
+
+_SAMPLE_TYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+@dataclass
+class Transcript:
+    """One transcribed utterance; text is empty when nothing was understood"""
+    text: str
+    backend: str
+    audio_seconds: float
+    seconds: float
+
+    @property
+    def rtf(self) -> float:
+        """Real-time factor: transcription time per second of audio"""
+        return self.seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+def read_wav(path: str) -> Tuple[bytes, int, int]:
+    """(frame_data, sample_rate, sample_width) of a PCM WAV file, downmixed to mono"""
+    with wave.open(path, 'rb') as wav:
+        sample_rate = wav.getframerate()
+        sample_width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        frame_data = wav.readframes(wav.getnframes())
+    if channels > 1:
+        dtype = _SAMPLE_TYPES[sample_width]
+        samples = np.frombuffer(frame_data, dtype=dtype).reshape(-1, channels)
+        frame_data = samples.mean(axis=1).astype(dtype).tobytes()
+    return frame_data, sample_rate, sample_width
+
+def read_audio(path: str) -> Tuple[bytes, int, int]:
+    """(frame_data, sample_rate, sample_width) of a WAV or FLAC file, mono"""
+    if path.lower().endswith('.wav'):
+        return read_wav(path)
+    try:
+        import soundfile
+    except ImportError:
+        # speech_recognition decodes FLAC with its bundled flac converter
+        import speech_recognition as sr
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+        return audio.frame_data, audio.sample_rate, audio.sample_width
+    samples, sample_rate = soundfile.read(path, dtype='int16', always_2d=True)
+    return samples.mean(axis=1).astype('<i2').tobytes(), sample_rate, 2
+
+def to_int16(frame_data: bytes, sample_width: int) -> bytes:
+    if sample_width == 2:
+        return frame_data
+    if sample_width == 1:
+        # 8-bit WAV is unsigned
+        samples = (np.frombuffer(frame_data, dtype=np.uint8).astype(np.int16) - 128) << 8
+    else:
+        samples = (np.frombuffer(frame_data, dtype=_SAMPLE_TYPES[sample_width]) >> 16).astype(np.int16)
+    return samples.astype('<i2').tobytes()
+
+class SpeechBackend:
+    """Speech-to-text engine interface.
+
+    recognize() returns the recognized text ('' when the audio held no
+    words), or None when the backend could not run at all (no network, no
+    model), so callers can fall through to another backend.
+    """
+    name = 'base'
+    local = True                # Audio never leaves the machine
+
+    def load(self) -> bool:
+        """Prepare the engine ahead of the first utterance; False if it cannot run"""
+        return True
+
+    def recognize(self, frame_data: bytes, sample_rate: int, sample_width: int) -> Optional[str]:
+        raise NotImplementedError
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int) -> Optional[Transcript]:
+        started = time.perf_counter()
+        text = self.recognize(frame_data, sample_rate, sample_width)
+        if text is None:
+            return None
+        audio_seconds = len(frame_data) / (sample_rate * sample_width)
+        return Transcript(text.strip(), self.name, audio_seconds, time.perf_counter() - started)
+
+    def transcribe_wav(self, path: str) -> Optional[Transcript]:
+        return self.transcribe(*read_wav(path))
+
+    def transcribe_file(self, path: str) -> Optional[Transcript]:
+        return self.transcribe(*read_audio(path))
+
+    def stream(self, sample_rate: int, sample_width: int) -> Optional['VoskStream']:
+        """A streaming session emitting partial hypotheses, or None if the backend cannot stream"""
+        return None
+
+class GoogleBackend(SpeechBackend):
+    """speech_recognition's Google Web Speech client (needs internet)"""
+    name = 'google'
+    local = False
+
+    def __init__(self, recognizer=None):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def recognize(self, frame_data: bytes, sample_rate: int, sample_width: int) -> Optional[str]:
+        audio = self.sr.AudioData(frame_data, sample_rate, sample_width)
+        try:
+            return self.recognizer.recognize_google(audio)
+        except self.sr.UnknownValueError:
+            return ''
+        except self.sr.RequestError as e:
+            logging.error(f"Google speech recognition unavailable: {str(e)}")
+            return None
+
+class VoskBackend(SpeechBackend):
+    """Offline Kaldi recognizer from the vosk package; runs on the CPU.
+
+    Models are loaded once per path and shared by every backend instance,
+    so only the first load pays the model read.
+    """
+    name = 'vosk'
+    _models: Dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model_path: str = FILE_PATHS['VOSK_MODEL']):
+        self.model_path = model_path
+        self.vosk = None
+        self.model = None
+        self.failed = False         # Set after a failed load so later utterances skip straight past
+
+    def load(self) -> bool:
+        if self.model is not None:
+            return True
+        if self.failed:
+            return False
+        # Callers arriving while a load is in progress wait for its outcome
+        with self._lock:
+            if self.model is not None or self.failed:
+                return self.model is not None
+            try:
+                import vosk
+            except ImportError:
+                logging.error("Offline speech recognition needs the vosk package (pip install vosk)")
+                self.failed = True
+                return False
+            model = self._models.get(self.model_path)
+            if model is None:
+                try:
+                    vosk.SetLogLevel(-1)
+                    model = vosk.Model(self.model_path)
+                except Exception as e:
+                    logging.error(f"Error loading Vosk model {self.model_path}: {str(e)}")
+                    self.failed = True
+                    return False
+                self._models[self.model_path] = model
+            self.vosk = vosk
+            self.model = model
+        return True
+
+    def recognizer(self, sample_rate: int):
+        """A fresh KaldiRecognizer on the shared model (cheap; one per utterance)"""
+        if not self.load():
+            return None
+        return self.vosk.KaldiRecognizer(self.model, sample_rate)
+
+    def recognize(self, frame_data: bytes, sample_rate: int, sample_width: int) -> Optional[str]:
+        recognizer = self.recognizer(sample_rate)
+        if recognizer is None:
+            return None
+        recognizer.AcceptWaveform(to_int16(frame_data, sample_width))
+        return json.loads(recognizer.FinalResult()).get('text', '')
+
+    def stream(self, sample_rate: int, sample_width: int) -> Optional['VoskStream']:
+        recognizer = self.recognizer(sample_rate)
+        if recognizer is None:
+            return None
+        return VoskStream(recognizer, sample_rate, sample_width)
+
+class VoskStream:
+    """Incremental Vosk recognition over the chunks of one utterance.
+
+    The transcript from finish() times only the work left once the audio
+    has ended, i.e. the delay the user waits for after they stop speaking.
+    """
+    def __init__(self, recognizer, sample_rate: int, sample_width: int):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.segments: List[str] = []
+        self.partial = ''
+        self.audio_bytes = 0
+
+    def feed(self, chunk: bytes) -> Optional[str]:
+        """Add audio; returns the hypothesis for everything heard so far when it changes"""
+        data = to_int16(chunk, self.sample_width)
+        self.audio_bytes += len(data)
+        if self.recognizer.AcceptWaveform(data):
+            self.segments.append(json.loads(self.recognizer.Result()).get('text', ''))
+            current = ''
+        else:
+            current = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        hypothesis = ' '.join(part for part in self.segments + [current] if part)
+        if hypothesis == self.partial:
+            return None
+        self.partial = hypothesis
+        return hypothesis
+
+    def finish(self) -> Transcript:
+        started = time.perf_counter()
+        final = json.loads(self.recognizer.FinalResult()).get('text', '')
+        text = ' '.join(part for part in self.segments + [final] if part)
+        return Transcript(text, VoskBackend.name, self.audio_bytes / (self.sample_rate * 2),
+                          time.perf_counter() - started)
+
+def create_backend(name: str, recognizer=None) -> Optional[SpeechBackend]:
+    """Backend by name ('vosk', 'google'); None if it cannot be created"""
+    try:
+        if name == 'google':
+            return GoogleBackend(recognizer)
+        if name == 'vosk':
+            return VoskBackend()
+        logging.error(f"Unknown speech backend '{name}'")
+    except Exception as e:
+        logging.error(f"Speech backend '{name}' unavailable: {str(e)}")
+    return None
+
+class SpeechEngine:
+    """Backends tried in preference order; the first one that can run answers.
+
+    Keeps the real-time factor of recent utterances for each backend.
+    """
+    def __init__(self, backends: List[SpeechBackend]):
+        self.backends = backends
+        self.history = deque(maxlen=SPEECH_SETTINGS['HISTORY'])
+
+    @classmethod
+    def from_settings(cls, recognizer=None) -> 'SpeechEngine':
+        backends = [create_backend(name, recognizer) for name in SPEECH_SETTINGS['BACKENDS']]
+        return cls([backend for backend in backends if backend is not None])
+
+    def load(self):
+        """Load every backend's model up front (call from a background thread)"""
+        for backend in self.backends:
+            backend.load()
+
+    def transcribe(self, frame_data: bytes, sample_rate: int, sample_width: int,
+                   local_only: bool = False) -> Optional[Transcript]:
+        for backend in self.backends:
+            if local_only and not backend.local:
+                continue
+            transcript = backend.transcribe(frame_data, sample_rate, sample_width)
+            if transcript is not None:
+                return self._record(transcript)
+        return None
+
+    def transcribe_head(self, frame_data: bytes, sample_rate: int, sample_width: int,
+                        seconds: float) -> Optional[Transcript]:
+        """Local transcript of the first seconds of the audio, e.g. to spot a wake phrase cheaply;
+        None when no local backend can run"""
+        head = frame_data[:int(seconds * sample_rate) * sample_width]
+        for backend in self.backends:
+            if backend.local:
+                transcript = backend.transcribe(head, sample_rate, sample_width)
+                if transcript is not None:
+                    return transcript
+        return None
+
+    def stream(self, sample_rate: int, sample_width: int) -> Optional[VoskStream]:
+        """Streaming session from the first backend that supports one"""
+        for backend in self.backends:
+            session = backend.stream(sample_rate, sample_width)
+            if session is not None:
+                return session
+        return None
+
+    def finish(self, session: VoskStream) -> Transcript:
+        return self._record(session.finish())
+
+    def _record(self, transcript: Transcript) -> Transcript:
+        self.history.append(transcript)
+        logging.info(f"Transcribed {transcript.audio_seconds:.1f} s of audio with {transcript.backend} "
+                     f"in {transcript.seconds:.2f} s (RTF {transcript.rtf:.2f})")
+        return transcript
+
+    def transcribe_wav(self, path: str) -> Optional[Transcript]:
+        return self.transcribe(*read_wav(path))
+
+    def rtf_summary(self) -> Dict[str, Dict[str, float]]:
+        """Median and worst real-time factor per backend over recent utterances"""
+        by_backend: Dict[str, List[float]] = {}
+        for transcript in self.history:
+            by_backend.setdefault(transcript.backend, []).append(transcript.rtf)
+        return {
+            name: {'utterances': len(rtfs), 'median_rtf': sorted(rtfs)[len(rtfs) // 2], 'max_rtf': max(rtfs)}
+            for name, rtfs in by_backend.items()
+        }
@@ -0,0 +1,293 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Set, Tuple
+
+from task_index import tokenize
+
+SORT_COLUMNS = ('name', 'status', 'start', 'finish')
+
+_NO_DATE = 10 ** 7          # Tasks without a date sort after every dated one
+_NO_STATUS = '\uffff'
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%B %d, %Y").toordinal()
+    except ValueError:
+        return None
+
+# One dashboard row: (task name, status, start, finish) as displayed
+TaskRow = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+class TaskTable:
+    """Sorted, filterable view of every task for the dashboard panel.
+
+    One sorted (key, name) list per column and inverted token and status
+    indexes are kept in sync through TaskManager change notifications, so a
+    change moves one entry in one list instead of re-sorting, and a filter
+    is answered from the indexes. The unfiltered view is the sorted list
+    itself; a filtered view is materialized once per filter and then
+    patched per change. rows() is a slice, so scrolling costs the same at
+    50 tasks or 50,000.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: Dict[str, List[Any]] = {}       # name -> [status, start, finish, start ordinal, finish ordinal]
+        self._sorted: Dict[str, List[Tuple[Any, str]]] = {column: [] for column in SORT_COLUMNS}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: Optional[List[str]] = []  # sorted tokens, for prefix lookups
+        self._statuses: Dict[str, Set[str]] = {}
+        self._changed: Set[str] = set()
+
+        self.sort_column = 'start'
+        self.descending = False
+        self.status_filter: Optional[str] = None
+        self.text_filter = ''
+        self._filter_tokens: List[str] = []
+        self._view: List[Tuple[Any, str]] = self._sorted[self.sort_column]
+        self.revision = 0           # bumped whenever the visible order may have changed
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    @property
+    def total(self) -> int:
+        return len(self._rows)
+
+    @property
+    def filtered(self) -> bool:
+        return bool(self.status_filter or self._filter_tokens)
+
+    def build(self, statuses: Dict[str, str], dates: Dict[str, str], end_dates: Dict[str, str]):
+        """Rebuild from TaskManager state"""
+        with self._lock:
+            self._rows = {}
+            self._tokens = {}
+            self._statuses = {}
+            self._vocabulary = None         # sorted once at the end instead of per token
+            for task_name in set(statuses) | set(dates) | set(end_dates):
+                self._rows[task_name] = self._row(statuses.get(task_name), dates.get(task_name),
+                                                   end_dates.get(task_name))
+                self._index_name(task_name)
+                status = statuses.get(task_name)
+                if status:
+                    self._statuses.setdefault(status.lower(), set()).add(task_name)
+            self._vocabulary = sorted(self._tokens)
+            for column in SORT_COLUMNS:
+                self._sorted[column] = sorted((self._key(column, name), name) for name in self._rows)
+            self._refilter()
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: move the changed task within the indexes"""
+        with self._lock:
+            if field == 'task':
+                if new is None:
+                    self._remove(task_name)
+                elif task_name not in self._rows:
+                    self._insert(task_name, self._row(None, None, None))
+                return
+            row = self._rows.get(task_name)
+            if row is None:
+                row = self._row(None, None, None)
+                self._insert(task_name, row)
+            column = {'status': 'status', 'date': 'start', 'end_date': 'finish'}.get(field)
+            if column is None:
+                return
+
+            matched = self._matches(task_name)
+            old_view_key = self._key(self.sort_column, task_name)
+            old_key = self._key(column, task_name)
+            if field == 'status':
+                if row[0]:
+                    self._statuses.get(row[0].lower(), set()).discard(task_name)
+                row[0] = new
+                if new:
+                    self._statuses.setdefault(new.lower(), set()).add(task_name)
+            elif field == 'date':
+                row[1], row[3] = new, _date_ordinal(new)
+            else:
+                row[2], row[4] = new, _date_ordinal(new)
+            self._move(self._sorted[column], old_key, self._key(column, task_name), task_name)
+
+            # The unfiltered view is the sorted list itself and has already moved
+            if self.filtered:
+                entries = self._view
+                if matched:
+                    self._discard(entries, (old_view_key, task_name))
+                if self._matches(task_name):
+                    insort(entries, (self._key(self.sort_column, task_name), task_name))
+            self._changed.add(task_name)
+            self.revision += 1
+
+    def set_view(self, sort_column: str = None, descending: bool = None,
+                 status: Optional[str] = '', text: str = None):
+        """Change the sort column/direction or filters; '' status clears the status filter"""
+        with self._lock:
+            if sort_column is not None and sort_column in SORT_COLUMNS:
+                self.sort_column = sort_column
+            if descending is not None:
+                self.descending = descending
+            if status != '':
+                self.status_filter = status.lower() if status else None
+            if text is not None:
+                self.text_filter = text
+                self._filter_tokens = tokenize(text)
+            self._refilter()
+
+    def rows(self, first: int, count: int) -> List[TaskRow]:
+        """Rows [first, first + count) of the current view, in display order"""
+        with self._lock:
+            size = len(self._view)
+            first = max(0, min(first, size))
+            last = min(size, first + count)
+            if self.descending:
+                entries = self._view[size - last:size - first][::-1]
+            else:
+                entries = self._view[first:last]
+            result = []
+            for _, name in entries:
+                row = self._rows[name]
+                result.append((name, row[0], row[1], row[2]))
+            return result
+
+    def position(self, task_name: str) -> Optional[int]:
+        """Display index of task_name in the current view, or None when filtered out"""
+        with self._lock:
+            if task_name not in self._rows:
+                return None
+            entry = (self._key(self.sort_column, task_name), task_name)
+            index = bisect_left(self._view, entry)
+            if index >= len(self._view) or self._view[index] != entry:
+                return None
+            return len(self._view) - 1 - index if self.descending else index
+
+    def timeline(self) -> Optional[Tuple[int, int]]:
+        """(earliest start, latest finish) date ordinals across every task, for the Gantt scale"""
+        with self._lock:
+            starts, finishes = self._sorted['start'], self._sorted['finish']
+            if not starts or starts[0][0] >= _NO_DATE:
+                return None
+            last = bisect_left(finishes, (_NO_DATE,)) - 1
+            latest = finishes[last][0] if last >= 0 else starts[0][0]
+            latest_start = starts[bisect_left(starts, (_NO_DATE,)) - 1][0]
+            return starts[0][0], max(latest, latest_start)
+
+    def take_changed(self) -> Set[str]:
+        """Tasks changed since the last call"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            return changed
+
+    # Internal helpers (callers hold the lock)
+    @staticmethod
+    def _row(status: Optional[str], start: Optional[str], finish: Optional[str]) -> List[Any]:
+        return [status, start, finish, _date_ordinal(start), _date_ordinal(finish)]
+
+    def _key(self, column: str, task_name: str):
+        row = self._rows[task_name]
+        if column == 'name':
+            return task_name.lower()
+        if column == 'status':
+            return row[0].lower() if row[0] else _NO_STATUS
+        ordinal = row[3] if column == 'start' else row[4]
+        return _NO_DATE if ordinal is None else ordinal
+
+    def _index_name(self, task_name: str):
+        for token in set(tokenize(task_name)):
+            names = self._tokens.get(token)
+            if names is None:
+                names = self._tokens[token] = set()
+                if self._vocabulary is not None:
+                    insort(self._vocabulary, token)
+            names.add(task_name)
+
+    def _insert(self, task_name: str, row: List[Any]):
+        self._rows[task_name] = row
+        self._index_name(task_name)
+        if row[0]:
+            self._statuses.setdefault(row[0].lower(), set()).add(task_name)
+        for column in SORT_COLUMNS:
+            insort(self._sorted[column], (self._key(column, task_name), task_name))
+        if self.filtered and self._matches(task_name):
+            insort(self._view, (self._key(self.sort_column, task_name), task_name))
+        self._changed.add(task_name)
+        self.revision += 1
+
+    def _remove(self, task_name: str):
+        if task_name not in self._rows:
+            return
+        if self.filtered and self._matches(task_name):
+            self._discard(self._view, (self._key(self.sort_column, task_name), task_name))
+        for column in SORT_COLUMNS:
+            self._discard(self._sorted[column], (self._key(column, task_name), task_name))
+        row = self._rows.pop(task_name)
+        if row[0]:
+            self._statuses.get(row[0].lower(), set()).discard(task_name)
+        for token in set(tokenize(task_name)):
+            names = self._tokens.get(token)
+            if names is not None:
+                names.discard(task_name)
+                if not names:
+                    del self._tokens[token]
+                    self._discard(self._vocabulary, token)
+        self._changed.discard(task_name)
+        self.revision += 1
+
+    @staticmethod
+    def _discard(entries: list, entry):
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+
+    def _move(self, entries: list, old_key, new_key, task_name: str):
+        if old_key != new_key:
+            self._discard(entries, (old_key, task_name))
+            insort(entries, (new_key, task_name))
+
+    def _matching_names(self) -> Optional[Set[str]]:
+        """Tasks passing the filters, from the indexes (None when nothing is filtered)"""
+        candidate_sets: List[Set[str]] = []
+        if self.status_filter:
+            candidate_sets.append(self._statuses.get(self.status_filter, set()))
+        for token in self._filter_tokens:
+            # Every filter word may be the start of a name word, so filtering works while typing
+            left = bisect_left(self._vocabulary, token)
+            right = bisect_right(self._vocabulary, token + '\uffff')
+            if right - left == 1:
+                candidate_sets.append(self._tokens[self._vocabulary[left]])
+            else:
+                names: Set[str] = set()
+                for match in self._vocabulary[left:right]:
+                    names |= self._tokens[match]
+                candidate_sets.append(names)
+        if not candidate_sets:
+            return None
+        candidate_sets.sort(key=len)
+        smallest, others = candidate_sets[0], candidate_sets[1:]
+        return {name for name in smallest if all(name in names for names in others)}
+
+    def _matches(self, task_name: str) -> bool:
+        if self.status_filter:
+            status = self._rows[task_name][0]
+            if not status or status.lower() != self.status_filter:
+                return False
+        if self._filter_tokens:
+            words = tokenize(task_name)
+            return all(any(word.startswith(token) for word in words) for token in self._filter_tokens)
+        return True
+
+    def _refilter(self):
+        entries = self._sorted[self.sort_column]
+        names = self._matching_names()
+        if names is None:
+            self._view = entries
+        elif len(names) * 8 < len(entries):
+            # Few matches: sorting them beats walking the whole column
+            self._view = sorted((self._key(self.sort_column, name), name) for name in names)
+        else:
+            self._view = [entry for entry in entries if entry[1] in names]
+        self.revision += 1
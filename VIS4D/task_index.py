@@ -0,0 +1,212 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List, Set, Iterable, Tuple
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+_TOKEN_ALIASES = {
+    '1st': 'first',
+    '2nd': 'second',
+    '3rd': 'third',
+    'ground': 'main'
+}
+
+def stem_token(word: str) -> str:
+    """Normalize a word for index lookups (case, floor aliases, simple plurals)"""
+    word = _TOKEN_ALIASES.get(word.lower(), word.lower())
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    return [stem_token(word) for word in _WORD.findall(text.lower())]
+
+_MAX_ORDINAL = 10 ** 7
+
+def _date_ordinal(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%B %d, %Y").toordinal()
+    except ValueError:
+        return None
+
+def _discard(keys: List[Tuple[int, str]], key: Tuple[int, str]):
+    index = bisect_left(keys, key)
+    if index < len(keys) and keys[index] == key:
+        del keys[index]
+
+class TaskIndex:
+    """Inverted index over task-name tokens with status and start-date facets.
+
+    Kept in sync through TaskManager change notifications. Every token and
+    status posting list is kept sorted by (start date, name), the order
+    results are returned in, so a query walks the posting list with the
+    fewest entries in the requested date range and probes the others' sets,
+    never sorting the matches. With a limit it stops after that many.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._tokens: Dict[str, Set[str]] = {}
+        self._token_order: Dict[str, List[Tuple[int, str]]] = {}     # token -> sorted (ordinal, name)
+        self._statuses: Dict[str, Set[str]] = {}
+        self._status_order: Dict[str, List[Tuple[int, str]]] = {}
+        self._order: List[Tuple[int, str]] = []                      # every task, sorted (ordinal, name)
+        self._task_tokens: Dict[str, Set[str]] = {}
+        self._task_status: Dict[str, str] = {}
+        self._task_key: Dict[str, Tuple[int, str]] = {}              # undated tasks sort first (ordinal 0)
+
+    def __len__(self) -> int:
+        return len(self._task_tokens)
+
+    def build(self, statuses: Dict[str, str], dates: Dict[str, str]):
+        """Rebuild the whole index from TaskManager state"""
+        with self._lock:
+            self._reset()
+            for task_name in set(statuses) | set(dates):
+                key = (_date_ordinal(dates.get(task_name)) or 0, task_name)
+                self._task_key[task_name] = key
+                self._order.append(key)
+                tokens = set(tokenize(task_name))
+                self._task_tokens[task_name] = tokens
+                for token in tokens:
+                    self._tokens.setdefault(token, set()).add(task_name)
+                    self._token_order.setdefault(token, []).append(key)
+                status = statuses.get(task_name)
+                if status:
+                    status = status.lower()
+                    self._task_status[task_name] = status
+                    self._statuses.setdefault(status, set()).add(task_name)
+                    self._status_order.setdefault(status, []).append(key)
+            self._order.sort()
+            for keys in list(self._token_order.values()) + list(self._status_order.values()):
+                keys.sort()
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: apply one field change incrementally"""
+        with self._lock:
+            if field == 'status':
+                self._clear_status(task_name)
+                if new is not None:
+                    self._add_name(task_name)
+                    self._set_status(task_name, new)
+            elif field == 'date':
+                ordinal = _date_ordinal(new)
+                if task_name in self._task_key:
+                    self._rekey(task_name, ordinal or 0)
+                elif ordinal is not None:
+                    self._add_name(task_name, ordinal)
+            elif field == 'task' and new is None:
+                self._remove(task_name)
+
+    def query(self, tokens: Iterable[str] = None, status: str = None,
+              start_from: date = None, start_to: date = None, limit: int = None) -> List[str]:
+        """Return task names matching every given filter, ordered by start date then name
+        (at most limit of them)"""
+        with self._lock:
+            postings: List[Tuple[List[Tuple[int, str]], Optional[Set[str]]]] = []
+            for token in tokens or []:
+                token = stem_token(token)
+                if token not in self._tokens:
+                    return []
+                postings.append((self._token_order[token], self._tokens[token]))
+            if status:
+                status = status.lower()
+                if status not in self._statuses:
+                    return []
+                postings.append((self._status_order[status], self._statuses[status]))
+            if not postings:
+                postings.append((self._order, None))
+
+            has_range = start_from is not None or start_to is not None
+            if has_range:
+                # Undated tasks (ordinal 0) never match a date range
+                lo = (start_from.toordinal() if start_from else 1,)
+                hi = (start_to.toordinal() + 1 if start_to else _MAX_ORDINAL,)
+            spans = []
+            for keys, names in postings:
+                left, right = (bisect_left(keys, lo), bisect_left(keys, hi)) if has_range else (0, len(keys))
+                spans.append((right - left, left, right, keys, names))
+            spans.sort(key=lambda span: span[0])
+
+            # Walk the smallest span in result order and probe the other filters' sets
+            _, left, right, keys, _ = spans[0]
+            others = [span[4] for span in spans[1:]]
+            names: List[str] = []
+            for position in range(left, right):
+                task_name = keys[position][1]
+                if all(task_name in members for members in others):
+                    names.append(task_name)
+                    if limit is not None and len(names) >= limit:
+                        break
+            return names
+
+    def facets(self) -> Dict[str, Any]:
+        """Task counts per status, useful for summaries"""
+        with self._lock:
+            return {status: len(names) for status, names in self._statuses.items() if names}
+
+    # Internal helpers (callers hold the lock)
+    def _add_name(self, task_name: str, ordinal: int = 0):
+        if task_name in self._task_tokens:
+            return
+        key = (ordinal, task_name)
+        self._task_key[task_name] = key
+        insort(self._order, key)
+        tokens = set(tokenize(task_name))
+        self._task_tokens[task_name] = tokens
+        for token in tokens:
+            self._tokens.setdefault(token, set()).add(task_name)
+            insort(self._token_order.setdefault(token, []), key)
+
+    def _set_status(self, task_name: str, status: str):
+        status = status.lower()
+        self._task_status[task_name] = status
+        self._statuses.setdefault(status, set()).add(task_name)
+        insort(self._status_order.setdefault(status, []), self._task_key[task_name])
+
+    def _clear_status(self, task_name: str):
+        status = self._task_status.pop(task_name, None)
+        if status is None:
+            return
+        names = self._statuses[status]
+        names.discard(task_name)
+        _discard(self._status_order[status], self._task_key[task_name])
+        if not names:
+            del self._statuses[status]
+            del self._status_order[status]
+
+    def _rekey(self, task_name: str, ordinal: int):
+        """Move a task to its new start date in every posting list that holds it"""
+        old = self._task_key[task_name]
+        new = (ordinal, task_name)
+        if new == old:
+            return
+        self._task_key[task_name] = new
+        lists = [self._order] + [self._token_order[token] for token in self._task_tokens[task_name]]
+        status = self._task_status.get(task_name)
+        if status is not None:
+            lists.append(self._status_order[status])
+        for keys in lists:
+            _discard(keys, old)
+            insort(keys, new)
+
+    def _remove(self, task_name: str):
+        if task_name not in self._task_key:
+            return
+        self._clear_status(task_name)
+        key = self._task_key.pop(task_name)
+        _discard(self._order, key)
+        for token in self._task_tokens.pop(task_name, set()):
+            names = self._tokens.get(token)
+            if names is not None:
+                names.discard(task_name)
+                _discard(self._token_order[token], key)
+                if not names:
+                    del self._tokens[token]
+                    del self._token_order[token]
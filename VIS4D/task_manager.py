@@ -1,18 +1,53 @@
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import threading
+import numpy as np
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from pathlib import Path
 
 # Import the NavisworksAPI class
 from navisworks_api import NavisworksAPI
+from task_index import TaskIndex
+from critical_path import CriticalPathEngine
+from interval_index import ZoneConflictIndex
+from task_tree import TaskTree
+from schedule_sync import TaskDigests, ScheduleSync
+from change_history import ChangeHistory
+from undo_stack import UndoStack
 
 class TaskManager:
     def __init__(self, client_id: str = None, client_secret: str = None):
         self.task_statuses = {}
         self.task_dates = {}
+        self.task_end_dates = {}
         self.task_mapping = self._load_task_mapping()
         
+        # Guards each change together with its listener notifications, and readers
+        # on other threads (commands run on the command worker, voice capture reads names)
+        self._lock = threading.RLock()
+        
+        # Bumped whenever the set of task names changes (used to invalidate parse caches)
+        self.vocabulary_version = 0
+        
+        # Incrementally maintained views are notified of every local change
+        self._listeners: List[Callable[[str, str, Optional[str], Optional[str]], None]] = []
+        self.index = TaskIndex()
+        self.add_listener(self.index.on_change)
+        self.schedule = CriticalPathEngine()
+        self.add_listener(self.schedule.on_change)
+        self.zones = ZoneConflictIndex()
+        self.add_listener(self.zones.on_change)
+        self.tree = TaskTree()
+        self.add_listener(self.tree.on_change)
+        self.digests = TaskDigests()
+        self.add_listener(self.digests.on_change)
+        self._sync: Optional[ScheduleSync] = None
+        self.history = ChangeHistory()
+        self.add_listener(self.history.on_change)
+        self.versions = UndoStack(self)
+        self.add_listener(self.versions.on_change)
+        
         # Initialize the NavisworksAPI client
         self.api = NavisworksAPI()
         
@@ -27,10 +62,10 @@ class TaskManager:
         # Load saved task state if available
         self._load_task_state()
 
-    def authenticate(self, client_id: str, client_secret: str) -> bool:
+    def authenticate(self, client_id: str, client_secret: str, timeout: float = None) -> bool:
         """Authenticate with the Navisworks API"""
         try:
-            success = self.api.authenticate(client_id, client_secret)
+            success = self.api.authenticate(client_id, client_secret, timeout=timeout)
             if success:
                 # Store credentials for future use
                 self.client_id = client_id
@@ -42,6 +77,16 @@ class TaskManager:
         except Exception as e:
             logging.error(f"Authentication error: {e}")
             return False
+    
+    def request_token(self, client_id: str, client_secret: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Check credentials with the Navisworks API without signing in (see apply_credentials)"""
+        return self.api.request_token(client_id, client_secret, timeout=timeout)
+    
+    def apply_credentials(self, client_id: str, client_secret: str, token: Dict[str, Any]):
+        """Sign in with credentials and the token request_token returned for them"""
+        self.api.apply_token(token)
+        self.client_id = client_id
+        self.client_secret = client_secret
 
     def _load_task_mapping(self) -> Dict[str, str]:
         try:
@@ -69,22 +114,267 @@ class TaskManager:
                     state = json.load(f)
                     self.task_statuses = state.get('statuses', {})
                     self.task_dates = state.get('dates', {})
+                    self.task_end_dates = state.get('end_dates', {})
+                    dependencies = state.get('dependencies', {})
+                    hierarchy = state.get('hierarchy', {})
+                    self.vocabulary_version += 1
                     logging.info("Task state loaded successfully")
+            else:
+                dependencies, hierarchy = {}, {}
+            self.index.build(self.task_statuses, self.task_dates)
+            self.schedule.build(self.task_dates, self.task_end_dates, dependencies)
+            self.zones.build(self.task_dates, self.task_end_dates)
+            self.tree.build(self.task_statuses, hierarchy)
+            self.digests.build(self.task_statuses, self.task_dates, self.task_end_dates)
+            self.history.seed(self.task_statuses, self.task_dates, self.task_end_dates)
+            self.versions.build(self.task_statuses, self.task_dates, self.task_end_dates)
         except Exception as e:
             logging.error(f"Error loading task state: {e}")
     
+    def known_tasks(self) -> List[str]:
+        """All task names tracked in local state"""
+        with self._lock:
+            names = set(self.task_statuses) | set(self.task_dates)
+        return sorted(names)
+    
+    def select_tasks(self, name_tokens: List[str] = None, floor: str = None, status: str = None) -> List[str]:
+        """Select tasks by name tokens (e.g. ['grade', 'beam', 'pour']), floor and/or status"""
+        tokens = list(name_tokens or [])
+        if floor:
+            tokens += [floor, 'floor']
+        return self.index.query(tokens=tokens, status=status)
+    
+    def query_tasks(self, tokens: List[str] = None, status: str = None, start_from: date = None,
+                    start_to: date = None, critical: bool = False, late: bool = False,
+                    conflicting: bool = False) -> List[str]:
+        """Answer a schedule query from the task index, optionally keeping only critical, late or
+        zone-conflicting tasks"""
+        names = self.index.query(tokens=tokens, status=status, start_from=start_from, start_to=start_to)
+        if critical:
+            critical_names = set(self.schedule.critical_tasks())
+            names = [name for name in names if name in critical_names]
+        if late:
+            late_names = self.schedule.late_tasks()
+            names = [name for name in names if name in late_names]
+        if conflicting:
+            names = [name for name in names if self.zones.conflicts_for(name)]
+        return names
+    
+    def plan_shift(self, task_names: List[str], days: int) -> List[Dict[str, Any]]:
+        """Compute shifted start dates for many tasks at once.
+        
+        Returns one update_date operation per task that has a date, each with
+        an extra 'previous_date' entry for previews. Finish dates move by the
+        same number of days so durations are kept.
+        """
+        dated = [name for name in task_names if self.task_dates.get(name)]
+        if not dated:
+            return []
+        ordinals = np.fromiter(
+            (datetime.strptime(self.task_dates[name], "%B %d, %Y").toordinal() for name in dated),
+            dtype=np.int64,
+            count=len(dated)
+        )
+        shifted = ordinals + days
+        operations = []
+        for name, ordinal in zip(dated, shifted):
+            operation = {
+                'action': 'update_date',
+                'task_name': name,
+                'date': date.fromordinal(int(ordinal)).strftime("%B %d, %Y"),
+                'previous_date': self.task_dates[name]
+            }
+            if self.task_end_dates.get(name):
+                end_ordinal = datetime.strptime(self.task_end_dates[name], "%B %d, %Y").toordinal() + days
+                operation['end_date'] = date.fromordinal(end_ordinal).strftime("%B %d, %Y")
+            operations.append(operation)
+        return operations
+    
+    def add_dependency(self, successor: str, predecessor: str, dep_type: str = 'FS', lag: int = 0) -> bool:
+        """Make successor depend on predecessor (finish-to-start or start-to-start, lag in days)"""
+        added = self.add_dependencies([(successor, predecessor, dep_type, lag)])[0]
+        if added:
+            logging.info(f"Added {dep_type} dependency '{predecessor}' -> '{successor}' (lag {lag})")
+        return added
+    
+    def add_dependencies(self, links: List[Tuple[str, str, str, int]], save: bool = True) -> List[bool]:
+        """Add (successor, predecessor, dep_type, lag) dependencies as one group.
+        
+        Returns a success flag per link, in order. Bulk loaders pass
+        save=False and call save_state() once at the end.
+        """
+        results = []
+        with self._lock:
+            for successor, predecessor, dep_type, lag in links:
+                try:
+                    for task_name in (successor, predecessor):
+                        if task_name not in self.task_statuses and task_name not in self.task_dates:
+                            raise ValueError(f"Unknown task '{task_name}'")
+                    self.schedule.add_dependency(successor, predecessor, dep_type, lag)
+                    results.append(True)
+                except ValueError as e:
+                    logging.error(f"Cannot add dependency '{predecessor}' -> '{successor}': {e}")
+                    results.append(False)
+        if save and any(results):
+            self._save_task_state()
+        return results
+    
+    def remove_dependency(self, successor: str, predecessor: str) -> bool:
+        removed = self.schedule.remove_dependency(successor, predecessor)
+        if removed:
+            self._save_task_state()
+        return removed
+    
+    def schedule_flags(self, task_name: str) -> Dict[str, Any]:
+        """Early start, total float and critical/late flags for a task"""
+        return self.schedule.schedule_flags(task_name)
+    
+    def critical_tasks(self) -> List[str]:
+        return self.schedule.critical_tasks()
+    
+    def late_tasks(self) -> Dict[str, int]:
+        """Tasks planned to start before their predecessors allow, with the slip in days"""
+        return self.schedule.late_tasks()
+    
+    def progress(self, group: str = None, within: str = None) -> Optional[Dict[str, Any]]:
+        """Percent complete and rolled-up status for a floor, zone or trade (the whole project by default)"""
+        return self.tree.summary(group, within)
+    
+    def recent_changes(self, since: date = None, until: date = None, task_name: str = None,
+                       limit: int = None) -> List[Dict[str, Any]]:
+        """Recorded status/date changes, newest first"""
+        return self.history.changes(since, until, task_name, limit)
+    
+    def slippage(self, since: date = None, until: date = None, field: str = 'date') -> Dict[str, Any]:
+        """Cumulative start (or finish) date slippage per day from the change history"""
+        return self.history.slippage(since, until, field)
+    
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """Revert the last command's task changes locally and in Timeliner (None if there is nothing to undo)"""
+        return self.versions.undo()
+    
+    def redo(self) -> Optional[Dict[str, Any]]:
+        """Re-apply the last undone command"""
+        return self.versions.redo()
+    
+    def set_task_path(self, task_name: str, path: List[str]):
+        """Place a task explicitly in the hierarchy instead of inferring it from its name"""
+        self.tree.set_path(task_name, path)
+        self._save_task_state()
+    
+    def zone_conflicts(self, task_name: str) -> List[str]:
+        """Tasks in the same floor/zone whose dates overlap task_name"""
+        return self.zones.conflicts_for(task_name)
+    
+    def add_listener(self, callback: Callable[[str, str, Optional[str], Optional[str]], None]):
+        """Register callback(task_name, field, old, new), called after every local change.
+        
+        field is 'status', 'date' (start) or 'end_date', or 'task' when a task
+        appears (old None) or disappears (new None).
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        for callback in self._listeners:
+            try:
+                callback(task_name, field, old, new)
+            except Exception as e:
+                logging.error(f"Task listener error: {e}")
+    
+    def _track_task_name(self, task_name: str):
+        """Bump the vocabulary version and announce task_name if it is not tracked yet"""
+        if (task_name not in self.task_statuses and task_name not in self.task_dates
+                and task_name not in self.task_end_dates):
+            self.vocabulary_version += 1
+            self._notify(task_name, 'task', None, task_name)
+    
+    def _set_status(self, task_name: str, status: str):
+        with self._lock:
+            self._track_task_name(task_name)
+            old = self.task_statuses.get(task_name)
+            self.task_statuses[task_name] = status
+            self._notify(task_name, 'status', old, status)
+    
+    def _set_date(self, task_name: str, date_str: str):
+        with self._lock:
+            self._track_task_name(task_name)
+            old = self.task_dates.get(task_name)
+            self.task_dates[task_name] = date_str
+            self._notify(task_name, 'date', old, date_str)
+    
+    def _set_end_date(self, task_name: str, date_str: str):
+        with self._lock:
+            self._track_task_name(task_name)
+            old = self.task_end_dates.get(task_name)
+            self.task_end_dates[task_name] = date_str
+            self._notify(task_name, 'end_date', old, date_str)
+    
+    def _remove_task(self, task_name: str):
+        with self._lock:
+            old_status = self.task_statuses.pop(task_name, None)
+            old_date = self.task_dates.pop(task_name, None)
+            old_end_date = self.task_end_dates.pop(task_name, None)
+            self.vocabulary_version += 1
+            if old_status is not None:
+                self._notify(task_name, 'status', old_status, None)
+            if old_date is not None:
+                self._notify(task_name, 'date', old_date, None)
+            if old_end_date is not None:
+                self._notify(task_name, 'end_date', old_end_date, None)
+            self._notify(task_name, 'task', task_name, None)
+    
     def _save_task_state(self):
         """Save current task state to a JSON file"""
         try:
-            state = {
-                'statuses': self.task_statuses,
-                'dates': self.task_dates
-            }
+            with self._lock:
+                state = {
+                    'statuses': dict(self.task_statuses),
+                    'dates': dict(self.task_dates),
+                    'end_dates': dict(self.task_end_dates),
+                    'dependencies': self.schedule.dependencies(),
+                    'hierarchy': self.tree.explicit_paths()
+                }
             with open('task_state.json', 'w') as f:
                 json.dump(state, f, indent=4)
+            self.history.flush()
         except Exception as e:
             logging.error(f"Error saving task state: {e}")
             
+    def save_state(self):
+        """Persist local task state (for callers that applied batches with save=False)"""
+        self._save_task_state()
+    
+    def apply_remote_state(self, tasks: Dict[str, Optional[Dict[str, Optional[str]]]], save: bool = True):
+        """Mirror values that are already in Timeliner into local state without sending them back.
+        
+        tasks maps names to {'status', 'date', 'end_date'} (None clears a value),
+        or to None for tasks that no longer exist in Timeliner.
+        """
+        for task_name, fields in tasks.items():
+            if fields is None:
+                self._remove_task(task_name)
+                continue
+            for field, table, setter in (('status', self.task_statuses, self._set_status),
+                                         ('date', self.task_dates, self._set_date),
+                                         ('end_date', self.task_end_dates, self._set_end_date)):
+                value = fields.get(field)
+                if value is not None:
+                    if table.get(task_name) != value:
+                        setter(task_name, value)
+                elif task_name in table:
+                    with self._lock:
+                        self._notify(task_name, field, table.pop(task_name), None)
+        if save:
+            self._save_task_state()
+    
+    def sync(self, remote=None, policy: str = None) -> Dict[str, Any]:
+        """Reconcile local state with Timeliner (or a received snapshot), sending only changed tasks"""
+        if self._sync is None:
+            self._sync = ScheduleSync(self)
+        if policy:
+            self._sync.policy = policy
+        return self._sync.sync(remote)
+    
     def _save_task_mapping(self, mapping: Dict[str, str]):
         try:
             with open('task_mapping.json', 'w') as f:
@@ -95,7 +385,7 @@ class TaskManager:
     def update_task_status(self, task_name: str, status: str) -> bool:
         try:
             # Update local state
-            self.task_statuses[task_name] = status
+            self._set_status(task_name, status)
             self._save_task_state()
 
             # Map status to Navisworks format
@@ -120,10 +410,13 @@ class TaskManager:
             logging.error(f"Error updating task status: {e}")
             return False
 
-    def update_task_date(self, task_name: str, date: str) -> bool:
+    def update_task_date(self, task_name: str, date: str, date_type: str = 'start') -> bool:
         try:
             # Update local state
-            self.task_dates[task_name] = date
+            if date_type == 'finish':
+                self._set_end_date(task_name, date)
+            else:
+                self._set_date(task_name, date)
             self._save_task_state()
 
             # Parse and format the date
@@ -132,7 +425,7 @@ class TaskManager:
             # Use NavisworksAPI to update the task
             result = self.api.update_task(
                 task_name=task_name,
-                updates={'start_date': date_obj},
+                updates={'end_date' if date_type == 'finish' else 'start_date': date_obj},
                 client_id=self.client_id,
                 client_secret=self.client_secret
             )
@@ -162,8 +455,9 @@ class TaskManager:
             
             if result.get('success', False):
                 # Update local state
-                self.task_dates[task_name] = start_date.strftime("%B %d, %Y")
-                self.task_statuses[task_name] = "not started"
+                self._set_date(task_name, start_date.strftime("%B %d, %Y"))
+                self._set_end_date(task_name, end_date.strftime("%B %d, %Y"))
+                self._set_status(task_name, "not started")
                 self._save_task_state()
                 
                 logging.info(f"Successfully created task '{task_name}'")
@@ -179,8 +473,7 @@ class TaskManager:
     def delete_task(self, task_name: str) -> bool:
         try:
             # Delete from local state
-            self.task_statuses.pop(task_name, None)
-            self.task_dates.pop(task_name, None)
+            self._remove_task(task_name)
             self._save_task_state()
 
             # Use NavisworksAPI to delete the task
@@ -199,4 +492,98 @@ class TaskManager:
                 
         except Exception as e:
             logging.error(f"Error deleting task: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def apply_operation(self, operation: Dict[str, Any]) -> bool:
+        """Apply a single operation dict (as produced by NLPProcessor) through the matching method"""
+        action = operation.get('action')
+        task_name = operation.get('task_name')
+        if action == 'update_status':
+            return self.update_task_status(task_name, operation['status'])
+        elif action == 'update_date':
+            return self.update_task_date(task_name, operation['date'], operation.get('date_type', 'start'))
+        elif action == 'create_task':
+            return self.create_task(task_name, operation['start_date'], operation['end_date'])
+        elif action == 'delete_task':
+            return self.delete_task(task_name)
+        logging.error(f"Unknown task operation: {action}")
+        return False
+
+    def apply_batch(self, operations: List[Dict[str, Any]], save: bool = True) -> List[bool]:
+        """Apply several operations as one group: one state save and one API round-trip.
+        
+        Returns a success flag per operation, in order. Bulk loaders pass
+        save=False and call save_state() once at the end.
+        """
+        try:
+            api_operations = []
+            for operation in operations:
+                action = operation['action']
+                task_name = operation['task_name']
+                
+                # Local state mirrors the single-task methods: updates and deletes
+                # are applied up front, creations only once the API accepts them
+                if action == 'update_status':
+                    self._set_status(task_name, operation['status'])
+                    api_operations.append({
+                        'action': 'update',
+                        'task_name': task_name,
+                        'updates': {'status': self.api.map_vis4d_status_to_navisworks(operation['status'])}
+                    })
+                elif action == 'update_date':
+                    updates = {}
+                    if operation.get('date_type') == 'finish':
+                        self._set_end_date(task_name, operation['date'])
+                        updates['end_date'] = datetime.strptime(operation['date'], "%B %d, %Y")
+                    else:
+                        self._set_date(task_name, operation['date'])
+                        updates['start_date'] = datetime.strptime(operation['date'], "%B %d, %Y")
+                    if operation.get('end_date'):
+                        self._set_end_date(task_name, operation['end_date'])
+                        updates['end_date'] = datetime.strptime(operation['end_date'], "%B %d, %Y")
+                    api_operations.append({
+                        'action': 'update',
+                        'task_name': task_name,
+                        'updates': updates
+                    })
+                elif action == 'create_task':
+                    api_operations.append({
+                        'action': 'create',
+                        'task_name': task_name,
+                        'task_type': operation.get('task_type', "Construct"),
+                        'start_date': operation['start_date'],
+                        'end_date': operation['end_date']
+                    })
+                elif action == 'delete_task':
+                    self._remove_task(task_name)
+                    api_operations.append({'action': 'delete', 'task_name': task_name})
+                else:
+                    raise ValueError(f"Unknown task operation: {action}")
+            
+            results = self.api.batch_tasks(
+                api_operations,
+                client_id=self.client_id,
+                client_secret=self.client_secret
+            )
+            
+            successes = []
+            for operation, result in zip(operations, results):
+                success = result.get('success', False)
+                if success and operation['action'] == 'create_task':
+                    self._set_date(operation['task_name'], operation['start_date'].strftime("%B %d, %Y"))
+                    self._set_end_date(operation['task_name'], operation['end_date'].strftime("%B %d, %Y"))
+                    self._set_status(operation['task_name'], "not started")
+                if not success:
+                    logging.error(f"Failed batch operation {operation['action']} on '{operation['task_name']}': {result.get('error')}")
+                successes.append(success)
+            
+            if save:
+                self._save_task_state()
+            logging.info(f"Applied batch of {len(operations)} operations ({sum(successes)} succeeded)")
+            return successes
+            
+        except Exception as e:
+            logging.error(f"Error applying task batch: {e}")
+            if save:
+                self._save_task_state()
+            return [False] * len(operations)
\ No newline at end of file
@@ -0,0 +1,193 @@
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from constants import TASK_HIERARCHY, STATUS_PROGRESS
+from interval_index import zone_of
+from task_index import tokenize, stem_token
+
+_TRADES = {stem_token(trade): trade for trade in TASK_HIERARCHY['TRADES']}
+
+def infer_path(task_name: str) -> Tuple[str, ...]:
+    """Place a task under its floor/zone and trade, e.g. "Main Floor Drywall Installation" -> ("main floor", "drywall")"""
+    zone = zone_of(task_name) or TASK_HIERARCHY['UNZONED']
+    trade = next((_TRADES[token] for token in tokenize(task_name) if token in _TRADES),
+                 TASK_HIERARCHY['GENERAL_TRADE'])
+    return zone, trade
+
+def rollup_status(counts: Dict[str, int], total: int) -> Optional[str]:
+    """Summarize child statuses into one status for a group of tasks"""
+    if not total:
+        return None
+    for status in ('complete', 'not started'):
+        if counts.get(status, 0) == total:
+            return status
+    if counts.get('in progress') or counts.get('complete'):
+        return 'in progress'
+    if counts.get('on hold'):
+        return 'on hold'
+    if counts.get('suspended'):
+        return 'suspended'
+    return 'not started'
+
+class _Node:
+    __slots__ = ('name', 'parent', 'children', 'members', 'counts', 'total', 'progress')
+
+    def __init__(self, name: str, parent: Optional['_Node'] = None):
+        self.name = name
+        self.parent = parent
+        self.children: Dict[str, '_Node'] = {}
+        self.members = 0                   # tasks attached directly to this group
+        self.counts: Dict[str, int] = {}
+        self.total = 0
+        self.progress = 0.0
+
+class TaskTree:
+    """Project -> floor/zone -> trade -> task hierarchy with incrementally maintained roll-ups.
+
+    Every group node keeps its task count, per-status counts and the sum of
+    task progress (STATUS_PROGRESS), so a status change only walks the few
+    ancestors of one task and progress questions are dictionary reads.
+    Paths are inferred from task names unless set explicitly.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.root = _Node(TASK_HIERARCHY['ROOT'])
+        self._task_node: Dict[str, _Node] = {}
+        self._task_status: Dict[str, str] = {}
+        self._explicit: Dict[str, Tuple[str, ...]] = {}
+        self._by_name: Dict[str, List[_Node]] = {self.root.name: [self.root]}
+
+    def build(self, statuses: Dict[str, str], explicit_paths: Dict[str, List[str]] = None):
+        """Rebuild the tree from TaskManager state"""
+        with self._lock:
+            self._reset()
+            self._explicit = {name: tuple(path) for name, path in (explicit_paths or {}).items()}
+            for task_name, status in statuses.items():
+                self._attach(task_name)
+                self._set_status(task_name, status)
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: adjust the roll-ups along one task's path"""
+        with self._lock:
+            if field == 'task':
+                if new is None:
+                    self._set_status(task_name, None)
+                    self._detach(task_name)
+                    self._explicit.pop(task_name, None)
+                else:
+                    self._attach(task_name)
+            elif field == 'status':
+                self._attach(task_name)
+                self._set_status(task_name, new)
+
+    def set_path(self, task_name: str, path: List[str]):
+        """Place a task under an explicit path of group names, e.g. ["building a", "level 2", "framing"]"""
+        with self._lock:
+            status = self._task_status.get(task_name)
+            self._set_status(task_name, None)
+            self._detach(task_name)
+            self._explicit[task_name] = tuple(part.lower() for part in path)
+            self._attach(task_name)
+            self._set_status(task_name, status)
+
+    def explicit_paths(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {name: list(path) for name, path in self._explicit.items()}
+
+    def path_of(self, task_name: str) -> Optional[List[str]]:
+        with self._lock:
+            node = self._task_node.get(task_name)
+            if node is None:
+                return None
+            path = []
+            while node is not None:
+                path.append(node.name)
+                node = node.parent
+            return path[::-1]
+
+    def summary(self, group: str = None, within: str = None) -> Optional[Dict[str, Any]]:
+        """Roll-up for a group name ("second floor", "drywall"; the whole project by default).
+
+        A trade name that appears under several floors is summed across them
+        unless within names the enclosing group to restrict to.
+        """
+        with self._lock:
+            nodes = self._by_name.get((group or self.root.name).lower(), [])
+            if within:
+                nodes = [node for node in nodes if self._has_ancestor(node, within.lower())]
+            if not nodes:
+                return None
+            counts: Dict[str, int] = {}
+            total, progress = 0, 0.0
+            for node in nodes:
+                total += node.total
+                progress += node.progress
+                for status, count in node.counts.items():
+                    counts[status] = counts.get(status, 0) + count
+            return {
+                'group': nodes[0].name,
+                'tasks': total,
+                'percent_complete': 100.0 * progress / total if total else 0.0,
+                'status': rollup_status(counts, total),
+                'status_counts': {status: count for status, count in counts.items() if count}
+            }
+
+    def groups(self) -> List[str]:
+        with self._lock:
+            return sorted(name for name, nodes in self._by_name.items() if any(node.total for node in nodes))
+
+    # Internal helpers (callers hold the lock)
+    @staticmethod
+    def _has_ancestor(node: _Node, name: str) -> bool:
+        node = node.parent
+        while node is not None:
+            if node.name == name:
+                return True
+            node = node.parent
+        return False
+
+    def _attach(self, task_name: str):
+        if task_name in self._task_node:
+            return
+        node = self.root
+        for part in self._explicit.get(task_name) or infer_path(task_name):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node(part, node)
+                self._by_name.setdefault(part, []).append(child)
+            node = child
+        node.members += 1
+        self._task_node[task_name] = node
+
+    def _detach(self, task_name: str):
+        node = self._task_node.pop(task_name, None)
+        if node is not None:
+            node.members -= 1
+        # Prune groups left without tasks
+        while node is not None and node is not self.root and node.members == 0 and not node.children:
+            del node.parent.children[node.name]
+            self._by_name[node.name].remove(node)
+            if not self._by_name[node.name]:
+                del self._by_name[node.name]
+            node = node.parent
+
+    def _set_status(self, task_name: str, status: Optional[str]):
+        old = self._task_status.pop(task_name, None)
+        if status is not None:
+            self._task_status[task_name] = status
+        node = self._task_node.get(task_name)
+        if node is None or old == status:
+            return
+        while node is not None:
+            if old is not None:
+                node.counts[old] -= 1
+                node.total -= 1
+                node.progress -= STATUS_PROGRESS.get(old, 0.0)
+            if status is not None:
+                node.counts[status] = node.counts.get(status, 0) + 1
+                node.total += 1
+                node.progress += STATUS_PROGRESS.get(status, 0.0)
+            node = node.parent
@@ -0,0 +1,64 @@
+import heapq
+from typing import Dict, Optional, List, Set, Iterable
+
+from task_index import tokenize
+from constants import CACHE_SETTINGS
+
+class TaskVocabulary:
+    """Known task names prepared once per vocabulary version for parsing.
+
+    Exact names resolve through a lowercase map. Loosely phrased names are
+    compared by embedding against a shortlist of names that share the most
+    words with them, so the embedding cache only ever sees a few dozen
+    candidates instead of every task in the project.
+    """
+    def __init__(self, names: Iterable[str], version: int = 0,
+                 shortlist_size: int = CACHE_SETTINGS['TASK_SHORTLIST'],
+                 max_scan: int = CACHE_SETTINGS['TASK_SHORTLIST_SCAN']):
+        self.version = version
+        self.shortlist_size = shortlist_size
+        self.max_scan = max_scan
+        self.by_lower: Dict[str, str] = {}
+        self._names_by_token: Dict[str, List[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        for name in names:
+            self.by_lower[name.lower()] = name
+            tokens = set(tokenize(name))
+            self._tokens[name] = tokens
+            for token in tokens:
+                self._names_by_token.setdefault(token, []).append(name)
+
+    def __len__(self) -> int:
+        return len(self.by_lower)
+
+    def exact(self, name: str) -> Optional[str]:
+        return self.by_lower.get(name.lower())
+
+    def starts_with_name(self, text: str, max_words: int = 8) -> bool:
+        """Whether text begins with a known task name ("slab B on hold")"""
+        words = text.lower().split()
+        if words and words[0] == 'the':
+            words = words[1:]
+        return any(' '.join(words[:count]) in self.by_lower for count in range(min(len(words), max_words), 0, -1))
+
+    def shortlist(self, text: str) -> List[str]:
+        """Names sharing the most words with text, best first.
+
+        Candidates come from the rarest words' posting lists; words shared
+        by many tasks ("floor", "installation") only rank them, so at most
+        max_scan names are looked at.
+        """
+        words = sorted(set(tokenize(text)), key=lambda token: len(self._names_by_token.get(token, ())))
+        words = [token for token in words if token in self._names_by_token]
+        if not words:
+            return []
+
+        candidates: Dict[str, int] = {}
+        for token in words:
+            if candidates and len(candidates) + len(self._names_by_token[token]) > self.max_scan:
+                break
+            for name in self._names_by_token[token][:self.max_scan]:
+                candidates[name] = 0
+        for name in candidates:
+            candidates[name] = sum(token in self._tokens[name] for token in words)
+        return heapq.nsmallest(self.shortlist_size, candidates, key=lambda name: (-candidates[name], len(name)))
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Tuple, Callable
+
+from constants import GUI_SETTINGS
+
+class UIUpdateQueue:
+    """Single entry point for updating the window from any thread.
+
+    Worker threads post status text, chat messages and callbacks here
+    instead of scheduling one Tk callback each; the Tk thread drains the
+    queue once per frame. Within a frame consecutive messages are inserted
+    with one call (so the chat view renders and scrolls once), and a status
+    line superseded before it was shown is dropped. Callbacks run in posting
+    order, after everything posted before them has been applied.
+    """
+    def __init__(self, widget, set_status: Callable[[str], None],
+                 insert_messages: Callable[[List[Tuple[str, bool]]], None],
+                 interval_ms: int = GUI_SETTINGS['FRAME_MS'],
+                 max_per_frame: int = GUI_SETTINGS['MAX_UPDATES_PER_FRAME']):
+        self.widget = widget
+        self.set_status = set_status
+        self.insert_messages = insert_messages
+        self.interval_ms = interval_ms
+        self.max_per_frame = max_per_frame
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+        self._job = None
+
+        self.frames = 0
+        self.updates = 0
+        self.statuses_dropped = 0
+        self.inserts = 0
+        self.frame_seconds: deque = deque(maxlen=500)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def status(self, text: str):
+        self._post(('status', text))
+
+    def message(self, text: str, is_user: bool = False):
+        self._post(('message', (text, is_user)))
+
+    def call(self, func: Callable, *args, **kwargs):
+        self._post(('call', (func, args, kwargs)))
+
+    def start(self):
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def drain(self) -> int:
+        """Apply up to max_per_frame queued updates (Tk thread only); returns how many"""
+        with self._lock:
+            count = min(len(self._items), self.max_per_frame)
+            items = [self._items.popleft() for _ in range(count)]
+        if not items:
+            return 0
+
+        started = time.perf_counter()
+        messages: List[Tuple[str, bool]] = []
+        status = None
+        for kind, payload in items:
+            if kind == 'message':
+                messages.append(payload)
+            elif kind == 'status':
+                if status is not None:
+                    self.statuses_dropped += 1
+                status = payload
+            else:
+                messages, status = self._flush(messages, status)
+                func, args, kwargs = payload
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    logging.error(f"Error in queued UI update {getattr(func, '__name__', func)}: {str(e)}")
+        self._flush(messages, status)
+
+        self.frames += 1
+        self.updates += count
+        self.frame_seconds.append(time.perf_counter() - started)
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        durations = sorted(self.frame_seconds)
+        return {
+            'frames': self.frames,
+            'updates': self.updates,
+            'inserts': self.inserts,
+            'statuses_dropped': self.statuses_dropped,
+            'pending': len(self),
+            'frame_p50_ms': durations[len(durations) // 2] * 1000 if durations else 0.0,
+            'frame_max_ms': durations[-1] * 1000 if durations else 0.0
+        }
+
+    def _post(self, item):
+        with self._lock:
+            self._items.append(item)
+
+    def _flush(self, messages: List[Tuple[str, bool]], status):
+        if messages:
+            self.inserts += 1
+            try:
+                self.insert_messages(messages)
+            except Exception as e:
+                logging.error(f"Error displaying {len(messages)} message(s): {str(e)}")
+        if status is not None:
+            try:
+                self.set_status(status)
+            except Exception as e:
+                logging.error(f"Error updating status: {str(e)}")
+        return [], None
+
+    def _tick(self):
+        try:
+            self.drain()
+        finally:
+            self._job = self.widget.after(self.interval_ms, self._tick)
@@ -0,0 +1,275 @@
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable
+
+from constants import UNDO_SETTINGS
+
+# (status, start date, end date) as kept by TaskManager; None where unset
+TaskRecord = Tuple[Optional[str], Optional[str], Optional[str]]
+_EMPTY: TaskRecord = (None, None, None)
+_FIELDS = {'status': 0, 'date': 1, 'end_date': 2}
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_DEPTH = 4                     # 32**4 leaves; below that entries share a small tuple
+
+def _slot(key_hash: int, level: int) -> int:
+    return (key_hash >> (_BITS * level)) & (_WIDTH - 1)
+
+class PersistentMap:
+    """Immutable hash trie from task names to records.
+
+    set() copies the one root-to-leaf path it changes and shares every other
+    node with the previous version, so keeping many versions costs memory
+    proportional to the changes between them. diff() skips subtrees the two
+    versions share, so comparing nearby versions is proportional to their
+    differences as well.
+    """
+    __slots__ = ('root', 'size')
+
+    def __init__(self, root: Optional[tuple] = None, size: int = 0):
+        self.root = root
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[str, TaskRecord]]) -> 'PersistentMap':
+        """Bulk build in one pass (no path copying)"""
+        root: list = [None] * _WIDTH
+        size = 0
+        for key, value in items:
+            key_hash = hash(key)
+            node = root
+            for level in range(_DEPTH - 1):
+                slot = _slot(key_hash, level)
+                if node[slot] is None:
+                    node[slot] = [None] * _WIDTH
+                node = node[slot]
+            slot = _slot(key_hash, _DEPTH - 1)
+            node[slot] = (node[slot] or ()) + ((key, value),)
+            size += 1
+
+        def freeze(node, level):
+            if level == _DEPTH - 1:
+                return tuple(node)
+            return tuple(freeze(child, level + 1) if child is not None else None for child in node)
+        return cls(freeze(root, 0), size)
+
+    def get(self, key: str) -> Optional[TaskRecord]:
+        key_hash = hash(key)
+        node = self.root
+        for level in range(_DEPTH):
+            if node is None:
+                return None
+            node = node[_slot(key_hash, level)]
+        for entry_key, value in node or ():
+            if entry_key == key:
+                return value
+        return None
+
+    def set(self, key: str, value: Optional[TaskRecord]) -> 'PersistentMap':
+        """New version with key set to value (removed when value is None)"""
+        key_hash = hash(key)
+        path = []
+        node = self.root
+        for level in range(_DEPTH):
+            path.append(node)
+            node = node[_slot(key_hash, level)] if node is not None else None
+        entries = node or ()
+        kept = tuple(entry for entry in entries if entry[0] != key)
+        size = self.size - (len(entries) - len(kept))
+        if value is not None:
+            kept += ((key, value),)
+            size += 1
+        child = kept or None
+        for level in range(_DEPTH - 1, -1, -1):
+            parent = path[level]
+            children = list(parent) if parent is not None else [None] * _WIDTH
+            children[_slot(key_hash, level)] = child
+            child = tuple(children) if any(item is not None for item in children) else None
+        return PersistentMap(child, size)
+
+    def diff(self, other: 'PersistentMap') -> Iterator[Tuple[str, Optional[TaskRecord], Optional[TaskRecord]]]:
+        """Yield (key, value here, value in other) for every key whose value differs"""
+        stack = [(self.root, other.root, 0)]
+        while stack:
+            mine, theirs, level = stack.pop()
+            if mine is theirs:
+                continue
+            if level == _DEPTH:
+                ours = dict(mine or ())
+                others = dict(theirs or ())
+                for key in ours.keys() | others.keys():
+                    if ours.get(key) != others.get(key):
+                        yield key, ours.get(key), others.get(key)
+                continue
+            for slot in range(_WIDTH):
+                left = mine[slot] if mine is not None else None
+                right = theirs[slot] if theirs is not None else None
+                if left is not right:
+                    stack.append((left, right, level + 1))
+
+@dataclass
+class UndoStep:
+    label: str
+    before: PersistentMap
+    after: PersistentMap
+
+def restore_operations(task_name: str, current: Optional[TaskRecord],
+                       target: Optional[TaskRecord]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """TaskManager operations that take one task from current back to target.
+
+    Returns (operations, status operations); statuses go in a second batch
+    so recreated tasks exist in Timeliner first.
+    """
+    operations, status_operations = [], []
+    if target is None:
+        if current is not None:
+            operations.append({'action': 'delete_task', 'task_name': task_name})
+        return operations, status_operations
+
+    status, start, end = target
+    current_status, current_start, current_end = current or _EMPTY
+    if current is None:
+        if not start and not end:
+            logging.error(f"Cannot recreate '{task_name}' without a start or finish date")
+            return operations, status_operations
+        start_date = datetime.strptime(start or end, "%B %d, %Y")
+        end_date = datetime.strptime(end or start, "%B %d, %Y")
+        operations.append({'action': 'create_task', 'task_name': task_name,
+                           'start_date': start_date, 'end_date': end_date})
+        current_status = 'not started'
+    else:
+        if start and start != current_start:
+            operation = {'action': 'update_date', 'task_name': task_name, 'date': start, 'date_type': 'start'}
+            if end and end != current_end:
+                operation['end_date'] = end
+            operations.append(operation)
+        elif end and end != current_end:
+            operations.append({'action': 'update_date', 'task_name': task_name, 'date': end, 'date_type': 'finish'})
+    if status and status != current_status:
+        status_operations.append({'action': 'update_status', 'task_name': task_name, 'status': status})
+    return operations, status_operations
+
+class UndoStack:
+    """Undo/redo for TaskManager built on PersistentMap versions of the task state.
+
+    The current version is advanced by change notifications. step() brackets
+    one user command: when it ends with a different version, the versions
+    before and after are pushed as an undo step. Undo and redo diff the two
+    versions and replay the inverse operations to Timeliner as one batch.
+    """
+    def __init__(self, task_manager, max_steps: int = UNDO_SETTINGS['MAX_STEPS']):
+        self.task_manager = task_manager
+        self.max_steps = max_steps
+        self._lock = threading.RLock()
+        self.current = PersistentMap()
+        self._undo: List[UndoStep] = []
+        self._redo: List[UndoStep] = []
+        self._open: Optional[Tuple[str, PersistentMap]] = None
+        self._depth = 0
+
+    def build(self, statuses: Dict[str, str], start_dates: Dict[str, str], end_dates: Dict[str, str]):
+        """Start from TaskManager state with empty undo/redo stacks"""
+        with self._lock:
+            self.current = PersistentMap.from_items(
+                (name, (statuses.get(name), start_dates.get(name), end_dates.get(name)))
+                for name in set(statuses) | set(start_dates) | set(end_dates)
+            )
+            self._undo.clear()
+            self._redo.clear()
+
+    def on_change(self, task_name: str, field: str, old: Optional[str], new: Optional[str]):
+        """TaskManager listener: advance the current version"""
+        with self._lock:
+            if field == 'task':
+                if new is None:
+                    self.current = self.current.set(task_name, None)
+                elif self.current.get(task_name) is None:
+                    self.current = self.current.set(task_name, _EMPTY)
+                return
+            index = _FIELDS.get(field)
+            if index is None:
+                return
+            record = list(self.current.get(task_name) or _EMPTY)
+            record[index] = new
+            self.current = self.current.set(task_name, tuple(record))
+
+    @contextmanager
+    def step(self, label: str):
+        """Record the changes made inside the block as one undoable step (nested steps merge)"""
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._open = (label, self.current)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    label, before = self._open
+                    self._open = None
+                    if before.root is not self.current.root and next(before.diff(self.current), None):
+                        self._undo.append(UndoStep(label, before, self.current))
+                        del self._undo[:-self.max_steps]
+                        self._redo.clear()
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """Revert the last step; returns a report, or None if there is nothing to undo"""
+        with self._lock:
+            if not self._undo:
+                return None
+            step = self._undo.pop()
+            report = self._restore(step.after, step.before, 'undo')
+            self._redo.append(step)
+            report['label'] = step.label
+            return report
+
+    def redo(self) -> Optional[Dict[str, Any]]:
+        """Re-apply the last undone step"""
+        with self._lock:
+            if not self._redo:
+                return None
+            step = self._redo.pop()
+            report = self._restore(step.before, step.after, 'redo')
+            self._undo.append(step)
+            report['label'] = step.label
+            return report
+
+    def _restore(self, source: PersistentMap, target: PersistentMap, action: str) -> Dict[str, Any]:
+        operations: List[Dict[str, Any]] = []
+        status_operations: List[Dict[str, Any]] = []
+        tasks = 0
+        for task_name, _, wanted in source.diff(target):
+            tasks += 1
+            task_operations, task_statuses = restore_operations(task_name, self.current.get(task_name), wanted)
+            operations.extend(task_operations)
+            status_operations.extend(task_statuses)
+
+        with self.task_manager.history.attribution(action, self.task_manager.client_id):
+            results = self.task_manager.apply_batch(operations, save=False)
+            created = {operation['task_name'] for operation, success in zip(operations, results)
+                       if operation['action'] == 'create_task' and not success}
+            status_operations = [operation for operation in status_operations if operation['task_name'] not in created]
+            results += self.task_manager.apply_batch(status_operations, save=False)
+            self.task_manager.save_state()
+
+        # The restore itself must not become a new step of a command that is still open
+        if self._open is not None:
+            self._open = (self._open[0], self.current)
+        failed = results.count(False)
+        if failed:
+            logging.error(f"{action.capitalize()} left {failed} operation(s) unapplied")
+        return {'success': not failed, 'tasks': tasks, 'operations': len(results), 'failed': failed}
@@ -2,9 +2,10 @@ from tkinter import ttk
 from typing import Dict, Any
 import logging
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from dateutil import parser
 from constants import COLORS
+from date_grammar import default_grammar
 
 def configure_styles(style: ttk.Style):
     """Configure ttk styles for the application"""
@@ -52,21 +53,8 @@ def format_date(date_str: str) -> str:
 def parse_relative_date(date_expression: str) -> str:
     """Parse relative date expressions (e.g., 'next week', 'tomorrow')"""
     try:
-        today = datetime.now()
-        expression = date_expression.lower()
-        
-        if 'tomorrow' in expression:
-            result = today + timedelta(days=1)
-        elif 'next week' in expression:
-            result = today + timedelta(weeks=1)
-        elif 'next month' in expression:
-            if today.month == 12:
-                result = today.replace(year=today.year + 1, month=1)
-            else:
-                result = today.replace(month=today.month + 1)
-        else:
-            result = today
-            
+        # Shares the compiled grammar and per-day memo with NLPProcessor
+        result = default_grammar.parse(date_expression) or datetime.now()
         return result.strftime("%B %d, %Y")
         
     except Exception as e:
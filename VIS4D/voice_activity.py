@@ -0,0 +1,204 @@
+import logging
+import queue
+import re
+import threading
+import time
+from typing import Optional, Callable, Tuple
+
+import numpy as np
+
+from constants import VAD_SETTINGS, RECORDING_SETTINGS
+
+def zero_crossing_rate(samples: np.ndarray) -> float:
+    """Fraction of adjacent samples that change sign"""
+    if len(samples) < 2:
+        return 0.0
+    return np.count_nonzero(np.diff(np.signbit(samples))) / (len(samples) - 1)
+
+class RingBuffer:
+    """Fixed-capacity int16 sample ring addressed by absolute sample position"""
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.written = 0            # samples written since creation
+
+    def write(self, samples: np.ndarray):
+        samples = samples[-self.capacity:]
+        start = self.written % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self.written += len(samples)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Samples [start, end), clipped to what is still held"""
+        start = max(start, self.written - self.capacity, 0)
+        end = min(end, self.written)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        first, last = start % self.capacity, end % self.capacity
+        if first < last or last == 0:
+            return self._data[first:last or self.capacity].copy()
+        return np.concatenate((self._data[first:], self._data[:last]))
+
+class ContinuousListener:
+    """Hands-free capture: frame-level voice activity detection over the shared stream.
+
+    Every frame is written to a ring buffer and classified as speech when its
+    energy clears the capture's rolling noise threshold and its zero-crossing
+    rate looks voiced (broadband noise such as fans and hiss crosses zero far
+    more often), or when it is much louder than the threshold. ONSET_FRAMES
+    of speech open a segment, HANGOVER_SECONDS of non-speech close it, and
+    only closed segments are handed to on_segment, on a worker thread so a
+    slow recognizer never stalls detection.
+    """
+    def __init__(self, capture, on_segment: Callable[[bytes], None]):
+        self.capture = capture
+        self.on_segment = on_segment
+        self.sample_rate = capture.sample_rate
+        frame_seconds = capture.frame_seconds
+        self.ring = RingBuffer(int(VAD_SETTINGS['BUFFER_SECONDS'] * self.sample_rate))
+        self.onset_frames = VAD_SETTINGS['ONSET_FRAMES']
+        self.hangover_frames = max(1, int(VAD_SETTINGS['HANGOVER_SECONDS'] / frame_seconds))
+        self.preroll = int(RECORDING_SETTINGS['PREROLL_SECONDS'] * self.sample_rate)
+        self.min_samples = int(VAD_SETTINGS['MIN_SEGMENT_SECONDS'] * self.sample_rate)
+        self.max_samples = int(VAD_SETTINGS['MAX_SEGMENT_SECONDS'] * self.sample_rate)
+
+        self._run_length = 0            # consecutive speech frames before a segment opens
+        self._silence = 0               # non-speech frames inside an open segment
+        self._segment_start: Optional[int] = None
+        self._segments: queue.Queue = queue.Queue()
+        self._running = threading.Event()
+        self._threads = []
+
+        self.segments = 0
+        self.cpu_seconds = 0.0          # detection thread CPU time
+        self.audio_seconds = 0.0
+
+    @property
+    def listening(self) -> bool:
+        return self._running.is_set()
+
+    def start(self):
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._detect, name="vad", daemon=True),
+            threading.Thread(target=self._deliver, name="vad-segments", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._running.clear()
+        self._segments.put(None)
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        self._segment_start = None
+        self._run_length = self._silence = 0
+
+    def cpu_percent(self) -> float:
+        """Detection CPU time as a percentage of the audio it processed"""
+        return 100.0 * self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def is_speech(self, samples: np.ndarray, energy: float) -> bool:
+        threshold = self.capture.noise.threshold
+        if energy <= threshold:
+            return False
+        return energy > threshold * VAD_SETTINGS['LOUD_RATIO'] or zero_crossing_rate(samples) < VAD_SETTINGS['ZCR_MAX']
+
+    def feed(self, chunk: bytes, energy: float) -> Optional[Tuple[int, int]]:
+        """Process one frame; returns (start, end) sample positions when a segment closes"""
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        self.ring.write(samples)
+        speech = self.is_speech(samples, energy)
+
+        if self._segment_start is None:
+            self._run_length = self._run_length + 1 if speech else 0
+            if self._run_length >= self.onset_frames:
+                onset = self.ring.written - self._run_length * len(samples)
+                self._segment_start = max(0, onset - self.preroll)
+                self._silence = 0
+            return None
+
+        self._silence = 0 if speech else self._silence + 1
+        length = self.ring.written - self._segment_start
+        if self._silence < self.hangover_frames and length < self.max_samples:
+            return None
+        start, end = self._segment_start, self.ring.written
+        self._segment_start = None
+        self._run_length = 0
+        if end - start - self._silence * len(samples) < self.min_samples:
+            return None
+        return start, end
+
+    def _detect(self):
+        frames = self.capture.subscribe()
+        try:
+            while self._running.is_set():
+                try:
+                    chunk, energy = frames.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                started = time.thread_time()
+                bounds = self.feed(chunk, energy)
+                if bounds is not None:
+                    self.segments += 1
+                    self._segments.put(self.ring.read(*bounds).tobytes())
+                self.cpu_seconds += time.thread_time() - started
+                self.audio_seconds += len(chunk) / (2 * self.sample_rate)
+        finally:
+            self.capture.unsubscribe(frames)
+
+    def _deliver(self):
+        while True:
+            frame_data = self._segments.get()
+            if frame_data is None or not self._running.is_set():
+                return
+            try:
+                self.on_segment(frame_data)
+            except Exception as e:
+                logging.error(f"Error handling speech segment: {str(e)}")
+
+class WakePhraseGate:
+    """Lets through only speech addressed to the assistant.
+
+    "hey visa, mark slab A complete" passes "mark slab A complete"; a bare
+    "hey visa" opens a window in which the next utterance passes as is.
+    accept() returns the command text, '' when only the wake phrase was
+    heard, or None when the speech should be ignored.
+    """
+    def __init__(self, phrases=VAD_SETTINGS['WAKE_PHRASES'], required: bool = VAD_SETTINGS['REQUIRE_WAKE_PHRASE'],
+                 window: float = VAD_SETTINGS['WAKE_WINDOW_SECONDS'], clock: Callable[[], float] = time.monotonic):
+        ordered = sorted(phrases, key=len, reverse=True)
+        self.phrases = ordered
+        self.pattern = re.compile(r"^\s*(?:" + "|".join(re.escape(phrase) for phrase in ordered) + r")\b[\s,.!]*")
+        self.required = required
+        self.window = window
+        self.clock = clock
+        self._armed_until = 0.0
+
+    @property
+    def armed(self) -> bool:
+        return self.clock() < self._armed_until
+
+    def heard(self, text: str) -> bool:
+        """Whether the transcript of a segment's first moments starts with a wake phrase,
+        or stops partway through one"""
+        text = text.lower().strip()
+        if not text:
+            return False
+        return bool(self.pattern.match(text)) or any(phrase.startswith(text) for phrase in self.phrases)
+
+    def accept(self, text: str) -> Optional[str]:
+        match = self.pattern.match(text.lower())
+        if match:
+            command = text[match.end():].strip()
+            self._armed_until = 0.0 if command else self.clock() + self.window
+            return command
+        if not self.required or self.armed:
+            self._armed_until = 0.0
+            return text.strip()
+        return None